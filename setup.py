@@ -57,6 +57,7 @@ ext_modules = [
         define_macros=[
             ("_FORTIFY_SOURCE", 2)
         ],
+        libraries=['lz4'],
         extra_compile_args=extra_compile_args
     )
 ]
@@ -77,6 +78,11 @@ setuptools.setup(
         'numpy'
     ],
     install_requires=INSTALL_REQUIRES,
+    entry_points={
+        'console_scripts': [
+            'typed_python_precompile=typed_python.compiler.precompile:main',
+        ],
+    },
 
     # https://pypi.org/classifiers/
     classifiers=[
@@ -0,0 +1,96 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#pragma once
+
+#include <atomic>
+#include <chrono>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+
+/*****
+Counters for the in-process profiler of compiled code.
+
+When the profiler is on, the compiler instruments each function it generates
+to call 'np_profile_enter' and 'np_profile_exit' on a Counter dedicated to
+that function. Counters are never freed, so the compiled code can hold a
+raw pointer to one. The counts are updated atomically, since compiled code
+can run on many threads without the GIL.
+******/
+class CompiledFunctionProfile {
+public:
+    class Counter {
+    public:
+        Counter() : calls(0), nanoseconds(0)
+        {
+        }
+
+        std::atomic<int64_t> calls;
+        std::atomic<int64_t> nanoseconds;
+    };
+
+    static CompiledFunctionProfile& singleton() {
+        static CompiledFunctionProfile* profile = new CompiledFunctionProfile();
+
+        return *profile;
+    }
+
+    static int64_t now() {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(
+            std::chrono::steady_clock::now().time_since_epoch()
+        ).count();
+    }
+
+    // return the counter for the function named 'name', creating it if necessary.
+    Counter* counterFor(const std::string& name) {
+        std::lock_guard<std::mutex> lock(mMutex);
+
+        std::unique_ptr<Counter>& counter = mCounters[name];
+
+        if (!counter) {
+            counter.reset(new Counter());
+        }
+
+        return counter.get();
+    }
+
+    // call 'f(name, calls, nanoseconds)' for each counter
+    template<class func_type>
+    void visit(const func_type& f) {
+        std::lock_guard<std::mutex> lock(mMutex);
+
+        for (auto& nameAndCounter: mCounters) {
+            f(nameAndCounter.first, (int64_t)nameAndCounter.second->calls, (int64_t)nameAndCounter.second->nanoseconds);
+        }
+    }
+
+    // zero every counter. Compiled code keeps pointers to them, so we can't delete them.
+    void reset() {
+        std::lock_guard<std::mutex> lock(mMutex);
+
+        for (auto& nameAndCounter: mCounters) {
+            nameAndCounter.second->calls = 0;
+            nameAndCounter.second->nanoseconds = 0;
+        }
+    }
+
+private:
+    std::mutex mMutex;
+
+    std::map<std::string, std::unique_ptr<Counter> > mCounters;
+};
@@ -18,6 +18,7 @@
 
 #include "Type.hpp"
 #include "WireType.hpp"
+#include <memory>
 #include <stdexcept>
 #include <stdlib.h>
 #include <vector>
@@ -41,12 +42,8 @@ public:
     ~DeserializationBuffer() {
         PyEnsureGilAcquired acquireTheGil;
 
-        for (auto& typeAndList: m_needs_decref) {
-            typeAndList.first->check([&](auto& concreteType) {
-                for (auto ptr: typeAndList.second) {
-                    concreteType.destroy((instance_ptr)&ptr);
-                }
-            });
+        for (auto& typeAndPtr: m_needs_decref) {
+            typeAndPtr.first->destroy((instance_ptr)&typeAndPtr.second);
         }
 
         for (auto p: m_pyobj_needs_decref) {
@@ -307,7 +304,7 @@ public:
     }
 
     std::string readStringObject() {
-        int32_t sz = readUnsignedVarint();
+        size_t sz = readUnsignedVarint();
         return read_bytes_fun(sz, [&](uint8_t* ptr) {
             return std::string(ptr, ptr + sz);
         });
@@ -370,7 +367,7 @@ public:
         m_cachedPointers[which] = ptr;
 
         if (decrefType) {
-            m_needs_decref[decrefType].push_back(ptr);
+            m_needs_decref.push_back(std::make_pair(decrefType, (void*)ptr));
         }
 
         return ptr;
@@ -499,14 +496,11 @@ private:
                 return false;
             }
 
-            //it's all one big uncompressed block
-            m_decompressed_buffer.insert(
-                m_decompressed_buffer.end(),
-                m_compressed_blocks,
-                m_compressed_blocks + m_compressed_block_data_remaining
-            );
+            //it's all one big uncompressed block, so we can read it in place
+            //without copying it. Our caller keeps it alive until we're done.
             m_size += m_compressed_block_data_remaining;
-            m_read_head = &m_decompressed_buffer[0];
+            m_read_head = m_compressed_blocks;
+            m_compressed_blocks += m_compressed_block_data_remaining;
             m_compressed_block_data_remaining = 0;
             m_read_head_offset = 0;
             return true;
@@ -515,8 +509,11 @@ private:
                 return false;
             }
 
-            //hold the GIL because we use python to do this
-            PyEnsureGilAcquired acquireTheGil;
+            //if the context decompresses in python, hold the GIL
+            std::unique_ptr<PyEnsureGilAcquired> acquireTheGil;
+            if (m_context.compressionNeedsGil()) {
+                acquireTheGil.reset(new PyEnsureGilAcquired());
+            }
 
             uint32_t bytesToDecompress = *((uint32_t*)m_compressed_blocks);
 
@@ -560,11 +557,11 @@ private:
     // maps indices to the pointers we've cached under that index.
     std::vector<void*> m_cachedPointers;
 
-    //a map from the object type to each object that needs decreffing.
+    //each object that needs decreffing, along with its type.
     //it must be the case that a pointer is the _natural_ layout of the
     //object (e.g. PyObject, Dict, etc). We pass a pointer to this
     //as the actual instance to the 'destroy' operation
-    std::map<Type*, std::vector<void*> > m_needs_decref;
+    std::vector<std::pair<Type*, void*> > m_needs_decref;
 
     std::vector<PyObject*> m_pyobj_needs_decref;
 };
@@ -269,7 +269,7 @@ instance_ptr DictType::lookupValueByKey(instance_ptr self, instance_ptr key) con
 
     typed_python_hash_type keyHash = m_key->hash(key);
 
-    int32_t index = record.find(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
+    int64_t index = record.find(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
         return m_key->cmp(key, ptr, Py_EQ, false);
     });
 
@@ -285,7 +285,7 @@ bool DictType::deleteKey(instance_ptr self, instance_ptr key) const {
 
     typed_python_hash_type keyHash = m_key->hash(key);
 
-    int32_t index = record.remove(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
+    int64_t index = record.remove(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
         return m_key->cmp(key, ptr, Py_EQ, false);
     });
 
@@ -318,7 +318,7 @@ bool DictType::deleteKeyWithUninitializedValue(instance_ptr self, instance_ptr k
 
     typed_python_hash_type keyHash = m_key->hash(key);
 
-    int32_t index = record.remove(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
+    int64_t index = record.remove(m_bytes_per_key_value_pair, keyHash, [&](instance_ptr ptr) {
         return m_key->cmp(key, ptr, Py_EQ, false);
     });
 
@@ -334,7 +334,7 @@ instance_ptr DictType::insertKey(instance_ptr self, instance_ptr key) const {
 
     typed_python_hash_type keyHash = m_key->hash(key);
 
-    int32_t slot = record.allocateNewSlot(m_bytes_per_key_value_pair);
+    int64_t slot = record.allocateNewSlot(m_bytes_per_key_value_pair);
 
     record.add(keyHash, slot);
 
@@ -18,6 +18,9 @@
 
 #include "Type.hpp"
 #include "ReprAccumulator.hpp"
+#include <atomic>
+#include <memory>
+#include <unordered_map>
 
 
 class Function : public Type {
@@ -113,15 +116,30 @@ public:
         CompiledSpecialization(
                     compiled_code_entrypoint funcPtr,
                     Type* returnType,
-                    const std::vector<Type*>& argTypes
+                    const std::vector<Type*>& argTypes,
+                    int64_t hotCallThreshold = 0
                     ) :
-            mFuncPtr(funcPtr),
+            mState(new State(funcPtr, hotCallThreshold)),
             mReturnType(returnType),
             mArgTypes(argTypes)
         {}
 
         compiled_code_entrypoint getFuncPtr() const {
-            return mFuncPtr;
+            return mState->funcPtr.load(std::memory_order_acquire);
+        }
+
+        // install a new implementation of this specialization. Calls already
+        // running the old one finish with it, so it must stay alive.
+        void setFuncPtr(compiled_code_entrypoint funcPtr) const {
+            mState->funcPtr.store(funcPtr, std::memory_order_release);
+        }
+
+        // count a call to this specialization. Returns true exactly once, on the
+        // call that reaches the hot-call threshold. If the threshold is zero we
+        // don't count at all.
+        bool countCall() const {
+            return mState->callsUntilHot.load(std::memory_order_relaxed) > 0
+                && mState->callsUntilHot.fetch_sub(1, std::memory_order_relaxed) == 1;
         }
 
         Type* getReturnType() const {
@@ -133,11 +151,42 @@ public:
         }
 
     private:
-        compiled_code_entrypoint mFuncPtr;
+        // the part of the specialization that can change after we install it.
+        // copies of a specialization share it, so that moving the table of
+        // specializations around doesn't lose updates.
+        class State {
+        public:
+            State(compiled_code_entrypoint inFuncPtr, int64_t hotCallThreshold) :
+                funcPtr(inFuncPtr),
+                callsUntilHot(hotCallThreshold)
+            {}
+
+            std::atomic<compiled_code_entrypoint> funcPtr;
+            std::atomic<int64_t> callsUntilHot;
+        };
+
+        std::shared_ptr<State> mState;
         Type* mReturnType;
         std::vector<Type*> mArgTypes;
     };
 
+    // the concrete python types of the arguments in a call. We use this to remember which
+    // compiled specialization a given call signature dispatched to.
+    typedef std::vector<PyTypeObject*> DispatchKey;
+
+    class HashDispatchKey {
+    public:
+        size_t operator()(const DispatchKey& key) const {
+            size_t res = key.size();
+
+            for (auto t: key) {
+                res = res * 1000003 ^ (size_t)t;
+            }
+
+            return res;
+        }
+    };
+
     class Overload {
     public:
         Overload(
@@ -149,6 +198,7 @@ public:
                 mReturnType(returnType),
                 mArgs(args),
                 mCompiledCodePtr(nullptr),
+                mDispatchCacheHits(0),
                 mHasKwarg(false),
                 mHasStarArg(false),
                 mMinPositionalArgs(0),
@@ -287,8 +337,15 @@ public:
             return mCompiledSpecializations;
         }
 
-        void addCompiledSpecialization(compiled_code_entrypoint e, Type* returnType, const std::vector<Type*>& argTypes) {
-            mCompiledSpecializations.push_back(CompiledSpecialization(e,returnType,argTypes));
+        // add a specialization, returning its index.
+        long addCompiledSpecialization(
+                    compiled_code_entrypoint e,
+                    Type* returnType,
+                    const std::vector<Type*>& argTypes,
+                    int64_t hotCallThreshold
+                    ) {
+            mCompiledSpecializations.push_back(CompiledSpecialization(e, returnType, argTypes, hotCallThreshold));
+            return mCompiledSpecializations.size() - 1;
         }
 
         void touchCompiledSpecializations() {
@@ -297,6 +354,36 @@ public:
             std::swap(mCompiledSpecializations, other);
         }
 
+        // return the index of the compiled specialization that calls with argument types
+        // 'key' dispatched to last time, or -1 if we haven't seen it. Callers must hold the GIL.
+        long lookupDispatchCache(const DispatchKey& key) const {
+            auto it = mDispatchCache.find(key);
+
+            if (it == mDispatchCache.end()) {
+                return -1;
+            }
+
+            mDispatchCacheHits++;
+
+            return it->second;
+        }
+
+        // record that calls with argument types 'key' dispatch to specialization 'specializationIx'.
+        // specializations are only ever appended, so indices stay valid. Callers must hold the GIL.
+        void recordDispatch(const DispatchKey& key, long specializationIx) const {
+            mDispatchCache[key] = specializationIx;
+        }
+
+        // the number of distinct argument signatures in the dispatch cache.
+        size_t dispatchCacheSize() const {
+            return mDispatchCache.size();
+        }
+
+        // how many lookups have found a signature in the dispatch cache.
+        int64_t dispatchCacheHits() const {
+            return mDispatchCacheHits;
+        }
+
         bool operator<(const Overload& other) const {
             if (mFunctionObj < other.mFunctionObj) { return true; }
             if (mFunctionObj > other.mFunctionObj) { return false; }
@@ -315,7 +402,9 @@ public:
         Type* mReturnType;
         std::vector<FunctionArg> mArgs;
         std::vector<CompiledSpecialization> mCompiledSpecializations;
+        mutable std::unordered_map<DispatchKey, long, HashDispatchKey> mDispatchCache;
         compiled_code_entrypoint mCompiledCodePtr; //accepts a pointer to packed arguments and another pointer with the return value
+        mutable int64_t mDispatchCacheHits;
 
         bool mHasStarArg;
         bool mHasKwarg;
@@ -325,11 +414,13 @@ public:
 
     Function(std::string inName,
             const std::vector<Overload>& overloads,
-            bool isEntrypoint
+            bool isEntrypoint,
+            bool isBackgroundCompiled=false
             ) :
         Type(catFunction),
         mOverloads(overloads),
-        mIsEntrypoint(isEntrypoint)
+        mIsEntrypoint(isEntrypoint),
+        mIsBackgroundCompiled(isBackgroundCompiled)
     {
         m_name = inName;
         m_is_simple = false;
@@ -339,20 +430,20 @@ public:
         endOfConstructorInitialization(); // finish initializing the type object.
     }
 
-    static Function* Make(std::string inName, std::vector<Overload>& overloads, bool isEntrypoint) {
+    static Function* Make(std::string inName, std::vector<Overload>& overloads, bool isEntrypoint, bool isBackgroundCompiled=false) {
         static std::mutex guard;
 
         std::lock_guard<std::mutex> lock(guard);
 
-        typedef std::tuple<const std::string, const std::vector<Overload>, bool> keytype;
+        typedef std::tuple<const std::string, const std::vector<Overload>, bool, bool> keytype;
 
         static std::map<keytype, Function*> m;
 
-        auto it = m.find(keytype(inName, overloads, isEntrypoint));
+        auto it = m.find(keytype(inName, overloads, isEntrypoint, isBackgroundCompiled));
         if (it == m.end()) {
             it = m.insert(std::pair<keytype, Function*>(
-                keytype(inName, overloads, isEntrypoint),
-                new Function(inName, overloads, isEntrypoint)
+                keytype(inName, overloads, isEntrypoint, isBackgroundCompiled),
+                new Function(inName, overloads, isEntrypoint, isBackgroundCompiled)
             )).first;
         }
 
@@ -376,7 +467,12 @@ public:
             overloads.push_back(o);
         }
 
-        return Function::Make(f1->m_name, overloads, f1->isEntrypoint() || f2->isEntrypoint());
+        return Function::Make(
+            f1->m_name,
+            overloads,
+            f1->isEntrypoint() || f2->isEntrypoint(),
+            f1->isBackgroundCompiled() || f2->isBackgroundCompiled()
+        );
     }
 
     bool cmp(instance_ptr left, instance_ptr right, int pyComparisonOp, bool suppressExceptions) {
@@ -417,17 +513,33 @@ public:
         return mOverloads;
     }
 
-    void addCompiledSpecialization(
+    long addCompiledSpecialization(
                     long whichOverload,
                     compiled_code_entrypoint entrypoint,
                     Type* returnType,
-                    const std::vector<Type*>& argTypes
+                    const std::vector<Type*>& argTypes,
+                    int64_t hotCallThreshold = 0
                     ) {
         if (whichOverload < 0 || whichOverload >= mOverloads.size()) {
             throw std::runtime_error("Invalid overload index.");
         }
 
-        mOverloads[whichOverload].addCompiledSpecialization(entrypoint, returnType, argTypes);
+        return mOverloads[whichOverload].addCompiledSpecialization(entrypoint, returnType, argTypes, hotCallThreshold);
+    }
+
+    // swap in a new implementation of an existing compiled specialization.
+    void replaceCompiledSpecialization(long whichOverload, long specializationIx, compiled_code_entrypoint entrypoint) {
+        if (whichOverload < 0 || whichOverload >= mOverloads.size()) {
+            throw std::runtime_error("Invalid overload index.");
+        }
+
+        const std::vector<CompiledSpecialization>& specializations = mOverloads[whichOverload].getCompiledSpecializations();
+
+        if (specializationIx < 0 || specializationIx >= specializations.size()) {
+            throw std::runtime_error("Invalid specialization index.");
+        }
+
+        specializations[specializationIx].setFuncPtr(entrypoint);
     }
 
     // a test function to force the compiled specialization table to change memory
@@ -445,11 +557,24 @@ public:
     }
 
     Function* withEntrypoint(bool isEntrypoint) {
-        return Function::Make(name(), mOverloads, isEntrypoint);
+        return Function::Make(name(), mOverloads, isEntrypoint, mIsBackgroundCompiled);
+    }
+
+    // should calls with new signatures compile on the runtime's background thread
+    // rather than blocking? This is part of the type, so that a function wrapped both
+    // with and without 'Entrypoint(background=True)' gets two distinct Function types.
+    bool isBackgroundCompiled() const {
+        return mIsBackgroundCompiled;
+    }
+
+    Function* withBackgroundCompilation(bool isBackgroundCompiled) {
+        return Function::Make(name(), mOverloads, mIsEntrypoint, isBackgroundCompiled);
     }
 
 private:
     std::vector<Overload> mOverloads;
 
     bool mIsEntrypoint;
+
+    bool mIsBackgroundCompiled;
 };
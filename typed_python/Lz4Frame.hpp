@@ -0,0 +1,127 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#pragma once
+
+#include <lz4frame.h>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include "SerializationContext.hpp"
+
+/*****
+Compress and decompress blocks in the LZ4 frame format natively, without
+touching the python interpreter, so callers can do it with the GIL released.
+
+The frames we write use the same settings as python's 'lz4.frame.compress'
+defaults (linked 64KB blocks, content size stored, no checksums), and we
+can read any valid frame, so data is interchangeable with
+SerializationContext.compress and SerializationContext.decompress.
+******/
+
+inline void lz4CheckError(size_t code) {
+    if (LZ4F_isError(code)) {
+        throw std::runtime_error(std::string("Corrupt data: lz4 error: ") + LZ4F_getErrorName(code));
+    }
+}
+
+inline std::shared_ptr<ByteBuffer> lz4FrameCompress(uint8_t* begin, uint8_t* end) {
+    size_t srcSize = end - begin;
+
+    LZ4F_preferences_t prefs;
+    memset(&prefs, 0, sizeof(prefs));
+    prefs.frameInfo.blockSizeID = LZ4F_default;
+    prefs.frameInfo.blockMode = LZ4F_blockLinked;
+    prefs.frameInfo.contentChecksumFlag = LZ4F_noContentChecksum;
+    prefs.frameInfo.contentSize = srcSize;
+    prefs.compressionLevel = 0;
+
+    std::shared_ptr<VectorByteBuffer> result(new VectorByteBuffer());
+
+    result->data().resize(LZ4F_compressFrameBound(srcSize, &prefs));
+
+    size_t written = LZ4F_compressFrame(
+        &result->data()[0],
+        result->data().size(),
+        begin,
+        srcSize,
+        &prefs
+    );
+
+    lz4CheckError(written);
+
+    result->data().resize(written);
+
+    return result;
+}
+
+inline std::shared_ptr<ByteBuffer> lz4FrameDecompress(uint8_t* begin, uint8_t* end) {
+    LZ4F_decompressionContext_t ctx;
+
+    lz4CheckError(LZ4F_createDecompressionContext(&ctx, LZ4F_VERSION));
+
+    std::shared_ptr<VectorByteBuffer> result(new VectorByteBuffer());
+    std::vector<uint8_t>& out = result->data();
+
+    try {
+        // frames written with the content size stored let us allocate once
+        LZ4F_frameInfo_t frameInfo;
+        size_t headerSize = end - begin;
+
+        lz4CheckError(LZ4F_getFrameInfo(ctx, &frameInfo, begin, &headerSize));
+
+        begin += headerSize;
+
+        out.resize(frameInfo.contentSize ? frameInfo.contentSize : (end - begin) * 4 + 1024);
+
+        size_t outPos = 0;
+
+        // nonzero while we're in the middle of a frame
+        size_t hint = headerSize;
+
+        while (begin < end || hint != 0) {
+            if (outPos == out.size()) {
+                out.resize(out.size() * 2);
+            }
+
+            size_t available = out.size() - outPos;
+            size_t dstSize = available;
+            size_t srcSize = end - begin;
+
+            hint = LZ4F_decompress(ctx, &out[outPos], &dstSize, begin, &srcSize, nullptr);
+
+            lz4CheckError(hint);
+
+            outPos += dstSize;
+            begin += srcSize;
+
+            // if the frame wants more input but we have none, and it didn't stop
+            // because it ran out of room for output, the frame is truncated.
+            if (hint != 0 && begin == end && dstSize < available) {
+                throw std::runtime_error("Corrupt data: truncated lz4 frame");
+            }
+        }
+
+        out.resize(outPos);
+    } catch(...) {
+        LZ4F_freeDecompressionContext(ctx);
+        throw;
+    }
+
+    LZ4F_freeDecompressionContext(ctx);
+
+    return result;
+}
@@ -30,10 +30,19 @@ public:
     virtual bool isCompressionEnabled() const {
         return false;
     }
+    virtual bool compressionNeedsGil() const {
+        return false;
+    }
+    virtual const std::unordered_set<Type*>& treeTypes() const {
+        return m_no_types;
+    }
     virtual std::shared_ptr<ByteBuffer> compress(uint8_t* begin, uint8_t* end) const {
         return std::shared_ptr<ByteBuffer>(new RangeByteBuffer(begin, end));
     }
     virtual std::shared_ptr<ByteBuffer> decompress(uint8_t* begin, uint8_t* end) const {
         return std::shared_ptr<ByteBuffer>(new RangeByteBuffer(begin, end));
     }
+
+private:
+    std::unordered_set<Type*> m_no_types;
 };
@@ -0,0 +1,117 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#pragma once
+
+#include <atomic>
+#include <exception>
+#include <mutex>
+#include <thread>
+#include <vector>
+#include "PyGilState.hpp"
+#include "util.hpp"
+
+/*****
+Call 'f(k)' for each k in [0, count) on up to 'threadCount' native threads.
+
+The caller must have released the GIL. Worker threads are registered with
+the interpreter, so 'f' may reacquire the GIL with PyEnsureGilAcquired if
+it needs to touch python objects.
+
+If any call throws, we stop handing out work, wait for the threads that
+are still running, and rethrow the first exception on the calling thread.
+A PythonExceptionSet thrown on a worker has its python error moved onto the
+calling thread before we rethrow it.
+******/
+template<class func_type>
+void parallelFor(size_t count, size_t threadCount, const func_type& f) {
+    if (threadCount > count) {
+        threadCount = count;
+    }
+
+    if (threadCount <= 1) {
+        for (size_t k = 0; k < count; k++) {
+            f(k);
+        }
+        return;
+    }
+
+    std::atomic<size_t> nextIndex(0);
+    std::atomic<bool> failed(false);
+
+    std::mutex errorMutex;
+    std::exception_ptr firstError;
+    PyObject* errType = nullptr;
+    PyObject* errValue = nullptr;
+    PyObject* errTraceback = nullptr;
+
+    auto worker = [&]() {
+        PyNativeThreadState registerThisThread;
+
+        while (!failed) {
+            size_t k = nextIndex++;
+
+            if (k >= count) {
+                return;
+            }
+
+            try {
+                f(k);
+            } catch(PythonExceptionSet& e) {
+                PyEnsureGilAcquired acquireTheGil;
+                std::lock_guard<std::mutex> lock(errorMutex);
+
+                if (!failed.exchange(true)) {
+                    PyErr_Fetch(&errType, &errValue, &errTraceback);
+                } else {
+                    PyErr_Clear();
+                }
+            } catch(...) {
+                std::lock_guard<std::mutex> lock(errorMutex);
+
+                if (!failed.exchange(true)) {
+                    firstError = std::current_exception();
+                }
+            }
+        }
+    };
+
+    std::vector<std::thread> threads;
+
+    for (size_t i = 0; i < threadCount; i++) {
+        threads.push_back(std::thread(worker));
+    }
+
+    for (auto& t: threads) {
+        t.join();
+    }
+
+    if (errType) {
+        PyEnsureGilAcquired acquireTheGil;
+        PyErr_Restore(errType, errValue, errTraceback);
+        throw PythonExceptionSet();
+    }
+
+    if (firstError) {
+        std::rethrow_exception(firstError);
+    }
+}
+
+inline size_t defaultThreadCount() {
+    size_t res = std::thread::hardware_concurrency();
+
+    return res ? res : 1;
+}
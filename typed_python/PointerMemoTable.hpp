@@ -0,0 +1,135 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#pragma once
+
+#include <stdint.h>
+#include <stdlib.h>
+#include <utility>
+
+/*****
+An open-addressing hash table from pointers to the memo ids we've assigned
+them during serialization.
+
+We probe linearly and keep the table at most half full. Entries are never
+removed. The null pointer is a valid key (empty TupleOf instances are null),
+so empty slots are marked with a pointer value that can't be a real object.
+******/
+class PointerMemoTable {
+public:
+    PointerMemoTable() :
+        m_slots(nullptr),
+        m_capacity(0),
+        m_shift(64),
+        m_size(0)
+    {
+    }
+
+    ~PointerMemoTable() {
+        free(m_slots);
+    }
+
+    PointerMemoTable(const PointerMemoTable&) = delete;
+    PointerMemoTable& operator=(const PointerMemoTable&) = delete;
+
+    size_t size() const {
+        return m_size;
+    }
+
+    // return a pointer to the id stored for 'key', or nullptr if there isn't one.
+    uint32_t* find(void* key) {
+        if (!m_capacity) {
+            return nullptr;
+        }
+
+        slot* s = slotFor(key);
+
+        return s->key == key ? &s->id : nullptr;
+    }
+
+    // add 'key' with 'id'. 'key' must not already be in the table.
+    void insert(void* key, uint32_t id) {
+        if ((m_size + 1) * 2 > m_capacity) {
+            grow();
+        }
+
+        slot* s = slotFor(key);
+        s->key = key;
+        s->id = id;
+        m_size++;
+    }
+
+private:
+    class slot {
+    public:
+        void* key;
+        uint32_t id;
+    };
+
+    static void* emptyKey() {
+        return (void*)~(uintptr_t)0;
+    }
+
+    static size_t hashPointer(void* p) {
+        // objects are at least 8-byte aligned, so the low bits carry no information.
+        // fibonacci hashing mixes the rest into the high bits, which we use as the index.
+        return (size_t)(((uint64_t)(uintptr_t)p >> 3) * 0x9E3779B97F4A7C15ULL);
+    }
+
+    // the slot holding 'key', or the empty slot where it would go.
+    slot* slotFor(void* key) {
+        size_t mask = m_capacity - 1;
+        size_t index = hashPointer(key) >> m_shift;
+
+        while (true) {
+            slot* s = m_slots + index;
+
+            if (s->key == key || s->key == emptyKey()) {
+                return s;
+            }
+
+            index = (index + 1) & mask;
+        }
+    }
+
+    void grow() {
+        slot* oldSlots = m_slots;
+        size_t oldCapacity = m_capacity;
+
+        m_capacity = m_capacity ? m_capacity * 2 : 64;
+        m_shift = m_capacity == 64 ? 58 : m_shift - 1;
+        m_slots = (slot*)malloc(sizeof(slot) * m_capacity);
+
+        for (size_t k = 0; k < m_capacity; k++) {
+            m_slots[k].key = emptyKey();
+        }
+
+        for (size_t k = 0; k < oldCapacity; k++) {
+            if (oldSlots[k].key != emptyKey()) {
+                slot* s = slotFor(oldSlots[k].key);
+                *s = oldSlots[k];
+            }
+        }
+
+        free(oldSlots);
+    }
+
+    slot* m_slots;
+    size_t m_capacity;
+    // 64 - log2(m_capacity)
+    size_t m_shift;
+    size_t m_size;
+};
@@ -239,7 +239,7 @@ PyObject* PyDictInstance::tp_iternext_concrete() {
         return NULL;
     }
 
-    int32_t curSlot = mIteratorOffset;
+    int64_t curSlot = mIteratorOffset;
 
     mIteratorOffset++;
     while (mIteratorOffset < type()->slotCount(dataPtr()) && !type()->slotPopulated(dataPtr(), mIteratorOffset)) {
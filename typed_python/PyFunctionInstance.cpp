@@ -167,39 +167,132 @@ std::pair<bool, PyObject*> PyFunctionInstance::tryToCall(const Function* f, PyOb
 }
 
 // static
-std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToNative(const Function* f, long overloadIx, const FunctionCallArgMapping& mapper) {
-    const Function::Overload& overload(f->getOverloads()[overloadIx]);
+bool PyFunctionInstance::computeDispatchKey(const Function::Overload& overload, const FunctionCallArgMapping& mapper, Function::DispatchKey& outKey) {
+    outKey.clear();
+
+    for (long k = 0; k < overload.getArgs().size(); k++) {
+        if (!overload.getArgs()[k].getIsNormalArg()) {
+            return false;
+        }
 
-    for (const auto& spec: overload.getCompiledSpecializations()) {
-        auto res = dispatchFunctionCallToCompiledSpecialization(overload, spec, mapper);
-        if (res.first) {
-            return res;
+        PyObject* arg = mapper.getSingleValueArgs()[k];
+
+        // only accept arguments where the python type alone determines which
+        // specialization the runtime would pick.
+        if (!(arg == Py_None
+                || PyBool_Check(arg)
+                || PyLong_CheckExact(arg)
+                || PyFloat_CheckExact(arg)
+                || PyUnicode_CheckExact(arg)
+                || PyBytes_CheckExact(arg)
+                || PyInstance::extractTypeFrom(arg->ob_type))) {
+            return false;
         }
+
+        outKey.push_back(arg->ob_type);
     }
 
-    if (f->isEntrypoint()) {
-        static PyObject* runtimeModule = PyImport_ImportModule("typed_python.compiler.runtime");
+    return true;
+}
 
-        if (!runtimeModule) {
-            throw std::runtime_error("Internal error: couldn't find typed_python.compiler.runtime");
-        }
+// return a borrowed reference to typed_python.compiler.runtime.Runtime.singleton()
+static PyObject* runtimeSingleton() {
+    static PyObject* runtimeModule = PyImport_ImportModule("typed_python.compiler.runtime");
 
-        PyObject* runtimeClass = PyObject_GetAttrString(runtimeModule, "Runtime");
+    if (!runtimeModule) {
+        throw std::runtime_error("Internal error: couldn't find typed_python.compiler.runtime");
+    }
+
+    static PyObject* runtimeClass = PyObject_GetAttrString(runtimeModule, "Runtime");
 
-        if (!runtimeClass) {
-            throw std::runtime_error("Internal error: couldn't find typed_python.compiler.runtime.Runtime");
+    if (!runtimeClass) {
+        throw std::runtime_error("Internal error: couldn't find typed_python.compiler.runtime.Runtime");
+    }
+
+    static PyObject* singleton = PyObject_CallMethod(runtimeClass, "singleton", "");
+
+    if (!singleton) {
+        if (PyErr_Occurred()) {
+            PyErr_Clear();
         }
 
-        PyObject* singleton = PyObject_CallMethod(runtimeClass, "singleton", "");
+        throw std::runtime_error("Internal error: couldn't call typed_python.compiler.runtime.Runtime.singleton");
+    }
+
+    return singleton;
+}
+
+// tell the runtime that specialization 'specIx' of overload 'overloadIx' of 'f' crossed
+// its hot-call threshold, so that it can compile an optimized replacement. This is
+// just a hint, so errors get reported as unraisable rather than failing the call.
+static void notifySpecializationIsHot(const Function* f, long overloadIx, long specIx) {
+    PyObjectStealer funcAsObj(PyInstance::initialize((Type*)f, [&](instance_ptr p) {}));
+
+    PyObject* res = PyObject_CallMethod(
+        runtimeSingleton(),
+        "specializationIsHot",
+        "Oll",
+        (PyObject*)funcAsObj,
+        overloadIx,
+        specIx
+    );
+
+    if (!res) {
+        PyErr_WriteUnraisable(funcAsObj);
+        return;
+    }
+
+    decref(res);
+}
+
+// static
+std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToNative(const Function* f, long overloadIx, const FunctionCallArgMapping& mapper) {
+    const Function::Overload& overload(f->getOverloads()[overloadIx]);
+
+    Function::DispatchKey key;
+    bool hasKey = computeDispatchKey(overload, mapper, key);
 
-        if (!singleton) {
-            if (PyErr_Occurred()) {
-                PyErr_Clear();
+    if (hasKey) {
+        long specIx = overload.lookupDispatchCache(key);
+
+        if (specIx >= 0) {
+            // this still checks each argument, but only against the one specialization
+            // we expect to match.
+            auto res = dispatchFunctionCallToCompiledSpecialization(overload, overload.getCompiledSpecializations()[specIx], mapper);
+            if (res.first) {
+                if (overload.getCompiledSpecializations()[specIx].countCall()) {
+                    notifySpecializationIsHot(f, overloadIx, specIx);
+                }
+                return res;
             }
+        }
+    }
 
-            throw std::runtime_error("Internal error: couldn't call typed_python.compiler.runtime.Runtime.singleton");
+    auto dispatchLinearly = [&]() {
+        for (long specIx = 0; specIx < overload.getCompiledSpecializations().size(); specIx++) {
+            auto res = dispatchFunctionCallToCompiledSpecialization(overload, overload.getCompiledSpecializations()[specIx], mapper);
+            if (res.first) {
+                if (hasKey) {
+                    overload.recordDispatch(key, specIx);
+                }
+                if (overload.getCompiledSpecializations()[specIx].countCall()) {
+                    notifySpecializationIsHot(f, overloadIx, specIx);
+                }
+                return res;
+            }
         }
 
+        return std::pair<bool, PyObject*>(false, (PyObject*)nullptr);
+    };
+
+    auto res = dispatchLinearly();
+    if (res.first) {
+        return res;
+    }
+
+    if (f->isEntrypoint()) {
+        PyObject* singleton = runtimeSingleton();
+
         PyObjectStealer arguments(mapper.extractFunctionArgumentValues());
         PyObjectStealer funcAsObj(PyInstance::initialize((Type*)f, [&](instance_ptr p) {}));
 
@@ -216,13 +309,18 @@ std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToNative(cons
             throw PythonExceptionSet();
         }
 
+        // the runtime is compiling this in the background, so the caller
+        // should run the function in the interpreter
+        if (res == Py_False) {
+            decref(res);
+            return std::pair<bool, PyObject*>(false, (PyObject*)nullptr);
+        }
+
         decref(res);
 
-        for (const auto& spec: overload.getCompiledSpecializations()) {
-            auto res = dispatchFunctionCallToCompiledSpecialization(overload, spec, mapper);
-            if (res.first) {
-                return res;
-            }
+        auto dispatched = dispatchLinearly();
+        if (dispatched.first) {
+            return dispatched;
         }
 
         throw std::runtime_error("Compiled but then failed to dispatch!");
@@ -242,8 +340,6 @@ std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToCompiledSpe
         throw std::runtime_error("Malformed function specialization: missing a return type.");
     }
 
-    std::vector<Instance> instances;
-
     // first, see if we can short-circuit
     for (long k = 0; k < overload.getArgs().size(); k++) {
         auto arg = overload.getArgs()[k];
@@ -256,14 +352,34 @@ std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToCompiledSpe
         }
     }
 
+    // holds the converted copies of any arguments we can't pass by pointer.
+    // reserve so that pointers into it stay valid as we push.
+    std::vector<Instance> instances;
+    instances.reserve(overload.getArgs().size());
+
+    std::vector<instance_ptr> args;
+
     for (long k = 0; k < overload.getArgs().size(); k++) {
         auto arg = overload.getArgs()[k];
         Type* argType = specialization.getArgTypes()[k];
 
+        // typed_python instances of exactly the right type can be handed to compiled
+        // code directly. The mapping holds a reference to them for the duration of the call,
+        // and compiled code never writes to its arguments in place.
+        if (arg.getIsNormalArg()) {
+            PyObject* pyArg = mapper.getSingleValueArgs()[k];
+
+            if (PyInstance::extractTypeFrom(pyArg->ob_type) == argType) {
+                args.push_back(((PyInstance*)pyArg)->dataPtr());
+                continue;
+            }
+        }
+
         std::pair<Instance, bool> res = mapper.extractArgWithType(k, argType);
 
         if (res.second) {
             instances.push_back(res.first);
+            args.push_back(instances.back().data());
         } else {
             return std::pair<bool, PyObject*>(false, (PyObject*)nullptr);
         }
@@ -271,11 +387,6 @@ std::pair<bool, PyObject*> PyFunctionInstance::dispatchFunctionCallToCompiledSpe
 
     try {
         Instance result = Instance::createAndInitialize(returnType, [&](instance_ptr returnData) {
-            std::vector<instance_ptr> args;
-            for (auto& i: instances) {
-                args.push_back(i.data());
-            }
-
             auto functionPtr = specialization.getFuncPtr();
 
             PyEnsureGilReleased releaseTheGIL;
@@ -443,6 +554,11 @@ void PyFunctionInstance::mirrorTypeInformationIntoPyTypeConcrete(Function* inTyp
         overloads
     );
 
+    PyDict_SetItemString(
+        pyType->tp_dict,
+        "isBackgroundCompiled",
+        inType->isBackgroundCompiled() ? Py_True : Py_False
+    );
 }
 
 int PyFunctionInstance::pyInquiryConcrete(const char* op, const char* opErrRep) {
@@ -466,6 +582,22 @@ PyObject* PyFunctionInstance::withEntrypoint(PyObject* funcObj, PyObject* args,
     return PyInstance::initialize(resType, [&](instance_ptr p) {});
 }
 
+/* static */
+PyObject* PyFunctionInstance::withBackgroundCompilation(PyObject* funcObj, PyObject* args, PyObject* kwargs) {
+    static const char *kwlist[] = {"isBackgroundCompiled", NULL};
+    int isBackgroundCompiled;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "p", (char**)kwlist, &isBackgroundCompiled)) {
+        return nullptr;
+    }
+
+    Function* resType = (Function*)((PyInstance*)(funcObj))->type();
+
+    resType = resType->withBackgroundCompilation(isBackgroundCompiled);
+
+    return PyInstance::initialize(resType, [&](instance_ptr p) {});
+}
+
 /* static */
 PyObject* PyFunctionInstance::overload(PyObject* funcObj, PyObject* args, PyObject* kwargs) {
     return translateExceptionToPyObject([&]() {
@@ -555,9 +687,10 @@ PyObject* PyFunctionInstance::resultTypeFor(PyObject* funcObj, PyObject* args, P
 
 /* static */
 PyMethodDef* PyFunctionInstance::typeMethodsConcrete(Type* t) {
-    return new PyMethodDef [5] {
+    return new PyMethodDef [6] {
         {"overload", (PyCFunction)PyFunctionInstance::overload, METH_VARARGS | METH_KEYWORDS, NULL},
         {"withEntrypoint", (PyCFunction)PyFunctionInstance::withEntrypoint, METH_VARARGS | METH_KEYWORDS, NULL},
+        {"withBackgroundCompilation", (PyCFunction)PyFunctionInstance::withBackgroundCompilation, METH_VARARGS | METH_KEYWORDS, NULL},
         {"resultTypeFor", (PyCFunction)PyFunctionInstance::resultTypeFor, METH_VARARGS | METH_KEYWORDS, NULL},
         {NULL, NULL}
     };
@@ -36,7 +36,13 @@ public:
 
     static std::pair<bool, PyObject*> tryToCallOverload(const Function* f, long overloadIx, PyObject* self, PyObject* args, PyObject* kwargs, bool convertExplicitly, bool dontActuallyCall);
 
-    //perform a linear scan of all specializations contained in overload and attempt to dispatch to each one.
+    //compute the key we use to look up the specialization for this call in the overload's dispatch cache.
+    //returns false if the call can't be classified by the python types of its arguments alone (e.g.
+    //because an argument is a type object or a function, whose specialization depends on its value).
+    static bool computeDispatchKey(const Function::Overload& overload, const FunctionCallArgMapping& mapping, Function::DispatchKey& outKey);
+
+    //look up the call's argument types in the overload's dispatch cache, and if that misses, perform a
+    //linear scan of all specializations contained in overload and attempt to dispatch to each one.
     //returns <true, result or none> if we dispatched..
     //if 'isEntrypoint', then if we don't match a compiled specialization, ask the runtime to produce
     //one for us.
@@ -67,6 +73,8 @@ public:
 
     static PyObject* withEntrypoint(PyObject* funcObj, PyObject* args, PyObject* kwargs);
 
+    static PyObject* withBackgroundCompilation(PyObject* funcObj, PyObject* args, PyObject* kwargs);
+
     static PyObject* resultTypeFor(PyObject* funcObj, PyObject* args, PyObject* kwargs);
 
     static Function* convertPythonObjectToFunction(PyObject* name, PyObject *funcObj);
@@ -48,6 +48,17 @@ PyEnsureGilAcquired::~PyEnsureGilAcquired() {
     }
 }
 
+PyNativeThreadState::PyNativeThreadState() {
+    m_gil_state = PyGILState_Ensure();
+    curPyThreadState = PyEval_SaveThread();
+}
+
+PyNativeThreadState::~PyNativeThreadState() {
+    PyEval_RestoreThread(curPyThreadState);
+    curPyThreadState = nullptr;
+    PyGILState_Release(m_gil_state);
+}
+
 void assertHoldingTheGil() {
     if (curPyThreadState) {
         throw std::runtime_error("We're not holding the gil!");
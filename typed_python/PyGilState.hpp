@@ -44,4 +44,17 @@ private:
     bool m_should_rerelease;
 };
 
+//scoped object for a native thread that we started ourselves. Registers the
+//thread with the interpreter and then releases the GIL, so that code on the thread
+//can use PyEnsureGilAcquired exactly as it would on a python thread.
+class PyNativeThreadState {
+public:
+    PyNativeThreadState();
+
+    ~PyNativeThreadState();
+
+private:
+    PyGILState_STATE m_gil_state;
+};
+
 void assertHoldingTheGil();
@@ -771,17 +771,37 @@ PyBufferProcs* PyInstance::bufferProcs() {
     return procs;
 }
 
+// static
+PyBufferProcs* PyInstance::exportingBufferProcs() {
+    static PyBufferProcs* procs = new PyBufferProcs {
+        PyTupleOrListOfInstance::bf_getbuffer,
+        PyTupleOrListOfInstance::bf_releasebuffer
+    };
+    return procs;
+}
+
+// static
+PyBufferProcs* PyInstance::bufferProcsFor(Type* t) {
+    if ((t->getTypeCategory() == Type::TypeCategory::catTupleOf ||
+            t->getTypeCategory() == Type::TypeCategory::catListOf) &&
+            ((TupleOrListOfType*)t)->getEltType()->isRegisterType()) {
+        return exportingBufferProcs();
+    }
+
+    return bufferProcs();
+}
+
 /**
     Determine if a given PyTypeObject* is one of our types.
 
     We are using pointer-equality with the tp_as_buffer function pointer
     that we set on our types. This should be safe because:
-    - No other type can be pointing to it, and
-    - All of our types point to the unique instance of PyBufferProcs
+    - No other type can be pointing to them, and
+    - All of our types point to one of our two unique instances of PyBufferProcs
 */
 // static
 bool PyInstance::isNativeType(PyTypeObject* typeObj) {
-    return typeObj->tp_as_buffer == bufferProcs();
+    return typeObj->tp_as_buffer == bufferProcs() || typeObj->tp_as_buffer == exportingBufferProcs();
 }
 
 /**
@@ -1018,7 +1038,7 @@ PyTypeObject* PyInstance::typeObjInternal(Type* inType) {
             .tp_str = tp_str,                           // reprfunc
             .tp_getattro = PyInstance::tp_getattro,     // getattrofunc
             .tp_setattro = PyInstance::tp_setattro,     // setattrofunc
-            .tp_as_buffer = bufferProcs(),              // PyBufferProcs*
+            .tp_as_buffer = bufferProcsFor(inType),     // PyBufferProcs*
             .tp_flags = typeCanBeSubclassed(inType) ?
                 Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE
             :   Py_TPFLAGS_DEFAULT,                     // unsigned long
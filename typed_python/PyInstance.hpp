@@ -545,6 +545,11 @@ public:
 
     static PyBufferProcs* bufferProcs();
 
+    // the buffer procs of types that export their data through the buffer protocol
+    static PyBufferProcs* exportingBufferProcs();
+
+    static PyBufferProcs* bufferProcsFor(Type* t);
+
     static PyObject* getInternalModuleMember(const char* name);
 
     static PyTypeObject* allTypesBaseType();
@@ -0,0 +1,210 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#include "PyListOfView.hpp"
+#include "PyTupleOrListOfInstance.hpp"
+
+// static
+PyTypeObject* PyListOfView::typeObj() {
+    static PyTypeObject* result = []() {
+        static PySequenceMethods sequenceMethods;
+        static PyBufferProcs bufferProcs;
+        static PyMethodDef methods[] = {
+            {"view", (PyCFunction)PyListOfView::view, METH_VARARGS, NULL},
+            {NULL, NULL}
+        };
+
+        sequenceMethods.sq_length = PyListOfView::sq_length;
+        sequenceMethods.sq_item = PyListOfView::sq_item;
+
+        bufferProcs.bf_getbuffer = PyListOfView::bf_getbuffer;
+        bufferProcs.bf_releasebuffer = NULL;
+
+        PyTypeObject* res = new PyTypeObject();
+        memset(res, 0, sizeof(PyTypeObject));
+
+        // the equivalent of PyVarObject_HEAD_INIT(NULL, 0)
+        Py_SET_REFCNT((PyObject*)res, 1);
+        res->tp_name = "ListOfView";
+        res->tp_basicsize = sizeof(PyListOfView);
+        res->tp_dealloc = PyListOfView::tp_dealloc;
+        res->tp_repr = PyListOfView::tp_repr;
+        res->tp_as_sequence = &sequenceMethods;
+        res->tp_as_buffer = &bufferProcs;
+        res->tp_flags = Py_TPFLAGS_DEFAULT;
+        res->tp_doc = "A read-only view of part of a ListOf that shares its buffer.";
+        res->tp_methods = methods;
+
+        PyType_Ready(res);
+
+        return res;
+    }();
+
+    return result;
+}
+
+// static
+PyObject* PyListOfView::create(ListOfType* listType, TupleOrListOfType::layout* layout, instance_ptr data, int64_t count) {
+    PyListOfView* self = (PyListOfView*)typeObj()->tp_alloc(typeObj(), 0);
+
+    if (!self) {
+        throw PythonExceptionSet();
+    }
+
+    self->mListType = listType;
+    listType->copy_constructor((instance_ptr)&self->mLayout, (instance_ptr)&layout);
+
+    // our data pointer is only good while the list can't reallocate its buffer
+    self->mLayout->buffer_exports++;
+
+    self->mData = data;
+    self->mCount = count;
+    self->mShape = count;
+    self->mStride = listType->getEltType()->bytecount();
+
+    return (PyObject*)self;
+}
+
+// static
+PyObject* PyListOfView::createForRange(
+        ListOfType* listType,
+        TupleOrListOfType::layout* layout,
+        instance_ptr data,
+        int64_t count,
+        PyObject* start,
+        PyObject* stop
+) {
+    PyObjectStealer slice(PySlice_New(start, stop, NULL));
+
+    if (!slice) {
+        throw PythonExceptionSet();
+    }
+
+    Py_ssize_t startIx, stopIx, step;
+
+    if (PySlice_Unpack(slice, &startIx, &stopIx, &step) == -1) {
+        throw PythonExceptionSet();
+    }
+
+    Py_ssize_t length = PySlice_AdjustIndices(count, &startIx, &stopIx, step);
+
+    return create(listType, layout, data + startIx * listType->getEltType()->bytecount(), length);
+}
+
+// static
+void PyListOfView::tp_dealloc(PyObject* o) {
+    PyListOfView* self = (PyListOfView*)o;
+
+    self->mLayout->buffer_exports--;
+    self->mListType->destroy((instance_ptr)&self->mLayout);
+
+    Py_TYPE(o)->tp_free(o);
+}
+
+// static
+PyObject* PyListOfView::tp_repr(PyObject* o) {
+    PyListOfView* self = (PyListOfView*)o;
+
+    return translateExceptionToPyObject([&]() {
+        PyObjectStealer elements(PySequence_List(o));
+
+        if (!elements) {
+            throw PythonExceptionSet();
+        }
+
+        return PyUnicode_FromFormat("<%s view %R>", self->mListType->name().c_str(), (PyObject*)elements);
+    });
+}
+
+// static
+Py_ssize_t PyListOfView::sq_length(PyObject* o) {
+    return ((PyListOfView*)o)->mCount;
+}
+
+// static
+PyObject* PyListOfView::sq_item(PyObject* o, Py_ssize_t ix) {
+    PyListOfView* self = (PyListOfView*)o;
+
+    if (ix < 0) {
+        ix += self->mCount;
+    }
+
+    if (ix < 0 || ix >= self->mCount) {
+        PyErr_SetString(PyExc_IndexError, "view index out of range");
+        return NULL;
+    }
+
+    Type* eltType = self->mListType->getEltType();
+
+    return PyInstance::extractPythonObject(self->mData + ix * eltType->bytecount(), eltType);
+}
+
+// static
+int PyListOfView::bf_getbuffer(PyObject* o, Py_buffer* view, int flags) {
+    PyListOfView* self = (PyListOfView*)o;
+    Type* eltType = self->mListType->getEltType();
+    const char* format = PyTupleOrListOfInstance::bufferFormatFor(eltType);
+
+    view->obj = NULL;
+
+    if (!format) {
+        PyErr_Format(
+            PyExc_TypeError,
+            "views of %s don't support the buffer protocol because %s isn't a register type",
+            self->mListType->name().c_str(),
+            eltType->name().c_str()
+        );
+        return -1;
+    }
+
+    if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "views are read-only");
+        return -1;
+    }
+
+    // an empty list may not have any data at all
+    static uint8_t emptyData[sizeof(double)];
+
+    // we already lock the list's size, and the export holds a reference to us.
+    view->obj = incref(o);
+    view->buf = self->mData ? self->mData : emptyData;
+    view->len = self->mCount * self->mStride;
+    view->readonly = 1;
+    view->itemsize = self->mStride;
+    view->format = (flags & PyBUF_FORMAT) ? (char*)format : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) == PyBUF_ND ? &self->mShape : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &self->mStride : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    return 0;
+}
+
+// static
+PyObject* PyListOfView::view(PyObject* o, PyObject* args) {
+    PyListOfView* self = (PyListOfView*)o;
+    PyObject* start = Py_None;
+    PyObject* stop = Py_None;
+
+    if (!PyArg_ParseTuple(args, "|OO:view", &start, &stop)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        return createForRange(self->mListType, self->mLayout, self->mData, self->mCount, start, stop);
+    });
+}
@@ -0,0 +1,75 @@
+/******************************************************************************
+   Copyright 2017-2019 typed_python Authors
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+******************************************************************************/
+
+#pragma once
+
+#include "PyInstance.hpp"
+
+/******
+A read-only window onto part of a ListOf, returned by 'ListOf.view'.
+
+A view shares the list's buffer instead of copying it: it holds a reference to the
+list's layout, a pointer to its first element, and a count. It also counts as an
+export of the list's buffer, so the list can't change size (and move its data) for
+as long as the view is alive. Views of register types support the buffer protocol
+themselves, so 'numpy.asarray(aList.view(a, b))' is zero-copy too.
+
+Compiled code models a view as the same (layout, data, count) triple, and turns it
+into one of these when it hands a view back to the interpreter.
+******/
+class PyListOfView {
+public:
+    PyObject_HEAD
+    ListOfType* mListType;
+    TupleOrListOfType::layout* mLayout;
+    instance_ptr mData;
+    int64_t mCount;
+
+    // the shape and stride we hand out in Py_buffer exports of our data.
+    Py_ssize_t mShape;
+    Py_ssize_t mStride;
+
+    static PyTypeObject* typeObj();
+
+    // a new view of the 'count' elements at 'data', which must point into the buffer of
+    // the list of type 'listType' whose layout is 'layout'. We take a reference to the
+    // layout and lock its size until we're destroyed.
+    static PyObject* create(ListOfType* listType, TupleOrListOfType::layout* layout, instance_ptr data, int64_t count);
+
+    // a new view of the elements of the 'count' elements at 'data' that lie between the
+    // python objects 'start' and 'stop', which are clamped like the bounds of a slice.
+    static PyObject* createForRange(
+        ListOfType* listType,
+        TupleOrListOfType::layout* layout,
+        instance_ptr data,
+        int64_t count,
+        PyObject* start,
+        PyObject* stop
+    );
+
+    static void tp_dealloc(PyObject* self);
+
+    static PyObject* tp_repr(PyObject* self);
+
+    static Py_ssize_t sq_length(PyObject* self);
+
+    static PyObject* sq_item(PyObject* self, Py_ssize_t ix);
+
+    static int bf_getbuffer(PyObject* self, Py_buffer* view, int flags);
+
+    // 'view(start, stop)': a view of part of this view, sharing the same list.
+    static PyObject* view(PyObject* self, PyObject* args);
+};
@@ -402,6 +402,29 @@ PyObject* PySetInstance::setUnion(PyObject* o, PyObject* args) {
     return (PyObject*)new_inst;
 }
 
+PyObject* PySetInstance::pyOperatorConcrete(PyObject* rhs, const char* op, const char* opErr) {
+    // like python's set, the operator forms only accept other sets.
+    Type* rhs_type = extractTypeFrom(rhs->ob_type);
+
+    if (rhs_type != type() && !PyAnySet_Check(rhs)) {
+        return PyInstance::pyOperatorConcrete(rhs, op, opErr);
+    }
+
+    PyObjectStealer args(PyTuple_Pack(1, rhs));
+
+    if (strcmp(op, "__or__") == 0) {
+        return setUnion((PyObject*)this, args);
+    }
+    if (strcmp(op, "__and__") == 0) {
+        return setIntersection((PyObject*)this, args);
+    }
+    if (strcmp(op, "__sub__") == 0) {
+        return setDifference((PyObject*)this, args);
+    }
+
+    return PyInstance::pyOperatorConcrete(rhs, op, opErr);
+}
+
 int PySetInstance::sq_contains_concrete(PyObject* item) {
     Type* item_type = extractTypeFrom(Py_TYPE(item));
     if (item_type == type()->keyType()) {
@@ -551,7 +574,7 @@ PyObject* PySetInstance::tp_iternext_concrete() {
         return NULL;
     }
 
-    int32_t curSlot = mIteratorOffset;
+    int64_t curSlot = mIteratorOffset;
 
     mIteratorOffset++;
     while (mIteratorOffset < type()->slotCount(dataPtr())
@@ -49,6 +49,7 @@ class PySetInstance : public PyInstance {
         return true;
     }
     int pyInquiryConcrete(const char* op, const char* opErrRep);
+    PyObject* pyOperatorConcrete(PyObject* rhs, const char* op, const char* opErrRep);
 
   private:
     static void insertKey(PySetInstance* self, PyObject* pyKey, instance_ptr key);
@@ -15,6 +15,7 @@
 ******************************************************************************/
 
 #include "PyTupleOrListOfInstance.hpp"
+#include "PyListOfView.hpp"
 
 TupleOrListOfType* PyTupleOrListOfInstance::type() {
     return (TupleOrListOfType*)extractTypeFrom(((PyObject*)this)->ob_type);
@@ -415,6 +416,173 @@ PyObject* PyTupleOrListOfInstance::toArray(PyObject* o, PyObject* args) {
     return NULL;
 }
 
+// static
+const char* PyTupleOrListOfInstance::bufferFormatFor(Type* eltType) {
+    switch (eltType->getTypeCategory()) {
+        case Type::TypeCategory::catBool: return "?";
+        case Type::TypeCategory::catInt8: return "b";
+        case Type::TypeCategory::catInt16: return "h";
+        case Type::TypeCategory::catInt32: return "i";
+        case Type::TypeCategory::catInt64: return "q";
+        case Type::TypeCategory::catUInt8: return "B";
+        case Type::TypeCategory::catUInt16: return "H";
+        case Type::TypeCategory::catUInt32: return "I";
+        case Type::TypeCategory::catUInt64: return "Q";
+        case Type::TypeCategory::catFloat32: return "f";
+        case Type::TypeCategory::catFloat64: return "d";
+        default: return nullptr;
+    }
+}
+
+// static
+bool PyTupleOrListOfInstance::bufferFormatMatches(Type* eltType, const char* format, Py_ssize_t itemsize) {
+    if (itemsize != eltType->bytecount()) {
+        return false;
+    }
+
+    // a missing format means unsigned bytes
+    if (!format) {
+        format = "B";
+    }
+
+    // we only understand native byte order
+    if (format[0] == '@' || format[0] == '=' || format[0] == (PY_LITTLE_ENDIAN ? '<' : '>')) {
+        format++;
+    }
+
+    if (strlen(format) != 1) {
+        return false;
+    }
+
+    // the buffer's itemsize already matches ours, so we only need to check the kind of element
+    const char* kinds;
+
+    switch (eltType->getTypeCategory()) {
+        case Type::TypeCategory::catBool: kinds = "?"; break;
+        case Type::TypeCategory::catInt8:
+        case Type::TypeCategory::catInt16:
+        case Type::TypeCategory::catInt32:
+        case Type::TypeCategory::catInt64: kinds = "bhilqn"; break;
+        case Type::TypeCategory::catUInt8:
+        case Type::TypeCategory::catUInt16:
+        case Type::TypeCategory::catUInt32:
+        case Type::TypeCategory::catUInt64: kinds = "BHILQN"; break;
+        case Type::TypeCategory::catFloat32:
+        case Type::TypeCategory::catFloat64: kinds = "fd"; break;
+        default: return false;
+    }
+
+    return strchr(kinds, format[0]) != nullptr;
+}
+
+// what we hand out in 'Py_buffer::internal' for each export of our data
+struct TupleOrListOfBufferExport {
+    Py_ssize_t shape;
+    Py_ssize_t stride;
+    TupleOrListOfType::layout* layout;
+};
+
+// static
+int PyTupleOrListOfInstance::bf_getbuffer(PyObject* o, Py_buffer* view, int flags) {
+    PyTupleOrListOfInstance* self_w = (PyTupleOrListOfInstance*)o;
+    TupleOrListOfType* tupT = self_w->type();
+    bool isTuple = tupT->getTypeCategory() == Type::TypeCategory::catTupleOf;
+
+    if (isTuple && (flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+        PyErr_Format(PyExc_BufferError, "%s is immutable, so its buffer is read-only", tupT->name().c_str());
+        view->obj = NULL;
+        return -1;
+    }
+
+    // an empty TupleOf has no layout, and an empty ListOf may have no data
+    static uint8_t emptyData[sizeof(double)];
+
+    TupleOrListOfType::layout* layout = *(TupleOrListOfType::layout**)self_w->dataPtr();
+    Py_ssize_t itemsize = tupT->getEltType()->bytecount();
+
+    TupleOrListOfBufferExport* exported = (TupleOrListOfBufferExport*)malloc(sizeof(TupleOrListOfBufferExport));
+    exported->shape = layout ? layout->count : 0;
+    exported->stride = itemsize;
+    exported->layout = layout;
+
+    view->obj = incref(o);
+    view->buf = layout && layout->data ? layout->data : emptyData;
+    view->len = exported->shape * itemsize;
+    view->readonly = isTuple ? 1 : 0;
+    view->itemsize = itemsize;
+    view->format = (flags & PyBUF_FORMAT) ? (char*)bufferFormatFor(tupT->getEltType()) : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) == PyBUF_ND ? &exported->shape : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &exported->stride : NULL;
+    view->suboffsets = NULL;
+    view->internal = exported;
+
+    // lock our size until the export is released
+    if (layout) {
+        layout->buffer_exports++;
+    }
+
+    return 0;
+}
+
+// static
+void PyTupleOrListOfInstance::bf_releasebuffer(PyObject* o, Py_buffer* view) {
+    TupleOrListOfBufferExport* exported = (TupleOrListOfBufferExport*)view->internal;
+
+    if (exported->layout) {
+        exported->layout->buffer_exports--;
+    }
+
+    free(exported);
+}
+
+// static
+PyObject* PyTupleOrListOfInstance::fromBuffer(PyObject* cls, PyObject* args) {
+    return translateExceptionToPyObject([&]() {
+        PyObject* source;
+
+        if (!PyArg_ParseTuple(args, "O:fromBuffer", &source)) {
+            throw PythonExceptionSet();
+        }
+
+        TupleOrListOfType* tupT = (TupleOrListOfType*)extractTypeFrom((PyTypeObject*)cls);
+        bool isTuple = tupT->getTypeCategory() == Type::TypeCategory::catTupleOf;
+
+        if (!bufferFormatFor(tupT->getEltType())) {
+            PyErr_Format(
+                PyExc_TypeError,
+                "%s can't adopt a buffer because %s isn't a register type",
+                tupT->name().c_str(),
+                tupT->getEltType()->name().c_str()
+            );
+            throw PythonExceptionSet();
+        }
+
+        // we use the buffer's memory in place, so it has to be contiguous, and writable if we're a list.
+        Py_buffer buffer;
+
+        if (PyObject_GetBuffer(source, &buffer, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | (isTuple ? 0 : PyBUF_WRITABLE)) == -1) {
+            throw PythonExceptionSet();
+        }
+
+        if (!bufferFormatMatches(tupT->getEltType(), buffer.format, buffer.itemsize)) {
+            PyErr_Format(
+                PyExc_TypeError,
+                "%s can't adopt a buffer of elements with format '%s' and size %d",
+                tupT->name().c_str(),
+                buffer.format ? buffer.format : "B",
+                (int)buffer.itemsize
+            );
+            PyBuffer_Release(&buffer);
+            throw PythonExceptionSet();
+        }
+
+        return PyInstance::initialize(tupT, [&](instance_ptr data) {
+            tupT->adoptBuffer(data, &buffer);
+        });
+    });
+}
+
 PyObject* PyTupleOrListOfInstance::sq_item_concrete(Py_ssize_t ix) {
     int64_t count = type()->count(dataPtr());
 
@@ -488,6 +656,7 @@ PyObject* PyTupleOrListOfInstance::mp_subscript_concrete(PyObject* item) {
 PyMethodDef* PyTupleOfInstance::typeMethodsConcrete(Type* t) {
     return new PyMethodDef [3] {
         {"toArray", (PyCFunction)PyTupleOrListOfInstance::toArray, METH_VARARGS, NULL},
+        {"fromBuffer", (PyCFunction)PyTupleOrListOfInstance::fromBuffer, METH_VARARGS | METH_CLASS, NULL},
         {NULL, NULL}
     };
 }
@@ -520,6 +689,10 @@ PyObject* PyListOfInstance::listAppend(PyObject* o, PyObject* args) {
 
         PyListOfInstance* self_w = (PyListOfInstance*)o;
 
+        if (!self_w->ensureResizable()) {
+            return NULL;
+        }
+
         Type* value_type = extractTypeFrom(value->ob_type);
 
         Type* eltType = self_w->type()->getEltType();
@@ -556,6 +729,10 @@ PyObject* PyListOfInstance::listExtend(PyObject* o, PyObject* args) {
 
         PyListOfInstance* self_w = (PyListOfInstance*)o;
 
+        if (!self_w->ensureResizable()) {
+            throw PythonExceptionSet();
+        }
+
         ListOfType* self_type = (ListOfType*)self_w->type();
 
         Type* value_type = extractTypeFrom(value->ob_type);
@@ -603,6 +780,15 @@ PyObject* PyListOfInstance::listReserved(PyObject* o, PyObject* args) {
     return PyLong_FromLong(self_w->type()->reserved(self_w->dataPtr()));
 }
 
+bool PyListOfInstance::ensureResizable() {
+    if (!type()->isResizable(dataPtr())) {
+        PyErr_SetString(PyExc_BufferError, "Existing exports of data: object cannot be re-sized");
+        return false;
+    }
+
+    return true;
+}
+
 PyObject* PyListOfInstance::listReserve(PyObject* o, PyObject* args) {
     if (PyTuple_Size(args) != 1) {
         PyErr_SetString(PyExc_TypeError, "ListOf.append takes one argument");
@@ -620,6 +806,10 @@ PyObject* PyListOfInstance::listReserve(PyObject* o, PyObject* args) {
 
     PyListOfInstance* self_w = (PyListOfInstance*)o;
 
+    if (!self_w->ensureResizable()) {
+        return NULL;
+    }
+
     self_w->type()->reserve(self_w->dataPtr(), size);
 
     return incref(Py_None);
@@ -633,6 +823,10 @@ PyObject* PyListOfInstance::listClear(PyObject* o, PyObject* args) {
 
     PyListOfInstance* self_w = (PyListOfInstance*)o;
 
+    if (!self_w->ensureResizable()) {
+        return NULL;
+    }
+
     self_w->type()->resize(self_w->dataPtr(), 0);
 
     return incref(Py_None);
@@ -657,6 +851,10 @@ PyObject* PyListOfInstance::listResize(PyObject* o, PyObject* args) {
         PyListOfInstance* self_w = (PyListOfInstance*)o;
         Type* eltType = self_w->type()->getEltType();
 
+        if (!self_w->ensureResizable()) {
+            return NULL;
+        }
+
         if (self_w->type()->count(self_w->dataPtr()) > size) {
             self_w->type()->resize(self_w->dataPtr(), size);
         } else {
@@ -707,6 +905,10 @@ PyObject* PyListOfInstance::listPop(PyObject* o, PyObject* args) {
 
     PyListOfInstance* self_w = (PyListOfInstance*)o;
 
+    if (!self_w->ensureResizable()) {
+        return NULL;
+    }
+
     int64_t listSize = self_w->type()->count(self_w->dataPtr());
 
     if (listSize == 0) {
@@ -801,7 +1003,377 @@ PyObject* PyListOfInstance::listTranspose(PyObject* o, PyObject* args) {
     return PyInstance::fromInstance(outTuple);
 }
 
+//static
+bool PyListOfInstance::parseSortArguments(const char* methodName, PyObject* args, PyObject* kwargs, PyObject** key, bool* reverse) {
+    static const char *kwlist[] = {"key", "reverse", NULL};
+
+    PyObject* pyReverse = Py_False;
+    *key = Py_None;
+
+    std::string format = std::string("|$OO:") + methodName;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, format.c_str(), (char**)kwlist, key, &pyReverse)) {
+        return false;
+    }
+
+    int isTrue = PyObject_IsTrue(pyReverse);
+    if (isTrue == -1) {
+        return false;
+    }
+
+    *reverse = isTrue;
+    return true;
+}
+
+std::vector<int64_t> PyListOfInstance::argsortWithKey(PyObject* key, bool reverse) {
+    int64_t ct = type()->count(dataPtr());
+    Type* eltType = type()->getEltType();
+
+    std::vector<PyObjectHolder> keys;
+    keys.reserve(ct);
+
+    for (int64_t k = 0; k < ct; k++) {
+        PyObjectStealer elt(extractPythonObject(type()->eltPtr(dataPtr(), k), eltType));
+        if (!elt) {
+            throw PythonExceptionSet();
+        }
+
+        PyObjectStealer keyValue(PyObject_CallFunctionObjArgs(key, (PyObject*)elt, NULL));
+        if (!keyValue) {
+            throw PythonExceptionSet();
+        }
+
+        keys.push_back(PyObjectHolder((PyObject*)keyValue));
+    }
+
+    std::vector<int64_t> order(ct);
+    for (int64_t k = 0; k < ct; k++) {
+        order[k] = k;
+    }
+
+    // like python, we only ever compare keys with '<'
+    std::stable_sort(order.begin(), order.end(), [&](int64_t l, int64_t r) {
+        int res = reverse ?
+            PyObject_RichCompareBool(keys[r], keys[l], Py_LT)
+        :   PyObject_RichCompareBool(keys[l], keys[r], Py_LT);
+
+        if (res == -1) {
+            throw PythonExceptionSet();
+        }
+
+        return res == 1;
+    });
+
+    return order;
+}
+
+// static
+PyObject* PyListOfInstance::listSort(PyObject* o, PyObject* args, PyObject* kwargs) {
+    PyListOfInstance* self_w = (PyListOfInstance*)o;
+
+    PyObject* key;
+    bool reverse;
+
+    if (!parseSortArguments("sort", args, kwargs, &key, &reverse)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        ListOfType* listT = self_w->type();
+
+        if (key != Py_None) {
+            listT->permute(self_w->dataPtr(), self_w->argsortWithKey(key, reverse));
+        } else if (listT->getEltType()->isRegisterType()) {
+            PyEnsureGilReleased releaseTheGil;
+
+            listT->sort(self_w->dataPtr(), reverse);
+        } else {
+            listT->sort(self_w->dataPtr(), reverse);
+        }
+
+        return incref(Py_None);
+    });
+}
+
+// static
+PyObject* PyListOfInstance::listArgsort(PyObject* o, PyObject* args, PyObject* kwargs) {
+    PyListOfInstance* self_w = (PyListOfInstance*)o;
+
+    PyObject* key;
+    bool reverse;
+
+    if (!parseSortArguments("argsort", args, kwargs, &key, &reverse)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        ListOfType* listT = self_w->type();
+
+        std::vector<int64_t> order;
+
+        if (key != Py_None) {
+            order = self_w->argsortWithKey(key, reverse);
+        } else if (listT->getEltType()->isRegisterType()) {
+            PyEnsureGilReleased releaseTheGil;
+
+            order = listT->argsort(self_w->dataPtr(), reverse);
+        } else {
+            order = listT->argsort(self_w->dataPtr(), reverse);
+        }
+
+        ListOfType* resultT = ListOfType::Make(Int64::Make());
+
+        return PyInstance::initialize(resultT, [&](instance_ptr data) {
+            resultT->constructor(data, order.size(), [&](instance_ptr tgt, int64_t k) {
+                *(int64_t*)tgt = order[k];
+            });
+        });
+    });
+}
+
+// static
+PyObject* PyListOfInstance::bisect(PyObject* o, PyObject* args, PyObject* kwargs, bool right) {
+    static const char *kwlist[] = {"x", "lo", "hi", NULL};
+
+    PyListOfInstance* self_w = (PyListOfInstance*)o;
+    ListOfType* listT = self_w->type();
+    int64_t ct = listT->count(self_w->dataPtr());
+
+    PyObject* value;
+    long long lo = 0;
+    PyObject* pyHi = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, right ? "O|LO:bisect_right" : "O|LO:bisect_left",
+            (char**)kwlist, &value, &lo, &pyHi)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        if (lo < 0) {
+            PyErr_SetString(PyExc_ValueError, "lo must be non-negative");
+            throw PythonExceptionSet();
+        }
+
+        int64_t hi = ct;
+
+        if (pyHi != Py_None) {
+            hi = PyLong_AsLongLong(pyHi);
+            if (hi == -1 && PyErr_Occurred()) {
+                throw PythonExceptionSet();
+            }
+            hi = std::min<int64_t>(hi, ct);
+        }
+
+        Type* eltType = listT->getEltType();
+
+        Instance toFind(eltType, [&](instance_ptr data) {
+            PyInstance::copyConstructFromPythonInstance(eltType, data, value, false);
+        });
+
+        return PyLong_FromLongLong(listT->bisect(self_w->dataPtr(), toFind.data(), lo, hi, right));
+    });
+}
+
+// static
+PyObject* PyListOfInstance::listBisectLeft(PyObject* o, PyObject* args, PyObject* kwargs) {
+    return bisect(o, args, kwargs, false);
+}
+
+// static
+PyObject* PyListOfInstance::listBisectRight(PyObject* o, PyObject* args, PyObject* kwargs) {
+    return bisect(o, args, kwargs, true);
+}
+
+// static
+PyObject* PyListOfInstance::listPartialSort(PyObject* o, PyObject* args) {
+    PyListOfInstance* self_w = (PyListOfInstance*)o;
+    long long n;
+
+    if (!PyArg_ParseTuple(args, "L:partialSort", &n)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        ListOfType* listT = self_w->type();
+
+        if (listT->getEltType()->isRegisterType()) {
+            PyEnsureGilReleased releaseTheGil;
+
+            listT->partialSort(self_w->dataPtr(), n);
+        } else {
+            listT->partialSort(self_w->dataPtr(), n);
+        }
+
+        return incref(Py_None);
+    });
+}
+
+// static
+PyObject* PyListOfInstance::listNthElement(PyObject* o, PyObject* args) {
+    PyListOfInstance* self_w = (PyListOfInstance*)o;
+    long long n;
+
+    if (!PyArg_ParseTuple(args, "L:nthElement", &n)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        ListOfType* listT = self_w->type();
+        int64_t ct = listT->count(self_w->dataPtr());
+
+        if (n < 0) {
+            n += ct;
+        }
+
+        if (n < 0 || n >= ct) {
+            PyErr_SetString(PyExc_IndexError, "nthElement index out of range");
+            throw PythonExceptionSet();
+        }
+
+        if (listT->getEltType()->isRegisterType()) {
+            PyEnsureGilReleased releaseTheGil;
+
+            listT->nthElement(self_w->dataPtr(), n);
+        } else {
+            listT->nthElement(self_w->dataPtr(), n);
+        }
+
+        return incref(Py_None);
+    });
+}
+
+// static
+PyObject* PyListOfInstance::listView(PyObject* o, PyObject* args) {
+    PyObject* start = Py_None;
+    PyObject* stop = Py_None;
+
+    if (!PyArg_ParseTuple(args, "|OO:view", &start, &stop)) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        PyListOfInstance* self_w = (PyListOfInstance*)o;
+        TupleOrListOfType::layout* layout = *(TupleOrListOfType::layout**)self_w->dataPtr();
+
+        return PyListOfView::createForRange(self_w->type(), layout, layout->data, layout->count, start, stop);
+    });
+}
+
+int PyListOfInstance::assignSlice(PyObject* item, PyObject* value) {
+    ListOfType* listT = type();
+    Type* eltType = listT->getEltType();
+
+    Py_ssize_t start, stop, step, slicelength;
+
+    if (PySlice_GetIndicesEx(item, listT->count(dataPtr()), &start, &stop, &step, &slicelength) == -1) {
+        return -1;
+    }
+
+    Instance newValues(listT, [&](instance_ptr data) {
+        if (value) {
+            PyInstance::copyConstructFromPythonInstance(listT, data, value, true);
+        } else {
+            listT->constructor(data);
+        }
+    });
+
+    // converting a list of our own type just takes a reference to it, and it may be us,
+    // so we need a copy of our own before we start moving our elements around.
+    if (*(TupleOrListOfType::layout**)newValues.data() == *(TupleOrListOfType::layout**)dataPtr()) {
+        newValues = Instance(listT, [&](instance_ptr data) {
+            listT->copyListObject(data, dataPtr());
+        });
+    }
+
+    int64_t newCount = listT->count(newValues.data());
+
+    if (value && step != 1 && newCount != slicelength) {
+        PyErr_Format(
+            PyExc_ValueError,
+            "attempt to assign sequence of size %lld to extended slice of size %lld",
+            (long long)newCount,
+            (long long)slicelength
+        );
+        return -1;
+    }
+
+    // only changing our size is a problem while our buffer is exported
+    if (newCount != slicelength && !ensureResizable()) {
+        return -1;
+    }
+
+    if (value && step != 1) {
+        for (int64_t k = 0; k < newCount; k++) {
+            eltType->assign(listT->eltPtr(dataPtr(), start + k * step), listT->eltPtr(newValues.data(), k));
+        }
+        return 0;
+    }
+
+    int64_t count = listT->count(dataPtr());
+    size_t eltSize = eltType->bytecount();
+
+    if (value) {
+        // replace the elements in [start, stop) with 'newValues', moving the tail to make room.
+        if (stop < start) {
+            stop = start;
+        }
+
+        eltType->destroy(stop - start, [&](int64_t k) { return listT->eltPtr(dataPtr(), start + k); });
+
+        if (count - (stop - start) + newCount > (int64_t)listT->reserved(dataPtr())) {
+            listT->reserve(dataPtr(), count - (stop - start) + newCount);
+        }
+
+        memmove(
+            listT->eltPtr(dataPtr(), start + newCount),
+            listT->eltPtr(dataPtr(), stop),
+            (count - stop) * eltSize
+        );
+
+        eltType->copy_constructor(
+            newCount,
+            [&](int64_t k) { return listT->eltPtr(dataPtr(), start + k); },
+            [&](int64_t k) { return listT->eltPtr(newValues.data(), k); }
+        );
+
+        listT->setSizeUnsafe(dataPtr(), count - (stop - start) + newCount);
+        return 0;
+    }
+
+    if (slicelength == 0) {
+        return 0;
+    }
+
+    // delete the slice, shifting the elements we keep down over the ones we're deleting.
+    if (step < 0) {
+        start += (slicelength - 1) * step;
+        step = -step;
+    }
+
+    int64_t last = start + (slicelength - 1) * step;
+    int64_t writeIx = start;
+
+    for (int64_t readIx = start; readIx < count; readIx++) {
+        if (readIx <= last && (readIx - start) % step == 0) {
+            eltType->destroy(listT->eltPtr(dataPtr(), readIx));
+        } else {
+            if (writeIx != readIx) {
+                memcpy(listT->eltPtr(dataPtr(), writeIx), listT->eltPtr(dataPtr(), readIx), eltSize);
+            }
+            writeIx++;
+        }
+    }
+
+    listT->setSizeUnsafe(dataPtr(), writeIx);
+
+    return 0;
+}
+
 int PyListOfInstance::mp_ass_subscript_concrete(PyObject* item, PyObject* value) {
+    if (PySlice_Check(item)) {
+        return assignSlice(item, value);
+    }
+
     if (!value) {
         PyErr_SetString(PyExc_TypeError, "Item deletion is not implemented yet");
         throw PythonExceptionSet();
@@ -849,8 +1421,9 @@ int PyListOfInstance::mp_ass_subscript_concrete(PyObject* item, PyObject* value)
 }
 
 PyMethodDef* PyListOfInstance::typeMethodsConcrete(Type* t) {
-    return new PyMethodDef [12] {
+    return new PyMethodDef [20] {
         {"toArray", (PyCFunction)PyTupleOrListOfInstance::toArray, METH_VARARGS, NULL},
+        {"fromBuffer", (PyCFunction)PyTupleOrListOfInstance::fromBuffer, METH_VARARGS | METH_CLASS, NULL},
         {"append", (PyCFunction)PyListOfInstance::listAppend, METH_VARARGS, NULL},
         {"extend", (PyCFunction)PyListOfInstance::listExtend, METH_VARARGS, NULL},
         {"clear", (PyCFunction)PyListOfInstance::listClear, METH_VARARGS, NULL},
@@ -861,6 +1434,13 @@ PyMethodDef* PyListOfInstance::typeMethodsConcrete(Type* t) {
         {"setSizeUnsafe", (PyCFunction)PyListOfInstance::listSetSizeUnsafe, METH_VARARGS, NULL},
         {"pointerUnsafe", (PyCFunction)PyListOfInstance::listPointerUnsafe, METH_VARARGS, NULL},
         {"transpose", (PyCFunction)PyListOfInstance::listTranspose, METH_VARARGS, NULL},
+        {"sort", (PyCFunction)PyListOfInstance::listSort, METH_VARARGS | METH_KEYWORDS, NULL},
+        {"argsort", (PyCFunction)PyListOfInstance::listArgsort, METH_VARARGS | METH_KEYWORDS, NULL},
+        {"bisect_left", (PyCFunction)PyListOfInstance::listBisectLeft, METH_VARARGS | METH_KEYWORDS, NULL},
+        {"bisect_right", (PyCFunction)PyListOfInstance::listBisectRight, METH_VARARGS | METH_KEYWORDS, NULL},
+        {"partialSort", (PyCFunction)PyListOfInstance::listPartialSort, METH_VARARGS, NULL},
+        {"nthElement", (PyCFunction)PyListOfInstance::listNthElement, METH_VARARGS, NULL},
+        {"view", (PyCFunction)PyListOfInstance::listView, METH_VARARGS, NULL},
         {NULL, NULL}
     };
 }
@@ -42,6 +42,18 @@ public:
 
     static PyObject* toArray(PyObject* o, PyObject* args);
 
+    static PyObject* fromBuffer(PyObject* cls, PyObject* args);
+
+    static int bf_getbuffer(PyObject* o, Py_buffer* view, int flags);
+
+    static void bf_releasebuffer(PyObject* o, Py_buffer* view);
+
+    // the buffer-protocol format character for 'eltType', or nullptr if it's not a register type.
+    static const char* bufferFormatFor(Type* eltType);
+
+    // can we read elements of type 'eltType' out of a buffer with the given format and itemsize?
+    static bool bufferFormatMatches(Type* eltType, const char* format, Py_ssize_t itemsize);
+
     static bool pyValCouldBeOfTypeConcrete(modeled_type* type, PyObject* pyRepresentation, bool isExplicit);
 
     static void mirrorTypeInformationIntoPyTypeConcrete(TupleOrListOfType* inType, PyTypeObject* pyType);
@@ -73,6 +85,34 @@ public:
 
     static PyObject* listTranspose(PyObject* o, PyObject* args);
 
+    static PyObject* listSort(PyObject* o, PyObject* args, PyObject* kwargs);
+
+    static PyObject* listArgsort(PyObject* o, PyObject* args, PyObject* kwargs);
+
+    static PyObject* listBisectLeft(PyObject* o, PyObject* args, PyObject* kwargs);
+
+    static PyObject* listBisectRight(PyObject* o, PyObject* args, PyObject* kwargs);
+
+    static PyObject* listPartialSort(PyObject* o, PyObject* args);
+
+    static PyObject* listNthElement(PyObject* o, PyObject* args);
+
+    static PyObject* listView(PyObject* o, PyObject* args);
+
+    // set a BufferError and return false if our buffer is exported or adopted and we can't change size.
+    bool ensureResizable();
+
+    // the indices that would stably sort our elements by the python objects 'key' returns for them.
+    std::vector<int64_t> argsortWithKey(PyObject* key, bool reverse);
+
+    // parse the 'key' and 'reverse' arguments of 'sort' and 'argsort'. Returns false if they're invalid.
+    static bool parseSortArguments(const char* methodName, PyObject* args, PyObject* kwargs, PyObject** key, bool* reverse);
+
+    static PyObject* bisect(PyObject* o, PyObject* args, PyObject* kwargs, bool right);
+
+    // assign the python iterable 'value' to the slice 'item' of us, or delete the slice if 'value' is null.
+    int assignSlice(PyObject* item, PyObject* value);
+
     int mp_ass_subscript_concrete(PyObject* item, PyObject* value);
 
     static PyMethodDef* typeMethodsConcrete(Type* t);
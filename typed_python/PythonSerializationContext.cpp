@@ -28,6 +28,129 @@ void PythonSerializationContext::setCompressionEnabled() {
     }
 
     mCompressionEnabled = ((PyObject*)isEnabled) == Py_True;
+
+    PyObjectStealer isNative(PyObject_GetAttrString(mContextObj, "nativeCompressionEnabled"));
+
+    if (!isNative) {
+        //contexts that don't say otherwise get their own 'compress' and 'decompress' called
+        PyErr_Clear();
+        mNativeCompression = false;
+    } else {
+        mNativeCompression = ((PyObject*)isNative) == Py_True;
+    }
+
+    PyObjectStealer treeTypes(PyObject_GetAttrString(mContextObj, "treeTypes"));
+
+    if (!treeTypes) {
+        PyErr_Clear();
+        return;
+    }
+
+    iterate(treeTypes, [&](PyObject* pyType) {
+        Type* t = PyInstance::unwrapTypeArgToTypePtr(pyType);
+
+        if (!t) {
+            throw std::runtime_error("SerializationContext.treeTypes must contain only typed_python types");
+        }
+
+        mTreeTypes.insert(t);
+    });
+}
+
+static const char* serializationCacheCapsuleName = "typed_python.PythonSerializationCache";
+
+static void destroySerializationCache(PyObject* capsule) {
+    delete (PythonSerializationCache*)PyCapsule_GetPointer(capsule, serializationCacheCapsuleName);
+}
+
+void PythonSerializationContext::attachCache() {
+    PyEnsureGilAcquired acquireTheGil;
+
+    PyObjectStealer capsule(PyObject_GetAttrString(mContextObj, "_nativeCache"));
+
+    if (!capsule) {
+        PyErr_Clear();
+    }
+
+    if (!capsule || !PyCapsule_IsValid(capsule, serializationCacheCapsuleName)) {
+        PythonSerializationCache* cache = new PythonSerializationCache();
+
+        capsule.steal(PyCapsule_New(cache, serializationCacheCapsuleName, destroySerializationCache));
+
+        if (!capsule) {
+            delete cache;
+            throw PythonExceptionSet();
+        }
+
+        if (PyObject_SetAttrString(mContextObj, "_nativeCache", capsule) == -1) {
+            //contexts that won't hold the cache get a fresh one for each call
+            PyErr_Clear();
+        }
+    }
+
+    mCacheCapsule = incref(capsule);
+    mCache = (PythonSerializationCache*)PyCapsule_GetPointer(capsule, serializationCacheCapsuleName);
+}
+
+const PythonSerializationCache::NameAndRepresentation&
+PythonSerializationContext::nameAndRepresentationForType(PyObject* o) const {
+    assertHoldingTheGil();
+
+    auto it = mCache->mTypeNamesAndRepresentations.find(o);
+
+    if (it != mCache->mTypeNamesAndRepresentations.end()) {
+        return it->second;
+    }
+
+    PythonSerializationCache::NameAndRepresentation result;
+
+    result.object.set(o);
+    result.name.steal(PyObject_CallMethod(mContextObj, "nameForObject", "O", o));
+
+    if (!result.name) {
+        throw PythonExceptionSet();
+    }
+
+    if (result.name != Py_None) {
+        if (!PyUnicode_Check(result.name)) {
+            throw std::runtime_error("nameForObject returned something other than None or a string.");
+        }
+
+        result.representation.set(Py_None);
+    } else {
+        result.representation.steal(PyObject_CallMethod(mContextObj, "representationFor", "O", o));
+
+        if (!result.representation) {
+            throw PythonExceptionSet();
+        }
+    }
+
+    return mCache->mTypeNamesAndRepresentations[o] = result;
+}
+
+bool PythonSerializationContext::isPlainInstanceType(PyTypeObject* o) const {
+    assertHoldingTheGil();
+
+    auto it = mCache->mPlainInstanceTypes.find(o);
+
+    if (it != mCache->mPlainInstanceTypes.end()) {
+        return it->second.second;
+    }
+
+    bool isPlain = false;
+
+    PyObjectStealer res(PyObject_CallMethod(mContextObj, "isPlainInstanceType", "O", (PyObject*)o));
+
+    if (!res) {
+        //contexts that don't say otherwise get asked about every instance
+        PyErr_Clear();
+    } else {
+        isPlain = ((PyObject*)res) == Py_True;
+    }
+
+    mCache->mPlainInstanceTypes[o] = std::make_pair(PyObjectHolder((PyObject*)o), isPlain);
+
+    return isPlain;
 }
 
 // virtual
@@ -345,30 +468,44 @@ void PythonSerializationContext::serializePythonObjectNamedOrAsObj(PyObject* o,
         return;
     }
 
-    //see if the object has a name
-    PyObjectStealer typeName(PyObject_CallMethod(mContextObj, "nameForObject", "O", o));
-    if (!typeName) {
-        throw PythonExceptionSet();
-    }
+    if (PyType_Check(o)) {
+        const PythonSerializationCache::NameAndRepresentation& cached = nameAndRepresentationForType(o);
 
-    if (typeName != Py_None) {
-        if (!PyUnicode_Check(typeName)) {
-            throw std::runtime_error(std::string("nameForObject returned a non-string"));
+        if (cached.name != Py_None) {
+            b.writeStringObject(FieldNumbers::OBJECT_NAME, std::string(PyUnicode_AsUTF8(cached.name)));
+            return;
         }
 
-        b.writeStringObject(FieldNumbers::OBJECT_NAME, std::string(PyUnicode_AsUTF8(typeName)));
-        return;
-    }
+        if (cached.representation != Py_None) {
+            serializePythonObjectRepresentation(cached.representation, b);
+            return;
+        }
+    } else if (!isPlainInstanceType(o->ob_type)) {
+        //see if the object has a name
+        PyObjectStealer typeName(PyObject_CallMethod(mContextObj, "nameForObject", "O", o));
+        if (!typeName) {
+            throw PythonExceptionSet();
+        }
 
-    //give the plugin a chance to convert the instance to something else
-    PyObjectStealer representation(PyObject_CallMethod(mContextObj, "representationFor", "O", o));
-    if (!representation) {
-        throw PythonExceptionSet();
-    }
+        if (typeName != Py_None) {
+            if (!PyUnicode_Check(typeName)) {
+                throw std::runtime_error(std::string("nameForObject returned a non-string"));
+            }
 
-    if (representation != Py_None) {
-        serializePythonObjectRepresentation(representation, b);
-        return;
+            b.writeStringObject(FieldNumbers::OBJECT_NAME, std::string(PyUnicode_AsUTF8(typeName)));
+            return;
+        }
+
+        //give the plugin a chance to convert the instance to something else
+        PyObjectStealer representation(PyObject_CallMethod(mContextObj, "representationFor", "O", o));
+        if (!representation) {
+            throw PythonExceptionSet();
+        }
+
+        if (representation != Py_None) {
+            serializePythonObjectRepresentation(representation, b);
+            return;
+        }
     }
 
     //check whether this is a type derived from a serializable native type, which we don't support
@@ -596,33 +733,16 @@ void PythonSerializationContext::serializeNativeType(
         return;
     }
 
-    PyObjectStealer nameForObject(PyObject_CallMethod(mContextObj, "nameForObject", "O", PyInstance::typeObj(nativeType)));
-
-    if (!nameForObject) {
-        throw PythonExceptionSet();
-    }
-
-    if (nameForObject != Py_None) {
-        if (!PyUnicode_Check(nameForObject)) {
-            decref(nameForObject);
-            throw std::runtime_error("nameForObject returned something other than None or a string.");
-        }
-
-        b.writeStringObject(FieldNumbers::OBJECT_NAME, std::string(PyUnicode_AsUTF8(nameForObject)));
+    const PythonSerializationCache::NameAndRepresentation& cached =
+        nameAndRepresentationForType((PyObject*)PyInstance::typeObj(nativeType));
 
+    if (cached.name != Py_None) {
+        b.writeStringObject(FieldNumbers::OBJECT_NAME, std::string(PyUnicode_AsUTF8(cached.name)));
         return;
     }
 
-    PyObjectStealer representation(
-        PyObject_CallMethod(mContextObj, "representationFor", "O", PyInstance::typeObj(nativeType))
-    );
-
-    if (!representation) {
-        throw PythonExceptionSet();
-    }
-
-    if (representation != Py_None) {
-        serializePythonObjectRepresentation(representation, b);
+    if (cached.representation != Py_None) {
+        serializePythonObjectRepresentation(cached.representation, b);
         return;
     }
 
@@ -1055,12 +1175,16 @@ PyObject* PythonSerializationContext::deserializePySet(DeserializationBuffer &b,
 }
 
 std::shared_ptr<ByteBuffer> PythonSerializationContext::compressOrDecompress(uint8_t* begin, uint8_t* end, bool compress) const {
-    assertHoldingTheGil();
-
     if (!mContextObj) {
         return std::shared_ptr<ByteBuffer>(new RangeByteBuffer(begin,end));
     }
 
+    if (mNativeCompression) {
+        return compress ? lz4FrameCompress(begin, end) : lz4FrameDecompress(begin, end);
+    }
+
+    assertHoldingTheGil();
+
     PyObjectStealer pyBytes(
         PyBytes_FromStringAndSize((const char*)begin, end-begin)
         );
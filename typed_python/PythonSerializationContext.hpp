@@ -19,6 +19,8 @@
 #include "util.hpp"
 #include "Type.hpp"
 #include "SerializationContext.hpp"
+#include "Lz4Frame.hpp"
+#include <unordered_map>
 
 // PySet_CheckExact is missing from the CPython API for some reason
 #ifndef PySet_CheckExact
@@ -81,6 +83,40 @@ private:
     Py_buffer m_buffer;
 };
 
+/*****
+What a python SerializationContext told us about the objects it names, kept
+across calls to 'serialize' so we don't have to call back into python for
+every object we encounter.
+
+We keep one of these in a capsule in the context's '_nativeCache' attribute.
+Contexts made by 'union', 'withPrefix' and the like are new objects and start
+with an empty cache, and 'SerializationContext.invalidateCache' drops it.
+
+We hold references to every object we use as a key, so an address can't
+be reused by some other object while it's in the cache. Only touch this
+with the GIL held.
+******/
+class PythonSerializationCache {
+public:
+    class NameAndRepresentation {
+    public:
+        PyObjectHolder object;
+
+        // the result of 'nameForObject': a str, or None
+        PyObjectHolder name;
+
+        // the result of 'representationFor', or None. Always None if 'name' isn't.
+        PyObjectHolder representation;
+    };
+
+    // python type objects (including those of native types) that we've looked up
+    std::unordered_map<PyObject*, NameAndRepresentation> mTypeNamesAndRepresentations;
+
+    // python types, and whether their instances are never named and never have
+    // a representation, so that we can skip asking about each instance.
+    std::unordered_map<PyTypeObject*, std::pair<PyObjectHolder, bool> > mPlainInstanceTypes;
+};
+
 class PythonSerializationContext : public SerializationContext {
 public:
     //enums in our protocol (serialized as uint8_t)
@@ -114,17 +150,46 @@ public:
 
     PythonSerializationContext(PyObject* typeSetObj) :
             mContextObj(typeSetObj),
-            mCompressionEnabled(false)
+            mCompressionEnabled(false),
+            mNativeCompression(false),
+            mCacheCapsule(nullptr),
+            mCache(nullptr)
     {
         setCompressionEnabled();
+        attachCache();
+    }
+
+    ~PythonSerializationContext() {
+        if (mCacheCapsule) {
+            PyEnsureGilAcquired acquireTheGil;
+            decref(mCacheCapsule);
+        }
     }
 
     void setCompressionEnabled();
 
+    //find (or create) the PythonSerializationCache held by our python context
+    void attachCache();
+
+    //the results of 'nameForObject' and 'representationFor' for the python type
+    //object 'o', from the cache if we can. Returns references owned by the cache.
+    const PythonSerializationCache::NameAndRepresentation& nameAndRepresentationForType(PyObject* o) const;
+
+    //true if instances of 'o' are never named and never have a representation.
+    bool isPlainInstanceType(PyTypeObject* o) const;
+
     bool isCompressionEnabled() const {
         return mCompressionEnabled;
     }
 
+    bool compressionNeedsGil() const {
+        return mCompressionEnabled && !mNativeCompression;
+    }
+
+    const std::unordered_set<Type*>& treeTypes() const {
+        return mTreeTypes;
+    }
+
     std::shared_ptr<ByteBuffer> compress(uint8_t* begin, uint8_t* end) const;
 
     std::shared_ptr<ByteBuffer> decompress(uint8_t* begin, uint8_t* end) const;
@@ -189,5 +254,18 @@ private:
     PyObject* mContextObj;
 
     bool mCompressionEnabled;
+
+    //true if the python context uses the stock lz4 frame compression, which
+    //we can do natively without the GIL
+    bool mNativeCompression;
+
+    //the types in the python context's 'treeTypes'
+    std::unordered_set<Type*> mTreeTypes;
+
+    //a reference to the capsule holding 'mCache', so that it stays alive
+    //even if the python context drops it while we're serializing
+    PyObject* mCacheCapsule;
+
+    PythonSerializationCache* mCache;
 };
 
@@ -16,12 +16,16 @@
 
 #pragma once
 
+#include <memory>
 #include <stdexcept>
 #include <stdlib.h>
 #include <map>
 #include <set>
+#include <unordered_set>
+#include <vector>
 #include "Type.hpp"
 #include "WireType.hpp"
+#include "PointerMemoTable.hpp"
 
 class Type;
 class SerializationContext;
@@ -35,23 +39,38 @@ public:
             m_buffer(nullptr),
             m_size(0),
             m_reserved(0),
-            m_last_compression_point(0)
+            m_last_compression_point(0),
+            m_owns_buffer(true),
+            m_tree_types(context.treeTypes()),
+            m_next_memo_id(0)
+    {
+    }
+
+    // serialize directly into 'bytecount' bytes of memory owned by someone else.
+    // if we outgrow it, we move the data into a buffer of our own, which callers
+    // can detect by checking 'isWritingIntoExternalBuffer'.
+    SerializationBuffer(const SerializationContext& context, uint8_t* externalBuffer, size_t bytecount) :
+            m_context(context),
+            m_wants_compress(context.isCompressionEnabled()),
+            m_buffer(externalBuffer),
+            m_size(0),
+            m_reserved(bytecount),
+            m_last_compression_point(0),
+            m_owns_buffer(false),
+            m_tree_types(context.treeTypes()),
+            m_next_memo_id(0)
     {
     }
 
     ~SerializationBuffer() {
         PyEnsureGilAcquired acquireTheGil;
 
-        if (m_buffer) {
+        if (m_buffer && m_owns_buffer) {
             free(m_buffer);
         }
 
-        for (auto& typeAndList: m_pointersNeedingDecref) {
-            typeAndList.first->check([&](auto& concreteType) {
-                for (auto ptr: typeAndList.second) {
-                    concreteType.destroy((instance_ptr)&ptr);
-                }
-            });
+        for (auto& typeAndPtr: m_pointersNeedingDecref) {
+            typeAndPtr.first->destroy((instance_ptr)&typeAndPtr.second);
         }
 
         for (auto p: m_pyObjectsNeedingDecref) {
@@ -220,8 +239,20 @@ public:
             throw std::runtime_error("Can't make reserved size smaller");
         }
 
+        if (!m_owns_buffer) {
+            uint8_t* newBuffer = (uint8_t*)::malloc(new_reserved);
+            memcpy(newBuffer, m_buffer, m_size);
+            m_buffer = newBuffer;
+            m_owns_buffer = true;
+        } else {
+            m_buffer = (uint8_t*)::realloc(m_buffer, new_reserved);
+        }
+
         m_reserved = new_reserved;
-        m_buffer = (uint8_t*)::realloc(m_buffer, m_reserved);
+    }
+
+    bool isWritingIntoExternalBuffer() const {
+        return !m_owns_buffer;
     }
 
     const SerializationContext& getContext() const {
@@ -239,12 +270,21 @@ public:
             object (PyObject, Dict, ConstDict, Class, etc.) since we assume
             the pointer is the actual held representation. If this argument
             is null, then we simply copy the pointer with no incref semantics.
-        @return - an std::pair containing its cache ID (the size of the cache)
+        @return - an std::pair containing its cache ID
                 and 'false' if the pointer was already in the cache.
+
+        If 'objType' is one of the context's tree types, we don't memoize at all:
+        every call gets a fresh ID, since the caller has promised that instances
+        of that type are never shared or cyclic.
     */
     std::pair<uint32_t, bool> cachePointer(void* t, Type* objType) {
-        auto it = m_idToPointerCache.find(t);
-        if (it == m_idToPointerCache.end()) {
+        if (objType && !m_tree_types.empty() && m_tree_types.find(objType) != m_tree_types.end()) {
+            return std::pair<uint32_t, bool>(m_next_memo_id++, true);
+        }
+
+        uint32_t* existingId = m_idToPointerCache.find(t);
+
+        if (!existingId) {
             void* otherPointer;
 
             if (objType) {
@@ -258,30 +298,31 @@ public:
             }
 
             if (objType) {
-                m_pointersNeedingDecref[objType].push_back(otherPointer);
+                m_pointersNeedingDecref.push_back(std::make_pair(objType, otherPointer));
             }
 
-            uint32_t id = m_idToPointerCache.size();
-            m_idToPointerCache[t] = id;
+            uint32_t id = m_next_memo_id++;
+            m_idToPointerCache.insert(t, id);
 
             return std::pair<uint32_t, bool>(id, true);
         }
 
-        return std::pair<uint32_t, bool>(it->second, false);
+        return std::pair<uint32_t, bool>(*existingId, false);
     }
 
     std::pair<uint32_t, bool> cachePointer(PyObject* t) {
-        auto it = m_idToPointerCache.find((void*)t);
-        if (it == m_idToPointerCache.end()) {
+        uint32_t* existingId = m_idToPointerCache.find((void*)t);
+
+        if (!existingId) {
             m_pyObjectsNeedingDecref.push_back(incref(t));
 
-            uint32_t id = m_idToPointerCache.size();
-            m_idToPointerCache[(void*)t] = id;
+            uint32_t id = m_next_memo_id++;
+            m_idToPointerCache.insert((void*)t, id);
 
             return std::pair<uint32_t, bool>(id, true);
         }
 
-        return std::pair<uint32_t, bool>(it->second, false);
+        return std::pair<uint32_t, bool>(*existingId, false);
     }
 
     void finalize() {
@@ -295,8 +336,11 @@ public:
             return;
         }
 
-        //make sure we're holding the GIL because we use python to do the serialization
-        PyEnsureGilAcquired acquireTheGil;
+        //if the context compresses in python, make sure we're holding the GIL
+        std::unique_ptr<PyEnsureGilAcquired> acquireTheGil;
+        if (m_context.compressionNeedsGil()) {
+            acquireTheGil.reset(new PyEnsureGilAcquired());
+        }
 
         //replace the data we have here with a block of 4 bytes of size of compressed data and
         //then the data stream
@@ -356,13 +400,22 @@ private:
     size_t m_reserved;
     size_t m_last_compression_point;
 
-    std::map<void*, int32_t> m_idToPointerCache;
+    // false if m_buffer belongs to our caller
+    bool m_owns_buffer;
+
+    PointerMemoTable m_idToPointerCache;
 
-    std::map<Type*, std::vector<void*>> m_pointersNeedingDecref;
+    // each memoized pointer and the type we need to destroy it with
+    std::vector<std::pair<Type*, void*> > m_pointersNeedingDecref;
 
     std::vector<PyObject*> m_pyObjectsNeedingDecref;
 
     std::set<Type*> m_types_being_serialized;
+
+    // types whose instances we don't memoize
+    const std::unordered_set<Type*>& m_tree_types;
+
+    uint32_t m_next_memo_id;
 };
 
 class MarkTypeBeingSerialized {
@@ -17,10 +17,13 @@
 #pragma once
 
 #include <memory>
+#include <unordered_set>
+#include <vector>
 #include "WireType.hpp"
 
 class SerializationBuffer;
 class DeserializationBuffer;
+class Type;
 
 //models a contiguous range of bytes. Underlying could be python data
 //or c++ data.
@@ -55,6 +58,26 @@ private:
     uint8_t* m_high;
 };
 
+//a contiguous range of bytes that we own, held in a std::vector
+class VectorByteBuffer : public ByteBuffer {
+public:
+    VectorByteBuffer() {
+    }
+
+    virtual ~VectorByteBuffer() { }
+
+    virtual std::pair<uint8_t*, uint8_t*> range() {
+        return std::make_pair(m_data.data(), m_data.data() + m_data.size());
+    }
+
+    std::vector<uint8_t>& data() {
+        return m_data;
+    }
+
+private:
+    std::vector<uint8_t> m_data;
+};
+
 class SerializationContext {
 public:
     virtual ~SerializationContext() {};
@@ -63,6 +86,14 @@ public:
     virtual PyObject* deserializePythonObject(DeserializationBuffer& b, size_t wireType) const = 0;
 
     virtual bool isCompressionEnabled() const = 0;
+
+    //true if 'compress' and 'decompress' call back into python, so callers need to hold the GIL
+    virtual bool compressionNeedsGil() const = 0;
+
+    //types whose instances the user has promised are never shared or cyclic
+    //within a single message, so we don't need to memoize them.
+    virtual const std::unordered_set<Type*>& treeTypes() const = 0;
+
     virtual std::shared_ptr<ByteBuffer> compress(uint8_t* begin, uint8_t* end) const = 0;
     virtual std::shared_ptr<ByteBuffer> decompress(uint8_t* begin, uint8_t* end) const = 0;
 };
@@ -12,7 +12,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typed_python._types import serialize, deserialize
+from typed_python._types import serialize, deserialize, serializeInto, deserializeFromFile
 from typed_python.python_ast import convertFunctionToAlgebraicPyAst, evaluateFunctionPyAst, Expr, Statement
 from typed_python.hash import sha_hash
 from typed_python.type_function import ConcreteTypeFunction, isTypeFunctionType, reconstructTypeFunctionType
@@ -55,11 +55,37 @@ _builtin_name_to_value[".ast.Expr.Lambda"] = Expr.Lambda
 _builtin_name_to_value[".ast.Statement.FunctionDef"] = Statement.FunctionDef
 
 _builtin_value_to_name = {id(v): k for k, v in _builtin_name_to_value.items()}
+_builtin_value_types = frozenset(type(v) for v in _builtin_name_to_value.values())
+
+# instances of these types get a value from 'representationFor'
+_types_with_representations = (
+    type, FunctionType, numpy.ndarray, numpy.number, numpy.dtype, datetime.datetime,
+    datetime.date, datetime.time, datetime.timedelta, datetime.tzinfo
+) + ((GoogleProtobufMessage,) if GoogleProtobufMessage is not None else ())
 
 
 class SerializationContext(object):
     """Represents a collection of types with well-specified names that we can use to serialize objects."""
-    def __init__(self, nameToObject=None, objToName=None, compressionEnabled=True, encodeLineInformationForCode=True):
+    def __init__(
+        self,
+        nameToObject=None,
+        objToName=None,
+        compressionEnabled=True,
+        encodeLineInformationForCode=True,
+        treeTypes=()
+    ):
+        """Create a SerializationContext.
+
+        Args:
+            nameToObject - a dict from names to the objects we serialize by name.
+            objToName - a dict from id(object) to name. Computed from 'nameToObject' if None.
+            compressionEnabled - should we lz4-compress what we serialize?
+            encodeLineInformationForCode - should serialized code carry line numbers?
+            treeTypes - typed_python types whose instances are never shared or cyclic
+                within a single serialized message. We don't memoize their instances,
+                which is faster, but shared instances come back as separate copies and
+                cyclic ones recurse forever.
+        """
         super().__init__()
 
         self.nameToObject = nameToObject or {}
@@ -85,6 +111,11 @@ class SerializationContext(object):
 
         self.compressionEnabled = compressionEnabled
         self.encodeLineInformationForCode = encodeLineInformationForCode
+        self.treeTypes = frozenset(treeTypes)
+
+        # state _types keeps about this context between calls. See 'invalidateCache'.
+        self._nativeCache = None
+        self._namedObjectTypes = None
 
     def compress(self, bytes):
         if self.compressionEnabled:
@@ -99,6 +130,18 @@ class SerializationContext(object):
         else:
             return bytes
 
+    @property
+    def nativeCompressionEnabled(self):
+        """Can _types do our compression itself, in C++, without the GIL?
+
+        True unless a subclass has replaced 'compress' or 'decompress', since
+        _types writes and reads the same lz4 frames we do.
+        """
+        return (
+            type(self).compress is SerializationContext.compress
+            and type(self).decompress is SerializationContext.decompress
+        )
+
     @staticmethod
     def FromModules(modules):
         """Given a list of modules, produce a serialization context by walking the objects."""
@@ -133,32 +176,58 @@ class SerializationContext(object):
     def union(self, other):
         nameToObject = dict(self.nameToObject)
         nameToObject.update(other.nameToObject)
-        return SerializationContext(nameToObject)
+        return SerializationContext(nameToObject, treeTypes=self.treeTypes.union(other.treeTypes))
 
     def withPrefix(self, prefix):
         return SerializationContext(
             {prefix + "." + k: v for k, v in self.nameToObject.items()},
-            self.compressionEnabled,
-            self.encodeLineInformationForCode
+            compressionEnabled=self.compressionEnabled,
+            encodeLineInformationForCode=self.encodeLineInformationForCode,
+            treeTypes=self.treeTypes
         )
 
+    def invalidateCache(self):
+        """Forget what _types has cached about the names and representations of objects.
+
+        _types remembers what 'nameForObject' and 'representationFor' returned for
+        types, and what 'isPlainInstanceType' returned, for as long as this context
+        lives. Call this after changing the answers they give. Contexts produced by
+        'union', 'withPrefix' and friends are new objects and start out with nothing
+        cached.
+        """
+        self._nativeCache = None
+        self._namedObjectTypes = None
+
     def withoutLineInfoEncoded(self):
         if not self.encodeLineInformationForCode:
             return self
 
-        return SerializationContext(self.nameToObject, self.objToName, self.compressionEnabled, False)
+        return SerializationContext(self.nameToObject, self.objToName, self.compressionEnabled, False, self.treeTypes)
 
     def withoutCompression(self):
         if not self.compressionEnabled:
             return self
 
-        return SerializationContext(self.nameToObject, self.objToName, False, self.encodeLineInformationForCode)
+        return SerializationContext(self.nameToObject, self.objToName, False, self.encodeLineInformationForCode, self.treeTypes)
 
     def withCompression(self):
         if self.compressionEnabled:
             return self
 
-        return SerializationContext(self.nameToObject, self.objToName, True, self.encodeLineInformationForCode)
+        return SerializationContext(self.nameToObject, self.objToName, True, self.encodeLineInformationForCode, self.treeTypes)
+
+    def withTreeTypes(self, *treeTypes):
+        """Return a copy of this context that doesn't memoize instances of 'treeTypes'.
+
+        See the 'treeTypes' argument to the constructor.
+        """
+        return SerializationContext(
+            self.nameToObject,
+            self.objToName,
+            self.compressionEnabled,
+            self.encodeLineInformationForCode,
+            self.treeTypes.union(treeTypes)
+        )
 
     def nameForObject(self, t):
         ''' Return a name(string) for an input object t, or None if not found. '''
@@ -170,6 +239,28 @@ class SerializationContext(object):
 
         return _builtin_value_to_name.get(tid)
 
+    def isPlainInstanceType(self, t):
+        """Are instances of the python type 't' never named and never given a representation?
+
+        _types asks this once for each type, and serializes instances of plain types
+        as their type and __dict__ without calling 'nameForObject' or 'representationFor'
+        on each one. Subclasses that override either of those get asked about every
+        instance unless they override this as well.
+        """
+        if (
+            type(self).nameForObject is not SerializationContext.nameForObject
+            or type(self).representationFor is not SerializationContext.representationFor
+        ):
+            return False
+
+        if issubclass(t, _types_with_representations):
+            return False
+
+        if getattr(self, "_namedObjectTypes", None) is None:
+            self._namedObjectTypes = set(type(v) for v in self.nameToObject.values()) | _builtin_value_types
+
+        return t not in self._namedObjectTypes
+
     def objectFromName(self, name):
         ''' Return an object for an input name(string), or None if not found. '''
         res = self.nameToObject.get(name)
@@ -195,6 +286,18 @@ class SerializationContext(object):
     def deserialize(self, bytes, serializeType=object):
         return deserialize(serializeType, bytes, self)
 
+    def serializeInto(self, instance, buffer, serializeType=object):
+        """Serialize 'instance' directly into the writable buffer 'buffer'.
+
+        Returns:
+            the number of bytes written. Raises ValueError if 'buffer' is too small.
+        """
+        return serializeInto(serializeType, instance, buffer, self)
+
+    def deserializeFromFile(self, path, serializeType=object):
+        """Deserialize the object serialized in the file at 'path', which we mmap."""
+        return deserializeFromFile(path, serializeType, self)
+
     def representationFor(self, inst):
         ''' Return the representation of a given instance or None.
 
@@ -22,7 +22,7 @@ SetType* SetType::Make(Type* eltype, SetType* knownType) {
 bool SetType::discard(instance_ptr self, instance_ptr key) {
     hash_table_layout& record = **(hash_table_layout**)self;
     typed_python_hash_type keyHash = m_key_type->hash(key);
-    int32_t index = record.remove(m_bytes_per_el, keyHash, [&](instance_ptr ptr) {
+    int64_t index = record.remove(m_bytes_per_el, keyHash, [&](instance_ptr ptr) {
         return m_key_type->cmp(key, ptr, Py_EQ);
     });
     if (index >= 0) {
@@ -44,7 +44,7 @@ void SetType::clear(instance_ptr self) {
 instance_ptr SetType::insertKey(instance_ptr self, instance_ptr key) {
     hash_table_layout& record = **(hash_table_layout**)self;
     typed_python_hash_type keyHash = m_key_type->hash(key);
-    int32_t slot = record.allocateNewSlot(m_bytes_per_el);
+    int64_t slot = record.allocateNewSlot(m_bytes_per_el);
     record.add(keyHash, slot);
     m_key_type->copy_constructor(record.items + slot * m_bytes_per_el, key);
     return record.items + slot * m_bytes_per_el;
@@ -53,7 +53,7 @@ instance_ptr SetType::insertKey(instance_ptr self, instance_ptr key) {
 instance_ptr SetType::lookupKey(instance_ptr self, instance_ptr key) const {
     hash_table_layout& record = **(hash_table_layout**)self;
     typed_python_hash_type keyHash = m_key_type->hash(key);
-    int32_t index = record.find(m_bytes_per_el, keyHash,
+    int64_t index = record.find(m_bytes_per_el, keyHash,
                                 [&](instance_ptr ptr) { return m_key_type->cmp(key, ptr, Py_EQ); });
     if (index >= 0) {
         return record.items + index * m_bytes_per_el;
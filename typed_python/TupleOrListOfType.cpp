@@ -15,6 +15,8 @@
 ******************************************************************************/
 
 #include "AllTypes.hpp"
+#include <cmath>
+#include <numeric>
 
 bool TupleOrListOfType::isBinaryCompatibleWithConcrete(Type* other) {
     if (other->getTypeCategory() != m_typeCategory) {
@@ -55,7 +57,7 @@ void TupleOrListOfType::repr(instance_ptr self, ReprAccumulator& stream, bool is
 
     stream << (m_is_tuple ? "(" : "[");
 
-    int32_t ct = count(self);
+    int64_t ct = count(self);
 
     for (long k = 0; k < ct;k++) {
         if (k > 0) {
@@ -76,7 +78,7 @@ typed_python_hash_type TupleOrListOfType::hash(instance_ptr left) {
     if ((*(layout**)left)->hash_cache == -1) {
         HashAccumulator acc(0);
 
-        int32_t ct = count(left);
+        int64_t ct = count(left);
 
         for (long k = 0; k < ct;k++) {
             acc.add(m_element_type->hash(eltPtr(left, k)));
@@ -224,9 +226,47 @@ void TupleOrListOfType::destroy(instance_ptr selfPtr) {
 
     if (self->refcount.fetch_sub(1) == 1) {
         m_element_type->destroy(self->count, [&](int64_t k) {return eltPtr(self,k);});
-        free(self->data);
-        free(self);
+
+        // exports hold a reference to us, so if any are left, they're the one for an adopted buffer
+        if (self->buffer_exports) {
+            releaseAdoptedBuffer(self);
+        } else {
+            free(self->data);
+            free(self);
+        }
+    }
+}
+
+void TupleOrListOfType::adoptBuffer(instance_ptr selfPtr, Py_buffer* buffer) {
+    layout_ptr& self = *(layout_ptr*)selfPtr;
+
+    int64_t count = buffer->len / m_element_type->bytecount();
+
+    if (count == 0 && m_is_tuple) {
+        PyBuffer_Release(buffer);
+        self = nullptr;
+        return;
     }
+
+    // we keep the Py_buffer right after the layout, so we can release it when we're destroyed
+    self = (layout*)malloc(sizeof(layout) + sizeof(Py_buffer));
+
+    *(Py_buffer*)(self + 1) = *buffer;
+
+    self->refcount = 1;
+    self->hash_cache = -1;
+    self->buffer_exports = 1;
+    self->count = count;
+    self->reserved = count;
+    self->data = (uint8_t*)buffer->buf;
+}
+
+// static
+void TupleOrListOfType::releaseAdoptedBuffer(layout* self) {
+    PyEnsureGilAcquired acquireTheGil;
+
+    PyBuffer_Release((Py_buffer*)(self + 1));
+    free(self);
 }
 
 void TupleOrListOfType::copy_constructor(instance_ptr self, instance_ptr other) {
@@ -286,6 +326,7 @@ void ListOfType::append(instance_ptr self, instance_ptr other) {
         self_layout->refcount = 1;
         self_layout->reserved = 1;
         self_layout->hash_cache = -1;
+        self_layout->buffer_exports = 0;
 
         getEltType()->copy_constructor(eltPtr(self, 0), other);
     } else {
@@ -356,3 +397,204 @@ void ListOfType::resize(instance_ptr self, size_t count, instance_ptr value) {
         self_layout->count = count;
     }
 }
+
+namespace {
+
+// call 'f' with a null pointer to the C type held by the register type 'category'.
+template<class func_type>
+void withRegisterCType(Type::TypeCategory category, const func_type& f) {
+    switch (category) {
+        case Type::TypeCategory::catBool: f((bool*)nullptr); return;
+        case Type::TypeCategory::catUInt8: f((uint8_t*)nullptr); return;
+        case Type::TypeCategory::catUInt16: f((uint16_t*)nullptr); return;
+        case Type::TypeCategory::catUInt32: f((uint32_t*)nullptr); return;
+        case Type::TypeCategory::catUInt64: f((uint64_t*)nullptr); return;
+        case Type::TypeCategory::catInt8: f((int8_t*)nullptr); return;
+        case Type::TypeCategory::catInt16: f((int16_t*)nullptr); return;
+        case Type::TypeCategory::catInt32: f((int32_t*)nullptr); return;
+        case Type::TypeCategory::catInt64: f((int64_t*)nullptr); return;
+        case Type::TypeCategory::catFloat32: f((float*)nullptr); return;
+        case Type::TypeCategory::catFloat64: f((double*)nullptr); return;
+        default:
+            throw std::runtime_error("Expected a register type");
+    }
+}
+
+template<class T>
+bool isNanValue(T value) {
+    return false;
+}
+
+bool isNanValue(float value) {
+    return std::isnan(value);
+}
+
+bool isNanValue(double value) {
+    return std::isnan(value);
+}
+
+// a strict weak ordering on register values. NaNs don't compare with anything,
+// so we treat them as equal to each other and greater than everything else,
+// regardless of the direction we're sorting in.
+template<class T>
+class RegisterOrdering {
+public:
+    RegisterOrdering(bool reverse) : m_reverse(reverse) {}
+
+    bool operator()(T left, T right) const {
+        if (isNanValue(right)) {
+            return !isNanValue(left);
+        }
+        if (isNanValue(left)) {
+            return false;
+        }
+
+        return m_reverse ? right < left : left < right;
+    }
+
+private:
+    bool m_reverse;
+};
+
+} // end anonymous namespace
+
+void ListOfType::sort(instance_ptr self, bool reverse) {
+    int64_t ct = count(self);
+
+    if (m_element_type->isRegisterType()) {
+        withRegisterCType(m_element_type->getTypeCategory(), [&](auto* nullPtr) {
+            typedef typename std::remove_pointer<decltype(nullPtr)>::type T;
+            T* data = (T*)eltPtr(self, 0);
+
+            if (std::is_floating_point<T>::value) {
+                // keep 0.0 and -0.0 in their original order
+                std::stable_sort(data, data + ct, RegisterOrdering<T>(reverse));
+            } else {
+                std::sort(data, data + ct, RegisterOrdering<T>(reverse));
+            }
+        });
+        return;
+    }
+
+    permute(self, argsort(self, reverse));
+}
+
+void ListOfType::partialSort(instance_ptr self, int64_t n) {
+    int64_t ct = count(self);
+
+    n = std::max<int64_t>(0, std::min<int64_t>(n, ct));
+
+    if (m_element_type->isRegisterType()) {
+        withRegisterCType(m_element_type->getTypeCategory(), [&](auto* nullPtr) {
+            typedef typename std::remove_pointer<decltype(nullPtr)>::type T;
+            T* data = (T*)eltPtr(self, 0);
+
+            std::partial_sort(data, data + n, data + ct, RegisterOrdering<T>(false));
+        });
+        return;
+    }
+
+    std::vector<int64_t> order(ct);
+    std::iota(order.begin(), order.end(), 0);
+
+    std::partial_sort(order.begin(), order.begin() + n, order.end(), [&](int64_t l, int64_t r) {
+        return m_element_type->cmp(eltPtr(self, l), eltPtr(self, r), Py_LT);
+    });
+
+    permute(self, order);
+}
+
+void ListOfType::nthElement(instance_ptr self, int64_t n) {
+    int64_t ct = count(self);
+
+    if (n < 0 || n >= ct) {
+        throw std::runtime_error("nthElement index out of range");
+    }
+
+    if (m_element_type->isRegisterType()) {
+        withRegisterCType(m_element_type->getTypeCategory(), [&](auto* nullPtr) {
+            typedef typename std::remove_pointer<decltype(nullPtr)>::type T;
+            T* data = (T*)eltPtr(self, 0);
+
+            std::nth_element(data, data + n, data + ct, RegisterOrdering<T>(false));
+        });
+        return;
+    }
+
+    std::vector<int64_t> order(ct);
+    std::iota(order.begin(), order.end(), 0);
+
+    std::nth_element(order.begin(), order.begin() + n, order.end(), [&](int64_t l, int64_t r) {
+        return m_element_type->cmp(eltPtr(self, l), eltPtr(self, r), Py_LT);
+    });
+
+    permute(self, order);
+}
+
+std::vector<int64_t> ListOfType::argsort(instance_ptr self, bool reverse) {
+    std::vector<int64_t> order(count(self));
+    std::iota(order.begin(), order.end(), 0);
+
+    if (m_element_type->isRegisterType()) {
+        withRegisterCType(m_element_type->getTypeCategory(), [&](auto* nullPtr) {
+            typedef typename std::remove_pointer<decltype(nullPtr)>::type T;
+            T* data = (T*)eltPtr(self, 0);
+            RegisterOrdering<T> ordering(reverse);
+
+            std::stable_sort(order.begin(), order.end(), [&](int64_t l, int64_t r) {
+                return ordering(data[l], data[r]);
+            });
+        });
+
+        return order;
+    }
+
+    // taking the right-hand element only when it's strictly less keeps equal
+    // elements in their original order in both directions.
+    std::stable_sort(order.begin(), order.end(), [&](int64_t l, int64_t r) {
+        if (reverse) {
+            return m_element_type->cmp(eltPtr(self, r), eltPtr(self, l), Py_LT);
+        }
+        return m_element_type->cmp(eltPtr(self, l), eltPtr(self, r), Py_LT);
+    });
+
+    return order;
+}
+
+void ListOfType::permute(instance_ptr self, const std::vector<int64_t>& order) {
+    size_t bytesPer = m_element_type->bytecount();
+
+    if (order.size() != count(self)) {
+        throw std::runtime_error("Can't permute a list with an order of the wrong size");
+    }
+
+    // we move the elements bitwise, since no typed_python layout points into itself,
+    // so nothing gets copied and no refcounts change.
+    std::vector<uint8_t> temp(order.size() * bytesPer);
+
+    for (size_t k = 0; k < order.size(); k++) {
+        memcpy(&temp[k * bytesPer], eltPtr(self, order[k]), bytesPer);
+    }
+
+    if (temp.size()) {
+        memcpy(eltPtr(self, 0), &temp[0], temp.size());
+    }
+}
+
+int64_t ListOfType::bisect(instance_ptr self, instance_ptr value, int64_t lo, int64_t hi, bool right) {
+    while (lo < hi) {
+        int64_t mid = lo + (hi - lo) / 2;
+
+        bool goesLeft = right ?
+            m_element_type->cmp(value, eltPtr(self, mid), Py_LT)
+        :   !m_element_type->cmp(eltPtr(self, mid), value, Py_LT);
+
+        if (goesLeft) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+
+    return lo;
+}
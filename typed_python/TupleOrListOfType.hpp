@@ -24,8 +24,13 @@ public:
     public:
         std::atomic<int64_t> refcount;
         typed_python_hash_type hash_cache;
-        int32_t count;
-        int32_t reserved;
+        // the number of live buffer-protocol exports of 'data', plus one if 'data' belongs to
+        // a buffer we adopted. We can't change size while it's nonzero. It sits in what would
+        // otherwise be padding after 'hash_cache', so it doesn't change our size. It's atomic
+        // because compiled code checks it without holding the GIL.
+        std::atomic<int32_t> buffer_exports;
+        int64_t count;
+        int64_t reserved;
         uint8_t* data;
     };
 
@@ -60,7 +65,7 @@ public:
     //serialize, but don't write a count
     template<class buf_t>
     void serializeStream(instance_ptr self, buf_t& buffer) {
-        int32_t ct = count(self);
+        int64_t ct = count(self);
         m_element_type->check([&](auto& concrete_type) {
             for (long k = 0; k < ct;k++) {
                 concrete_type.serialize(this->eltPtr(self,k), buffer, 0);
@@ -68,6 +73,87 @@ public:
         });
     }
 
+    // lists of register types are written as a single BYTES message holding the raw
+    // contiguous element data, rather than one message per element.
+    bool hasPackedSerialization() const {
+        return m_element_type->isRegisterType();
+    }
+
+    // write the 'ct' elements of 'self' as the body of a compound message.
+    template<class buf_t>
+    void serializeElements(instance_ptr self, size_t ct, buf_t& buffer) {
+        // readers don't expect any element messages for an empty list, packed or not
+        if (ct == 0) {
+            return;
+        }
+
+        if (hasPackedSerialization()) {
+            size_t bytecount = ct * m_element_type->bytecount();
+
+            buffer.writeBeginBytes(0, bytecount);
+            buffer.write_bytes(eltPtr(self, 0), bytecount);
+            return;
+        }
+
+        m_element_type->check([&](auto& concrete_type) {
+            for (long k = 0; k < ct; k++) {
+                concrete_type.serialize(this->eltPtr(self,k), buffer, 0);
+            }
+        });
+    }
+
+    // construct a list of 'ct' elements at 'self', reading the elements written by
+    // 'serializeElements'. We accept both the packed and the per-element encodings.
+    // 'onConstructed' is called after the list is allocated but before any elements
+    // are read, so that recursive references to the list can be resolved.
+    template<class buf_t, class callback_type>
+    void deserializeElements(instance_ptr self, size_t ct, buf_t& buffer, const callback_type& onConstructed) {
+        auto fieldAndWire = buffer.readFieldNumberAndWireType();
+
+        if (fieldAndWire.first) {
+            throw std::runtime_error("Corrupt data (count)");
+        }
+        if (fieldAndWire.second == WireType::END_COMPOUND) {
+            throw std::runtime_error("Corrupt data (count)");
+        }
+
+        if (fieldAndWire.second == WireType::BYTES && hasPackedSerialization()) {
+            size_t bytecount = buffer.readUnsignedVarint();
+            size_t eltBytecount = m_element_type->bytecount();
+
+            if (bytecount % eltBytecount || bytecount / eltBytecount != ct) {
+                throw std::runtime_error("Corrupt data (packed element bytecount)");
+            }
+
+            if (!buffer.canConsume(bytecount)) {
+                throw std::runtime_error("Corrupt data (not enough data in the stream)");
+            }
+
+            // register types don't need initialization, since we're about to overwrite them.
+            constructor(self, ct, [&](instance_ptr tgt, int64_t k) {});
+            onConstructed();
+
+            buffer.read_bytes(eltPtr(self, 0), bytecount);
+            return;
+        }
+
+        constructor(self, ct, [&](instance_ptr tgt, int64_t k) {
+            if (k == 0) {
+                onConstructed();
+            } else {
+                fieldAndWire = buffer.readFieldNumberAndWireType();
+                if (fieldAndWire.first) {
+                    throw std::runtime_error("Corrupt data (count)");
+                }
+                if (fieldAndWire.second == WireType::END_COMPOUND) {
+                    throw std::runtime_error("Corrupt data (count)");
+                }
+            }
+
+            m_element_type->deserialize(tgt, buffer, fieldAndWire.second);
+        });
+    }
+
     void repr(instance_ptr self, ReprAccumulator& stream, bool isStr);
 
     typed_python_hash_type hash(instance_ptr left);
@@ -110,8 +196,9 @@ public:
 
         self->count = count;
         self->refcount = 1;
-        self->reserved = std::max<int32_t>(1, count);
+        self->reserved = std::max<int64_t>(1, count);
         self->hash_cache = -1;
+        self->buffer_exports = 0;
         self->data = (uint8_t*)malloc(getEltType()->bytecount() * self->reserved);
 
         for (int64_t k = 0; k < count; k++) {
@@ -139,6 +226,7 @@ public:
         self->refcount = 1;
         self->reserved = 1;
         self->hash_cache = -1;
+        self->buffer_exports = 0;
         self->data = (uint8_t*)malloc(getEltType()->bytecount() * self->reserved);
 
         while(true) {
@@ -170,6 +258,19 @@ public:
 
     void constructor(instance_ptr self);
 
+    // construct at 'self' an instance that uses the memory of 'buffer' directly instead of
+    // copying it. We take ownership of 'buffer', which must hold contiguous elements of our
+    // element type, and release it once we're destroyed. Adopted buffers can't change size.
+    void adoptBuffer(instance_ptr self, Py_buffer* buffer);
+
+    // release the buffer that the data of 'self' was adopted from, and free 'self'.
+    static void releaseAdoptedBuffer(layout* self);
+
+    // can 'self' change size? Not while its buffer is exported or adopted.
+    bool isResizable(instance_ptr self) const {
+        return !(*(layout**)self) || !(*(layout**)self)->buffer_exports;
+    }
+
     void destroy(instance_ptr self);
 
     void copy_constructor(instance_ptr self, instance_ptr other);
@@ -212,6 +313,29 @@ public:
 
     void ensureSpaceFor(instance_ptr self, size_t count);
 
+    // stably sort the elements of 'self' in place. Lists of register types are
+    // sorted directly on their values, with any NaNs placed at the end, and never
+    // touch the interpreter. Other lists compare their elements with 'cmp'.
+    void sort(instance_ptr self, bool reverse);
+
+    // rearrange 'self' so its first 'n' elements are the smallest ones, in order.
+    // The remaining elements end up in no particular order.
+    void partialSort(instance_ptr self, int64_t n);
+
+    // rearrange 'self' so that element 'n' is the one 'sort' would put there, with
+    // nothing greater before it and nothing smaller after it.
+    void nthElement(instance_ptr self, int64_t n);
+
+    // return the indices that would stably sort 'self'.
+    std::vector<int64_t> argsort(instance_ptr self, bool reverse);
+
+    // move the element at index 'order[k]' to index 'k'. 'order' must be a permutation.
+    void permute(instance_ptr self, const std::vector<int64_t>& order);
+
+    // find where to insert 'value' into the sorted range [lo, hi) of 'self', before
+    // any equal elements, or after them if 'right' is true, like the 'bisect' module.
+    int64_t bisect(instance_ptr self, instance_ptr value, int64_t lo, int64_t hi, bool right);
+
     template<class initializer>
     void extend(instance_ptr self, size_t count, const initializer& initFun) {
         layout_ptr& self_layout = *(layout_ptr*)self;
@@ -253,11 +377,7 @@ public:
         buffer.writeUnsignedVarintObject(0, id);
         buffer.writeUnsignedVarintObject(0, ct);
 
-        m_element_type->check([&](auto& concrete_type) {
-            for (long k = 0; k < ct; k++) {
-                concrete_type.serialize(this->eltPtr(self,k), buffer, 0);
-            }
-        });
+        serializeElements(self, ct, buffer);
 
         buffer.writeEndCompound();
     }
@@ -284,21 +404,9 @@ public:
             (*(layout**)self)->refcount++;
             buffer.addCachedPointer(id, *((layout**)self), this);
         } else {
-            constructor(self, ct, [&](instance_ptr tgt, int k) {
-                if (k == 0) {
-                    buffer.addCachedPointer(id, *((layout**)self), this);
-                    (*(layout**)self)->refcount++;
-                }
-
-                auto fieldAndWire = buffer.readFieldNumberAndWireType();
-                if (fieldAndWire.first) {
-                    throw std::runtime_error("Corrupt data (count)");
-                }
-                if (fieldAndWire.second == WireType::END_COMPOUND) {
-                    throw std::runtime_error("Corrupt data (count)");
-                }
-
-                m_element_type->deserialize(tgt, buffer, fieldAndWire.second);
+            deserializeElements(self, ct, buffer, [&]() {
+                buffer.addCachedPointer(id, *((layout**)self), this);
+                (*(layout**)self)->refcount++;
             });
         }
 
@@ -329,11 +437,7 @@ public:
 
         buffer.writeUnsignedVarintObject(0, ct);
 
-        m_element_type->check([&](auto& concrete_type) {
-            for (long k = 0; k < ct; k++) {
-                concrete_type.serialize(this->eltPtr(self,k), buffer, 0);
-            }
-        });
+        serializeElements(self, ct, buffer);
 
         buffer.writeEndCompound();
     }
@@ -350,17 +454,11 @@ public:
 
         size_t ct = buffer.readUnsignedVarintObject();
 
-        constructor(self, ct, [&](instance_ptr tgt, int k) {
-            auto fieldAndWire = buffer.readFieldNumberAndWireType();
-            if (fieldAndWire.first) {
-                throw std::runtime_error("Corrupt data (count)");
-            }
-            if (fieldAndWire.second == WireType::END_COMPOUND) {
-                throw std::runtime_error("Corrupt data (count)");
-            }
-
-            m_element_type->deserialize(tgt, buffer, fieldAndWire.second);
-        });
+        if (ct == 0) {
+            constructor(self, 0, [](instance_ptr tgt, int64_t k) {});
+        } else {
+            deserializeElements(self, ct, buffer, []() {});
+        }
 
         buffer.finishCompoundMessage(wireType);
     }
@@ -457,6 +457,14 @@ public:
         return m_is_simple;
     }
 
+    // bool, the integer types and the float types. Instances of these are a fixed
+    // number of bytes with no pointers, so an array of them can be copied as a block.
+    bool isRegisterType() const {
+        return (m_typeCategory >= catBool && m_typeCategory <= catInt64)
+            || m_typeCategory == catFloat32
+            || m_typeCategory == catFloat64;
+    }
+
     const std::set<Forward*>& getReferencedForwards() const {
         return m_referenced_forwards;
     }
@@ -26,6 +26,7 @@ from typed_python.type_filter import TypeFilter
 from typed_python._types import (
     Forward, TupleOf, ListOf, Tuple, NamedTuple, OneOf, ConstDict,
     Alternative, Value, serialize, deserialize, serializeStream, deserializeStream,
+    serializeInto, deserializeFromFile, serializeChunkedStream, deserializeChunkedStream,
     PointerTo, Dict, validateSerializedObject, validateSerializedObjectStream, decodeSerializedObject,
     getOrSetTypeResolver, Set, Class, Type, PythonObjectOfType, BoundMethod
 )
@@ -10,6 +10,8 @@
 #include "BytesType.hpp"
 #include "hash_table_layout.hpp"
 #include "PyInstance.hpp"
+#include "PyListOfView.hpp"
+#include "CompiledFunctionProfile.hpp"
 
 #include <pythread.h>
 
@@ -238,7 +240,87 @@ extern "C" {
             return;
         }
 
-        PyErr_Restore((PyObject*)incref(layout->pyObj->ob_type), incref(layout->pyObj), nullptr);
+        // keep the traceback the exception already has, so that re-raising a caught
+        // exception doesn't lose where it came from.
+        PyErr_Restore(
+            (PyObject*)incref(layout->pyObj->ob_type),
+            incref(layout->pyObj),
+            PyException_GetTraceback(layout->pyObj)
+        );
+    }
+
+    // take the exception that's currently set, clearing it, and return it (with its traceback
+    // attached) as a new reference, or nullptr if no exception is set.
+    static PyObject* fetchNormalizedException() {
+        PyObject *type, *value, *traceback;
+
+        PyErr_Fetch(&type, &value, &traceback);
+
+        if (!type) {
+            return nullptr;
+        }
+
+        PyErr_NormalizeException(&type, &value, &traceback);
+
+        if (traceback) {
+            PyException_SetTraceback(value, traceback);
+        }
+
+        decref(type);
+        if (traceback) {
+            decref(traceback);
+        }
+
+        return value;
+    }
+
+    // called when compiled code catches an exception. Clears the exception
+    // and returns it, so the 'except' clauses can match against it.
+    PythonObjectOfType::layout_type* np_fetch_exception() {
+        PyEnsureGilAcquired getTheGil;
+
+        PyObject* value = fetchNormalizedException();
+
+        if (!value) {
+            PyErr_SetString(PyExc_SystemError, "compiled code caught an exception but no exception was set");
+            value = fetchNormalizedException();
+        }
+
+        return PythonObjectOfType::stealToCreateLayout(value);
+    }
+
+    bool np_exception_matches(PythonObjectOfType::layout_type* exception, PythonObjectOfType::layout_type* excType) {
+        PyEnsureGilAcquired getTheGil;
+
+        return PyErr_GivenExceptionMatches(exception->pyObj, excType->pyObj);
+    }
+
+    // 'finally' blocks run while an exception may be propagating. We set it aside
+    // while the block runs, so that the block can call into the interpreter.
+    PyObject* np_save_exception() {
+        PyEnsureGilAcquired getTheGil;
+
+        return fetchNormalizedException();
+    }
+
+    void np_restore_exception(PyObject* value) {
+        if (!value) {
+            return;
+        }
+
+        PyEnsureGilAcquired getTheGil;
+
+        PyErr_Restore((PyObject*)incref(value->ob_type), value, PyException_GetTraceback(value));
+    }
+
+    void np_discard_exception(PyObject* value) {
+        if (!value) {
+            return;
+        }
+
+        PyEnsureGilAcquired getTheGil;
+
+        decref(value);
     }
 
     void np_add_traceback(const char* funcname, const char* filename, int lineno) {
@@ -247,6 +329,18 @@ extern "C" {
         _PyTraceback_Add(funcname, filename, lineno);
     }
 
+    // called on entry to a compiled function when the profiler is on. Returns the time.
+    int64_t np_profile_enter(CompiledFunctionProfile::Counter* counter) {
+        counter->calls++;
+
+        return CompiledFunctionProfile::now();
+    }
+
+    // called on every exit from a compiled function, with the time 'np_profile_enter' returned.
+    void np_profile_exit(CompiledFunctionProfile::Counter* counter, int64_t startTime) {
+        counter->nanoseconds += CompiledFunctionProfile::now() - startTime;
+    }
+
     PythonObjectOfType::layout_type* np_builtin_pyobj_by_name(const char* utf8_name) {
         PyEnsureGilAcquired getTheGil;
 
@@ -665,7 +759,7 @@ extern "C" {
         return result;
     }
 
-    int32_t nativepython_dict_allocateNewSlot(hash_table_layout* layout, size_t kvPairSize) {
+    int64_t nativepython_dict_allocateNewSlot(hash_table_layout* layout, size_t kvPairSize) {
         return layout->allocateNewSlot(kvPairSize);
     }
 
@@ -1180,6 +1274,52 @@ extern "C" {
         return ret;
     }
 
+    // the sorting entrypoints are only called on lists of register types, so they
+    // can't throw and don't need the GIL.
+    void np_list_of_sort(ListOfType* tp, ListOfType::layout* list, bool reverse) {
+        tp->sort((instance_ptr)&list, reverse);
+    }
+
+    ListOfType::layout* np_list_of_argsort(ListOfType* tp, ListOfType::layout* list, bool reverse) {
+        static ListOfType* listOfIntT = ListOfType::Make(Int64::Make());
+
+        std::vector<int64_t> order = tp->argsort((instance_ptr)&list, reverse);
+
+        ListOfType::layout* outList;
+
+        listOfIntT->constructor((instance_ptr)&outList, order.size(), [&](instance_ptr tgt, int64_t k) {
+            *(int64_t*)tgt = order[k];
+        });
+
+        return outList;
+    }
+
+    void np_list_of_partial_sort(ListOfType* tp, ListOfType::layout* list, int64_t n) {
+        tp->partialSort((instance_ptr)&list, n);
+    }
+
+    void np_list_of_nth_element(ListOfType* tp, ListOfType::layout* list, int64_t n) {
+        tp->nthElement((instance_ptr)&list, n);
+    }
+
+    void np_release_adopted_tuple_or_list(TupleOrListOfType::layout* self) {
+        TupleOrListOfType::releaseAdoptedBuffer(self);
+    }
+
+    // hand a compiled view of 'count' elements at 'data' in 'list' to the interpreter
+    PythonObjectOfType::layout_type* np_list_of_view_to_pyobj(
+            ListOfType* tp,
+            ListOfType::layout* list,
+            instance_ptr data,
+            int64_t count
+    ) {
+        PyEnsureGilAcquired acquireTheGil;
+
+        return PythonObjectOfType::stealToCreateLayout(
+            PyListOfView::create(tp, list, data, count)
+        );
+    }
+
     double np_pyobj_to_float64(PythonObjectOfType::layout_type* obj) {
         PyEnsureGilAcquired getTheGil;
 
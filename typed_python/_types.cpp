@@ -21,16 +21,23 @@
 #include <vector>
 #include <string>
 #include <iostream>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
 
 #include "AllTypes.hpp"
 #include "NullSerializationContext.hpp"
 #include "util.hpp"
 #include "PyInstance.hpp"
 #include "PyFunctionInstance.hpp"
+#include "PyListOfView.hpp"
 #include "SerializationBuffer.hpp"
 #include "DeserializationBuffer.hpp"
 #include "PythonSerializationContext.hpp"
 #include "UnicodeProps.hpp"
+#include "ParallelFor.hpp"
+#include "CompiledFunctionProfile.hpp"
 #include "_types.hpp"
 
 PyObject *MakeTupleOrListOfType(PyObject* nullValue, PyObject* args, bool isTuple) {
@@ -958,6 +965,106 @@ PyObject *refcount(PyObject* nullValue, PyObject* args) {
     return NULL;
 }
 
+// holds a contiguous view of a python buffer-protocol object for the lifetime of a call
+class PyBufferHolder {
+public:
+    PyBufferHolder() : m_held(false) {
+    }
+
+    ~PyBufferHolder() {
+        if (m_held) {
+            PyBuffer_Release(&m_view);
+        }
+    }
+
+    PyBufferHolder(const PyBufferHolder&) = delete;
+    PyBufferHolder& operator=(const PyBufferHolder&) = delete;
+
+    // returns false and sets a python exception if 'obj' can't give us the view.
+    bool acquire(PyObject* obj, bool writable, const char* argDescription) {
+        if (!PyObject_CheckBuffer(obj)) {
+            PyErr_Format(
+                PyExc_TypeError,
+                "%s must be a bytes-like object supporting the buffer protocol, not %S",
+                argDescription,
+                (PyObject*)obj->ob_type
+            );
+            return false;
+        }
+
+        if (PyObject_GetBuffer(obj, &m_view, PyBUF_C_CONTIGUOUS | (writable ? PyBUF_WRITABLE : 0)) == -1) {
+            return false;
+        }
+
+        m_held = true;
+        return true;
+    }
+
+    uint8_t* data() const {
+        return (uint8_t*)m_view.buf;
+    }
+
+    size_t size() const {
+        return m_view.len;
+    }
+
+private:
+    bool m_held;
+    Py_buffer m_view;
+};
+
+// serialize 'inst' as 'serializeType' into 'b'. Returns false if a python exception is set.
+bool serializeIntoBuffer(Type* serializeType, PyObject* inst, SerializationBuffer& b) {
+    Type* actualType = PyInstance::extractTypeFrom(inst->ob_type);
+
+    try{
+        if (actualType == serializeType) {
+            //the simple case
+            PyEnsureGilReleased releaseTheGil;
+
+            actualType->serialize(((PyInstance*)inst)->dataPtr(), b, 0);
+        } else {
+            //try to construct a 'serialize type' from the argument and then serialize that
+            Instance i = Instance::createAndInitialize(serializeType, [&](instance_ptr p) {
+                PyInstance::copyConstructFromPythonInstance(serializeType, p, inst, true);
+            });
+
+            PyEnsureGilReleased releaseTheGil;
+
+            i.type()->serialize(i.data(), b, 0);
+        }
+
+        PyEnsureGilReleased releaseTheGil;
+        b.finalize();
+    } catch (std::exception& e) {
+        PyErr_SetString(PyExc_TypeError, e.what());
+        return false;
+    } catch(PythonExceptionSet& e) {
+        return false;
+    }
+
+    return true;
+}
+
+// build the serialization context for an optional python 'context' argument.
+// Returns nullptr if a python exception is set.
+std::shared_ptr<SerializationContext> serializationContextFor(PyObject* contextArg) {
+    std::shared_ptr<SerializationContext> context(new NullSerializationContext());
+
+    try {
+        if (contextArg && contextArg != Py_None) {
+            context.reset(new PythonSerializationContext(contextArg));
+        }
+    } catch (std::exception& e) {
+        PyErr_SetString(PyExc_TypeError, e.what());
+        return nullptr;
+    } catch(PythonExceptionSet& e) {
+        return nullptr;
+    }
+
+    return context;
+}
+
 /**
     Serializes an object instance and returns a pointer to a PyBytes object
 
@@ -989,50 +1096,87 @@ PyObject *serialize(PyObject* nullValue, PyObject* args) {
 
     serializeType->assertForwardsResolved();
 
-    Type* actualType = PyInstance::extractTypeFrom(a2->ob_type);
+    std::shared_ptr<SerializationContext> context = serializationContextFor(a3);
+    if (!context) {
+        return NULL;
+    }
 
-    std::shared_ptr<SerializationContext> context(new NullSerializationContext());
+    SerializationBuffer b(*context);
 
-    try {
-        if (a3 && a3 != Py_None) {
-            context.reset(new PythonSerializationContext(a3));
-        }
-    } catch (std::exception& e) {
-        PyErr_SetString(PyExc_TypeError, e.what());
+    if (!serializeIntoBuffer(serializeType, a2, b)) {
         return NULL;
-    } catch(PythonExceptionSet& e) {
+    }
+
+    return PyBytes_FromStringAndSize((const char*)b.buffer(), b.size());
+}
+
+/**
+    Serializes an object instance directly into a writable buffer-protocol object
+    (a bytearray, a writable mmap or memoryview, shared memory, ...) and returns
+    the number of bytes written.
+
+    If the buffer is too small, raises a ValueError that names the required size
+    and leaves the contents of the buffer unspecified.
+
+    Note: we list the params to be extracted from `args`
+    @param a1: Serialization Type
+    @param a2: Instance
+    @param a3: The writable buffer
+    @param a4: Serialization Context (optional)
+*/
+PyObject *serializeInto(PyObject* nullValue, PyObject* args) {
+    if (PyTuple_Size(args) != 3 && PyTuple_Size(args) != 4) {
+        PyErr_SetString(PyExc_TypeError, "serializeInto takes 3 or 4 positional arguments");
         return NULL;
     }
 
-    SerializationBuffer b(*context);
+    PyObjectHolder a1(PyTuple_GetItem(args, 0));
+    PyObjectHolder a2(PyTuple_GetItem(args, 1));
+    PyObjectHolder a3(PyTuple_GetItem(args, 2));
+    PyObjectHolder a4(PyTuple_Size(args) == 4 ? PyTuple_GetItem(args, 3) : nullptr);
 
-    try{
-        if (actualType == serializeType) {
-            //the simple case
-            PyEnsureGilReleased releaseTheGil;
+    Type* serializeType = PyInstance::unwrapTypeArgToTypePtr(a1);
 
-            actualType->serialize(((PyInstance*)(PyObject*)a2)->dataPtr(), b, 0);
-        } else {
-            //try to construct a 'serialize type' from the argument and then serialize that
-            Instance i = Instance::createAndInitialize(serializeType, [&](instance_ptr p) {
-                PyInstance::copyConstructFromPythonInstance(serializeType, p, a2, true);
-            });
+    if (!serializeType) {
+        PyErr_Format(
+            PyExc_TypeError,
+            "first argument to serializeInto must be a native type object, not %S",
+            (PyObject*)a1
+            );
+        return NULL;
+    }
 
-            PyEnsureGilReleased releaseTheGil;
+    serializeType->assertForwardsResolved();
 
-            i.type()->serialize(i.data(), b, 0);
-        }
+    PyBufferHolder target;
+    if (!target.acquire(a3, true, "third argument to serializeInto")) {
+        return NULL;
+    }
 
-        b.finalize();
-    } catch (std::exception& e) {
-        PyErr_SetString(PyExc_TypeError, e.what());
+    std::shared_ptr<SerializationContext> context = serializationContextFor(a4);
+    if (!context) {
         return NULL;
-    } catch(PythonExceptionSet& e) {
+    }
+
+    SerializationBuffer b(*context, target.data(), target.size());
+
+    if (!serializeIntoBuffer(serializeType, a2, b)) {
         return NULL;
     }
 
-    return PyBytes_FromStringAndSize((const char*)b.buffer(), b.size());
+    if (!b.isWritingIntoExternalBuffer()) {
+        PyErr_Format(
+            PyExc_ValueError,
+            "serializeInto needs a buffer of at least %zu bytes, but was given one of %zu bytes",
+            b.size(),
+            target.size()
+        );
+        return NULL;
+    }
+
+    return PyLong_FromSize_t(b.size());
 }
+
 /**
     Serializes a container instance as a stream of concatenated messages, and return a pointer to a PyBytes object
 
@@ -1085,11 +1229,13 @@ PyObject *serializeStream(PyObject* nullValue, PyObject* args) {
         if (actualType && (actualType->getTypeCategory() == Type::TypeCategory::catListOf ||
                 actualType->getTypeCategory() == Type::TypeCategory::catTupleOf)) {
             if (((TupleOrListOfType*)actualType)->getEltType() == serializeType) {
-                PyEnsureGilReleased releaseTheGil;
+                {
+                    PyEnsureGilReleased releaseTheGil;
 
-                ((TupleOrListOfType*)actualType)->serializeStream(((PyInstance*)(PyObject*)a2)->dataPtr(), b);
+                    ((TupleOrListOfType*)actualType)->serializeStream(((PyInstance*)(PyObject*)a2)->dataPtr(), b);
 
-                b.finalize();
+                    b.finalize();
+                }
 
                 return PyBytes_FromStringAndSize((const char*)b.buffer(), b.size());
             }
@@ -1105,10 +1251,9 @@ PyObject *serializeStream(PyObject* nullValue, PyObject* args) {
         {
             PyEnsureGilReleased releaseTheGil;
             serializeTupleType->serializeStream(i.data(), b);
+            b.finalize();
         }
 
-        b.finalize();
-
         return PyBytes_FromStringAndSize((const char*)b.buffer(), b.size());
     } catch (std::exception& e) {
         PyErr_SetString(PyExc_TypeError, e.what());
@@ -1118,6 +1263,34 @@ PyObject *serializeStream(PyObject* nullValue, PyObject* args) {
     }
 }
 
+// deserialize a single object of type 'serializeType' from 'sz' bytes at 'data',
+// which must stay valid until we return.
+PyObject *deserializeFromMemory(Type* serializeType, uint8_t* data, size_t sz, PyObject* contextArg) {
+    std::shared_ptr<SerializationContext> context = serializationContextFor(contextArg);
+    if (!context) {
+        return NULL;
+    }
+
+    DeserializationBuffer buf(data, sz, *context);
+
+    try {
+        serializeType->assertForwardsResolved();
+
+        Instance i = Instance::createAndInitialize(serializeType, [&](instance_ptr p) {
+            PyEnsureGilReleased releaseTheGil;
+            auto fieldAndWireType = buf.readFieldNumberAndWireType();
+            serializeType->deserialize(p, buf, fieldAndWireType.second);
+        });
+
+        return PyInstance::extractPythonObject(i.data(), i.type());
+    } catch(std::exception& e) {
+        PyErr_SetString(PyExc_TypeError, e.what());
+        return NULL;
+    } catch(PythonExceptionSet& e) {
+        return NULL;
+    }
+}
+
 PyObject *deserialize(PyObject* nullValue, PyObject* args) {
     if (PyTuple_Size(args) != 2 && PyTuple_Size(args) != 3) {
         PyErr_SetString(PyExc_TypeError, "deserialize takes 2 or 3 positional arguments");
@@ -1133,34 +1306,86 @@ PyObject *deserialize(PyObject* nullValue, PyObject* args) {
         PyErr_SetString(PyExc_TypeError, "first argument to deserialize must be a native type object");
         return NULL;
     }
-    if (!PyBytes_Check(a2)) {
-        PyErr_SetString(PyExc_TypeError, "second argument to deserialize must be a bytes object");
+
+    // we hold the buffer (not a copy of it) until we're done reading
+    PyBufferHolder data;
+    if (!data.acquire(a2, false, "second argument to deserialize")) {
         return NULL;
     }
 
-    std::shared_ptr<SerializationContext> context(new NullSerializationContext());
-    if (a3 && a3 != Py_None) {
-        context.reset(new PythonSerializationContext(a3));
+    return deserializeFromMemory(serializeType, data.data(), data.size(), a3);
+}
+
+/**
+    Deserializes a single object from the file at 'path', which we map into
+    memory rather than reading into an intermediate bytes object.
+
+    Note: we list the params to be extracted from `args`
+    @param a1: The path to the file
+    @param a2: Serialization Type
+    @param a3: Serialization Context (optional)
+*/
+PyObject *deserializeFromFile(PyObject* nullValue, PyObject* args) {
+    if (PyTuple_Size(args) != 2 && PyTuple_Size(args) != 3) {
+        PyErr_SetString(PyExc_TypeError, "deserializeFromFile takes 2 or 3 positional arguments");
+        return NULL;
     }
+    PyObjectHolder a1(PyTuple_GetItem(args, 0));
+    PyObjectHolder a2(PyTuple_GetItem(args, 1));
+    PyObjectHolder a3(PyTuple_Size(args) == 3 ? PyTuple_GetItem(args, 2) : nullptr);
 
-    DeserializationBuffer buf((uint8_t*)PyBytes_AsString(a2), PyBytes_GET_SIZE((PyObject*)a2), *context);
+    Type* serializeType = PyInstance::unwrapTypeArgToTypePtr(a2);
 
-    try {
-        serializeType->assertForwardsResolved();
+    if (!serializeType) {
+        PyErr_SetString(PyExc_TypeError, "second argument to deserializeFromFile must be a native type object");
+        return NULL;
+    }
 
-        Instance i = Instance::createAndInitialize(serializeType, [&](instance_ptr p) {
-            PyEnsureGilReleased releaseTheGil;
-            auto fieldAndWireType = buf.readFieldNumberAndWireType();
-            serializeType->deserialize(p, buf, fieldAndWireType.second);
-        });
+    PyObject* pathBytesRaw = nullptr;
+    if (!PyUnicode_FSConverter(a1, &pathBytesRaw)) {
+        return NULL;
+    }
+    PyObjectStealer pathBytes(pathBytesRaw);
 
-        return PyInstance::extractPythonObject(i.data(), i.type());
-    } catch(std::exception& e) {
-        PyErr_SetString(PyExc_TypeError, e.what());
+    int fd = open(PyBytes_AsString(pathBytes), O_RDONLY);
+    if (fd == -1) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, a1);
         return NULL;
-    } catch(PythonExceptionSet& e) {
+    }
+
+    struct stat fileStat;
+    if (fstat(fd, &fileStat) == -1) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, a1);
+        close(fd);
         return NULL;
     }
+
+    size_t fileSize = fileStat.st_size;
+
+    // mmap refuses zero-length mappings. An empty file is just an empty message,
+    // which the deserializer will reject with its usual error.
+    if (fileSize == 0) {
+        close(fd);
+        return deserializeFromMemory(serializeType, nullptr, 0, a3);
+    }
+
+    void* mapped = mmap(nullptr, fileSize, PROT_READ, MAP_PRIVATE, fd, 0);
+
+    // the mapping keeps the file alive, so we don't need the descriptor any more
+    close(fd);
+
+    if (mapped == MAP_FAILED) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, a1);
+        return NULL;
+    }
+
+    madvise(mapped, fileSize, MADV_SEQUENTIAL);
+
+    PyObject* result = deserializeFromMemory(serializeType, (uint8_t*)mapped, fileSize, a3);
+
+    munmap(mapped, fileSize);
+
+    return result;
 }
 
 PyObject *decodeSerializedObject(PyObject* nullValue, PyObject* args) {
@@ -1339,17 +1564,18 @@ PyObject *deserializeStream(PyObject* nullValue, PyObject* args) {
         PyErr_SetString(PyExc_TypeError, "first argument to deserialize must be a native type object");
         return NULL;
     }
-    if (!PyBytes_Check(a2)) {
-        PyErr_SetString(PyExc_TypeError, "second argument to deserialize must be a bytes object");
+
+    PyBufferHolder data;
+    if (!data.acquire(a2, false, "second argument to deserializeStream")) {
         return NULL;
     }
 
-    std::shared_ptr<SerializationContext> context(new NullSerializationContext());
-    if (a3 && a3 != Py_None) {
-        context.reset(new PythonSerializationContext(a3));
+    std::shared_ptr<SerializationContext> context = serializationContextFor(a3);
+    if (!context) {
+        return NULL;
     }
 
-    DeserializationBuffer buf((uint8_t*)PyBytes_AsString(a2), PyBytes_GET_SIZE((PyObject*)a2), *context);
+    DeserializationBuffer buf(data.data(), data.size(), *context);
 
     try {
         serializeType->assertForwardsResolved();
@@ -1382,6 +1608,350 @@ PyObject *deserializeStream(PyObject* nullValue, PyObject* args) {
     }
 }
 
+/*****
+A 'chunked stream' holds the elements of a large list as independent chunks
+that can be serialized and deserialized in parallel, along with an index
+that lets readers decode just the chunks covering a subrange. It's a single
+ordinary message, so validateSerializedObject and decodeSerializedObject
+understand it:
+
+    BEGIN_COMPOUND(0)
+        0: VARINT - the total number of elements
+        1: VARINT - the number of elements in each chunk (the last may have fewer)
+        2: a compound of VARINTs, each the size in bytes of one chunk
+        3: BYTES - every chunk, concatenated. Each chunk is what 'serializeStream'
+            produces for its elements, compressed independently if the
+            serialization context compresses.
+    END_COMPOUND
+
+The header is never compressed, so readers can find any chunk without
+decoding the others.
+******/
+
+const int64_t DEFAULT_STREAM_CHUNK_SIZE = 65536;
+
+/**
+    Serializes a container as a chunked stream, serializing the chunks on a pool
+    of native threads, and returns a PyBytes object.
+
+    @param serializeType: the element type
+    @param instance: the container (a ListOf or TupleOf of 'serializeType', or anything
+        convertible to TupleOf(serializeType))
+    @param context: serialization context (optional)
+    @param chunkSize: elements per chunk (optional)
+    @param threadCount: how many threads to use (optional, defaults to the number of cores)
+*/
+PyObject *serializeChunkedStream(PyObject* nullValue, PyObject* args, PyObject* kwargs) {
+    static const char *kwlist[] = {"serializeType", "instance", "context", "chunkSize", "threadCount", NULL};
+
+    PyObject* pySerializeType;
+    PyObject* pyInstance;
+    PyObject* pyContext = nullptr;
+    Py_ssize_t chunkSize = DEFAULT_STREAM_CHUNK_SIZE;
+    Py_ssize_t threadCount = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(
+            args, kwargs, "OO|Onn", (char**)kwlist,
+            &pySerializeType, &pyInstance, &pyContext, &chunkSize, &threadCount
+        )) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        Type* serializeType = PyInstance::unwrapTypeArgToTypePtr(pySerializeType);
+
+        if (!serializeType) {
+            throw std::runtime_error("first argument to serializeChunkedStream must be a native type object");
+        }
+
+        if (chunkSize <= 0) {
+            throw std::runtime_error("chunkSize must be positive");
+        }
+
+        serializeType->assertForwardsResolved();
+
+        std::shared_ptr<SerializationContext> context = serializationContextFor(pyContext);
+        if (!context) {
+            throw PythonExceptionSet();
+        }
+
+        // find (or make) a container holding the elements
+        Type* actualType = PyInstance::extractTypeFrom(pyInstance->ob_type);
+
+        TupleOrListOfType* containerType;
+        Instance container;
+
+        if (actualType && (actualType->getTypeCategory() == Type::TypeCategory::catListOf ||
+                actualType->getTypeCategory() == Type::TypeCategory::catTupleOf) &&
+                ((TupleOrListOfType*)actualType)->getEltType() == serializeType) {
+            containerType = (TupleOrListOfType*)actualType;
+            container = Instance(((PyInstance*)pyInstance)->dataPtr(), containerType);
+        } else {
+            containerType = TupleOfType::Make(serializeType);
+            container = Instance::createAndInitialize(containerType, [&](instance_ptr p) {
+                PyInstance::copyConstructFromPythonInstance(containerType, p, pyInstance, true);
+            });
+        }
+
+        int64_t eltCount = containerType->count(container.data());
+        int64_t chunkCount = (eltCount + chunkSize - 1) / chunkSize;
+
+        std::vector<std::unique_ptr<SerializationBuffer> > chunks;
+        for (int64_t k = 0; k < chunkCount; k++) {
+            chunks.push_back(std::unique_ptr<SerializationBuffer>(new SerializationBuffer(*context)));
+        }
+
+        {
+            PyEnsureGilReleased releaseTheGil;
+
+            parallelFor(chunkCount, threadCount > 0 ? threadCount : defaultThreadCount(), [&](size_t k) {
+                int64_t top = std::min<int64_t>(eltCount, (k + 1) * chunkSize);
+
+                serializeType->check([&](auto& concreteType) {
+                    for (int64_t i = k * chunkSize; i < top; i++) {
+                        concreteType.serialize(containerType->eltPtr(container.data(), i), *chunks[k], 0);
+                    }
+                });
+
+                chunks[k]->finalize();
+            });
+        }
+
+        NullSerializationContext nullContext;
+        SerializationBuffer header(nullContext);
+
+        size_t totalChunkBytes = 0;
+
+        header.writeBeginCompound(0);
+        header.writeUnsignedVarintObject(0, eltCount);
+        header.writeUnsignedVarintObject(1, chunkSize);
+        header.writeBeginCompound(2);
+        for (auto& chunk: chunks) {
+            header.writeUnsignedVarintObject(0, chunk->size());
+            totalChunkBytes += chunk->size();
+        }
+        header.writeEndCompound();
+        header.writeBeginBytes(3, totalChunkBytes);
+
+        SerializationBuffer trailer(nullContext);
+        trailer.writeEndCompound();
+
+        PyObject* result = PyBytes_FromStringAndSize(nullptr, header.size() + totalChunkBytes + trailer.size());
+        if (!result) {
+            throw PythonExceptionSet();
+        }
+
+        uint8_t* out = (uint8_t*)PyBytes_AS_STRING(result);
+
+        memcpy(out, header.buffer(), header.size());
+        out += header.size();
+
+        for (auto& chunk: chunks) {
+            memcpy(out, chunk->buffer(), chunk->size());
+            out += chunk->size();
+        }
+
+        memcpy(out, trailer.buffer(), trailer.size());
+
+        return result;
+    });
+}
+
+// convert an optional python index into a position in [0, count], python-slice style.
+int64_t sliceIndexFromPyObject(PyObject* index, int64_t defaultValue, int64_t count) {
+    if (!index || index == Py_None) {
+        return defaultValue;
+    }
+
+    int64_t res = PyLong_AsLongLong(index);
+    if (res == -1 && PyErr_Occurred()) {
+        throw PythonExceptionSet();
+    }
+
+    if (res < 0) {
+        res += count;
+    }
+
+    return std::max<int64_t>(0, std::min<int64_t>(res, count));
+}
+
+/**
+    Deserializes the elements [start, stop) of a chunked stream produced by
+    'serializeChunkedStream', decoding only the chunks that cover that range,
+    on a pool of native threads. Returns a ListOf(serializeType).
+
+    @param serializeType: the element type
+    @param data: a bytes-like object holding the stream
+    @param context: serialization context (optional)
+    @param start, stop: the range of elements to decode, as in a python slice (optional)
+    @param threadCount: how many threads to use (optional, defaults to the number of cores)
+*/
+PyObject *deserializeChunkedStream(PyObject* nullValue, PyObject* args, PyObject* kwargs) {
+    static const char *kwlist[] = {"serializeType", "data", "context", "start", "stop", "threadCount", NULL};
+
+    PyObject* pySerializeType;
+    PyObject* pyData;
+    PyObject* pyContext = nullptr;
+    PyObject* pyStart = nullptr;
+    PyObject* pyStop = nullptr;
+    Py_ssize_t threadCount = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(
+            args, kwargs, "OO|OOOn", (char**)kwlist,
+            &pySerializeType, &pyData, &pyContext, &pyStart, &pyStop, &threadCount
+        )) {
+        return NULL;
+    }
+
+    return translateExceptionToPyObject([&]() {
+        Type* serializeType = PyInstance::unwrapTypeArgToTypePtr(pySerializeType);
+
+        if (!serializeType) {
+            throw std::runtime_error("first argument to deserializeChunkedStream must be a native type object");
+        }
+
+        serializeType->assertForwardsResolved();
+
+        PyBufferHolder data;
+        if (!data.acquire(pyData, false, "second argument to deserializeChunkedStream")) {
+            throw PythonExceptionSet();
+        }
+
+        std::shared_ptr<SerializationContext> context = serializationContextFor(pyContext);
+        if (!context) {
+            throw PythonExceptionSet();
+        }
+
+        // read the header
+        NullSerializationContext nullContext;
+        DeserializationBuffer header(data.data(), data.size(), nullContext);
+
+        auto expectField = [&](size_t fieldNumber, size_t wireType) {
+            auto fieldAndWire = header.readFieldNumberAndWireType();
+            if (fieldAndWire.first != fieldNumber || fieldAndWire.second != wireType) {
+                throw std::runtime_error("Corrupt data: not a chunked stream");
+            }
+        };
+
+        expectField(0, WireType::BEGIN_COMPOUND);
+        expectField(0, WireType::VARINT);
+        int64_t eltCount = header.readUnsignedVarint();
+        expectField(1, WireType::VARINT);
+        int64_t chunkSize = header.readUnsignedVarint();
+
+        std::vector<size_t> chunkOffsets;
+        size_t totalChunkBytes = 0;
+
+        expectField(2, WireType::BEGIN_COMPOUND);
+        header.consumeCompoundMessageWithImpliedFieldNumbers(WireType::BEGIN_COMPOUND, [&](size_t k, size_t wireType) {
+            assertWireTypesEqual(wireType, WireType::VARINT);
+            chunkOffsets.push_back(totalChunkBytes);
+            totalChunkBytes += header.readUnsignedVarint();
+        });
+        chunkOffsets.push_back(totalChunkBytes);
+
+        expectField(3, WireType::BYTES);
+
+        if (header.readUnsignedVarint() != totalChunkBytes) {
+            throw std::runtime_error("Corrupt data: chunked stream index doesn't match its data");
+        }
+
+        size_t chunkDataStart = header.pos();
+
+        if (chunkDataStart + totalChunkBytes > data.size()) {
+            throw std::runtime_error("Corrupt data: chunked stream is truncated");
+        }
+
+        int64_t chunkCount = chunkOffsets.size() - 1;
+
+        if (chunkSize <= 0 ? eltCount != 0 : (eltCount + chunkSize - 1) / chunkSize != chunkCount) {
+            throw std::runtime_error("Corrupt data: chunked stream has the wrong number of chunks");
+        }
+
+        int64_t start = sliceIndexFromPyObject(pyStart, 0, eltCount);
+        int64_t stop = std::max(start, sliceIndexFromPyObject(pyStop, eltCount, eltCount));
+
+        ListOfType* listType = ListOfType::Make(serializeType);
+
+        if (start == stop) {
+            Instance empty = Instance::createAndInitialize(listType, [&](instance_ptr p) {
+                listType->constructor(p, 0, [](instance_ptr, int64_t) {});
+            });
+
+            return PyInstance::extractPythonObject(empty.data(), listType);
+        }
+
+        int64_t firstChunk = start / chunkSize;
+        int64_t lastChunk = (stop - 1) / chunkSize;
+
+        std::vector<Instance> chunks(lastChunk - firstChunk + 1);
+
+        {
+            PyEnsureGilReleased releaseTheGil;
+
+            parallelFor(chunks.size(), threadCount > 0 ? threadCount : defaultThreadCount(), [&](size_t i) {
+                int64_t k = firstChunk + i;
+
+                DeserializationBuffer buf(
+                    data.data() + chunkDataStart + chunkOffsets[k],
+                    chunkOffsets[k + 1] - chunkOffsets[k],
+                    *context
+                );
+
+                chunks[i] = Instance::createAndInitialize(listType, [&](instance_ptr p) {
+                    listType->constructorUnbounded(p, [&](instance_ptr elt, int64_t index) {
+                        if (buf.isDone()) {
+                            return false;
+                        }
+
+                        auto fieldAndWireType = buf.readFieldNumberAndWireType();
+                        serializeType->deserialize(elt, buf, fieldAndWireType.second);
+
+                        return true;
+                    });
+                });
+
+                if (listType->count(chunks[i].data()) != std::min<int64_t>(chunkSize, eltCount - k * chunkSize)) {
+                    throw std::runtime_error("Corrupt data: chunk has the wrong number of elements");
+                }
+            });
+        }
+
+        // move the elements we want out of each chunk with a bitwise copy, and then
+        // destroy the rest of them.
+        Instance result = Instance::createAndInitialize(listType, [&](instance_ptr p) {
+            listType->constructor(p, stop - start, [](instance_ptr, int64_t) {});
+        });
+
+        size_t eltBytes = serializeType->bytecount();
+        int64_t written = 0;
+
+        for (size_t i = 0; i < chunks.size(); i++) {
+            int64_t chunkBase = (firstChunk + i) * chunkSize;
+            int64_t lo = std::max<int64_t>(start, chunkBase) - chunkBase;
+            int64_t hi = std::min<int64_t>(stop, chunkBase + chunkSize) - chunkBase;
+            int64_t chunkLen = listType->count(chunks[i].data());
+
+            memcpy(
+                listType->eltPtr(result.data(), written),
+                listType->eltPtr(chunks[i].data(), lo),
+                (hi - lo) * eltBytes
+            );
+            written += hi - lo;
+
+            for (int64_t j = 0; j < chunkLen; j++) {
+                if (j < lo || j >= hi) {
+                    serializeType->destroy(listType->eltPtr(chunks[i].data(), j));
+                }
+            }
+
+            listType->setSizeUnsafe(chunks[i].data(), 0);
+        }
+
+        return PyInstance::extractPythonObject(result.data(), listType);
+    });
+}
+
 PyObject *isSimple(PyObject* nullValue, PyObject* args) {
     if (PyTuple_Size(args) != 1) {
         PyErr_SetString(PyExc_TypeError, "isSimple takes 1 positional argument");
@@ -1528,8 +2098,8 @@ PyObject *isDispatchEnabled(PyObject* nullValue, PyObject* args) {
 }
 
 PyObject *installNativeFunctionPointer(PyObject* nullValue, PyObject* args) {
-    if (PyTuple_Size(args) != 5) {
-        PyErr_SetString(PyExc_TypeError, "installNativeFunctionPointer takes 5 positional arguments");
+    if (PyTuple_Size(args) != 5 && PyTuple_Size(args) != 6) {
+        PyErr_SetString(PyExc_TypeError, "installNativeFunctionPointer takes 5 or 6 positional arguments");
         return NULL;
     }
     PyObjectHolder a1(PyTuple_GetItem(args, 0));
@@ -1569,6 +2139,19 @@ PyObject *installNativeFunctionPointer(PyObject* nullValue, PyObject* args) {
         return NULL;
     }
 
+    int64_t hotCallThreshold = 0;
+
+    if (PyTuple_Size(args) == 6) {
+        PyObject* a6 = PyTuple_GetItem(args, 5);
+
+        if (!PyLong_Check(a6)) {
+            PyErr_SetString(PyExc_TypeError, "sixth argument to 'installNativeFunctionPointer' must be an integer 'hotCallThreshold'");
+            return NULL;
+        }
+
+        hotCallThreshold = PyLong_AsLongLong(a6);
+    }
+
     Function* f = (Function*)t1;
 
     int index = PyLong_AsLong(a2);
@@ -1579,7 +2162,92 @@ PyObject *installNativeFunctionPointer(PyObject* nullValue, PyObject* args) {
         return NULL;
     }
 
-    f->addCompiledSpecialization(index,(compiled_code_entrypoint)ptr, returnType, argTypes);
+    return PyLong_FromLong(
+        f->addCompiledSpecialization(index,(compiled_code_entrypoint)ptr, returnType, argTypes, hotCallThreshold)
+    );
+}
+
+PyObject *replaceNativeFunctionPointer(PyObject* nullValue, PyObject* args) {
+    if (PyTuple_Size(args) != 4) {
+        PyErr_SetString(PyExc_TypeError, "replaceNativeFunctionPointer takes 4 positional arguments");
+        return NULL;
+    }
+    PyObjectHolder a1(PyTuple_GetItem(args, 0));
+    PyObjectHolder a2(PyTuple_GetItem(args, 1));
+    PyObjectHolder a3(PyTuple_GetItem(args, 2));
+    PyObjectHolder a4(PyTuple_GetItem(args, 3));
+
+    Type* t1 = PyInstance::unwrapTypeArgToTypePtr(a1);
+
+    if (!t1 || t1->getTypeCategory() != Type::TypeCategory::catFunction) {
+        PyErr_SetString(PyExc_TypeError, "first argument to 'replaceNativeFunctionPointer' must be a Function");
+        return NULL;
+    }
+
+    if (!PyLong_Check(a2)) {
+        PyErr_SetString(PyExc_TypeError, "second argument to 'replaceNativeFunctionPointer' must be an integer 'index'");
+        return NULL;
+    }
+
+    if (!PyLong_Check(a3)) {
+        PyErr_SetString(PyExc_TypeError, "third argument to 'replaceNativeFunctionPointer' must be an integer specialization index");
+        return NULL;
+    }
+
+    if (!PyLong_Check(a4)) {
+        PyErr_SetString(PyExc_TypeError, "fourth argument to 'replaceNativeFunctionPointer' must be an integer function pointer");
+        return NULL;
+    }
+
+    Function* f = (Function*)t1;
+
+    return translateExceptionToPyObject([&]() {
+        f->replaceCompiledSpecialization(
+            PyLong_AsLong(a2),
+            PyLong_AsLong(a3),
+            (compiled_code_entrypoint)PyLong_AsSize_t(a4)
+        );
+
+        return incref(Py_None);
+    });
+}
+
+PyObject *compiledFunctionProfileCounter(PyObject* nullValue, PyObject* args) {
+    const char* name;
+
+    if (!PyArg_ParseTuple(args, "s", &name)) {
+        return NULL;
+    }
+
+    return PyLong_FromSize_t((size_t)CompiledFunctionProfile::singleton().counterFor(name));
+}
+
+PyObject *compiledFunctionProfile(PyObject* nullValue, PyObject* args) {
+    PyObjectStealer result(PyDict_New());
+
+    bool failed = false;
+
+    CompiledFunctionProfile::singleton().visit([&](const std::string& name, int64_t calls, int64_t nanoseconds) {
+        if (failed) {
+            return;
+        }
+
+        PyObjectStealer value(Py_BuildValue("(LL)", (long long)calls, (long long)nanoseconds));
+
+        if (!value || PyDict_SetItemString(result, name.c_str(), value) != 0) {
+            failed = true;
+        }
+    });
+
+    if (failed) {
+        return NULL;
+    }
+
+    return incref(result);
+}
+
+PyObject *resetCompiledFunctionProfile(PyObject* nullValue, PyObject* args) {
+    CompiledFunctionProfile::singleton().reset();
 
     return incref(Py_None);
 }
@@ -1618,6 +2286,40 @@ PyObject *touchCompiledSpecializations(PyObject* nullValue, PyObject* args) {
     return incref(Py_None);
 }
 
+PyObject *dispatchCacheStats(PyObject* nullValue, PyObject* args) {
+    if (PyTuple_Size(args) != 2) {
+        PyErr_SetString(PyExc_TypeError, "dispatchCacheStats takes 2 positional arguments");
+        return NULL;
+    }
+    PyObjectHolder a1(PyTuple_GetItem(args, 0));
+    PyObjectHolder a2(PyTuple_GetItem(args, 1));
+
+    Type* t1 = PyInstance::unwrapTypeArgToTypePtr(a1);
+
+    if (!t1 || t1->getTypeCategory() != Type::TypeCategory::catFunction) {
+        PyErr_SetString(PyExc_TypeError, "first argument to 'dispatchCacheStats' must be a Function");
+        return NULL;
+    }
+
+    if (!PyLong_Check(a2)) {
+        PyErr_SetString(PyExc_TypeError, "second argument to 'dispatchCacheStats' must be an integer 'index'");
+        return NULL;
+    }
+
+    Function* f = (Function*)t1;
+
+    int index = PyLong_AsLong(a2);
+
+    if (index < 0 || index >= f->getOverloads().size()) {
+        PyErr_SetString(PyExc_TypeError, "index is out of bounds");
+        return NULL;
+    }
+
+    const Function::Overload& overload = f->getOverloads()[index];
+
+    return Py_BuildValue("(nL)", (Py_ssize_t)overload.dispatchCacheSize(), (long long)overload.dispatchCacheHits());
+}
+
 PyObject *isBinaryCompatible(PyObject* nullValue, PyObject* args) {
     if (PyTuple_Size(args) != 2) {
         PyErr_SetString(PyExc_TypeError, "isBinaryCompatible takes 2 positional arguments");
@@ -1735,11 +2437,15 @@ static PyMethodDef module_methods[] = {
     {"TypeFor", (PyCFunction)MakeTypeFor, METH_VARARGS, NULL},
     {"serialize", (PyCFunction)serialize, METH_VARARGS, NULL},
     {"deserialize", (PyCFunction)deserialize, METH_VARARGS, NULL},
+    {"deserializeFromFile", (PyCFunction)deserializeFromFile, METH_VARARGS, NULL},
+    {"serializeInto", (PyCFunction)serializeInto, METH_VARARGS, NULL},
     {"decodeSerializedObject", (PyCFunction)decodeSerializedObject, METH_VARARGS, NULL},
     {"validateSerializedObject", (PyCFunction)validateSerializedObject, METH_VARARGS, NULL},
     {"validateSerializedObjectStream", (PyCFunction)validateSerializedObjectStream, METH_VARARGS, NULL},
     {"serializeStream", (PyCFunction)serializeStream, METH_VARARGS, NULL},
     {"deserializeStream", (PyCFunction)deserializeStream, METH_VARARGS, NULL},
+    {"serializeChunkedStream", (PyCFunction)serializeChunkedStream, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"deserializeChunkedStream", (PyCFunction)deserializeChunkedStream, METH_VARARGS | METH_KEYWORDS, NULL},
     {"is_default_constructible", (PyCFunction)is_default_constructible, METH_VARARGS, NULL},
     {"isSimple", (PyCFunction)isSimple, METH_VARARGS, NULL},
     {"canConstructFrom", (PyCFunction)canConstructFrom, METH_VARARGS, NULL},
@@ -1749,7 +2455,12 @@ static PyMethodDef module_methods[] = {
     {"wantsToDefaultConstruct", (PyCFunction)wantsToDefaultConstruct, METH_VARARGS, NULL},
     {"all_alternatives_empty", (PyCFunction)all_alternatives_empty, METH_VARARGS, NULL},
     {"installNativeFunctionPointer", (PyCFunction)installNativeFunctionPointer, METH_VARARGS, NULL},
+    {"replaceNativeFunctionPointer", (PyCFunction)replaceNativeFunctionPointer, METH_VARARGS, NULL},
+    {"compiledFunctionProfileCounter", (PyCFunction)compiledFunctionProfileCounter, METH_VARARGS, NULL},
+    {"compiledFunctionProfile", (PyCFunction)compiledFunctionProfile, METH_VARARGS, NULL},
+    {"resetCompiledFunctionProfile", (PyCFunction)resetCompiledFunctionProfile, METH_VARARGS, NULL},
     {"touchCompiledSpecializations", (PyCFunction)touchCompiledSpecializations, METH_VARARGS, NULL},
+    {"dispatchCacheStats", (PyCFunction)dispatchCacheStats, METH_VARARGS, NULL},
     {"disableNativeDispatch", (PyCFunction)disableNativeDispatch, METH_VARARGS, NULL},
     {"enableNativeDispatch", (PyCFunction)enableNativeDispatch, METH_VARARGS, NULL},
     {"isDispatchEnabled", (PyCFunction)isDispatchEnabled, METH_VARARGS, NULL},
@@ -1830,6 +2541,7 @@ PyInit__types(void)
     PyModule_AddObject(module, "BoundMethod", (PyObject*)incref(PyInstance::typeCategoryBaseType(Type::TypeCategory::catBoundMethod)));
     PyModule_AddObject(module, "EmbeddedMessage", (PyObject*)incref(PyInstance::typeCategoryBaseType(Type::TypeCategory::catEmbeddedMessage)));
     PyModule_AddObject(module, "PythonObjectOfType", (PyObject*)incref(PyInstance::typeCategoryBaseType(Type::TypeCategory::catPythonObjectOfType)));
+    PyModule_AddObject(module, "ListOfView", (PyObject*)incref(PyListOfView::typeObj()));
 
 
     if (module == NULL)
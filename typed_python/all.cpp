@@ -40,6 +40,7 @@ compile the entire group all at once.
 #include "PyBoundMethodInstance.cpp"
 #include "PyGilState.cpp"
 #include "PySetInstance.cpp"
+#include "PyListOfView.cpp"
 
 #include "SetType.cpp"
 #include "AlternativeType.cpp"
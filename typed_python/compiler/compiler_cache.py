@@ -0,0 +1,528 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import fcntl
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+import typed_python
+import typed_python.ast_util as ast_util
+from typed_python import _types
+from typed_python.hash import sha_hash
+from typed_python.SerializationContext import SerializationContext
+from typed_python.compiler.llvm_compiler import BinarySharedObject
+
+# by default, we hold at most this many bytes of shared objects on disk.
+DEFAULT_MAX_CACHE_SIZE = 1024 ** 3
+
+# temporary directories older than this (in seconds) belong to a process that died
+# while writing an entry, and get cleaned up during eviction.
+STALE_TEMP_DIR_AGE = 3600
+
+_MODULE_FILENAME = "module.so"
+_META_FILENAME = "meta.dat"
+_LOCK_FILENAME = ".lock"
+_TEMP_PREFIX = ".tmp."
+
+
+class NotCacheable(Exception):
+    """Raised when we can't produce a stable fingerprint for something a compiled function depends on."""
+
+
+def _sourceHash(pyFunc):
+    try:
+        return sha_hash(ast_util.getSourceText(pyFunc)).hexdigest
+    except ast_util.CantGetSourceTextError:
+        raise NotCacheable(f"Can't get the source text of {pyFunc}")
+
+
+def _codeNames(code):
+    names = set(code.co_names)
+
+    # there are 'code' objects for embedded list comprehensions and lambdas.
+    for c in code.co_consts:
+        if isinstance(c, types.CodeType):
+            names.update(_codeNames(c))
+
+    return names
+
+
+def _fingerprint(value, names=frozenset()):
+    """Return a hex digest that changes whenever compiled code depending on 'value' would change.
+
+    Functions are fingerprinted by their source text only. The functions they call
+    are checked separately, using the dependency list stored alongside each entry.
+
+    Args:
+        value - the object compiled code refers to.
+        names - every name the referring code uses (see '_codeNames'). Modules are
+            fingerprinted by the values of those of their attributes.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return sha_hash((type(value).__name__, value)).hexdigest
+
+    if isinstance(value, types.FunctionType):
+        return sha_hash(("function", value.__module__, value.__qualname__, _sourceHash(value))).hexdigest
+
+    if isinstance(value, _types.Function):
+        value = type(value)
+
+    if isinstance(value, types.ModuleType):
+        return _moduleFingerprint(value, names, frozenset())
+
+    if isinstance(value, type):
+        if issubclass(value, _types.Function):
+            return sha_hash(("Function",) + tuple(_fingerprint(o.functionObj) for o in value.overloads)).hexdigest
+
+        if getattr(value, '__typed_python_category__', None) is not None:
+            try:
+                return sha_hash(("Type", _serializationContext.serialize(value))).hexdigest
+            except Exception:
+                raise NotCacheable(f"Can't serialize type {value}")
+
+        return sha_hash(("type", value.__module__, value.__qualname__)).hexdigest
+
+    raise NotCacheable(f"Can't fingerprint {type(value)}")
+
+
+def _moduleFingerprint(module, names, seen):
+    """Fingerprint 'module' by the values of its attributes in 'names'.
+
+    Compiled code bakes in what it reads out of a module, like 'config.THRESHOLD', so
+    the fingerprint has to change whenever one of those values does. 'names' holds
+    every global and attribute name the compiled code uses, so it covers every
+    attribute it could read. 'seen' holds the names of the modules we're already
+    fingerprinting, in case modules refer to each other.
+    """
+    seen = seen | {module.__name__}
+    attributes = []
+
+    for name in sorted(names):
+        if name not in module.__dict__:
+            continue
+
+        attr = module.__dict__[name]
+
+        if isinstance(attr, types.ModuleType):
+            if attr.__name__ in seen:
+                attributes.append((name, attr.__name__))
+            else:
+                attributes.append((name, _moduleFingerprint(attr, names, seen)))
+        elif isinstance(attr, types.BuiltinFunctionType):
+            attributes.append((name, getattr(attr, "__module__", None), attr.__qualname__))
+        else:
+            attributes.append((name, _fingerprint(attr, names)))
+
+    return sha_hash(("module", module.__name__, tuple(attributes))).hexdigest
+
+
+def _resolveQualname(moduleName, qualname):
+    """Find the object named 'qualname' in module 'moduleName', or return None."""
+    if "<locals>" in qualname:
+        return None
+
+    obj = sys.modules.get(moduleName)
+
+    for part in qualname.split("."):
+        if obj is None:
+            return None
+        obj = getattr(obj, part, None)
+
+    return obj
+
+
+def _pythonFunctionsIn(obj):
+    if isinstance(obj, (staticmethod, classmethod)):
+        obj = obj.__func__
+
+    if isinstance(obj, _types.Function):
+        obj = type(obj)
+
+    if isinstance(obj, type) and issubclass(obj, _types.Function):
+        return [o.functionObj for o in obj.overloads]
+
+    if isinstance(obj, types.FunctionType):
+        return [obj]
+
+    return []
+
+
+def _freeVariablesFingerprint(pyFunc):
+    """Fingerprint the globals and closure variables 'pyFunc' reads.
+
+    Compiled code bakes these in as constants, so the fingerprint has to change
+    whenever one of them does.
+
+    Raises:
+        NotCacheable if one of them can't be fingerprinted, or if a closure cell
+        hasn't been assigned yet (e.g. a recursive local function).
+    """
+    freevars = {}
+
+    globalNames = _codeNames(pyFunc.__code__)
+
+    for name in sorted(globalNames):
+        if name in pyFunc.__globals__:
+            freevars[name] = _fingerprint(pyFunc.__globals__[name], globalNames)
+
+    if pyFunc.__closure__:
+        for i, name in enumerate(pyFunc.__code__.co_freevars):
+            try:
+                contents = pyFunc.__closure__[i].cell_contents
+            except ValueError:
+                raise NotCacheable(f"Closure variable {name} of {pyFunc} isn't assigned")
+
+            freevars[name] = _fingerprint(contents, globalNames)
+
+    return sha_hash(tuple(sorted(freevars.items()))).hexdigest
+
+
+def _dependencyRecords(dependencies):
+    """Describe the python functions compiled into an entry, so we can check them when we load it.
+
+    Each record holds the function's source hash and the fingerprint of the globals
+    and closure it reads, so that changing a module constant a callee reads
+    invalidates the entry just like changing one the root function reads.
+    """
+    return tuple(sorted(set(
+        (f.__module__, f.__qualname__, _sourceHash(f), _freeVariablesFingerprint(f))
+        for f in dependencies
+    )))
+
+
+def _dependenciesAreCurrent(dependencies):
+    """Do the functions described by '_dependencyRecords' still have the same source and free variables?"""
+    for moduleName, qualname, sourceHash, freevarsHash in dependencies:
+        if "<locals>" in qualname:
+            # local functions are covered by the source and globals of the function
+            # they're defined in, which are part of the key.
+            continue
+
+        candidates = _pythonFunctionsIn(_resolveQualname(moduleName, qualname))
+
+        try:
+            if not any(
+                _sourceHash(f) == sourceHash and _freeVariablesFingerprint(f) == freevarsHash
+                for f in candidates
+            ):
+                return False
+        except NotCacheable:
+            return False
+
+    return True
+
+
+_serializationContext = SerializationContext({})
+
+
+class CompilerCache:
+    """A directory of compiled native code that can be shared by many processes.
+
+    Each entry is a subdirectory named by the hex key of one compiled specialization,
+    holding a self-contained shared object and a small metadata file. The key covers
+    the function's source, its closure and referenced globals (including the module
+    attributes it reads), the input wrapper types, the return type annotation, and
+    the typed_python and python versions.
+
+    Entries are written to a temporary directory and renamed into place, so readers
+    either see a complete entry or nothing at all. Each hit touches the entry's
+    directory, and 'evictIfNeeded' drops least-recently-used entries (under an
+    exclusive file lock) until the cache fits in 'maxSizeBytes'.
+    """
+    def __init__(self, cacheDir, maxSizeBytes=DEFAULT_MAX_CACHE_SIZE):
+        self.cacheDir = os.path.abspath(cacheDir)
+        self.maxSizeBytes = maxSizeBytes
+
+        os.makedirs(self.cacheDir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def keyFor(pyFunc, inputWrappers, returnType):
+        """Return the hex cache key for compiling 'pyFunc' with 'inputWrappers', or None.
+
+        Returns None if the function depends on something we can't fingerprint, in
+        which case it's simply compiled every time.
+        """
+        try:
+            return sha_hash((
+                typed_python.__version__,
+                sys.version,
+                platform.machine(),
+                _fingerprint(pyFunc),
+                _freeVariablesFingerprint(pyFunc),
+                tuple((type(w).__name__, _fingerprint(w.typeRepresentation)) for w in inputWrappers),
+                _fingerprint(returnType)
+            )).hexdigest
+        except NotCacheable:
+            return None
+
+    def _entryDir(self, key):
+        return os.path.join(self.cacheDir, key)
+
+    def load(self, key):
+        """Load the entry for 'key' if we have a valid one.
+
+        Returns:
+            None on a miss, or a pair (functionPointer, outputType) where outputType
+            is None if the function never returns.
+        """
+        entryDir = self._entryDir(key)
+
+        if not os.path.isdir(entryDir):
+            self.misses += 1
+            return None
+
+        try:
+            with open(os.path.join(entryDir, _META_FILENAME), "rb") as f:
+                meta = _serializationContext.deserialize(f.read())
+
+            if not _dependenciesAreCurrent(meta['dependencies']):
+                self.invalidate(key)
+                self.misses += 1
+                return None
+
+            fp = BinarySharedObject.functionPointersFromPath(
+                os.path.join(entryDir, _MODULE_FILENAME),
+                [meta['symbol']]
+            )[meta['symbol']]
+
+            # mark the entry as recently used.
+            os.utime(entryDir)
+        except Exception:
+            # the entry got evicted out from under us, or is truncated, malformed, or
+            # written by an incompatible version. Any of these is just a miss.
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return fp, meta['outputType']
+
+    def store(self, key, sharedObject, symbol, outputType, dependencies):
+        """Write a new entry to the cache.
+
+        Args:
+            key - the key produced by 'keyFor'
+            sharedObject - a self-contained BinarySharedObject
+            symbol - the name of the dispatch function in 'sharedObject' that we
+                install as the native pointer.
+            outputType - the interpreter type the function returns, or None if it never returns.
+            dependencies - a list of python functions whose code is compiled into the
+                shared object.
+
+        Returns:
+            True if we wrote the entry, False if it can't be cached.
+        """
+        try:
+            meta = dict(
+                symbol=symbol,
+                outputType=outputType,
+                dependencies=_dependencyRecords(dependencies)
+            )
+
+            metaBytes = _serializationContext.serialize(meta)
+        except NotCacheable:
+            return False
+        except Exception:
+            # the output type isn't something we can serialize without names.
+            return False
+
+        tempDir = tempfile.mkdtemp(prefix=_TEMP_PREFIX, dir=self.cacheDir)
+
+        try:
+            with open(os.path.join(tempDir, _MODULE_FILENAME), "wb") as f:
+                f.write(sharedObject.binaryForm)
+
+            with open(os.path.join(tempDir, _META_FILENAME), "wb") as f:
+                f.write(metaBytes)
+
+            try:
+                os.rename(tempDir, self._entryDir(key))
+            except OSError:
+                # another process wrote the same entry first.
+                shutil.rmtree(tempDir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tempDir, ignore_errors=True)
+            raise
+
+        self.evictIfNeeded()
+
+        return True
+
+    def invalidate(self, key):
+        """Remove the entry for 'key' if it exists."""
+        self._removeEntryDir(self._entryDir(key))
+
+    def clear(self):
+        """Remove every entry in the cache."""
+        with self._exclusiveLock():
+            for name in os.listdir(self.cacheDir):
+                if name != _LOCK_FILENAME:
+                    self._removeEntryDir(os.path.join(self.cacheDir, name))
+
+    def _removeEntryDir(self, entryDir):
+        # rename first, so that concurrent readers never see a partially deleted entry.
+        tempDir = tempfile.mkdtemp(prefix=_TEMP_PREFIX, dir=self.cacheDir)
+
+        try:
+            os.rename(entryDir, os.path.join(tempDir, "entry"))
+        except OSError:
+            shutil.rmtree(tempDir, ignore_errors=True)
+            return
+
+        shutil.rmtree(tempDir, ignore_errors=True)
+
+    def _entries(self):
+        """Return a list of (lastUsedTimestamp, sizeInBytes, entryDir) for every entry."""
+        res = []
+
+        for name in os.listdir(self.cacheDir):
+            if name.startswith("."):
+                continue
+
+            entryDir = os.path.join(self.cacheDir, name)
+
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entryDir, f)) for f in os.listdir(entryDir)
+                )
+                res.append((os.path.getmtime(entryDir), size, entryDir))
+            except OSError:
+                pass
+
+        return res
+
+    def sizeInBytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evictIfNeeded(self):
+        """Drop least-recently-used entries until the cache fits in 'maxSizeBytes'."""
+        with self._exclusiveLock():
+            self._removeStaleTempDirs()
+
+            entries = sorted(self._entries())
+            totalSize = sum(size for _, size, _ in entries)
+
+            for _, size, entryDir in entries:
+                if totalSize <= self.maxSizeBytes:
+                    return
+
+                self._removeEntryDir(entryDir)
+                totalSize -= size
+
+    def _removeStaleTempDirs(self):
+        for name in os.listdir(self.cacheDir):
+            if name.startswith(_TEMP_PREFIX):
+                path = os.path.join(self.cacheDir, name)
+                try:
+                    if time.time() - os.path.getmtime(path) > STALE_TEMP_DIR_AGE:
+                        shutil.rmtree(path, ignore_errors=True)
+                except OSError:
+                    pass
+
+    def _exclusiveLock(self):
+        cache = self
+
+        class Locker:
+            def __enter__(self):
+                self.fd = os.open(os.path.join(cache.cacheDir, _LOCK_FILENAME), os.O_RDWR | os.O_CREAT)
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+            def __exit__(self, *args):
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+                os.close(self.fd)
+
+        return Locker()
+
+
+class PrecompiledModule:
+    """A single shared object holding many compiled entrypoints, written by Runtime.precompile.
+
+    'path' is the shared object itself, and 'path' + ".meta" maps the cache key (see
+    CompilerCache.keyFor) of each specialization it holds to the symbol we install
+    for it. We only dlopen the shared object the first time one of its entries is used.
+    """
+    def __init__(self, path, entries):
+        """Initialize a PrecompiledModule.
+
+        Args:
+            path - the path of the shared object.
+            entries - a dict from cache key to a dict with 'symbol', 'outputType'
+                and 'dependencies' (from '_dependencyRecords').
+        """
+        self.path = os.path.abspath(path)
+        self.entries = entries
+        self._functionPointers = None
+
+    @staticmethod
+    def write(path, sharedObject, entries):
+        """Write 'sharedObject' to 'path' and its entries to 'path' + ".meta".
+
+        Args:
+            path - the path to write the shared object to.
+            sharedObject - a self-contained BinarySharedObject.
+            entries - a list of (key, symbol, outputType, dependencies) where 'dependencies'
+                is a list of the python functions compiled into 'symbol'.
+
+        Returns:
+            the PrecompiledModule. Entries we can't describe in a way another process
+            can check (see CompilerCache.store) are left out of it.
+        """
+        meta = {}
+
+        for key, symbol, outputType, dependencies in entries:
+            try:
+                entry = dict(symbol=symbol, outputType=outputType, dependencies=_dependencyRecords(dependencies))
+                _serializationContext.serialize(entry)
+            except Exception:
+                continue
+
+            meta[key] = entry
+
+        metaBytes = _serializationContext.serialize(meta)
+
+        with open(path, "wb") as f:
+            f.write(sharedObject.binaryForm)
+
+        with open(path + ".meta", "wb") as f:
+            f.write(metaBytes)
+
+        return PrecompiledModule(path, meta)
+
+    @staticmethod
+    def read(path):
+        with open(path + ".meta", "rb") as f:
+            return PrecompiledModule(path, _serializationContext.deserialize(f.read()))
+
+    def load(self, key):
+        """Return (functionPointer, outputType) for 'key', or None if we don't have a current entry."""
+        entry = self.entries.get(key)
+
+        if entry is None or not _dependenciesAreCurrent(entry['dependencies']):
+            return None
+
+        if self._functionPointers is None:
+            self._functionPointers = BinarySharedObject.functionPointersFromPath(
+                self.path,
+                [e['symbol'] for e in self.entries.values()]
+            )
+
+        return self._functionPointers[entry['symbol']], entry['outputType']
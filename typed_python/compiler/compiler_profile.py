@@ -0,0 +1,165 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+
+# the phases of compilation we time, in the order they happen
+PHASES = ["typeInference", "lowering", "parse", "optimize", "emit", "finalize"]
+
+# phases that LLVM runs on a whole module at once
+_MODULE_PHASES = ["parse", "optimize", "emit", "finalize"]
+
+
+class CompilerProfile:
+    """Accumulates where the compiler spends its time.
+
+    The runtime hands one of these to the python-to-native converter, the native
+    ast lowering, and the llvm compiler (see Runtime.enableCompilerProfile). Each
+    records the time it spends on each function or module. LLVM works on whole
+    modules, so we charge each function in a module a share of the module's
+    LLVM time proportional to its instruction count.
+
+    All methods are threadsafe, since modules can be optimized on worker threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._phaseSeconds = {phase: 0.0 for phase in PHASES}
+            self._phaseCounts = {phase: 0 for phase in PHASES}
+            self._functions = {}
+            self._modules = []
+
+    def _function(self, name):
+        if name not in self._functions:
+            self._functions[name] = {
+                'name': name,
+                'typeInferencePasses': 0,
+                'typeInferenceSeconds': 0.0,
+                'loweringSeconds': 0.0,
+                'instructionCount': 0,
+                'llvmSeconds': 0.0,
+            }
+
+        return self._functions[name]
+
+    def _addPhase(self, phase, seconds):
+        self._phaseSeconds[phase] += seconds
+        self._phaseCounts[phase] += 1
+
+    def addTypeInferencePass(self, name, seconds):
+        """Record one pass of type inference over the function 'name'."""
+        with self._lock:
+            self._addPhase("typeInference", seconds)
+
+            function = self._function(name)
+            function['typeInferencePasses'] += 1
+            function['typeInferenceSeconds'] += seconds
+
+    def addLowering(self, name, seconds, instructionCount):
+        """Record lowering the native definition of 'name' to 'instructionCount' llvm instructions."""
+        with self._lock:
+            self._addPhase("lowering", seconds)
+
+            function = self._function(name)
+            function['loweringSeconds'] += seconds
+            function['instructionCount'] = instructionCount
+
+    def addModulePhase(self, functionNames, phase, seconds):
+        """Record that LLVM spent 'seconds' on 'phase' for the module holding 'functionNames'."""
+        with self._lock:
+            self._addPhase(phase, seconds)
+
+            self._modules.append((tuple(functionNames), phase, seconds))
+
+    def report(self):
+        """Return a structured summary of everything we've recorded.
+
+        Returns:
+            a dict with
+                'phases': a dict from phase name to {'seconds': float, 'count': int}
+                'functions': a list of dicts, one per function, with the keys 'name',
+                    'typeInferencePasses', 'typeInferenceSeconds', 'loweringSeconds',
+                    'instructionCount', 'llvmSeconds', and 'totalSeconds', ordered by
+                    'totalSeconds', most expensive first.
+                'modules': a list of dicts with keys 'functionCount' and one
+                    key for each phase LLVM ran on the module.
+        """
+        with self._lock:
+            functions = {name: dict(function) for name, function in self._functions.items()}
+            modules = {}
+
+            for functionNames, phase, seconds in self._modules:
+                module = modules.setdefault(functionNames, {'functionCount': len(functionNames)})
+                module[phase] = module.get(phase, 0.0) + seconds
+
+                totalInstructions = sum(
+                    self._functions[name]['instructionCount'] for name in functionNames if name in self._functions
+                )
+
+                for name in functionNames:
+                    function = functions.get(name)
+
+                    if function is not None:
+                        if totalInstructions:
+                            function['llvmSeconds'] += seconds * function['instructionCount'] / totalInstructions
+                        else:
+                            function['llvmSeconds'] += seconds / len(functionNames)
+
+            for function in functions.values():
+                function['totalSeconds'] = (
+                    function['typeInferenceSeconds'] + function['loweringSeconds'] + function['llvmSeconds']
+                )
+
+            return {
+                'phases': {
+                    phase: {'seconds': self._phaseSeconds[phase], 'count': self._phaseCounts[phase]}
+                    for phase in PHASES
+                },
+                'functions': sorted(functions.values(), key=lambda f: f['totalSeconds'], reverse=True),
+                'modules': list(modules.values())
+            }
+
+    def formatReport(self, topN=20):
+        """Return the report as text, listing the 'topN' most expensive functions."""
+        report = self.report()
+
+        lines = ["typed_python compiler profile", "", "phase            seconds    count"]
+
+        for phase in PHASES:
+            lines.append(
+                "%-14s %9.3f %8d" % (phase, report['phases'][phase]['seconds'], report['phases'][phase]['count'])
+            )
+
+        lines.append("")
+        lines.append(
+            "%9s %9s %6s %9s %9s %7s  %s" % ("total", "typeInf", "passes", "lowering", "llvm", "instrs", "function")
+        )
+
+        for function in report['functions'][:topN]:
+            lines.append(
+                "%9.3f %9.3f %6d %9.3f %9.3f %7d  %s" % (
+                    function['totalSeconds'],
+                    function['typeInferenceSeconds'],
+                    function['typeInferencePasses'],
+                    function['loweringSeconds'],
+                    function['llvmSeconds'],
+                    function['instructionCount'],
+                    function['name']
+                )
+            )
+
+        return "\n".join(lines)
@@ -14,11 +14,14 @@
 
 import typed_python.compiler
 import typed_python.compiler.native_ast as native_ast
+import typed_python.python_ast as python_ast
 import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
+import inspect
 import types
 
 from typed_python.internals import makeFunction, FunctionOverload
 from typed_python.compiler.function_stack_state import FunctionStackState
+from typed_python.compiler.python_ast_analysis import finallyBlocksLeave
 from typed_python.compiler.type_wrappers.one_of_wrapper import OneOfWrapper
 from typed_python.compiler.python_object_representation import pythonObjectRepresentation
 from typed_python.compiler.python_object_representation import pythonObjectRepresentationType
@@ -28,6 +31,9 @@ from typed_python import NoneType, Alternative, OneOf, Int32, ListOf, String, Tu
 from typed_python._types import getTypePointer
 from typed_python.compiler.type_wrappers.named_tuple_masquerading_as_dict_wrapper import NamedTupleMasqueradingAsDict
 from typed_python.compiler.type_wrappers.typed_tuple_masquerading_as_tuple_wrapper import TypedTupleMasqueradingAsTuple
+from typed_python.compiler.type_wrappers.generator_expression_wrapper import GeneratorExpressionWrapper
+from typed_python.compiler.type_wrappers.generator_function_wrapper import GeneratorFunctionWrapper
+from typed_python.compiler.type_wrappers.comprehensions import convertComprehension
 
 builtinValueIdToNameAndValue = {id(v): (k, v) for k, v in __builtins__.items()}
 
@@ -43,6 +49,24 @@ ExpressionIntermediate = Alternative(
 
 _memoizedThingsById = {}
 _pyFuncToFuncCache = {}
+_pyFuncNeedsInterpreterCache = {}
+
+
+def functionNeedsInterpreter(f):
+    """Does the python function 'f' use control flow we can't compile yet?
+
+    Calls to such functions from compiled code go through the interpreter instead.
+    """
+    if f not in _pyFuncNeedsInterpreterCache:
+        try:
+            pyast = python_ast.convertFunctionToAlgebraicPyAst(f)
+        except Exception:
+            # leave it to the converter to report functions we can't find the source of
+            _pyFuncNeedsInterpreterCache[f] = False
+        else:
+            _pyFuncNeedsInterpreterCache[f] = bool(pyast.matches.FunctionDef and finallyBlocksLeave(pyast.body))
+
+    return _pyFuncNeedsInterpreterCache[f]
 
 
 FunctionArgMapping = Alternative(
@@ -68,6 +92,10 @@ class ExpressionConversionContext(object):
         self.teardowns = []
         self.variableStates = variableStates
 
+        # names bound by the comprehension whose body we're converting, if any.
+        # These shadow the function's own variables.
+        self.boundNames = None
+
     @property
     def converter(self):
         return self.functionContext.converter
@@ -100,6 +128,8 @@ class ExpressionConversionContext(object):
         # this guarantees the object stays alive as long as this module
         _memoizedThingsById[id(x)] = x
 
+        self.markUnrelocatable()
+
         return self.push(
             object,
             lambda oExpr:
@@ -948,6 +978,17 @@ class ExpressionConversionContext(object):
         if not isinstance(f, types.FunctionType):
             raise Exception(f"Can't convert a py function of type {type(f)}")
 
+        if f.__code__.co_flags & inspect.CO_GENERATOR:
+            try:
+                return GeneratorFunctionWrapper.convertGeneratorCall(self, f, args, kwargs)
+            except NotImplementedError:
+                # let the interpreter run generators we can't compile. The generator
+                # it returns can be iterated like any other 'object'.
+                return self.constantPyObject(f).convert_call(args, kwargs)
+
+        if functionNeedsInterpreter(f):
+            return self.constantPyObject(f).convert_call(args, kwargs)
+
         if f not in _pyFuncToFuncCache:
             _pyFuncToFuncCache[f] = makeFunction(f.__name__, f)
         typedFunc = _pyFuncToFuncCache[f]
@@ -1090,7 +1131,29 @@ class ExpressionConversionContext(object):
                 return expr.changeType(varType)
         return expr
 
+    def scopedNames(self, names):
+        """Resolve the names in 'names' (a dict from name to TypedExpression) ahead of any others.
+
+        We use this to convert the body of a comprehension, whose variables
+        live in the comprehension rather than in our function's stack frame.
+        Scopes nest, so the body of an inner comprehension can see the
+        variables of the outer one.
+        """
+        class Scope:
+            def __enter__(scope):
+                scope.boundNames = self.boundNames
+                self.boundNames = dict(self.boundNames or {})
+                self.boundNames.update(names)
+
+            def __exit__(scope, *args):
+                self.boundNames = scope.boundNames
+
+        return Scope()
+
     def namedVariableLookup(self, name):
+        if self.boundNames is not None and name in self.boundNames:
+            return self.boundNames[name]
+
         if self.functionContext.isLocalVariable(name):
             if self.functionContext.externalScopeVarExpr(self, name) is not None:
                 res = self.functionContext.externalScopeVarExpr(self, name)
@@ -1121,6 +1184,27 @@ class ExpressionConversionContext(object):
         self.pushException(NameError, "name '%s' is not defined" % name)
         return None
 
+    def convert_slice_bounds(self, sliceAst):
+        """Convert the 'lower', 'upper' and 'step' of a python_ast.Slice node.
+
+        Returns:
+            None if one of the bounds doesn't return control flow to the caller,
+            or a tuple (lower, upper, step) of TypedExpressions, where bounds that
+            were left out of the slice are None.
+        """
+        bounds = []
+
+        for boundAst in (sliceAst.lower, sliceAst.upper, sliceAst.step):
+            if boundAst is None:
+                bounds.append(None)
+            else:
+                bound = self.convert_expression_ast(boundAst)
+                if bound is None:
+                    return None
+                bounds.append(bound)
+
+        return tuple(bounds)
+
     def convert_expression_ast(self, ast):
         """Convert a python_ast.Expression node to a TypedExpression.
 
@@ -1276,28 +1360,11 @@ class ExpressionConversionContext(object):
 
                 return val.convert_getitem(index)
             elif ast.slice.matches.Slice:
-                if ast.slice.lower is None:
-                    lower = None
-                else:
-                    lower = self.convert_expression_ast(ast.slice.lower)
-                    if lower is None:
-                        return lower
-
-                if ast.slice.upper is None:
-                    upper = None
-                else:
-                    upper = self.convert_expression_ast(ast.slice.upper)
-                    if upper is None:
-                        return upper
-
-                if ast.slice.step is None:
-                    step = None
-                else:
-                    step = self.convert_expression_ast(ast.slice.step)
-                    if step is None:
-                        return step
+                bounds = self.convert_slice_bounds(ast.slice)
+                if bounds is None:
+                    return None
 
-                return val.convert_getslice(lower, upper, step)
+                return val.convert_getslice(*bounds)
             else:
                 assert False, type(ast.slice)
 
@@ -1513,7 +1580,13 @@ class ExpressionConversionContext(object):
 
             return aList
 
-        raise ConversionException("can't handle python expression type %s" % ast.Name)
+        if ast.matches.GeneratorExp:
+            return GeneratorExpressionWrapper.convertGeneratorExpression(self, ast)
+
+        if ast.matches.ListComp or ast.matches.SetComp or ast.matches.DictComp:
+            return convertComprehension(self, ast)
+
+        raise ConversionException("can't handle python expression type %s" % python_ast.alternativeName(ast))
 
     def getTypePointer(self, t):
         """Return a raw type pointer for type t
@@ -1521,4 +1594,14 @@ class ExpressionConversionContext(object):
         Args:
             t - python representation of Type, e.g. int, UInt64, ListOf(String), ...
         """
+        self.markUnrelocatable()
+
         return getTypePointer(t)
+
+    def markUnrelocatable(self):
+        """Note that we're embedding a process-specific pointer in the generated code.
+
+        Code containing such constants can't be written to the compiler cache and
+        loaded into a different process.
+        """
+        self.converter.markCurrentFunctionUnrelocatable()
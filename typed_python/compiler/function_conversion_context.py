@@ -17,18 +17,21 @@ import typed_python.python_ast as python_ast
 from typed_python.compiler.python_ast_analysis import (
     computeAssignedVariables,
     computeReadVariables,
-    computeFunctionArgVariables
+    computeFunctionArgVariables,
+    statementsLeaveBlock
 )
 
 import typed_python.compiler
 import typed_python.compiler.native_ast as native_ast
+import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
 from typed_python.compiler.expression_conversion_context import ExpressionConversionContext
 from typed_python.compiler.function_stack_state import FunctionStackState
 from typed_python.compiler.type_wrappers.none_wrapper import NoneWrapper
+from typed_python.compiler.type_wrappers.python_free_object_wrapper import PythonFreeObjectWrapper
 from typed_python.compiler.type_wrappers.python_type_object_wrapper import PythonTypeObjectWrapper
 from typed_python.compiler.typed_expression import TypedExpression
 from typed_python.compiler.conversion_exception import ConversionException
-from typed_python import OneOf
+from typed_python import OneOf, _types
 
 typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
 
@@ -74,6 +77,10 @@ class FunctionConversionContext(object):
         self._tempStackVarIx = 0
         self._tempIterVarIx = 0
 
+        # the names of the variables holding the exceptions caught by the 'except'
+        # clauses we're currently inside, innermost last. A bare 'raise' re-raises the last one.
+        self._handledExceptionVarnames = []
+
         self._typesAreUnstable = False
         self._functionOutputTypeKnown = False
         self._native_args = None
@@ -147,6 +154,9 @@ class FunctionConversionContext(object):
                 expr=body_native_expr
             )
 
+        if self.converter.profileCompiledFunctions:
+            body_native_expr = self.instrumentForProfiling(body_native_expr)
+
         return_type = self._varname_to_type.get(FunctionOutput, None)
 
         if return_type is None:
@@ -181,6 +191,37 @@ class FunctionConversionContext(object):
                 return_type
             )
 
+    def instrumentForProfiling(self, body_native_expr):
+        """Wrap a function body so it counts its calls and the time they take.
+
+        Each function gets a counter in the native profiler (see
+        Runtime.enableCompiledFunctionProfile), and we embed a pointer to it,
+        so the code can't go in the compiler cache.
+        """
+        self.converter.markCurrentFunctionUnrelocatable()
+
+        counter = native_ast.const_uint64_expr(
+            _types.compiledFunctionProfileCounter(self.converter.identityToName(self.identity))
+        ).cast(native_ast.Void.pointer())
+
+        startTime = self.allocateLetVarname()
+
+        return native_ast.Expression.Let(
+            var=startTime,
+            val=runtime_functions.profile_enter.call(counter),
+            within=native_ast.Expression.Finally(
+                expr=body_native_expr,
+                teardowns=[
+                    native_ast.Teardown.Always(
+                        expr=runtime_functions.profile_exit.call(
+                            counter,
+                            native_ast.Expression.Variable(name=startTime)
+                        )
+                    )
+                ]
+            )
+        )
+
     def _constructInitialVarnameToType(self):
         input_types = self._input_types
 
@@ -408,6 +449,17 @@ class FunctionConversionContext(object):
 
         variableStates.variableAssigned(varname, assignedType)
 
+    @staticmethod
+    def isSupportedLoopTarget(target):
+        """Can a 'for' loop assign to 'target'? We allow names and (nested) tuples of names."""
+        if target.matches.Name:
+            return True
+
+        if target.matches.Tuple:
+            return all(FunctionConversionContext.isSupportedLoopTarget(elt) for elt in target.elts)
+
+        return False
+
     def convert_assignment(self, target, op, val_to_store):
         subcontext = val_to_store.context
 
@@ -431,6 +483,27 @@ class FunctionConversionContext(object):
 
             return True
 
+        if target.matches.Subscript and target.ctx.matches.Store and target.slice.matches.Slice:
+            slicing = subcontext.convert_expression_ast(target.value)
+            if slicing is None:
+                return False
+
+            bounds = subcontext.convert_slice_bounds(target.slice)
+            if bounds is None:
+                return False
+
+            if op is not None:
+                getSlice = slicing.convert_getslice(*bounds)
+                if getSlice is None:
+                    return False
+
+                val_to_store = getSlice.convert_bin_op(op, val_to_store, True)
+                if val_to_store is None:
+                    return False
+
+            slicing.convert_setslice(*bounds, val_to_store)
+            return True
+
         if target.matches.Subscript and target.ctx.matches.Store:
             assert target.slice.matches.Index
 
@@ -740,13 +813,18 @@ class FunctionConversionContext(object):
                     )
 
         if ast.matches.Try:
-            raise NotImplementedError()
+            return self.convert_try(ast, variableStates)
 
         if ast.matches.For:
-            if not ast.target.matches.Name:
-                raise NotImplementedError("Can't handle multi-variable loop expressions")
+            if not self.isSupportedLoopTarget(ast.target):
+                raise NotImplementedError(
+                    "Can't handle loops that assign to %s" % python_ast.alternativeName(ast.target)
+                )
 
-            target_var_name = ast.target.id
+            if ast.target.matches.Name:
+                target_var_name = ast.target.id
+            else:
+                target_var_name = ".target." + str(ast.col_offset)
 
             iterator_setup_context = ExpressionConversionContext(self, variableStates)
 
@@ -760,7 +838,8 @@ class FunctionConversionContext(object):
             # expressions to unroll, so that we can retain typing information.
             if iteration_expressions is not None:
                 for subexpr in iteration_expressions:
-                    self.assignToLocalVariable(target_var_name, subexpr, variableStates)
+                    if not self.convert_assignment(ast.target, None, subexpr):
+                        return iterator_setup_context.finalize(None, exceptionsTakeFrom=ast), False
 
                     thisOne, thisOneReturns = self.convert_statement_list_ast(ast.body, variableStates)
 
@@ -815,7 +894,7 @@ class FunctionConversionContext(object):
 
                     with cond_context.ifelse(is_populated.nonref_expr) as (if_true, if_false):
                         with if_true:
-                            self.assignToLocalVariable(target_var_name, next_ptr, variableStates)
+                            self.convert_assignment(ast.target, None, next_ptr)
 
                     variableStatesTrue = variableStates.clone()
                     variableStatesFalse = variableStates.clone()
@@ -844,7 +923,19 @@ class FunctionConversionContext(object):
 
         if ast.matches.Raise:
             expr_context = ExpressionConversionContext(self, variableStates)
-            toThrow = expr_context.convert_expression_ast(ast.exc)
+
+            if ast.exc is None:
+                # a bare 'raise' re-raises the exception we're handling
+                if not self._handledExceptionVarnames:
+                    expr_context.pushException(RuntimeError, "No active exception to reraise")
+                    return expr_context.finalize(None, exceptionsTakeFrom=ast), False
+
+                toThrow = expr_context.namedVariableLookup(self._handledExceptionVarnames[-1])
+            else:
+                toThrow = expr_context.convert_expression_ast(ast.exc)
+
+            if toThrow is None:
+                return expr_context.finalize(None, exceptionsTakeFrom=ast), False
 
             expr_context.pushExceptionObject(toThrow)
             return expr_context.finalize(None, exceptionsTakeFrom=ast), False
@@ -938,6 +1029,264 @@ class FunctionConversionContext(object):
 
         raise ConversionException("Can't handle python ast Statement.%s" % ast.Name)
 
+    def convert_try(self, ast, variableStates: FunctionStackState):
+        """Convert a python 'try' statement. Returns the same as 'convert_statement_ast'.
+
+        Compiled code signals an exception by setting the python exception and then
+        throwing, so the body becomes a native TryCatch whose handler takes the python
+        exception and tests it against each 'except' clause in turn, re-raising it if
+        none match. 'finally' becomes a teardown, which runs however we leave the
+        statement.
+        """
+        if statementsLeaveBlock(ast.finalbody):
+            raise ConversionException("Can't 'return', 'break', or 'continue' inside a 'finally' block yet.")
+
+        # an 'except' clause can start from anywhere in the body, so any variable
+        # the body assigns may hold any value of its type, or be uninitialized.
+        handlerStates = variableStates.clone()
+
+        for name in computeAssignedVariables(ast.body):
+            if name in self._varname_to_type:
+                handlerStates.variableMaybeAssigned(name, self._varname_to_type[name].typeRepresentation)
+
+        # the 'finally' block can run after any prefix of the try/except/else
+        finallyStates = handlerStates.clone()
+
+        for name in computeAssignedVariables(list(ast.handlers) + [ast.orelse]):
+            if name in self._varname_to_type:
+                finallyStates.variableMaybeAssigned(name, self._varname_to_type[name].typeRepresentation)
+
+        body, bodyReturns = self.convert_statement_list_ast(ast.body, variableStates)
+
+        # states at each point where control flow leaves the try/except/else
+        exitStates = []
+
+        if ast.orelse:
+            # we can't put the 'else' block inside the TryCatch, since the 'except'
+            # clauses don't apply to it. Instead we note whether the body completed.
+            bodyCompleted = native_ast.Expression.StackSlot(
+                name=f".try.{ast.line_number}.{ast.col_offset}.completed",
+                type=native_ast.Bool
+            )
+
+            if bodyReturns:
+                orelse, orelseReturns = self.convert_statement_list_ast(ast.orelse, variableStates)
+
+                body = body >> bodyCompleted.store(native_ast.trueExpr)
+
+                if orelseReturns:
+                    exitStates.append(variableStates)
+            else:
+                orelse = native_ast.nullExpr
+        elif bodyReturns:
+            exitStates.append(variableStates)
+
+        if ast.handlers:
+            handler, handlerReturnStates = self.convert_exception_handlers(ast, handlerStates)
+
+            exitStates.extend(handlerReturnStates)
+
+            body = native_ast.Expression.TryCatch(
+                expr=body,
+                varname=self.allocateLetVarname(),
+                handler=handler
+            )
+
+        if ast.orelse:
+            body = (
+                bodyCompleted.store(native_ast.falseExpr)
+                >> body
+                >> native_ast.Expression.Branch(
+                    cond=bodyCompleted.load(),
+                    true=orelse,
+                    false=native_ast.nullExpr
+                )
+            )
+
+        mergedStates = None
+        for states in exitStates:
+            if mergedStates is None:
+                mergedStates = states.clone()
+            else:
+                mergedStates.mergeWithSelf(states)
+
+        variableStates.becomeMerge(mergedStates, None)
+
+        flowReturns = bool(exitStates)
+
+        if ast.finalbody:
+            finalbody, finalbodyReturns = self.convert_statement_list_ast(ast.finalbody, finallyStates)
+
+            for name in computeAssignedVariables(ast.finalbody):
+                if name in self._varname_to_type:
+                    variableStates.variableMaybeAssigned(name, self._varname_to_type[name].typeRepresentation)
+
+            body = native_ast.Expression.Finally(
+                expr=body,
+                teardowns=[native_ast.Teardown.Always(expr=self.protectPendingException(finalbody))]
+            )
+
+            flowReturns = flowReturns and finalbodyReturns
+
+        return body, flowReturns
+
+    def convert_exception_handlers(self, ast, handlerStates):
+        """Build the handler for the TryCatch implementing the python 'try' statement 'ast'.
+
+        Args:
+            ast - the python_ast.Statement.Try
+            handlerStates - the FunctionStackState on entry to any 'except' clause.
+
+        Returns:
+            a pair (native_ast.Expression, list of FunctionStackState) giving the handler,
+            and the states at the end of each 'except' clause that returns control flow.
+        """
+        # the caught exception goes in a variable of its own, so that we can
+        # still re-raise it after an 'except E as e' clause has been entered.
+        exceptionVarname = f".exception.{ast.line_number}.{ast.col_offset}"
+
+        fetch_context = ExpressionConversionContext(self, handlerStates)
+
+        self.assignToLocalVariable(
+            exceptionVarname,
+            fetch_context.push(
+                object,
+                lambda exceptionSlot:
+                    exceptionSlot.expr.store(
+                        runtime_functions.fetch_exception.call().cast(exceptionSlot.expr_type.getNativeLayoutType())
+                    )
+            ),
+            handlerStates
+        )
+
+        # if no clause matches, we re-raise the exception
+        reraise_context = ExpressionConversionContext(self, handlerStates)
+        reraise_context.pushExceptionObject(reraise_context.namedVariableLookup(exceptionVarname))
+
+        handler = reraise_context.finalize(None)
+        returnStates = []
+
+        for handlerAst in reversed(ast.handlers):
+            clauseStates = handlerStates.clone()
+
+            bind_context = ExpressionConversionContext(self, clauseStates)
+
+            if handlerAst.name is not None:
+                self.assignToLocalVariable(
+                    handlerAst.name,
+                    bind_context.namedVariableLookup(exceptionVarname),
+                    clauseStates
+                )
+
+            self._handledExceptionVarnames.append(exceptionVarname)
+
+            try:
+                clauseBody, clauseReturns = self.convert_statement_list_ast(handlerAst.body, clauseStates)
+            finally:
+                self._handledExceptionVarnames.pop()
+
+            clause = bind_context.finalize(None, exceptionsTakeFrom=handlerAst) >> clauseBody
+
+            if clauseReturns:
+                returnStates.append(clauseStates)
+
+            if handlerAst.type is None:
+                # a bare 'except' catches everything, so any clauses after it are unreachable
+                handler = clause
+            else:
+                cond_context = ExpressionConversionContext(self, handlerStates)
+
+                matches = self.exceptionMatchesExpr(cond_context, exceptionVarname, handlerAst.type)
+
+                if matches is None:
+                    handler = cond_context.finalize(None, exceptionsTakeFrom=handlerAst)
+                else:
+                    handler = native_ast.Expression.Branch(
+                        cond=cond_context.finalize(matches, exceptionsTakeFrom=handlerAst),
+                        true=clause,
+                        false=handler
+                    )
+
+        return fetch_context.finalize(None) >> handler, returnStates
+
+    def exceptionMatchesExpr(self, context, exceptionVarname, typeAst):
+        """Return a native expression for whether the exception in 'exceptionVarname' matches 'typeAst'.
+
+        'typeAst' is the type expression from an 'except' clause: an exception type, a tuple
+        of them, or an expression producing one as an 'object'.
+
+        Returns:
+            a native_ast.Expression producing a Bool, or None if evaluating the type always throws.
+        """
+        if typeAst.matches.Tuple:
+            typeValues = []
+
+            for eltAst in typeAst.elts:
+                eltExpr = context.convert_expression_ast(eltAst)
+
+                if eltExpr is None:
+                    return None
+
+                if not isinstance(eltExpr.expr_type, PythonFreeObjectWrapper):
+                    raise ConversionException(
+                        "Tuples in an 'except' clause must hold exception types we know at compile time"
+                    )
+
+                typeValues.append(eltExpr.expr_type.getCompileTimeConstant())
+
+            typeObject = context.constantPyObject(tuple(typeValues))
+        else:
+            typeExpr = context.convert_expression_ast(typeAst)
+
+            if typeExpr is None:
+                return None
+
+            if isinstance(typeExpr.expr_type, PythonFreeObjectWrapper):
+                typeObject = context.constant(typeExpr.expr_type.getCompileTimeConstant(), allowArbitrary=True)
+
+                if typeObject.expr_type.typeRepresentation is not object:
+                    typeObject = context.constantPyObject(typeExpr.expr_type.getCompileTimeConstant())
+            else:
+                typeObject = typeExpr.convert_to_type(object)
+
+                if typeObject is None:
+                    return None
+
+        exception = context.namedVariableLookup(exceptionVarname)
+
+        return context.pushPod(
+            bool,
+            runtime_functions.exception_matches.call(
+                exception.nonref_expr.cast(native_ast.VoidPtr),
+                typeObject.nonref_expr.cast(native_ast.VoidPtr)
+            )
+        ).nonref_expr
+
+    def protectPendingException(self, expr):
+        """Wrap the body of a 'finally' block so it can run while an exception propagates.
+
+        We set aside the python exception (if any) while 'expr' runs, since it may call into
+        the interpreter, and restore it afterwards. If 'expr' raises, its exception replaces
+        the one we set aside.
+        """
+        savedExceptionVarname = self.allocateLetVarname()
+        savedException = native_ast.Expression.Variable(name=savedExceptionVarname)
+
+        return native_ast.Expression.Let(
+            var=savedExceptionVarname,
+            val=runtime_functions.save_exception.call(),
+            within=native_ast.Expression.TryCatch(
+                expr=expr,
+                varname=self.allocateLetVarname(),
+                handler=runtime_functions.discard_exception.call(savedException)
+                >> native_ast.Expression.Throw(
+                    expr=native_ast.Expression.Constant(
+                        val=native_ast.Constant.NullPointer(value_type=native_ast.UInt8.pointer())
+                    )
+                )
+            ) >> runtime_functions.restore_exception.call(savedException)
+        )
+
     def freeVariableLookup(self, name):
         if self.isLocalVariable(name):
             return None
@@ -992,6 +1341,15 @@ class FunctionConversionContext(object):
             if slicing is None:
                 return expr_context.finalize(None), False
 
+            if expression.slice.matches.Slice:
+                bounds = expr_context.convert_slice_bounds(expression.slice)
+                if bounds is None:
+                    return expr_context.finalize(None), False
+
+                res = slicing.convert_delslice(*bounds)
+
+                return expr_context.finalize(None), res is not None
+
             # we are assuming this is an index. We ought to be checking this
             # and doing something else if it's a Slice or an Ellipsis or whatnot
             index = expr_context.convert_expression_ast(expression.slice.value)
@@ -58,6 +58,17 @@ class FunctionStackState:
         self._types[varname] = varType
         self._maybeUnintialized.discard(varname)
 
+    def variableMaybeAssigned(self, varname, varType):
+        """Indicate that 'varname' may have been assigned some value of its declared type 'varType'.
+
+        This models a point we can reach from partway through a block of code,
+        such as an 'except' clause, where we can't know which assignments ran.
+        """
+        if varname not in self._types:
+            self._maybeUnintialized.add(varname)
+
+        self._types[varname] = varType
+
     def currentType(self, varname):
         return self._types.get(varname)
 
@@ -12,6 +12,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import contextlib
 import llvmlite.binding as llvm
 import llvmlite.ir
 import typed_python.compiler.native_ast_to_llvm as native_ast_to_llvm
@@ -21,6 +22,9 @@ import struct
 import tempfile
 import os
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typed_python import _types, sha_hash
 
 llvm.initialize()
@@ -63,19 +67,25 @@ def sizeof_native_type(native_type):
 _engineCache = []
 
 
-def create_execution_engine():
-    if _engineCache:
-        return _engineCache[0]
-
+def create_module_pass_manager(targetMachine, optLevel=3):
     pmb = llvm.create_pass_manager_builder()
-    pmb.opt_level = 3
+    pmb.opt_level = optLevel
     pmb.size_level = 0
     pmb.inlining_threshold = 1
 
     pass_manager = llvm.create_module_pass_manager()
     pmb.populate(pass_manager)
 
-    target_machine.add_analysis_passes(pass_manager)
+    targetMachine.add_analysis_passes(pass_manager)
+
+    return pass_manager
+
+
+def create_execution_engine():
+    if _engineCache:
+        return _engineCache[0]
+
+    pass_manager = create_module_pass_manager(target_machine)
 
     # And an execution engine with an empty backing module
     backing_mod = llvm.parse_assembly("")
@@ -86,6 +96,143 @@ def create_execution_engine():
     return engine, pass_manager
 
 
+# functions with at least this many expressions (see Expression.nodeCount) are big
+# enough that we don't mind calling them across modules, so we never pull them into
+# their callers' partitions.
+LARGE_FUNCTION_SIZE = 2000
+
+
+def _definitionSize(definition):
+    if definition.body.matches.Internal:
+        return definition.body.body.nodeCount()
+    return 1
+
+
+def partitionFunctions(functions, partitionCount, largeFunctionSize=LARGE_FUNCTION_SIZE):
+    """Split a dict of new native function definitions into at most 'partitionCount' dicts.
+
+    We try to keep functions in the same partition as the functions they call, so
+    LLVM can still inline them into each other. But a group of functions that all
+    call each other, like the methods of one class hierarchy compiled from a single
+    entrypoint, can be most of a batch, so we cut the call graph in two places:
+    calls to functions with at least 'largeFunctionSize' expressions, and calls that
+    would make a partition bigger than an even share of the batch. Those calls go
+    across modules, which is fine since we link the modules together afterwards.
+    We balance the partitions by the size of the functions they hold.
+
+    Args:
+        functions - a dict from function name to native_ast.Function
+        partitionCount - the most partitions we want
+        largeFunctionSize - the size at which we always cut calls to a function.
+
+    Returns:
+        a nonempty list of dicts from function name to native_ast.Function
+    """
+    if partitionCount <= 1 or len(functions) <= 1:
+        return [dict(functions)]
+
+    sizes = {name: _definitionSize(definition) for name, definition in functions.items()}
+
+    budget = max(largeFunctionSize, sum(sizes.values()) / partitionCount)
+
+    # union-find over the calls between the functions in 'functions'
+    parent = {name: name for name in functions}
+    componentSize = dict(sizes)
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name in sorted(functions):
+        definition = functions[name]
+
+        if definition.body.matches.Internal:
+            for callee in sorted(definition.body.body.calledFunctionNames()):
+                if callee not in parent or sizes[callee] >= largeFunctionSize:
+                    continue
+
+                calleeRoot, callerRoot = find(callee), find(name)
+
+                if calleeRoot != callerRoot and componentSize[calleeRoot] + componentSize[callerRoot] <= budget:
+                    parent[calleeRoot] = callerRoot
+                    componentSize[callerRoot] += componentSize[calleeRoot]
+
+    components = {}
+    for name in functions:
+        components.setdefault(find(name), []).append(name)
+
+    partitions = [{} for _ in range(min(partitionCount, len(components)))]
+    partitionSizes = [0] * len(partitions)
+
+    for root, component in sorted(components.items(), key=lambda rc: (-componentSize[rc[0]], rc[0])):
+        smallest = partitionSizes.index(min(partitionSizes))
+
+        for name in component:
+            partitions[smallest][name] = functions[name]
+
+        partitionSizes[smallest] += componentSize[root]
+
+    return partitions
+
+
+def function_sizes_in_object(objectCode):
+    """Return a dict from name to size in bytes of each global function defined in an object file.
+
+    We only understand 64-bit little-endian ELF files, and return an empty dict for anything else.
+    """
+    if objectCode[:6] != b"\x7fELF\x02\x01":
+        return {}
+
+    sectionHeadersOffset, = struct.unpack_from("<Q", objectCode, 0x28)
+    sectionHeaderSize, sectionCount = struct.unpack_from("<HH", objectCode, 0x3A)
+
+    # each is (name, type, flags, addr, offset, size, link, info, addralign, entsize)
+    sections = [
+        struct.unpack_from("<IIQQQQIIQQ", objectCode, sectionHeadersOffset + i * sectionHeaderSize)
+        for i in range(sectionCount)
+    ]
+
+    SHT_SYMTAB = 2
+    STT_FUNC = 2
+    STB_GLOBAL = 1
+
+    result = {}
+
+    for section in sections:
+        if section[1] != SHT_SYMTAB:
+            continue
+
+        stringsOffset = sections[section[6]][4]
+
+        for symbolOffset in range(section[4], section[4] + section[5], 24):
+            nameOffset, info, _, sectionIndex, _, size = struct.unpack_from("<IBBHQQ", objectCode, symbolOffset)
+
+            if info & 0xF == STT_FUNC and info >> 4 == STB_GLOBAL and sectionIndex != 0:
+                nameStart = stringsOffset + nameOffset
+                result[objectCode[nameStart:objectCode.index(b"\0", nameStart)].decode("utf-8")] = size
+
+    return result
+
+
+class PerfMap:
+    """Tells 'perf' the name of each function we compile.
+
+    'perf' looks up the symbols of JIT-compiled code in /tmp/perf-<pid>.map,
+    which has a line 'START SIZE NAME' (addresses and sizes in hex) for each function.
+    """
+    def __init__(self, path=None):
+        self.path = path or "/tmp/perf-%d.map" % os.getpid()
+        self._file = open(self.path, "a")
+        self._lock = threading.Lock()
+
+    def add(self, address, size, name):
+        with self._lock:
+            self._file.write("%x %x %s\n" % (address, size, name))
+            self._file.flush()
+
+
 class NativeFunctionPointer:
     def __init__(self, fname, fp, input_types, output_type):
         self.fp = fp
@@ -135,6 +282,11 @@ class BinarySharedObject:
         with open(modulePath, "wb") as f:
             f.write(self.binaryForm)
 
+        return BinarySharedObject.functionPointersFromPath(modulePath, symbolsToReturn)
+
+    @staticmethod
+    def functionPointersFromPath(modulePath, symbolsToReturn):
+        """Load the .so at 'modulePath' and return a dict from symbol -> integer function pointer"""
         dll = ctypes.CDLL(modulePath)
 
         output = {}
@@ -148,13 +300,104 @@ class BinarySharedObject:
 
 
 class Compiler:
-    def __init__(self):
+    def __init__(self, workerCount=None):
         self.engine, self.module_pass_manager = create_execution_engine()
         self.converter = native_ast_to_llvm.Converter()
         self.functions_by_name = {}
         self.verbose = False
         self.optimize = True
 
+        # the optimization level for new functions. Tiered compilation lowers this,
+        # and then uses 'add_optimized_copy' to recompile the code that turns out to be hot.
+        self.optLevel = 3
+        self._pass_managers = {3: self.module_pass_manager}
+
+        if workerCount is None:
+            workerCount = int(os.getenv("TP_COMPILER_WORKERS", "1"))
+
+        self.workerCount = max(workerCount, 1)
+
+        # a pool of threads for optimizing and emitting independent modules. llvmlite
+        # releases the GIL while LLVM works, so these really do run in parallel.
+        self._workerPool = None
+
+        # each worker thread gets its own pass manager and target machine,
+        # since LLVM doesn't let threads share them.
+        self._workerState = threading.local()
+
+        # if not None, a CompilerProfile that we tell how long LLVM spends on each module
+        self.profile = None
+
+        # if not None, a PerfMap that we tell about each function we generate
+        self.perfMap = None
+        self._pendingPerfMapEntries = {}
+
+    def setProfile(self, profile):
+        """Report timings to the CompilerProfile 'profile' (or stop, if it's None)."""
+        self.profile = profile
+        self.converter.profile = profile
+
+    @contextlib.contextmanager
+    def _timing(self, functionNames, phase):
+        t0 = time.perf_counter()
+
+        yield
+
+        if self.profile is not None:
+            self.profile.addModulePhase(functionNames, phase, time.perf_counter() - t0)
+
+    def enablePerfMap(self, path=None):
+        """Write the address, size, and name of each function we generate from now on to a perf map.
+
+        Args:
+            path - the file to append to. Defaults to /tmp/perf-<pid>.map, where 'perf' looks.
+
+        Returns:
+            the PerfMap.
+        """
+        if self.perfMap is None:
+            self.perfMap = PerfMap(path)
+
+        return self.perfMap
+
+    def _add_object_file(self, objectCode):
+        self.engine.add_object_file(llvm.ObjectFileRef.from_data(objectCode))
+
+        if self.perfMap is not None:
+            # the engine only has addresses for these once we finalize
+            self._pendingPerfMapEntries.update(function_sizes_in_object(objectCode))
+
+    def _flush_perf_map(self):
+        if self.perfMap is not None:
+            for name, size in self._pendingPerfMapEntries.items():
+                self.perfMap.add(self.engine.get_function_address(name), size, name)
+
+        self._pendingPerfMapEntries = {}
+
+    def setWorkerCount(self, workerCount):
+        """Set how many modules we optimize and emit at once.
+
+        Batches of new functions are split into up to this many modules (see
+        'partitionFunctions'). With a count of 1, each batch is a single module.
+        """
+        workerCount = max(workerCount, 1)
+
+        if workerCount != self.workerCount and self._workerPool is not None:
+            self._workerPool.shutdown()
+            self._workerPool = None
+
+        self.workerCount = workerCount
+
+    def setOptLevel(self, optLevel):
+        """Set the LLVM optimization level (0 through 3) we use for new functions."""
+        self.optLevel = optLevel
+
+    def _pass_manager_for(self, optLevel):
+        if optLevel not in self._pass_managers:
+            self._pass_managers[optLevel] = create_module_pass_manager(target_machine, optLevel)
+
+        return self._pass_managers[optLevel]
+
     def mark_converter_verbose(self):
         self.converter.verbose = True
 
@@ -180,6 +423,25 @@ class Compiler:
 
         return BinarySharedObject.fromModule(mod)
 
+    def shared_object_for(self, names):
+        """Return a self-contained BinarySharedObject holding the functions in 'names'.
+
+        The functions must already have been added with 'add_functions'. Everything
+        they call is lowered again into the same module, so the resulting .so only
+        depends on symbols exported by _types.
+        """
+        definitions = self.converter.definitionsWithDependencies(names)
+
+        module = native_ast_to_llvm.Converter().add_functions(definitions)
+
+        mod = llvm.parse_assembly(module)
+        mod.verify()
+
+        if self.optimize:
+            self.module_pass_manager.run(mod)
+
+        return BinarySharedObject.fromModule(mod)
+
     def link_binary_shared_object(self, binarySO, functions, storageDir):
         """Compile a module from pre-optimized text."""
         integerFuncPtrs = binarySO.loadAndReturnFunctionPointers(functions.keys(), storageDir)
@@ -200,32 +462,141 @@ class Compiler:
 
         return native_function_pointers
 
+    def optimized_copy_module(self, name):
+        """Return the text of a fresh llvm module holding 'name' and everything it calls.
+
+        'name' must already have been added with 'add_functions'. Pass the result to
+        'emit_optimized_copy', which doesn't touch any shared state and so can run
+        on another thread.
+        """
+        converter = native_ast_to_llvm.Converter()
+        converter.emit_debug_info = self.converter.emit_debug_info
+
+        return converter.add_functions(self.converter.definitionsWithDependencies([name]))
+
+    @staticmethod
+    def emit_optimized_copy(module, name, newName):
+        """Optimize a module from 'optimized_copy_module' at -O3 and return its object code.
+
+        Every function but 'name' becomes internal to the module, so LLVM can inline
+        them freely and they can't clash with the functions we already have. 'name'
+        itself is renamed to 'newName'.
+        """
+        targetMachine = target.create_target_machine()
+
+        mod = llvm.parse_assembly(module, context=llvm.create_context())
+
+        for func in mod.functions:
+            if not func.is_declaration:
+                if func.name == name:
+                    func.name = newName
+                else:
+                    func.linkage = llvm.Linkage.internal
+
+        mod.verify()
+
+        create_module_pass_manager(targetMachine).run(mod)
+
+        return targetMachine.emit_object(mod)
+
+    def add_optimized_copy(self, name, objectCode, newName):
+        """Load object code from 'emit_optimized_copy' and return a NativeFunctionPointer to it.
+
+        Returns:
+            a NativeFunctionPointer for 'newName', with the signature of 'name'.
+        """
+        self._add_object_file(objectCode)
+        self.engine.finalize_object()
+        self._flush_perf_map()
+
+        existing = self.functions_by_name[name]
+
+        self.functions_by_name[newName] = NativeFunctionPointer(
+            newName,
+            self.engine.get_function_address(newName),
+            existing.input_types,
+            existing.output_type
+        )
+
+        return self.functions_by_name[newName]
+
     def function_pointer_by_name(self, name):
         return self.functions_by_name.get(name)
 
-    def add_functions(self, functions):
-        if not functions:
-            return {}
+    def _optimizeAndEmit(self, module, functionNames):
+        """Parse, optimize, and emit the object code for the text of an llvm module.
 
-        module = self.converter.add_functions(functions)
+        This runs on a worker thread, so it parses the module into its own llvm context.
+        """
+        state = self._workerState
+
+        if not hasattr(state, "pass_managers"):
+            state.target_machine = target.create_target_machine()
+            state.pass_managers = {}
+
+        if self.optLevel not in state.pass_managers:
+            state.pass_managers[self.optLevel] = create_module_pass_manager(state.target_machine, self.optLevel)
 
         try:
-            mod = llvm.parse_assembly(module)
-            mod.verify()
+            with self._timing(functionNames, "parse"):
+                mod = llvm.parse_assembly(module, context=llvm.create_context())
+                mod.verify()
         except Exception:
             print("failing: ", module)
             raise
 
-        # Now add the module and make sure it is ready for execution
-        self.engine.add_module(mod)
-
         if self.optimize:
-            self.module_pass_manager.run(mod)
+            with self._timing(functionNames, "optimize"):
+                state.pass_managers[self.optLevel].run(mod)
 
         if self.verbose:
             print(mod)
 
-        self.engine.finalize_object()
+        with self._timing(functionNames, "emit"):
+            return state.target_machine.emit_object(mod)
+
+    def add_functions(self, functions):
+        if not functions:
+            return {}
+
+        partitions = partitionFunctions(functions, self.workerCount)
+
+        # the engine doesn't tell us how big the code for a module is, so when we're
+        # writing a perf map we always emit object code ourselves and read it from that.
+        if len(partitions) == 1 and self.perfMap is None:
+            module = self.converter.add_functions(functions)
+
+            try:
+                with self._timing(functions, "parse"):
+                    mod = llvm.parse_assembly(module)
+                    mod.verify()
+            except Exception:
+                print("failing: ", module)
+                raise
+
+            # Now add the module and make sure it is ready for execution
+            self.engine.add_module(mod)
+
+            if self.optimize:
+                with self._timing(functions, "optimize"):
+                    self._pass_manager_for(self.optLevel).run(mod)
+
+            if self.verbose:
+                print(mod)
+        else:
+            modules = self.converter.add_function_partitions(partitions)
+
+            if self._workerPool is None:
+                self._workerPool = ThreadPoolExecutor(self.workerCount)
+
+            for objectCode in self._workerPool.map(self._optimizeAndEmit, modules, partitions):
+                self._add_object_file(objectCode)
+
+        # with MCJIT, this is where machine code gets generated for modules we added directly
+        with self._timing(functions, "finalize"):
+            self.engine.finalize_object()
+
+        self._flush_perf_map()
 
         # Look up the function pointer (a Python int)
         native_function_pointers = {}
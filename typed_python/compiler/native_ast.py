@@ -263,6 +263,8 @@ def expr_str(self):
         return "(" + str(self.ptr) + ")[0]=" + str(self.val)
     if self.matches.AtomicAdd:
         return "atomic_add(" + str(self.ptr) + "," + str(self.val) + ")"
+    if self.matches.AtomicLoad:
+        return "atomic_load(" + str(self.ptr) + ")"
     if self.matches.Alloca:
         return "alloca(" + str(self.type) + ")"
     if self.matches.Cast:
@@ -418,6 +420,66 @@ def expr_return_targets(expr):
     return res
 
 
+def expr_called_function_names(self):
+    """Return the set of names of the non-external functions this expression refers to."""
+    res = set()
+
+    if self.matches.Call and self.target.matches.Named and not self.target.target.external:
+        res.add(self.target.target.name)
+
+    if self.matches.Call and self.target.matches.Pointer:
+        res |= self.target.expr.calledFunctionNames()
+
+    if self.matches.FunctionPointer and not self.target.external:
+        res.add(self.target.name)
+
+    if self.matches.MakeStruct:
+        for _, e in self.args:
+            res |= e.calledFunctionNames()
+
+    if self.matches.Finally:
+        for teardown in self.teardowns:
+            res |= teardown.expr.calledFunctionNames()
+
+    for name in self.ElementType.ElementNames:
+        child = getattr(self, name)
+
+        if isinstance(child, Expression):
+            res |= child.calledFunctionNames()
+        elif isinstance(child, TupleOf(Expression)):
+            for c in child:
+                res |= c.calledFunctionNames()
+
+    return res
+
+
+def expr_node_count(self):
+    """Return the number of expressions in this expression tree, as a rough measure of its code size."""
+    res = 1
+
+    if self.matches.Call and self.target.matches.Pointer:
+        res += self.target.expr.nodeCount()
+
+    if self.matches.MakeStruct:
+        for _, e in self.args:
+            res += e.nodeCount()
+
+    if self.matches.Finally:
+        for teardown in self.teardowns:
+            res += teardown.expr.nodeCount()
+
+    for name in self.ElementType.ElementNames:
+        child = getattr(self, name)
+
+        if isinstance(child, Expression):
+            res += child.nodeCount()
+        elif isinstance(child, TupleOf(Expression)):
+            for c in child:
+                res += c.nodeCount()
+
+    return res
+
+
 def expr_with_return_target_name(self, name):
     return Expression.Finally(
         expr=self,
@@ -458,6 +520,7 @@ Expression = Expression.define(Alternative(
     Load={'ptr': Expression},
     Store={'ptr': Expression, 'val': Expression},
     AtomicAdd={'ptr': Expression, 'val': Expression},
+    AtomicLoad={'ptr': Expression},
     Alloca={'type': Type},
     Cast={'left': Expression, 'to_type': Type},
     Binop={'op': BinaryOp, 'left': Expression, 'right': Expression},
@@ -531,13 +594,16 @@ Expression = Expression.define(Alternative(
     load=lambda self: Expression.Load(ptr=self),
     store=lambda self, val: Expression.Store(ptr=self, val=ensureExpr(val)),
     atomic_add=lambda self, val: Expression.AtomicAdd(ptr=self, val=ensureExpr(val)),
+    atomic_load=lambda self: Expression.AtomicLoad(ptr=self),
     cast=lambda self, targetType: Expression.Cast(left=self, to_type=targetType),
     with_comment=lambda self, c: Expression.Comment(comment=c, expr=self),
     elemPtr=lambda self, *exprs: Expression.ElementPtr(left=self, offsets=[ensureExpr(e) for e in exprs]),
     is_simple=expr_is_simple,
     returnTargets=expr_return_targets,
     withReturnTargetName=expr_with_return_target_name,
-    couldThrow=expr_could_throw
+    couldThrow=expr_could_throw,
+    calledFunctionNames=expr_called_function_names,
+    nodeCount=expr_node_count
 ))
 
 
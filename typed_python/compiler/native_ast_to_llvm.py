@@ -12,6 +12,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import os
+import time
 import typed_python.compiler.native_ast as native_ast
 import llvmlite.ir
 
@@ -490,7 +492,8 @@ class FunctionConverter:
                  builder,
                  arg_assignments,
                  output_type,
-                 external_function_references
+                 external_function_references,
+                 debug_info=None
                  ):
         self.function = function
         self.module = module
@@ -501,6 +504,7 @@ class FunctionConverter:
         self.external_function_references = external_function_references
         self.tags_initialized = {}
         self.stack_slots = {}
+        self.debug_info = debug_info
 
     def tags_as(self, new_tags):
         class scoper():
@@ -630,9 +634,14 @@ class FunctionConverter:
         else:
             func = self.converter._functions_by_name[target.name]
 
+            self.converter._function_callees.setdefault(self.function.name, set()).add(target.name)
+
             if func.module is not self.module:
                 # first, see if we'd like to inline this module
-                if self.converter.totalFunctionComplexity(target.name) < CROSS_MODULE_INLINE_COMPLEXITY:
+                if (
+                    target.name not in self.converter._functions_being_defined
+                    and self.converter.totalFunctionComplexity(target.name) < CROSS_MODULE_INLINE_COMPLEXITY
+                ):
                     func = self.converter.repeatFunctionInModule(target.name, self.module)
                 else:
                     if target.name not in self.external_function_references:
@@ -748,6 +757,16 @@ class FunctionConverter:
                 val.native_type
             )
 
+        if expr.matches.AtomicLoad:
+            ptr = self.convert(expr.ptr)
+
+            assert ptr.native_type.matches.Pointer and ptr.native_type.value_type.matches.Int, ptr.native_type
+
+            return TypedLLVMValue(
+                self.builder.load_atomic(ptr.llvm_value, "monotonic", ptr.native_type.value_type.bits // 8),
+                ptr.native_type.value_type
+            )
+
         if expr.matches.Load:
             ptr = self.convert(expr.ptr)
 
@@ -1200,10 +1219,22 @@ class FunctionConverter:
             )
             new_handler = self.teardown_handler
 
+            location = traceback_location(expr.handler) if self.debug_info is not None else None
+
+            if location is not None:
+                prior_location = self.builder.debug_metadata
+                self.builder.debug_metadata = self.debug_info.location(self.function.name, *location)
+
             result = self.convert(expr.expr)
 
+            if location is not None:
+                self.builder.debug_metadata = prior_location
+
             self.teardown_handler = new_handler.parent_scope
 
+            # whether the handler can resume control flow after the try-catch
+            handler_resumes = []
+
             def generator(tags, resume_normal_block):
                 with self.tags_as(tags):
                     prior = self.arg_assignments.get(expr.varname, None)
@@ -1222,12 +1253,15 @@ class FunctionConverter:
                     else:
                         self.arg_assignments[expr.varname] = prior
 
-                    if handler_res is not None:
+                    # a handler ending in a named 'Return' (say, a 'continue') has
+                    # already branched away
+                    if handler_res is not None and not self.builder.block.is_terminated:
+                        handler_resumes.append(True)
                         self.builder.branch(resume_normal_block)
 
             target_resume_block = self.builder.append_basic_block()
 
-            if result is not None:
+            if result is not None and not self.builder.block.is_terminated:
                 self.builder.branch(target_resume_block)
 
             new_handler.generate_trycatch_unwind(target_resume_block, generator)
@@ -1235,7 +1269,12 @@ class FunctionConverter:
             self.builder.position_at_start(target_resume_block)
 
             if result is None:
-                self.builder.unreachable()
+                if not handler_resumes:
+                    self.builder.unreachable()
+                    return None
+
+                # only the handler gets here, so there's no value from 'expr'
+                return TypedLLVMValue(None, native_ast.Type.Void())
 
             return result
 
@@ -1255,9 +1294,13 @@ class FunctionConverter:
 
             self.teardown_handler = self.teardown_handler.parent_scope
 
+            # a named 'Return' at the very end of 'expr' (say, a 'break') produces a result
+            # but has already branched to the teardown handler.
+            falls_through = finally_result is not None and not self.builder.block.is_terminated
+
             # if we have a result, then we need to generate teardowns
             # in the normal course of execution
-            if finally_result is not None:
+            if falls_through:
                 for teardown in expr.teardowns:
                     self.convert_teardown(teardown)
             else:
@@ -1272,7 +1315,7 @@ class FunctionConverter:
             if expr.name is not None:
                 finalBlock = self.builder.append_basic_block(self.teardown_handler.blockName() + "_resume")
 
-                if finally_result is not None:
+                if falls_through:
                     self.builder.branch(finalBlock)
                 else:
                     # we didn't have a result, so the block we're on is already
@@ -1310,6 +1353,114 @@ def populate_needed_externals(external_function_references, module):
     define("__gxx_personality_v0", llvm_i32, [], vararg=True)
 
 
+def traceback_location(handler):
+    """Return the (filename, line) an exception handler reports in tracebacks, or None.
+
+    The python converter guards each expression that can throw with a handler that
+    calls 'np_add_traceback' with the source location of the expression. These are
+    the only source locations that survive into the native ast.
+    """
+    if handler.matches.Sequence and handler.vals:
+        handler = handler.vals[0]
+
+    if not (handler.matches.Call and handler.target.matches.Named):
+        return None
+
+    if handler.target.target.name != "np_add_traceback" or len(handler.args) != 3:
+        return None
+
+    filename, line = handler.args[1], handler.args[2]
+
+    if not (
+        filename.matches.Constant and filename.val.matches.ByteArray
+        and line.matches.Constant and line.val.matches.Int
+    ):
+        return None
+
+    return filename.val.val.decode("utf-8"), line.val.val
+
+
+class ModuleDebugInfo:
+    """Builds the DWARF line tables that map the code in a module back to python source.
+
+    Each function gets a subprogram. Code inside an expression that carries a traceback
+    location (see 'traceback_location') gets that file and line. Everything else gets
+    line 0 of its function.
+    """
+    def __init__(self, module):
+        self.module = module
+        self._files = {}
+        self.subprograms = {}
+
+        module.add_named_metadata(
+            "llvm.module.flags", module.add_metadata([llvm_i32(2), "Debug Info Version", llvm_i32(3)])
+        )
+        module.add_named_metadata(
+            "llvm.module.flags", module.add_metadata([llvm_i32(2), "Dwarf Version", llvm_i32(4)])
+        )
+
+        self.file = self.file_for("<typed_python>")
+
+        self.compile_unit = module.add_debug_info(
+            "DICompileUnit",
+            {
+                "language": llvmlite.ir.DIToken("DW_LANG_Python"),
+                "file": self.file,
+                "producer": "typed_python",
+                "runtimeVersion": 0,
+                "isOptimized": True,
+                "emissionKind": 1
+            },
+            is_distinct=True
+        )
+
+        module.add_named_metadata("llvm.dbg.cu", self.compile_unit)
+
+        self.subroutine_type = module.add_debug_info("DISubroutineType", {"types": module.add_metadata([])})
+
+    def file_for(self, filename):
+        if filename not in self._files:
+            directory, basename = os.path.split(filename)
+
+            self._files[filename] = self.module.add_debug_info(
+                "DIFile", {"filename": basename, "directory": directory}
+            )
+
+        return self._files[filename]
+
+    def add_subprogram(self, func):
+        """Attach a subprogram to the llvmlite function 'func' and return its default location."""
+        self.subprograms[func.name] = self.module.add_debug_info(
+            "DISubprogram",
+            {
+                "name": func.name,
+                "file": self.file,
+                "line": 0,
+                "type": self.subroutine_type,
+                "isLocal": False,
+                "isDefinition": True,
+                "unit": self.compile_unit,
+                "scopeLine": 0
+            },
+            is_distinct=True
+        )
+
+        func.set_metadata("dbg", self.subprograms[func.name])
+
+        return self.location(func.name)
+
+    def location(self, function_name, filename=None, line=0):
+        scope = self.subprograms[function_name]
+
+        if filename is not None:
+            scope = self.module.add_debug_info(
+                "DILexicalBlockFile",
+                {"scope": scope, "file": self.file_for(filename), "discriminator": 0}
+            )
+
+        return self.module.add_debug_info("DILocation", {"line": line, "column": 0, "scope": scope})
+
+
 class Converter(object):
     def __init__(self):
         object.__init__(self)
@@ -1320,8 +1471,22 @@ class Converter(object):
         # total number of instructions in each function, by name
         self._function_complexity = {}
 
+        # for each function, by name, the set of non-external functions it calls
+        self._function_callees = {}
+
         self._inlineRequests = []
 
+        # names of the functions we're in the middle of defining in a call
+        # to 'add_function_partitions'. These may not have a body yet, so we
+        # can't repeat them in other modules.
+        self._functions_being_defined = set()
+
+        # if not None, a CompilerProfile that we tell about each function we lower
+        self.profile = None
+
+        # if True, emit DWARF line tables mapping our code back to python source
+        self.emit_debug_info = False
+
         self.verbose = False
 
     def totalFunctionComplexity(self, name):
@@ -1341,6 +1506,25 @@ class Converter(object):
 
         return res
 
+    def definitionsWithDependencies(self, names):
+        """Return the definitions of the functions in 'names' and everything they call.
+
+        All of the functions must already have been lowered by 'add_functions'. The result
+        is a dict from name to native_ast.Function that can be passed to a fresh Converter
+        to produce a module with no references to functions defined in other modules.
+        """
+        result = {}
+        toCheck = list(names)
+
+        while toCheck:
+            name = toCheck.pop()
+
+            if name not in result:
+                result[name] = self._function_definitions[name]
+                toCheck.extend(self._function_callees.get(name, ()))
+
+        return result
+
     def repeatFunctionInModule(self, name, module):
         """Request that the function given by 'name' be inlined into 'module'.
 
@@ -1367,30 +1551,64 @@ class Converter(object):
         return self._functions_by_name[name]
 
     def add_functions(self, names_to_definitions):
-        names_to_definitions = dict(names_to_definitions)
+        return self.add_function_partitions([names_to_definitions])[0]
+
+    def add_function_partitions(self, partitions):
+        """Lower several groups of new function definitions, each into its own module.
+
+        Functions may call functions in other groups, but such calls are never inlined
+        across modules, so groups that don't call each other lose nothing by being
+        split apart, and their modules can be optimized and emitted independently.
 
-        for name in names_to_definitions:
-            assert name not in self._functions_by_name, "can't define %s twice" % name
+        Args:
+            partitions - a list of dicts from function name to native_ast.Function.
 
-        module_name = "module_%s" % len(self._modules)
+        Returns:
+            a list containing the text of the llvm module for each partition.
+        """
+        partitions = [dict(names_to_definitions) for names_to_definitions in partitions]
 
-        module = llvmlite.ir.Module(name=module_name)
+        modules = []
 
-        self._modules[module_name] = module
+        for names_to_definitions in partitions:
+            for name in names_to_definitions:
+                assert name not in self._functions_by_name, "can't define %s twice" % name
 
-        external_function_references = {}
-        populate_needed_externals(external_function_references, module)
+            module_name = "module_%s" % len(self._modules)
 
-        for name, function in names_to_definitions.items():
-            func_type = llvmlite.ir.FunctionType(
-                type_to_llvm_type(function.output_type),
-                [type_to_llvm_type(x[1]) for x in function.args]
-            )
-            self._functions_by_name[name] = llvmlite.ir.Function(module, func_type, name)
+            module = llvmlite.ir.Module(name=module_name)
+
+            self._modules[module_name] = module
+
+            external_function_references = {}
+            populate_needed_externals(external_function_references, module)
+
+            debug_info = ModuleDebugInfo(module) if self.emit_debug_info else None
+
+            for name, function in names_to_definitions.items():
+                func_type = llvmlite.ir.FunctionType(
+                    type_to_llvm_type(function.output_type),
+                    [type_to_llvm_type(x[1]) for x in function.args]
+                )
+                self._functions_by_name[name] = llvmlite.ir.Function(module, func_type, name)
 
-            self._functions_by_name[name].linkage = 'external'
-            self._function_definitions[name] = function
+                self._functions_by_name[name].linkage = 'external'
+                self._function_definitions[name] = function
 
+            modules.append((module, external_function_references, debug_info))
+
+        for names_to_definitions in partitions:
+            self._functions_being_defined.update(names_to_definitions)
+
+        try:
+            for (module, external_function_references, debug_info), names_to_definitions in zip(modules, partitions):
+                self._lowerFunctions(module, external_function_references, names_to_definitions, debug_info)
+        finally:
+            self._functions_being_defined.clear()
+
+        return [str(module) for module, _, _ in modules]
+
+    def _lowerFunctions(self, module, external_function_references, names_to_definitions, debug_info):
         if self.verbose:
             for name in names_to_definitions:
                 definition = names_to_definitions[name]
@@ -1420,9 +1638,14 @@ class Converter(object):
                     arg_assignments[definition.args[i][0]] = \
                         TypedLLVMValue(func.args[i], definition.args[i][1])
 
+                t0 = time.perf_counter()
+
                 block = func.append_basic_block('entry')
                 builder = llvmlite.ir.IRBuilder(block)
 
+                if debug_info is not None:
+                    builder.debug_metadata = debug_info.add_subprogram(func)
+
                 try:
                     func_converter = FunctionConverter(
                         module,
@@ -1431,7 +1654,8 @@ class Converter(object):
                         builder,
                         arg_assignments,
                         definition.output_type,
-                        external_function_references
+                        external_function_references,
+                        debug_info
                     )
 
                     func_converter.setup()
@@ -1455,10 +1679,15 @@ class Converter(object):
                     print("function failing = " + name)
                     raise
 
+                if self.profile is not None:
+                    self.profile.addLowering(
+                        name,
+                        time.perf_counter() - t0,
+                        sum(len(block.instructions) for block in func.basic_blocks)
+                    )
+
             # each function listed here was deemed 'inlinable', which means that we
             # want to repeat its definition in this particular module.
             for name in self._inlineRequests:
                 names_to_definitions[name] = self._function_definitions[name]
             self._inlineRequests.clear()
-
-        return str(module)
@@ -0,0 +1,107 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Compile the entrypoint signatures listed in a manifest into a shared object.
+
+Usage:
+    python -m typed_python.compiler.precompile MODULE MANIFEST OUTPUT
+
+MODULE is a dotted module name, or the path of a python file, which we import
+by its basename from its directory. Each line of MANIFEST names a function in
+the module and the types of its positional arguments:
+
+    # comments and blank lines are ignored
+    addOne: int
+    sumOf: ListOf(float)
+    SomeClass.helper: str, OneOf(None, int)
+
+The argument types are python expressions, evaluated in the module's namespace
+with typed_python's exports available. We compile every signature as one LLVM
+module and write it to OUTPUT. Set TP_COMPILER_PRECOMPILED=OUTPUT (or call
+Runtime.loadPrecompiled) in the process that serves the code to use it.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import typed_python
+from typed_python.compiler.compiler_cache import PrecompiledModule
+from typed_python.compiler.runtime import Runtime
+
+
+def importModule(modulePath):
+    if modulePath.endswith(".py") or os.path.sep in modulePath:
+        directory, filename = os.path.split(os.path.abspath(modulePath))
+        sys.path.insert(0, directory)
+        modulePath = os.path.splitext(filename)[0]
+
+    return importlib.import_module(modulePath)
+
+
+def parseManifest(module, manifestText):
+    """Parse the text of a manifest into a list of (function, argTypes)."""
+    namespace = {k: getattr(typed_python, k) for k in dir(typed_python) if not k.startswith("_")}
+    namespace.update(module.__dict__)
+
+    signatures = []
+
+    for lineNumber, line in enumerate(manifestText.split("\n")):
+        line = line.split("#")[0].strip()
+
+        if not line:
+            continue
+
+        if ":" not in line:
+            raise ValueError(f"Manifest line {lineNumber + 1} should look like 'function: argType, ...'")
+
+        funcName, argTypes = line.split(":", 1)
+
+        func = module
+        for part in funcName.strip().split("."):
+            func = getattr(func, part)
+
+        argTypes = eval("(" + argTypes + ",)", namespace) if argTypes.strip() else ()
+
+        signatures.append((func, list(argTypes)))
+
+    return signatures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompile typed_python entrypoints into a shared object.")
+    parser.add_argument("module", help="a dotted module name or the path of a python file")
+    parser.add_argument("manifest", help="a file listing the signatures to compile")
+    parser.add_argument("output", help="where to write the shared object")
+
+    args = parser.parse_args(argv)
+
+    module = importModule(args.module)
+
+    with open(args.manifest, "r") as f:
+        signatures = parseManifest(module, f.read())
+
+    Runtime.singleton().precompile(signatures, args.output)
+
+    print(
+        f"Compiled {len(signatures)} signatures. Wrote {len(PrecompiledModule.read(args.output).entries)} "
+        f"specializations that other processes can load to {args.output}"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
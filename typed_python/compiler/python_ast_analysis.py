@@ -93,6 +93,8 @@ def computeAssignedVariables(astNode):
     def visit(x):
         if isinstance(x, Alias):
             variables.add(x)
+        if isinstance(x, ExceptionHandler) and x.name is not None:
+            variables.add(x.name)
         if isinstance(x, Expr):
             if x.matches.Name and (x.ctx.matches.Store or x.ctx.matches.Del or x.ctx.matches.AugStore):
                 variables.add(x.id)
@@ -100,6 +102,12 @@ def computeAssignedVariables(astNode):
             if x.matches.Lambda:
                 return False
 
+            if isComprehension(x):
+                # the targets of a comprehension are local to it. Only the iterable of
+                # its first clause is evaluated in the enclosing scope.
+                visitPyAstChildren(x.generators[0].iter, visit)
+                return False
+
         if isinstance(x, Statement):
             # we don't need to worry about all the individual operations because
             # we can catch the variable names from the Expr.Name context as they're used
@@ -131,6 +139,70 @@ def computeAssignedVariables(astNode):
     return variables
 
 
+def statementsLeaveBlock(statements):
+    """Could these statements transfer control out of the block holding them, except by raising?
+
+    That is, do they contain a 'return', or a 'break' or 'continue' that isn't inside a loop
+    of their own. Nested function and class definitions don't count.
+    """
+    found = [False]
+
+    def visit(x, loopDepth):
+        if found[0] or isinstance(x, (int, float, str, bytes, bool, type(None))):
+            return
+
+        if isinstance(x, Statement):
+            if x.matches.FunctionDef or x.matches.ClassDef:
+                return
+
+            if x.matches.Return or ((x.matches.Break or x.matches.Continue) and loopDepth == 0):
+                found[0] = True
+                return
+
+            if x.matches.For or x.matches.While:
+                visit(x.body, loopDepth + 1)
+                visit(x.orelse, loopDepth)
+                return
+
+            for name in x.ElementType.ElementNames:
+                visit(getattr(x, name), loopDepth)
+        elif isinstance(x, ExceptionHandler):
+            visit(x.body, loopDepth)
+        elif not isinstance(x, nodeTypes):
+            for child in x:
+                visit(child, loopDepth)
+
+    visit(statements, 0)
+
+    return found[0]
+
+
+def finallyBlocksLeave(statements):
+    """Does a 'finally' block in these statements 'return', 'break', or 'continue' out of itself?
+
+    The compiler can't convert those yet. Nested function and class definitions don't count.
+    """
+    found = [False]
+
+    def visit(x):
+        if found[0]:
+            return False
+
+        if isinstance(x, Statement):
+            if x.matches.FunctionDef or x.matches.ClassDef:
+                return False
+
+            if x.matches.Try and statementsLeaveBlock(x.finalbody):
+                found[0] = True
+                return False
+
+        return True
+
+    visitPyAstChildren(statements, visit)
+
+    return found[0]
+
+
 def computeFunctionArgVariables(args: Arguments):
     """Compute the set of names bound by the given arguments.
 
@@ -171,6 +243,11 @@ def computeReadVariables(astNode):
                 variables.update(computeReadVariables(x.args))
                 return False
 
+            if isComprehension(x):
+                variables.update(computeReadVariables(x.generators[0].iter))
+                variables.update(computeComprehensionReadVariables(x))
+                return False
+
         if isinstance(x, Statement):
             if x.matches.FunctionDef:
                 variables.update(
@@ -209,3 +286,33 @@ def computeReadVariables(astNode):
     visitPyAstChildren(astNode, visit)
 
     return variables
+
+
+def isComprehension(expr):
+    """Is 'expr' a list, set, or dict comprehension, or a generator expression?"""
+    return expr.matches.ListComp or expr.matches.SetComp or expr.matches.DictComp or expr.matches.GeneratorExp
+
+
+def computeComprehensionReadVariables(comprehension):
+    """Return the set of variable names a comprehension reads from its enclosing scope when it runs.
+
+    This leaves out the iterable of the first 'for' clause, which python evaluates
+    in the enclosing scope when the comprehension is created, and the variables
+    the comprehension binds itself.
+
+    Args:
+        comprehension - a python_ast.Expr that's a ListComp, SetComp, DictComp, or GeneratorExp.
+    """
+    if comprehension.matches.DictComp:
+        body = [comprehension.key, comprehension.value]
+    else:
+        body = [comprehension.elt]
+
+    for i, generator in enumerate(comprehension.generators):
+        body.extend(generator.ifs)
+        if i > 0:
+            body.append(generator.iter)
+
+    return computeReadVariables(body).difference(
+        computeAssignedVariables([generator.target for generator in comprehension.generators])
+    )
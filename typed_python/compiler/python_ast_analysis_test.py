@@ -79,3 +79,19 @@ class TestPythonAstAnalysis(unittest.TestCase):
                     return z  # noqa
 
         self.freeVarCheck(f, ['z'], ['AClass'])
+
+    def test_comprehensions(self):
+        def f():
+            return [x + y for x in z if x > w]  # noqa
+
+        self.freeVarCheck(f, ['y', 'z', 'w'], [])
+
+        def g():
+            return list(sum(x * y for y in row) for row in rows)  # noqa
+
+        self.freeVarCheck(g, ['list', 'sum', 'x', 'rows'], [])
+
+        def h():
+            return {k: v for k, v in d.items()}  # noqa
+
+        self.freeVarCheck(h, ['d'], [])
@@ -47,6 +47,7 @@ from typed_python.compiler.type_wrappers.is_compiled_wrapper import IsCompiledWr
 from typed_python.compiler.type_wrappers.make_named_tuple_wrapper import MakeNamedTupleWrapper
 from typed_python.compiler.type_wrappers.math_wrappers import MathFunctionWrapper
 from typed_python.compiler.type_wrappers.builtin_wrappers import BuiltinWrapper
+from typed_python.compiler.type_wrappers.iterable_builtin_wrappers import IterableBuiltinWrapper
 from typed_python.compiler.type_wrappers.bytecount_wrapper import BytecountWrapper
 from typed_python.compiler.type_wrappers.arithmetic_wrapper import IntWrapper, FloatWrapper, BoolWrapper
 from typed_python.compiler.type_wrappers.string_wrapper import StringWrapper
@@ -206,6 +207,9 @@ def pythonObjectRepresentation(context, f):
     if f in BuiltinWrapper.SUPPORTED_FUNCTIONS:
         return TypedExpression(context, native_ast.nullExpr, BuiltinWrapper(f), False)
 
+    if f in IterableBuiltinWrapper.SUPPORTED_FUNCTIONS:
+        return TypedExpression(context, native_ast.nullExpr, IterableBuiltinWrapper(f), False)
+
     if f is None:
         return TypedExpression(
             context,
@@ -12,6 +12,7 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import time
 import typed_python.python_ast as python_ast
 import typed_python.ast_util as ast_util
 import typed_python._types as _types
@@ -129,11 +130,17 @@ class PythonToNativeConverter(object):
         # if True, then insert additional code to check for undefined behavior.
         self.generateDebugChecks = False
         self._link_name_for_identity = {}
+        self._identity_for_link_name = {}
         self._definitions = {}
         self._targets = {}
         self._inflight_definitions = {}
         self._inflight_function_conversions = {}
         self._times_calculated = {}
+
+        # identities whose generated code embeds process-specific pointers
+        # (type pointers, PyObject* constants, vtables) and therefore can't
+        # be reloaded in another process from the compiler cache.
+        self._unrelocatable_identities = set()
         self._new_native_functions = set()
         self._used_names = set()
         self._linktimeHooks = []
@@ -146,6 +153,12 @@ class PythonToNativeConverter(object):
 
         self._dependencies = FunctionDependencyGraph()
 
+        # if not None, a CompilerProfile that we tell about each type inference pass
+        self.profile = None
+
+        # if True, new functions count their calls and time in the native profiler
+        self.profileCompiledFunctions = False
+
     def addVisitor(self, visitor):
         self._visitors.append(visitor)
 
@@ -164,6 +177,28 @@ class PythonToNativeConverter(object):
         """
         return self._link_name_for_identity.get(identity)
 
+    def _setLinkName(self, identity, name):
+        self._link_name_for_identity[identity] = name
+        self._identity_for_link_name[name] = identity
+
+    def markCurrentFunctionUnrelocatable(self):
+        """Note that the function being converted can't be reused in another process."""
+        if self._currentlyConverting is not None:
+            self._unrelocatable_identities.add(self._currentlyConverting)
+
+    def isRelocatable(self, name):
+        """Is the native function 'name' free of process-specific constants?"""
+        return self._identity_for_link_name.get(name) not in self._unrelocatable_identities
+
+    def pythonFunctionForName(self, name):
+        """Return the python function that native function 'name' was converted from, or None."""
+        identity = self._identity_for_link_name.get(name)
+
+        if identity is not None and identity[0] == "pyfunction":
+            return identity[1]
+
+        return None
+
     def extract_new_function_definitions(self):
         """Return a list of all new function definitions from the last conversion."""
         res = {}
@@ -244,7 +279,7 @@ class PythonToNativeConverter(object):
 
         new_name = self.new_name(name, "runtime.")
 
-        self._link_name_for_identity[identity] = new_name
+        self._setLinkName(identity, new_name)
         self._inflight_function_conversions[identity] = NativeFunctionConversionContext(
             self, input_types, output_type, generatingFunction, identity
         )
@@ -393,7 +428,7 @@ class PythonToNativeConverter(object):
         )
 
         new_name = self.new_name(callTarget.name + ".dispatch")
-        self._link_name_for_identity[identifier] = new_name
+        self._setLinkName(identifier, new_name)
 
         self._definitions[new_name] = definition
         self._new_native_functions.add(new_name)
@@ -415,8 +450,16 @@ class PythonToNativeConverter(object):
 
                 self._times_calculated[identity] = self._times_calculated.get(identity, 0) + 1
 
+                t0 = time.perf_counter()
+
                 nativeFunction, actual_output_type = functionConverter.convertToNativeFunction()
 
+                if self.profile is not None:
+                    self.profile.addTypeInferencePass(
+                        self._link_name_for_identity.get(identity, str(identity)),
+                        time.perf_counter() - t0
+                    )
+
                 if nativeFunction is not None:
                     self._inflight_definitions[identity] = (nativeFunction, actual_output_type)
 
@@ -502,7 +545,7 @@ class PythonToNativeConverter(object):
             name = self._link_name_for_identity[identity]
         else:
             name = self.new_name(f.__name__)
-            self._link_name_for_identity[identity] = name
+            self._setLinkName(identity, name)
 
         if name in self._targets:
             return self._targets[name]
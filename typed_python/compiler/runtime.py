@@ -12,11 +12,17 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import atexit
+import collections
+import logging
 import threading
 import os
+import sys
 import types
 import typed_python.compiler.python_to_native_converter as python_to_native_converter
 import typed_python.compiler.llvm_compiler as llvm_compiler
+from typed_python.compiler.compiler_cache import CompilerCache, PrecompiledModule
+from typed_python.compiler.compiler_profile import CompilerProfile
 import typed_python
 from typed_python.type_function import ConcreteTypeFunction
 from typed_python.compiler.type_wrappers.one_of_wrapper import OneOfWrapper
@@ -44,6 +50,32 @@ def toInterpreterType(setOfTypes):
     return res
 
 
+# how many functions TP_COMPILER_PROFILE reports if it isn't set to a number
+DEFAULT_PROFILE_REPORT_LENGTH = 20
+
+
+def _profileReportLength(envValue):
+    """Parse the value of TP_COMPILER_PROFILE into the number of functions to report.
+
+    A diagnostics variable shouldn't be able to break compilation, so values that
+    aren't positive integers (like 'yes') log a warning and use the default.
+    """
+    try:
+        topN = int(envValue)
+    except ValueError:
+        topN = 0
+
+    if topN <= 0:
+        logging.warning(
+            "TP_COMPILER_PROFILE should be the number of functions to report, not %r. Reporting %s.",
+            envValue,
+            DEFAULT_PROFILE_REPORT_LENGTH
+        )
+        return DEFAULT_PROFILE_REPORT_LENGTH
+
+    return topN
+
+
 class RuntimeEventVisitor:
     """Base class for a Visitor that gets to see what's going on in the runtime.
 
@@ -53,6 +85,13 @@ class RuntimeEventVisitor:
     def onNewFunction(self, function, inputTypes, outputType, variableTypes):
         pass
 
+    def onEntrypointSignature(self, function, inputWrappers):
+        """Called when a call to the entrypoint 'function' (a python function) misses and we compile it.
+
+        'inputWrappers' is the list of Wrappers we're compiling it for.
+        """
+        pass
+
     def __enter__(self):
         Runtime.singleton().addEventVisitor(self)
 
@@ -101,6 +140,269 @@ class Runtime:
         self.converter = python_to_native_converter.PythonToNativeConverter()
         self.lock = threading.RLock()
         self.timesCompiled = 0
+        self.compilerCache = None
+        self.eventVisitors = []
+        self.precompiledModules = []
+
+        # state for compiling entrypoints on a background thread. Guarded by
+        # '_backgroundCondition', not 'lock', which the compiler thread holds while
+        # it works.
+        self.backgroundCompilationEnabled = bool(os.getenv("TP_COMPILER_BACKGROUND"))
+        self._backgroundCondition = threading.Condition()
+        self._backgroundQueue = collections.deque()
+        self._backgroundPending = set()
+        self._backgroundFailed = set()
+        self._backgroundThread = None
+
+        # state for tiered compilation. If 'hotCallThreshold' is positive, we compile
+        # new code at a cheap optimization level, and recompile a specialization at
+        # -O3 once it has been called that many times.
+        self.hotCallThreshold = 0
+        self.timesReoptimized = 0
+        self._tieredSpecializations = {}
+        self._optimizedCopies = {}
+
+        if os.getenv("TP_COMPILER_TIERED"):
+            self.setTieredCompilation(int(os.getenv("TP_COMPILER_TIERED")))
+
+        self.compilerProfile = None
+
+        if os.getenv("TP_COMPILER_PROFILE"):
+            profile = self.enableCompilerProfile()
+            topN = _profileReportLength(os.getenv("TP_COMPILER_PROFILE"))
+
+            atexit.register(lambda: print(profile.formatReport(topN), file=sys.stderr))
+
+        if os.getenv("TP_COMPILER_PERF_MAP"):
+            self.enablePerfMap()
+
+        if os.getenv("TP_COMPILER_FUNCTION_PROFILE"):
+            self.enableCompiledFunctionProfile()
+
+        if os.getenv("TP_COMPILER_CACHE"):
+            self.enableCompilerCache(os.getenv("TP_COMPILER_CACHE"))
+
+        if os.getenv("TP_COMPILER_PRECOMPILED"):
+            for path in os.getenv("TP_COMPILER_PRECOMPILED").split(os.pathsep):
+                self.loadPrecompiled(path)
+
+        if os.getenv("TP_COMPILER_RECORD_SIGNATURES"):
+            from typed_python.compiler.signature_recorder import SignatureRecorder
+            self.addEventVisitor(SignatureRecorder(os.getenv("TP_COMPILER_RECORD_SIGNATURES")))
+
+    def enableCompilerCache(self, cacheDir, **kwargs):
+        """Load and store compiled entrypoints in the on-disk cache at 'cacheDir'.
+
+        The cache can be shared by many processes at once. Keyword arguments
+        (e.g. 'maxSizeBytes') are passed to CompilerCache.
+        """
+        with self.lock:
+            self.compilerCache = CompilerCache(cacheDir, **kwargs)
+
+    def disableCompilerCache(self):
+        with self.lock:
+            self.compilerCache = None
+
+    def enableCompilerProfile(self):
+        """Start recording where compile time goes, and return the CompilerProfile we record into.
+
+        Call 'report()' or 'formatReport(topN)' on the profile to see the results.
+        Setting TP_COMPILER_PROFILE=N does this at startup and prints the N most
+        expensive functions to stderr when the process exits.
+        """
+        with self.lock:
+            if self.compilerProfile is None:
+                self.compilerProfile = CompilerProfile()
+                self.converter.profile = self.compilerProfile
+                self.llvm_compiler.setProfile(self.compilerProfile)
+
+            return self.compilerProfile
+
+    def disableCompilerProfile(self):
+        with self.lock:
+            self.compilerProfile = None
+            self.converter.profile = None
+            self.llvm_compiler.setProfile(None)
+
+    def enablePerfMap(self, path=None, lineTables=True):
+        """Make the functions we compile from now on visible to native profilers and debuggers.
+
+        We append the address, size, and name of each function to 'path', which
+        defaults to /tmp/perf-<pid>.map, where 'perf report' looks for the symbols
+        of JIT-compiled code. If 'lineTables', we also emit DWARF line tables
+        mapping the generated code back to the python source it came from.
+
+        Setting TP_COMPILER_PERF_MAP does this at startup.
+
+        Returns:
+            the llvm_compiler.PerfMap we write to.
+        """
+        with self.lock:
+            self.llvm_compiler.converter.emit_debug_info = lineTables
+
+            return self.llvm_compiler.enablePerfMap(path)
+
+    def enableCompiledFunctionProfile(self):
+        """Count the calls to, and time spent in, each function we compile from now on.
+
+        Only functions compiled after this call are instrumented, and each
+        function's time includes the time spent in the functions it calls.
+        Read the counts with 'compiledFunctionProfile'. Setting
+        TP_COMPILER_FUNCTION_PROFILE does this at startup.
+        """
+        with self.lock:
+            self.converter.profileCompiledFunctions = True
+
+    def disableCompiledFunctionProfile(self):
+        """Stop instrumenting new functions. Code that's already instrumented keeps counting."""
+        with self.lock:
+            self.converter.profileCompiledFunctions = False
+
+    def compiledFunctionProfile(self):
+        """Return a dict from the name of each instrumented function to (calls, nanoseconds)."""
+        return _types.compiledFunctionProfile()
+
+    def resetCompiledFunctionProfile(self):
+        """Zero the counts of every instrumented function."""
+        _types.resetCompiledFunctionProfile()
+
+    def loadPrecompiled(self, path):
+        """Use the code in the shared object that 'precompile' wrote to 'path'.
+
+        Nothing gets installed until an entrypoint is called with a signature
+        the module holds.
+        """
+        with self.lock:
+            self.precompiledModules.append(PrecompiledModule.read(path))
+
+    def precompile(self, signatures, outputPath=None):
+        """Compile many entrypoint signatures at once, as a single LLVM module.
+
+        Args:
+            signatures - a list of (func, argTypes), where 'func' is an Entrypoint
+                (or a python function, which we wrap in one), and 'argTypes' is a
+                list of the types of its positional arguments.
+            outputPath - if not None, also write the compiled code to this path as
+                a shared object that 'loadPrecompiled' can use in another process.
+
+        Returns:
+            a list with, for each signature, a list of the TypedCallTargets for each
+            overload of 'func' that the signature can match.
+        """
+        ExpressionConversionContext = typed_python.compiler.expression_conversion_context.ExpressionConversionContext
+
+        with self.lock:
+            compiled = []
+            result = []
+
+            for func, argTypes in signatures:
+                if not isinstance(func, _types.Function):
+                    func = Entrypoint(func)
+
+                argTypes = [typeWrapper(a) for a in argTypes]
+
+                callTargets = []
+
+                for overload in func.overloads:
+                    argumentSignature = ExpressionConversionContext.computeFunctionArgumentTypeSignature(overload, argTypes, {})
+
+                    if argumentSignature is None:
+                        continue
+
+                    inputWrappers = self._inputWrappersFor(overload, argumentSignature, True)
+
+                    if inputWrappers is None:
+                        continue
+
+                    self.timesCompiled += 1
+
+                    callTarget = self.converter.convert(overload.functionObj, inputWrappers, overload.returnType, assertIsRoot=True)
+                    callTarget = self.converter.demasqueradeCallTargetOutput(callTarget)
+
+                    compiled.append(
+                        (overload, inputWrappers, callTarget, self.converter.generateCallConverter(callTarget))
+                    )
+                    callTargets.append(callTarget)
+
+                result.append(callTargets)
+
+            self.llvm_compiler.add_functions(self.converter.extract_new_function_definitions())
+
+            for overload, inputWrappers, callTarget, wrappingCallTargetName in compiled:
+                self._installCompiledSpecialization(overload, inputWrappers, callTarget, wrappingCallTargetName)
+
+            self._collectLinktimeHooks()
+
+            if outputPath is not None:
+                self._writePrecompiledModule(outputPath, compiled)
+
+            return result
+
+    def _writePrecompiledModule(self, outputPath, compiled):
+        entries = []
+
+        for overload, inputWrappers, callTarget, wrappingCallTargetName in compiled:
+            cacheKey = CompilerCache.keyFor(overload.functionObj, inputWrappers, overload.returnType)
+            dependencies = self._relocatableDependencies(wrappingCallTargetName)
+
+            if cacheKey is not None and dependencies is not None:
+                entries.append((
+                    cacheKey,
+                    wrappingCallTargetName,
+                    callTarget.output_type.typeRepresentation if callTarget.output_type is not None else None,
+                    dependencies
+                ))
+
+        return PrecompiledModule.write(
+            outputPath,
+            self.llvm_compiler.shared_object_for([e[1] for e in entries]),
+            entries
+        )
+
+    def setBackgroundCompilation(self, enabled=True):
+        """Compile every entrypoint in the background, as if it had 'Entrypoint(background=True)'."""
+        self.backgroundCompilationEnabled = enabled
+
+    def setTieredCompilation(self, hotCallThreshold=1000, firstTierOptLevel=1):
+        """Compile new code cheaply, and only optimize fully the code that gets called a lot.
+
+        Each entrypoint specialization we compile from now on is optimized at
+        'firstTierOptLevel'. After 'hotCallThreshold' calls through the interpreter,
+        we recompile it and everything it calls at -O3 on the background compiler
+        thread, and swap the new code in. A threshold of 0 turns this off.
+
+        This defaults to off, or to the threshold in TP_COMPILER_TIERED.
+        """
+        with self.lock:
+            self.hotCallThreshold = hotCallThreshold
+            self.llvm_compiler.setOptLevel(firstTierOptLevel if hotCallThreshold > 0 else 3)
+
+    def setCompilerWorkerCount(self, workerCount):
+        """Optimize and emit independent groups of new functions on up to 'workerCount' threads.
+
+        This defaults to the value of TP_COMPILER_WORKERS, or 1.
+        """
+        with self.lock:
+            self.llvm_compiler.setWorkerCount(workerCount)
+
+    def pendingBackgroundCompilationCount(self):
+        """Return the number of entrypoint signatures queued or compiling in the background."""
+        with self._backgroundCondition:
+            return len(self._backgroundPending)
+
+    def waitForBackgroundCompilation(self, timeout=None):
+        """Block until every background compilation has finished.
+
+        Don't call this while holding 'self.lock', which the compiler thread needs.
+
+        Args:
+            timeout - None, or the maximum number of seconds to wait.
+
+        Returns:
+            True if nothing is pending, False if we timed out.
+        """
+        with self._backgroundCondition:
+            return self._backgroundCondition.wait_for(lambda: not self._backgroundPending, timeout)
 
     def verboselyDisplayNativeCode(self):
         self.llvm_compiler.mark_converter_verbose()
@@ -108,9 +410,11 @@ class Runtime:
 
     def addEventVisitor(self, visitor: RuntimeEventVisitor):
         self.converter.addVisitor(visitor)
+        self.eventVisitors.append(visitor)
 
     def removeEventVisitor(self, visitor: RuntimeEventVisitor):
         self.converter.removeVisitor(visitor)
+        self.eventVisitors.remove(visitor)
 
     def _collectLinktimeHooks(self):
         while True:
@@ -192,25 +496,82 @@ class Runtime:
                 instead of actual values.
 
         Returns:
-            None if it is not possible to match this overload with these arguments or
-            a TypedCallTarget.
+            None if it is not possible to match this overload with these arguments,
+            False if we queued the compilation on the background compiler thread and
+            the caller should run the function in the interpreter for now, or a
+            TypedCallTarget.
         """
 
         overload = typedFunc.overloads[overloadIx]
 
         assert len(arguments) == len(overload.args)
 
+        if not argumentsAreTypes and self._shouldCompileInBackground(typedFunc):
+            inputWrappers = self._inputWrappersFor(overload, arguments, argumentsAreTypes)
+
+            if inputWrappers is None:
+                return None
+
+            self._visitEntrypointSignature(overload, inputWrappers)
+
+            if self._compileInBackground(typedFunc, overloadIx, inputWrappers):
+                return False
+        else:
+            inputWrappers = None
+
         with self.lock:
-            inputWrappers = []
+            if inputWrappers is None:
+                inputWrappers = self._inputWrappersFor(overload, arguments, argumentsAreTypes)
 
-            for i in range(len(arguments)):
-                inputWrappers.append(
-                    self.pickSpecializationTypeFor(overload.args[i], arguments[i], argumentsAreTypes)
-                )
+                if inputWrappers is None:
+                    return None
 
-            if any(x is None for x in inputWrappers):
-                # this signature is unmatchable with these arguments.
-                return None
+                self._visitEntrypointSignature(overload, inputWrappers)
+
+            return self._compileWithInputWrappers(overload, inputWrappers)
+
+    def _visitEntrypointSignature(self, overload, inputWrappers):
+        for visitor in self.eventVisitors:
+            visitor.onEntrypointSignature(overload.functionObj, inputWrappers)
+
+    def _inputWrappersFor(self, overload, arguments, argumentsAreTypes):
+        inputWrappers = []
+
+        for i in range(len(arguments)):
+            inputWrappers.append(
+                self.pickSpecializationTypeFor(overload.args[i], arguments[i], argumentsAreTypes)
+            )
+
+        if any(x is None for x in inputWrappers):
+            # this signature is unmatchable with these arguments.
+            return None
+
+        return inputWrappers
+
+    def _compileWithInputWrappers(self, overload, inputWrappers):
+        with self.lock:
+            cacheKey = None
+
+            if self.compilerCache is not None or self.precompiledModules:
+                cacheKey = CompilerCache.keyFor(overload.functionObj, inputWrappers, overload.returnType)
+
+                if cacheKey is not None:
+                    cached = self._loadCompiled(cacheKey)
+
+                    if cached is not None:
+                        fp, outputType = cached
+
+                        overload._installNativePointer(
+                            fp,
+                            outputType if outputType is not None else NoneType,
+                            [i.typeRepresentation for i in inputWrappers]
+                        )
+
+                        return python_to_native_converter.TypedCallTarget(
+                            None,
+                            inputWrappers,
+                            typeWrapper(outputType) if outputType is not None else None
+                        )
 
             self.timesCompiled += 1
 
@@ -226,19 +587,200 @@ class Runtime:
 
             self.llvm_compiler.add_functions(targets)
 
-            # if the callTargetName isn't in the list, then we already compiled it and installed it.
-            fp = self.llvm_compiler.function_pointer_by_name(wrappingCallTargetName)
-
-            overload._installNativePointer(
-                fp.fp,
-                callTarget.output_type.typeRepresentation if callTarget.output_type is not None else NoneType,
-                [i.typeRepresentation for i in inputWrappers]
-            )
+            self._installCompiledSpecialization(overload, inputWrappers, callTarget, wrappingCallTargetName)
 
             self._collectLinktimeHooks()
 
+            if cacheKey is not None and self.compilerCache is not None:
+                self._storeInCompilerCache(cacheKey, wrappingCallTargetName, callTarget)
+
             return callTarget
 
+    def _installCompiledSpecialization(self, overload, inputWrappers, callTarget, wrappingCallTargetName):
+        """Install the code we just compiled for 'wrappingCallTargetName' as a specialization of 'overload'."""
+        # if the callTargetName isn't in the list, then we already compiled it and installed it.
+        fp = self.llvm_compiler.function_pointer_by_name(wrappingCallTargetName)
+
+        # code we compiled below -O3 gets counted, so we can optimize it when it's hot
+        hotCallThreshold = self.hotCallThreshold if self.llvm_compiler.optLevel < 3 else 0
+
+        specializationIx = overload._installNativePointer(
+            fp.fp,
+            callTarget.output_type.typeRepresentation if callTarget.output_type is not None else NoneType,
+            [i.typeRepresentation for i in inputWrappers],
+            hotCallThreshold
+        )
+
+        if hotCallThreshold:
+            self._tieredSpecializations[overload.functionTypeObject, overload.index, specializationIx] = \
+                wrappingCallTargetName
+
+    def specializationIsHot(self, typedFunc, overloadIx, specializationIx):
+        """Called by the interpreter when a specialization we compiled cheaply crosses the hot-call threshold.
+
+        We queue a -O3 recompile of it on the background compiler thread.
+        """
+        overload = typedFunc.overloads[overloadIx]
+
+        # don't take 'lock' here: another thread may hold it for a long compile, and
+        # we're in the middle of a call.
+        name = self._tieredSpecializations.get((overload.functionTypeObject, overloadIx, specializationIx))
+
+        if name is None:
+            return
+
+        with self._backgroundCondition:
+            self._queueInBackground(
+                ("reoptimize", overload.functionTypeObject, overloadIx, specializationIx),
+                lambda: self._reoptimizeSpecialization(overload, specializationIx, name),
+                overload.functionObj.__qualname__
+            )
+
+    def _reoptimizeSpecialization(self, overload, specializationIx, name):
+        """Recompile 'name' and everything it calls at -O3 and swap it in for the given specialization."""
+        optimizedName = name + ".optimized"
+
+        with self.lock:
+            fp = self._optimizedCopies.get(name)
+
+            if fp is None:
+                module = self.llvm_compiler.optimized_copy_module(name)
+
+        if fp is None:
+            # llvm releases the GIL while it optimizes, and we don't hold the lock,
+            # so this doesn't hold up other compilation.
+            objectCode = llvm_compiler.Compiler.emit_optimized_copy(module, name, optimizedName)
+
+            with self.lock:
+                if name not in self._optimizedCopies:
+                    self._optimizedCopies[name] = self.llvm_compiler.add_optimized_copy(name, objectCode, optimizedName)
+                    self.timesReoptimized += 1
+
+                fp = self._optimizedCopies[name]
+
+        overload._replaceNativePointer(specializationIx, fp.fp)
+
+    def _loadCompiled(self, cacheKey):
+        """Find the compiled code for 'cacheKey' in a precompiled module or the compiler cache.
+
+        Returns:
+            None, or a pair (functionPointer, outputType).
+        """
+        for module in self.precompiledModules:
+            res = module.load(cacheKey)
+
+            if res is not None:
+                return res
+
+        if self.compilerCache is not None:
+            return self.compilerCache.load(cacheKey)
+
+        return None
+
+    def _relocatableDependencies(self, wrappingCallTargetName):
+        """Return the python functions compiled into 'wrappingCallTargetName' and everything it calls.
+
+        Returns None if any of that code can't be loaded into another process.
+        """
+        names = self.llvm_compiler.converter.definitionsWithDependencies([wrappingCallTargetName])
+
+        if not all(self.converter.isRelocatable(name) for name in names):
+            return None
+
+        return [
+            self.converter.pythonFunctionForName(name) for name in names
+            if self.converter.pythonFunctionForName(name) is not None
+        ]
+
+    def _shouldCompileInBackground(self, typedFunc):
+        if threading.current_thread() is self._backgroundThread:
+            return False
+
+        return self.backgroundCompilationEnabled or typedFunc.isBackgroundCompiled
+
+    def _compileInBackground(self, typedFunc, overloadIx, inputWrappers):
+        """Queue a compilation of 'typedFunc.overloads[overloadIx]' on the compiler thread.
+
+        Returns:
+            False if this signature already failed to compile in the background, in which
+            case the caller should compile it synchronously so that it sees the error.
+            Otherwise, True.
+        """
+        key = (type(typedFunc), overloadIx, tuple(inputWrappers))
+        overload = typedFunc.overloads[overloadIx]
+
+        with self._backgroundCondition:
+            if key in self._backgroundFailed:
+                return False
+
+            self._queueInBackground(
+                key,
+                lambda: self._compileWithInputWrappers(overload, inputWrappers),
+                overload.functionObj.__qualname__
+            )
+
+            return True
+
+    def _queueInBackground(self, key, work, description):
+        """Call 'work()' on the background compiler thread, unless 'key' is already pending.
+
+        The caller must hold '_backgroundCondition'. If 'work' throws, we log it
+        (using 'description') and add 'key' to '_backgroundFailed'.
+        """
+        if key in self._backgroundPending:
+            return
+
+        self._backgroundPending.add(key)
+        self._backgroundQueue.append((key, work, description))
+
+        if self._backgroundThread is None:
+            self._backgroundThread = threading.Thread(
+                target=self._backgroundCompilationLoop,
+                name="typed_python background compiler",
+                daemon=True
+            )
+            self._backgroundThread.start()
+
+        self._backgroundCondition.notify_all()
+
+    def _backgroundCompilationLoop(self):
+        while True:
+            with self._backgroundCondition:
+                while not self._backgroundQueue:
+                    self._backgroundCondition.wait()
+
+                key, work, description = self._backgroundQueue.popleft()
+
+            failed = False
+
+            try:
+                work()
+            except Exception:
+                logging.exception("Background compilation of %s failed", description)
+                failed = True
+
+            with self._backgroundCondition:
+                if failed:
+                    self._backgroundFailed.add(key)
+
+                self._backgroundPending.discard(key)
+                self._backgroundCondition.notify_all()
+
+    def _storeInCompilerCache(self, cacheKey, wrappingCallTargetName, callTarget):
+        """Write the code for 'wrappingCallTargetName' to the compiler cache, if it's relocatable."""
+        dependencies = self._relocatableDependencies(wrappingCallTargetName)
+
+        if dependencies is None:
+            return
+
+        self.compilerCache.store(
+            cacheKey,
+            self.llvm_compiler.shared_object_for([wrappingCallTargetName]),
+            wrappingCallTargetName,
+            callTarget.output_type.typeRepresentation if callTarget.output_type is not None else None,
+            dependencies
+        )
+
     def resultTypeForCall(self, funcObj, argTypes, kwargTypes):
         """Determine the result of calling funcObj with things of type 'argTypes' and 'kwargTypes'
 
@@ -291,14 +833,22 @@ def NotCompiled(pyFunc):
     return Function(pyFunc)
 
 
-def Entrypoint(pyFunc):
+def Entrypoint(pyFunc=None, background=False):
     """Decorate 'pyFunc' to JIT-compile it based on the signature of the arguments.
 
     Each time you call 'pyFunc', we look at the argument signature and see whether
     we have already compiled a form of that function. If so, we dispatch to that.
     Otherwise, we compile a new form (which blocks) and then use that when
     compilation has completed.
+
+    With 'Entrypoint(background=True)', a call with a new signature queues its
+    compilation on a background thread and runs in the interpreter instead of
+    blocking. Once that compilation finishes, calls dispatch to the compiled code.
+    See Runtime.waitForBackgroundCompilation and Runtime.setBackgroundCompilation.
     """
+    if pyFunc is None:
+        return lambda pyFunc: Entrypoint(pyFunc, background=background)
+
     wrapInStatic = False
 
     typedFunc = pyFunc
@@ -314,6 +864,9 @@ def Entrypoint(pyFunc):
 
     typedFunc = typedFunc.withEntrypoint(True)
 
+    if background:
+        typedFunc = typedFunc.withBackgroundCompilation(True)
+
     if wrapInStatic:
         return staticmethod(typedFunc)
 
@@ -0,0 +1,196 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Record the entrypoint signatures a process compiles, and precompile them in another.
+
+Run a service with TP_COMPILER_RECORD_SIGNATURES=PATH (or add a SignatureRecorder
+to the runtime yourself) to append each new signature to PATH. Then, at startup
+of a fresh process, call 'replaySignatures(PATH)', or run
+
+    python -m typed_python.compiler.signature_recorder PATH [OUTPUT]
+
+to compile them all, optionally writing a shared object for TP_COMPILER_PRECOMPILED.
+"""
+
+import argparse
+import fcntl
+import importlib
+import logging
+import struct
+import sys
+import threading
+
+from typed_python.SerializationContext import SerializationContext
+from typed_python.compiler.compiler_cache import _resolveQualname
+from typed_python.compiler.python_object_representation import typedPythonTypeToTypeWrapper
+from typed_python.compiler.runtime import Runtime, RuntimeEventVisitor
+
+# each record is a little-endian uint32 byte count followed by that many bytes
+_RECORD_HEADER = struct.Struct("<I")
+
+
+def _defaultSerializationContext():
+    return SerializationContext({}).withoutCompression()
+
+
+class SignatureRecorder(RuntimeEventVisitor):
+    """Appends each new (module, qualname, input types) an entrypoint compiles to a file.
+
+    Each record is appended while holding an exclusive flock on the file, so several
+    processes can share a file. Signatures we can't replay are skipped: those of
+    functions defined inside other functions, those involving *args or **kwargs, and
+    those whose types we can't serialize. A truncated record at the end of the file,
+    left by a process that died while writing it, is removed when the recorder opens
+    the file. We take the same lock to do that, so we never cut off a record another
+    process is still writing.
+    """
+    def __init__(self, path, serializationContext=None):
+        self.path = path
+        self.serializationContext = serializationContext or _defaultSerializationContext()
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, "rb+") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+                records, end = _splitRecords(f.read())
+
+                # drop any partial record a process left when it died, so that the
+                # records we append start where a reader expects the next one.
+                f.truncate(end)
+        except FileNotFoundError:
+            records = []
+
+        self._seen = set(self.serializationContext.deserialize(r) for r in records)
+
+    def onEntrypointSignature(self, function, inputWrappers):
+        if "<locals>" in function.__qualname__:
+            return
+
+        if any(typedPythonTypeToTypeWrapper(w.typeRepresentation) != w for w in inputWrappers):
+            return
+
+        record = (function.__module__, function.__qualname__, tuple(w.typeRepresentation for w in inputWrappers))
+
+        with self._lock:
+            if record in self._seen:
+                return
+
+            self._seen.add(record)
+
+            try:
+                data = self.serializationContext.serialize(record)
+            except Exception:
+                logging.warning("Can't record the signature of %s.%s", record[0], record[1])
+                return
+
+            with open(self.path, "ab") as f:
+                # closing the file releases the lock, after the write is flushed
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                f.write(_RECORD_HEADER.pack(len(data)) + data)
+
+
+def readSignatures(path, serializationContext=None, missingOk=False):
+    """Return the list of (moduleName, qualname, inputTypes) recorded in 'path'.
+
+    A truncated final record (say, from a process that died while writing it) is ignored.
+    """
+    serializationContext = serializationContext or _defaultSerializationContext()
+
+    try:
+        with open(path, "rb") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+            data = f.read()
+    except FileNotFoundError:
+        if missingOk:
+            return []
+        raise
+
+    return [serializationContext.deserialize(r) for r in _splitRecords(data)[0]]
+
+
+def _splitRecords(data):
+    """Split the contents of a signature file into its complete records.
+
+    Returns:
+        a pair of the list of the bytes of each complete record, and the offset
+        in 'data' where the last complete record ends.
+    """
+    res = []
+    pos = 0
+
+    while pos + _RECORD_HEADER.size <= len(data):
+        size, = _RECORD_HEADER.unpack_from(data, pos)
+
+        if pos + _RECORD_HEADER.size + size > len(data):
+            break
+
+        pos += _RECORD_HEADER.size
+        res.append(data[pos:pos + size])
+        pos += size
+
+    return res, pos
+
+
+def replaySignatures(path, serializationContext=None, outputPath=None):
+    """Compile every signature recorded in 'path' as one batch.
+
+    Args:
+        path - a file written by SignatureRecorder.
+        serializationContext - the context the recorder used, if it wasn't the default.
+        outputPath - if not None, also write the compiled code to a shared object here
+            (see Runtime.precompile).
+
+    Returns:
+        the number of signatures we compiled. Signatures whose functions we can't
+        find any more are logged and skipped.
+    """
+    signatures = []
+
+    for moduleName, qualname, inputTypes in readSignatures(path, serializationContext):
+        try:
+            importlib.import_module(moduleName)
+        except ImportError:
+            logging.warning("Can't import %s to replay %s", moduleName, qualname)
+            continue
+
+        func = _resolveQualname(moduleName, qualname)
+
+        if func is None:
+            logging.warning("Can't find %s.%s to replay it", moduleName, qualname)
+            continue
+
+        signatures.append((func, list(inputTypes)))
+
+    Runtime.singleton().precompile(signatures, outputPath)
+
+    return len(signatures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the entrypoint signatures recorded by a SignatureRecorder.")
+    parser.add_argument("signatures", help="the file the recorder wrote")
+    parser.add_argument("output", nargs="?", default=None, help="where to write a shared object of the compiled code")
+
+    args = parser.parse_args(argv)
+
+    count = replaySignatures(args.signatures, outputPath=args.output)
+
+    print(f"Compiled {count} recorded signatures")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import types
+import unittest
+
+from typed_python import Int64
+from typed_python.compiler.compiler_cache import CompilerCache, _dependencyRecords, _dependenciesAreCurrent
+from typed_python.compiler.llvm_compiler import BinarySharedObject
+
+
+# stands in for a config module whose constants compiled code reads
+cacheTestConfig = types.ModuleType("cache_test_config")
+cacheTestConfig.THRESHOLD = 1
+
+
+def readsModuleConstant(x):
+    return x * cacheTestConfig.THRESHOLD
+
+
+MODULE_TEMPLATE = """
+from typed_python import Entrypoint, ListOf
+
+@Entrypoint
+def sumOf(x: ListOf(int)):
+    res = 0
+    for i in x:
+        res += i
+    return res * {multiplier}
+"""
+
+SCRIPT = """
+import sys
+sys.path.insert(0, {moduleDir!r})
+
+from typed_python import ListOf
+from typed_python.compiler.runtime import Runtime
+import cached_module
+
+print(cached_module.sumOf(ListOf(int)([1, 2, 3])))
+print(Runtime.singleton().timesCompiled)
+print(Runtime.singleton().compilerCache.hits)
+"""
+
+
+class TestCompilerCache(unittest.TestCase):
+    def runInFreshProcess(self, cacheDir, moduleDir):
+        output = subprocess.check_output(
+            [sys.executable, "-c", SCRIPT.format(moduleDir=moduleDir)],
+            env=dict(os.environ, TP_COMPILER_CACHE=cacheDir)
+        )
+
+        return [int(x) for x in output.decode("ASCII").split()]
+
+    def writeModule(self, moduleDir, multiplier):
+        with open(os.path.join(moduleDir, "cached_module.py"), "w") as f:
+            f.write(textwrap.dedent(MODULE_TEMPLATE.format(multiplier=multiplier)))
+
+    def test_second_process_loads_from_cache(self):
+        with tempfile.TemporaryDirectory() as cacheDir, tempfile.TemporaryDirectory() as moduleDir:
+            self.writeModule(moduleDir, 1)
+
+            self.assertEqual(self.runInFreshProcess(cacheDir, moduleDir), [6, 1, 0])
+            self.assertEqual(self.runInFreshProcess(cacheDir, moduleDir), [6, 0, 1])
+
+    def test_changing_source_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as cacheDir, tempfile.TemporaryDirectory() as moduleDir:
+            self.writeModule(moduleDir, 1)
+            self.assertEqual(self.runInFreshProcess(cacheDir, moduleDir), [6, 1, 0])
+
+            self.writeModule(moduleDir, 2)
+            self.assertEqual(self.runInFreshProcess(cacheDir, moduleDir), [12, 1, 0])
+            self.assertEqual(self.runInFreshProcess(cacheDir, moduleDir), [12, 0, 1])
+
+    def test_keys_depend_on_input_types(self):
+        def f(x):
+            return x
+
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilerCache(cacheDir)
+
+            from typed_python.compiler.python_object_representation import typedPythonTypeToTypeWrapper
+
+            k1 = cache.keyFor(f, [typedPythonTypeToTypeWrapper(int)], None)
+            k2 = cache.keyFor(f, [typedPythonTypeToTypeWrapper(float)], None)
+
+            self.assertIsNotNone(k1)
+            self.assertNotEqual(k1, k2)
+            self.assertEqual(k1, cache.keyFor(f, [typedPythonTypeToTypeWrapper(int)], None))
+
+    def test_keys_depend_on_module_attributes_read(self):
+        from typed_python.compiler.python_object_representation import typedPythonTypeToTypeWrapper
+
+        intWrapper = [typedPythonTypeToTypeWrapper(int)]
+
+        k1 = CompilerCache.keyFor(readsModuleConstant, intWrapper, None)
+        self.assertIsNotNone(k1)
+
+        try:
+            cacheTestConfig.THRESHOLD = 2
+            self.assertNotEqual(CompilerCache.keyFor(readsModuleConstant, intWrapper, None), k1)
+
+            # attributes the function doesn't read don't matter
+            cacheTestConfig.THRESHOLD = 1
+            cacheTestConfig.UNRELATED = 10
+            self.assertEqual(CompilerCache.keyFor(readsModuleConstant, intWrapper, None), k1)
+
+            # and if we can't fingerprint an attribute it does read, it isn't cacheable
+            cacheTestConfig.THRESHOLD = object()
+            self.assertIsNone(CompilerCache.keyFor(readsModuleConstant, intWrapper, None))
+        finally:
+            cacheTestConfig.THRESHOLD = 1
+            cacheTestConfig.__dict__.pop("UNRELATED", None)
+
+    def test_dependencies_depend_on_module_attributes_read(self):
+        # 'readsModuleConstant' stands in for a callee compiled into some other
+        # function's entry, so only its dependency record covers the constant.
+        records = _dependencyRecords([readsModuleConstant])
+        self.assertTrue(_dependenciesAreCurrent(records))
+
+        try:
+            cacheTestConfig.THRESHOLD = 2
+            self.assertFalse(_dependenciesAreCurrent(records))
+
+            cacheTestConfig.THRESHOLD = 1
+            cacheTestConfig.UNRELATED = 10
+            self.assertTrue(_dependenciesAreCurrent(records))
+
+            cacheTestConfig.THRESHOLD = object()
+            self.assertFalse(_dependenciesAreCurrent(records))
+        finally:
+            cacheTestConfig.THRESHOLD = 1
+            cacheTestConfig.__dict__.pop("UNRELATED", None)
+
+    def test_malformed_entries_are_misses(self):
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilerCache(cacheDir)
+
+            self.assertTrue(cache.store("key", BinarySharedObject(b" "), "f", Int64, []))
+
+            with open(os.path.join(cacheDir, "key", "meta.dat"), "r+b") as f:
+                f.truncate(3)
+
+            self.assertIsNone(cache.load("key"))
+            self.assertEqual(cache.misses, 1)
+
+            # a complete meta file next to a shared object we can't load is a miss too
+            cache.store("key2", BinarySharedObject(b"not a shared object"), "f", Int64, [])
+
+            self.assertIsNone(cache.load("key2"))
+            self.assertEqual(cache.misses, 2)
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilerCache(cacheDir, maxSizeBytes=3500)
+
+            for i in range(3):
+                self.assertTrue(cache.store("key%s" % i, BinarySharedObject(b" " * 1000), "f", Int64, []))
+                # make sure the entries get distinct timestamps
+                os.utime(os.path.join(cacheDir, "key%s" % i), (time.time() - 100 + i, time.time() - 100 + i))
+
+            # touch key0 so that key1 is the least recently used
+            os.utime(os.path.join(cacheDir, "key0"))
+
+            cache.store("key3", BinarySharedObject(b" " * 1000), "f", Int64, [])
+
+            self.assertLessEqual(cache.sizeInBytes(), 3500)
+            self.assertTrue(os.path.isdir(os.path.join(cacheDir, "key0")))
+            self.assertFalse(os.path.isdir(os.path.join(cacheDir, "key1")))
+            self.assertTrue(os.path.isdir(os.path.join(cacheDir, "key3")))
+
+    def test_concurrent_writers_of_same_key(self):
+        with tempfile.TemporaryDirectory() as cacheDir:
+            caches = [CompilerCache(cacheDir) for _ in range(8)]
+
+            threads = [
+                threading.Thread(
+                    target=lambda c=c: c.store("key", BinarySharedObject(b"x" * 100), "f", Int64, [])
+                )
+                for c in caches
+            ]
+
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual([x for x in os.listdir(cacheDir) if not x.startswith(".")], ["key"])
+            self.assertEqual(caches[0].sizeInBytes(), 100 + os.path.getsize(os.path.join(cacheDir, "key", "meta.dat")))
+
+    def test_clear_and_invalidate(self):
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cache = CompilerCache(cacheDir)
+
+            cache.store("key0", BinarySharedObject(b" "), "f", Int64, [])
+            cache.store("key1", BinarySharedObject(b" "), "f", Int64, [])
+
+            cache.invalidate("key0")
+            self.assertFalse(os.path.isdir(os.path.join(cacheDir, "key0")))
+            self.assertTrue(os.path.isdir(os.path.join(cacheDir, "key1")))
+
+            cache.clear()
+            self.assertEqual(cache.sizeInBytes(), 0)
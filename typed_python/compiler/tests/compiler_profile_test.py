@@ -0,0 +1,137 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import subprocess
+import sys
+import unittest
+
+from typed_python import Entrypoint, ListOf
+from typed_python.compiler.compiler_profile import CompilerProfile, PHASES
+from typed_python.compiler.runtime import Runtime, _profileReportLength, DEFAULT_PROFILE_REPORT_LENGTH
+
+
+SCRIPT = """
+from typed_python import Entrypoint
+
+@Entrypoint
+def profiledFunction(x):
+    return x + 1
+
+profiledFunction(1)
+"""
+
+
+class TestCompilerProfile(unittest.TestCase):
+    def test_profile_records_each_phase(self):
+        runtime = Runtime.singleton()
+
+        profile = runtime.enableCompilerProfile()
+        profile.reset()
+
+        try:
+            def helper(x):
+                return x * 2
+
+            @Entrypoint
+            def profiledSum(x):
+                res = 0
+                for i in x:
+                    res += helper(i)
+                return res
+
+            self.assertEqual(profiledSum(ListOf(int)([1, 2, 3])), 12)
+        finally:
+            runtime.disableCompilerProfile()
+
+        report = profile.report()
+
+        for phase in ["typeInference", "lowering", "parse", "optimize", "finalize"]:
+            self.assertGreater(report['phases'][phase]['count'], 0, phase)
+            self.assertGreater(report['phases'][phase]['seconds'], 0.0, phase)
+
+        names = [f['name'] for f in report['functions']]
+
+        self.assertTrue(any('profiledSum' in name for name in names), names)
+        self.assertTrue(any('helper' in name for name in names), names)
+
+        for function in report['functions']:
+            self.assertAlmostEqual(
+                function['totalSeconds'],
+                function['typeInferenceSeconds'] + function['loweringSeconds'] + function['llvmSeconds']
+            )
+
+        totals = [f['totalSeconds'] for f in report['functions']]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+        # llvm time is shared out between the functions of each module
+        self.assertAlmostEqual(
+            sum(f['llvmSeconds'] for f in report['functions']),
+            sum(report['phases'][phase]['seconds'] for phase in ["parse", "optimize", "emit", "finalize"])
+        )
+
+        self.assertIn('profiledSum', profile.formatReport(5))
+
+    def test_llvm_time_is_shared_by_instruction_count(self):
+        profile = CompilerProfile()
+
+        profile.addLowering('a', 1.0, 30)
+        profile.addLowering('b', 1.0, 10)
+        profile.addModulePhase(['a', 'b'], 'optimize', 4.0)
+        profile.addTypeInferencePass('a', 0.5)
+        profile.addTypeInferencePass('a', 0.5)
+
+        report = profile.report()
+
+        self.assertEqual([f['name'] for f in report['functions']], ['a', 'b'])
+        self.assertEqual(report['functions'][0]['llvmSeconds'], 3.0)
+        self.assertEqual(report['functions'][0]['typeInferencePasses'], 2)
+        self.assertEqual(report['functions'][0]['totalSeconds'], 5.0)
+        self.assertEqual(report['functions'][1]['llvmSeconds'], 1.0)
+        self.assertEqual(report['modules'], [{'functionCount': 2, 'optimize': 4.0}])
+        self.assertEqual(set(report['phases']), set(PHASES))
+
+        profile.reset()
+
+        self.assertEqual(profile.report()['functions'], [])
+
+    def test_profile_environment_variable(self):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            env=dict(os.environ, TP_COMPILER_PROFILE="5"),
+            stderr=subprocess.PIPE,
+            check=True
+        )
+
+        stderr = output.stderr.decode("utf8")
+
+        self.assertIn("typed_python compiler profile", stderr)
+        self.assertIn("profiledFunction", stderr)
+
+    def test_malformed_profile_environment_variable(self):
+        self.assertEqual(_profileReportLength("5"), 5)
+
+        for value in ["yes", "1x", "0", "-3"]:
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(_profileReportLength(value), DEFAULT_PROFILE_REPORT_LENGTH)
+
+        # and a bad value doesn't stop anything compiling
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            env=dict(os.environ, TP_COMPILER_PROFILE="yes"),
+            stderr=subprocess.PIPE,
+            check=True
+        )
+
+        self.assertIn("profiledFunction", output.stderr.decode("utf8"))
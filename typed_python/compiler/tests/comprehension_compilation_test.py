@@ -0,0 +1,120 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import time
+import unittest
+
+from typed_python import Entrypoint, ListOf, Dict, Set, Tuple
+
+
+class TestComprehensionCompilation(unittest.TestCase):
+    def test_list_comprehension(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return [x * 2.5 for x in xs if x != 2]
+
+        res = f(ListOf(int)([1, 2, 3]))
+
+        self.assertEqual(type(res), ListOf(float))
+        self.assertEqual(res, [2.5, 7.5])
+
+    def test_list_comprehension_over_range(self):
+        @Entrypoint
+        def f(n: int):
+            return [str(i) for i in range(n)]
+
+        self.assertEqual(f(3), ["0", "1", "2"])
+        self.assertEqual(f(0), [])
+        self.assertEqual(type(f(3)), ListOf(str))
+
+    def test_list_comprehension_reserves_space(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return [x + 1 for x in xs].reserved()
+
+        self.assertEqual(f(ListOf(int)(range(100))), 100)
+
+    def test_set_comprehension(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return {x % 3 for x in xs}
+
+        res = f(ListOf(int)(range(10)))
+
+        self.assertEqual(type(res), Set(int))
+        self.assertEqual(set(res), {0, 1, 2})
+
+    def test_dict_comprehension(self):
+        @Entrypoint
+        def f(pairs: ListOf(Tuple(str, int))):
+            return {k: v * 2 for k, v in pairs if v > 0}
+
+        res = f(ListOf(Tuple(str, int))([("a", 1), ("b", -1), ("c", 2)]))
+
+        self.assertEqual(type(res), Dict(str, int))
+        self.assertEqual(dict(res), {"a": 2, "c": 4})
+
+    def test_several_for_clauses(self):
+        @Entrypoint
+        def f(rows: ListOf(ListOf(int)), scale: int):
+            return [x * scale for row in rows if len(row) > 1 for x in row if x > 0]
+
+        rows = ListOf(ListOf(int))([[1, -2, 3], [4], [5, 6]])
+
+        self.assertEqual(f(rows, 10), [10, 30, 50, 60])
+
+    def test_nested_comprehensions(self):
+        @Entrypoint
+        def f(n: int):
+            return [[i * j for j in range(i)] for i in range(n)]
+
+        res = f(4)
+
+        self.assertEqual(type(res), ListOf(ListOf(int)))
+        self.assertEqual(res, [[], [0], [0, 2], [0, 3, 6]])
+
+    def test_comprehension_variables_dont_leak(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            x = "outer"
+            ys = [x for x in xs]
+            return x, ys
+
+        self.assertEqual(f(ListOf(int)([1, 2])), ("outer", [1, 2]))
+
+    def test_exceptions_propagate(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return [10 // x for x in xs]
+
+        with self.assertRaises(ZeroDivisionError):
+            f(ListOf(int)([1, 0]))
+
+    def test_comprehension_performance(self):
+        @Entrypoint
+        def f(xs: ListOf(float)):
+            return [x * 2.0 for x in xs]
+
+        xs = ListOf(float)(range(1000000))
+
+        f(xs)
+
+        t0 = time.time()
+        res = f(xs)
+        t1 = time.time()
+
+        self.assertEqual(res[-1], 1999998.0)
+
+        # a million multiplies and appends should be nowhere near interpreter speed
+        self.assertLess(t1 - t0, 0.1)
@@ -12,11 +12,12 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typed_python import ListOf, Class, Member, Final, TupleOf, DisableCompiledCode, Int64, isCompiled
-from typed_python._types import touchCompiledSpecializations
+from typed_python import ListOf, Class, Member, Final, TupleOf, DisableCompiledCode, Int64, isCompiled, NamedTuple
+from typed_python._types import touchCompiledSpecializations, dispatchCacheStats
 from typed_python import Entrypoint, NotCompiled, Function
 from typed_python.compiler.runtime import Runtime, RuntimeEventVisitor
 from flaky import flaky
+import os
 import traceback
 import threading
 import time
@@ -94,6 +95,70 @@ class TestCompileSpecializedEntrypoints(unittest.TestCase):
         # I get about .5 seconds on my laptop
         self.assertTrue(time.time() - t0 < 3.0, time.time() - t0)
 
+    def test_dispatch_cache_serves_repeated_signatures(self):
+        def identity(x):
+            return x
+
+        compiledIdentity = Entrypoint(identity)
+
+        argTypes = [NamedTuple(**{"a%s" % i: int}) for i in range(32)]
+
+        # the first call compiles, and the second finds the specialization and caches it
+        for _ in range(2):
+            for T in argTypes:
+                compiledIdentity(T())
+
+        functionType = compiledIdentity.overloads[0].functionTypeObject
+        cacheSize, hitsBefore = dispatchCacheStats(functionType, 0)
+
+        self.assertEqual(cacheSize, len(argTypes))
+
+        compiledSignatures = []
+
+        class Visitor(RuntimeEventVisitor):
+            def onEntrypointSignature(self, function, inputWrappers):
+                compiledSignatures.append(inputWrappers)
+
+        with Visitor():
+            for T in reversed(argTypes):
+                self.assertEqual(compiledIdentity(T()), T())
+
+        # every call found its specialization in the cache, and nothing recompiled
+        self.assertEqual(compiledSignatures, [])
+        self.assertEqual(dispatchCacheStats(functionType, 0), (len(argTypes), hitsBefore + len(argTypes)))
+
+    @unittest.skipUnless(os.getenv("TP_RUN_BENCHMARKS"), "a benchmark: set TP_RUN_BENCHMARKS=1 to run it")
+    def test_dispatch_overhead_vs_specialization_count(self):
+        def identity(x):
+            return x
+
+        compiledIdentity = Entrypoint(identity)
+
+        argTypes = [NamedTuple(**{"a%s" % i: int}) for i in range(32)]
+
+        def timeCallsWith(T, count=100000):
+            arg = T()
+            compiledIdentity(arg)
+
+            t0 = time.time()
+            for _ in range(count):
+                compiledIdentity(arg)
+            return time.time() - t0
+
+        elapsedWithOne = timeCallsWith(argTypes[0])
+
+        for T in argTypes[1:]:
+            compiledIdentity(T())
+
+        # dispatching to the last specialization used to require checking all the others first.
+        elapsedFirst = timeCallsWith(argTypes[0])
+        elapsedLast = timeCallsWith(argTypes[-1])
+
+        print(
+            "per-call time with 1 specialization: ", elapsedWithOne / 100000,
+            "; with 32 specializations: ", elapsedFirst / 100000, "(first) ", elapsedLast / 100000, "(last)"
+        )
+
     def test_specialized_entrypoint_perf_difference(self):
         compiledAdd = Entrypoint(add)
 
@@ -506,3 +571,61 @@ class TestCompileSpecializedEntrypoints(unittest.TestCase):
         a = numpy.arange(100).astype('int')
 
         self.assertEqual(f(a), a.sum())
+
+    def test_background_compilation(self):
+        @Entrypoint(background=True)
+        def callIsCompiled(x):
+            return isCompiled()
+
+        runtime = Runtime.singleton()
+        runtime.waitForBackgroundCompilation()
+
+        # the compiler thread can't do anything while we hold the runtime lock
+        with runtime.lock:
+            self.assertFalse(callIsCompiled(1))
+            self.assertFalse(callIsCompiled(2))
+
+            # calling twice with the same signature only queues one compilation
+            self.assertEqual(runtime.pendingBackgroundCompilationCount(), 1)
+
+            self.assertFalse(callIsCompiled(1.5))
+            self.assertEqual(runtime.pendingBackgroundCompilationCount(), 2)
+
+            self.assertFalse(runtime.waitForBackgroundCompilation(timeout=0.1))
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertEqual(runtime.pendingBackgroundCompilationCount(), 0)
+
+        self.assertTrue(callIsCompiled(1))
+        self.assertTrue(callIsCompiled(1.5))
+
+    def test_background_flag_belongs_to_the_entrypoint(self):
+        def callIsCompiled(x):
+            return isCompiled()
+
+        inBackground = Entrypoint(background=True)(callIsCompiled)
+        blocking = Entrypoint(callIsCompiled)
+
+        self.assertTrue(inBackground.isBackgroundCompiled)
+        self.assertFalse(blocking.isBackgroundCompiled)
+
+        # wrapping the same python function without 'background' still compiles before returning
+        self.assertTrue(blocking(1))
+
+    def test_background_compilation_runtime_setting(self):
+        @Entrypoint
+        def callIsCompiled(x):
+            return isCompiled()
+
+        runtime = Runtime.singleton()
+
+        runtime.setBackgroundCompilation(True)
+        try:
+            with runtime.lock:
+                self.assertFalse(callIsCompiled(1))
+        finally:
+            runtime.setBackgroundCompilation(False)
+
+        runtime.waitForBackgroundCompilation()
+
+        self.assertTrue(callIsCompiled(1))
@@ -0,0 +1,287 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import time
+import unittest
+
+from typed_python import Entrypoint, ListOf, Tuple, Dict
+
+
+def total(iterable):
+    res = 0
+    for x in iterable:
+        res += x
+    return res
+
+
+def square(x):
+    return x * x
+
+
+def isOdd(x):
+    return x % 2 == 1
+
+
+def countTo(n):
+    i = 0
+    while i < n:
+        yield i
+        i += 1
+
+
+def countToInTheInterpreter(n):
+    try:
+        for i in range(n):
+            yield i
+    finally:
+        pass
+
+
+def evensThenOdds(xs):
+    for x in xs:
+        if x % 2 == 0:
+            yield x
+    for x in xs:
+        if x % 2 == 1:
+            yield x
+
+
+def fibonacci(limit, stopAt):
+    a, b = 0, 1
+    while True:
+        if a > limit:
+            break
+        if a == stopAt:
+            return
+        yield a
+        a, b = b, a + b
+
+
+def nonzeroCells(rows):
+    for i in range(len(rows)):
+        for j in range(len(rows[i])):
+            if rows[i][j] == 0:
+                continue
+            yield i * 10 + j
+
+
+def checkedReciprocalsTimesTen(xs):
+    for x in xs:
+        if x == 0:
+            raise ValueError("can't take the reciprocal of zero")
+        yield 10 // x
+
+
+class TestGeneratorExpressionCompilation(unittest.TestCase):
+    def test_iterate_generator_expression(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            res = ListOf(int)()
+            for y in (x * 2 for x in xs if x > 1):
+                res.append(y)
+            return res
+
+        self.assertEqual(f(ListOf(int)([1, 2, 3])), [4, 6])
+        self.assertEqual(f(ListOf(int)()), [])
+
+    def test_streaming_pipeline(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return total(square(x) for x in xs if isOdd(x))
+
+        xs = ListOf(int)(range(10))
+
+        self.assertEqual(f(xs), sum(square(x) for x in xs if isOdd(x)))
+
+    def test_nested_generators(self):
+        @Entrypoint
+        def f(n: int, k: int):
+            return total(y + k for y in (x * x for x in range(n)) if y % 2 == 0)
+
+        self.assertEqual(f(10, 1), sum(y + 1 for y in (x * x for x in range(10)) if y % 2 == 0))
+
+    def test_generator_reading_the_enclosing_element(self):
+        @Entrypoint
+        def f(rows: ListOf(ListOf(int))):
+            return total(total(x * len(row) for x in row) for row in rows)
+
+        rows = ListOf(ListOf(int))([[1, 2], [3], []])
+
+        self.assertEqual(f(rows), 1 * 2 + 2 * 2 + 3 * 1)
+
+    def test_construct_list_of_from_generator(self):
+        @Entrypoint
+        def f(xs: ListOf(int), offset: float):
+            return ListOf(float)(x + offset for x in xs if x != 2)
+
+        self.assertEqual(f(ListOf(int)([1, 2, 3]), 0.5), [1.5, 3.5])
+
+    def test_tuple_targets(self):
+        @Entrypoint
+        def f(pairs: ListOf(Tuple(int, str))):
+            return ListOf(str)(s * i for i, s in pairs)
+
+        self.assertEqual(f(ListOf(Tuple(int, str))([(1, "a"), (2, "b")])), ["a", "bb"])
+
+    def test_generator_over_dict(self):
+        @Entrypoint
+        def f(d: Dict(str, int)):
+            return total(d[k] for k in d if k != "skip")
+
+        self.assertEqual(f(Dict(str, int)({"a": 1, "b": 2, "skip": 100})), 3)
+
+    def test_exceptions_propagate(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return total(10 // x for x in xs)
+
+        self.assertEqual(f(ListOf(int)([1, 2])), 15)
+
+        with self.assertRaises(ZeroDivisionError):
+            f(ListOf(int)([1, 0]))
+
+    def test_generator_functions(self):
+        @Entrypoint
+        def f(n: int):
+            res = ListOf(int)()
+            for i in countTo(n):
+                res.append(i)
+            return res
+
+        self.assertEqual(f(3), [0, 1, 2])
+        self.assertEqual(f(0), [])
+
+    def test_generator_functions_with_several_yields(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return ListOf(int)(evensThenOdds(xs))
+
+        xs = ListOf(int)([1, 2, 3, 4, 5])
+
+        self.assertEqual(f(xs), list(evensThenOdds(xs)))
+
+    def test_generator_functions_with_while_break_and_return(self):
+        @Entrypoint
+        def f(limit: int, stopAt: int):
+            return ListOf(int)(fibonacci(limit, stopAt))
+
+        for limit, stopAt in [(100, 1000), (100, 21), (0, 5)]:
+            self.assertEqual(f(limit, stopAt), list(fibonacci(limit, stopAt)))
+
+    def test_generator_functions_with_nested_loops(self):
+        @Entrypoint
+        def f(rows: ListOf(ListOf(int))):
+            return ListOf(int)(nonzeroCells(rows))
+
+        rows = ListOf(ListOf(int))([[0, 1], [], [2, 0, 3]])
+
+        self.assertEqual(f(rows), list(nonzeroCells(rows)))
+
+    def test_generator_functions_feed_other_generators(self):
+        @Entrypoint
+        def f(n: int):
+            return total(x * x for x in countTo(n) if x % 2 == 1)
+
+        self.assertEqual(f(10), sum(x * x for x in range(10) if x % 2 == 1))
+
+    def test_generator_functions_raise(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            res = ListOf(int)()
+            for x in checkedReciprocalsTimesTen(xs):
+                res.append(x)
+            return res
+
+        self.assertEqual(f(ListOf(int)([1, 2])), [10, 5])
+
+        with self.assertRaisesRegex(ValueError, "zero"):
+            f(ListOf(int)([1, 0]))
+
+    def test_unsupported_generator_functions_run_in_the_interpreter(self):
+        def withTry(n):
+            try:
+                for i in range(n):
+                    yield i
+            finally:
+                pass
+
+        @Entrypoint
+        def f(n: int):
+            res = ListOf(int)()
+            for i in withTry(n):
+                res.append(i)
+            return res
+
+        self.assertEqual(f(3), [0, 1, 2])
+
+    def test_generator_functions_reading_unassigned_locals_raise(self):
+        def readsTooEarly(n):
+            if n > 0:
+                x = n
+            yield x
+
+        @Entrypoint
+        def f(n: int):
+            res = ListOf(int)()
+            for i in readsTooEarly(n):
+                res.append(i)
+            return res
+
+        self.assertEqual(f(3), [3])
+
+        with self.assertRaises(UnboundLocalError):
+            f(0)
+
+    def test_generator_functions_perf(self):
+        @Entrypoint
+        def compiledGenerator(n: int):
+            return total(countTo(n))
+
+        @Entrypoint
+        def interpretedGenerator(n: int):
+            return total(countToInTheInterpreter(n))
+
+        compiledGenerator(1)
+        interpretedGenerator(1)
+
+        t0 = time.time()
+        compiledGenerator(1000000)
+        t1 = time.time()
+        interpretedGenerator(1000000)
+        t2 = time.time()
+
+        # the compiled generator never touches a python object
+        self.assertLess(t1 - t0, (t2 - t1) * 0.5)
+
+    def test_streaming_is_faster_than_materializing(self):
+        @Entrypoint
+        def streamed(xs: ListOf(float)):
+            return total(x * 2.0 for x in xs if x > 0.5)
+
+        @Entrypoint
+        def materialized(xs: ListOf(float)):
+            return total(ListOf(float)(x * 2.0 for x in xs if x > 0.5))
+
+        xs = ListOf(float)([i / 1000000 for i in range(1000000)])
+
+        self.assertEqual(streamed(xs), materialized(xs))
+
+        t0 = time.time()
+        streamed(xs)
+        t1 = time.time()
+        materialized(xs)
+        t2 = time.time()
+
+        # streaming skips allocating and filling the intermediate list
+        self.assertLess(t1 - t0, (t2 - t1) * 1.5)
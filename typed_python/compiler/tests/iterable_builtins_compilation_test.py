@@ -0,0 +1,247 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import time
+import unittest
+
+from typed_python import Entrypoint, ListOf, TupleOf, Tuple, Dict, ConstDict
+
+
+def negate(x):
+    return -x
+
+
+def firstElement(t):
+    return t[0]
+
+
+class TestIterableBuiltinsCompilation(unittest.TestCase):
+    def test_min_and_max(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return min(xs), max(xs), min(xs, key=negate), max(xs, key=abs)
+
+        xs = ListOf(int)([3, -7, 5, 1])
+
+        self.assertEqual(f(xs), (min(xs), max(xs), min(xs, key=negate), max(xs, key=abs)))
+
+    def test_min_and_max_take_the_first_best_element(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return min(xs, key=abs), max(xs, key=abs)
+
+        self.assertEqual(f(ListOf(int)([2, -1, 1, -2])), (-1, 2))
+
+    def test_min_and_max_of_empty_sequences(self):
+        @Entrypoint
+        def minOf(xs: ListOf(float)):
+            return min(xs)
+
+        @Entrypoint
+        def maxOrDefault(xs: ListOf(float)):
+            return max(xs, default=-1.0)
+
+        with self.assertRaisesRegex(ValueError, "empty sequence"):
+            minOf(ListOf(float)())
+
+        self.assertEqual(maxOrDefault(ListOf(float)()), -1.0)
+        self.assertEqual(maxOrDefault(ListOf(float)([1.5, 2.5])), 2.5)
+
+    def test_min_and_max_of_arguments(self):
+        @Entrypoint
+        def f(x: int, y: int, z: int):
+            return min(x, y, z), max(x, y, z), max(x, y, z, key=negate)
+
+        self.assertEqual(f(3, 1, 2), (1, 3, 1))
+        self.assertEqual(f(2, 2, 5), (2, 5, 2))
+
+        @Entrypoint
+        def mixed(x: int, y: float):
+            return max(x, y)
+
+        self.assertEqual(mixed(1, 2.5), 2.5)
+        self.assertEqual(mixed(3, 2.5), 3)
+        self.assertIs(type(mixed(3, 2.5)), int)
+
+    def test_sum(self):
+        @Entrypoint
+        def sumList(xs: ListOf(float)):
+            return sum(xs)
+
+        @Entrypoint
+        def sumRange(n: int):
+            return sum(range(n), 10)
+
+        @Entrypoint
+        def sumGenerator(xs: ListOf(int)):
+            return sum(x * x for x in xs)
+
+        self.assertEqual(sumList(ListOf(float)([1.5, 2.5])), 4.0)
+        self.assertEqual(sumList(ListOf(float)()), 0.0)
+        self.assertIs(type(sumList(ListOf(float)())), float)
+        self.assertEqual(sumRange(10), sum(range(10), 10))
+        self.assertEqual(sumGenerator(ListOf(int)([1, 2, 3])), 14)
+
+    def test_sum_of_strings_throws(self):
+        @Entrypoint
+        def f(xs: ListOf(str)):
+            return sum(xs, "")
+
+        with self.assertRaisesRegex(TypeError, "can't sum strings"):
+            f(ListOf(str)(["a"]))
+
+    def test_any_and_all(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return any(xs), all(xs), any(x > 2 for x in xs)
+
+        for xs in [[], [0], [1, 2], [0, 3], [1, 2, 3]]:
+            self.assertEqual(f(ListOf(int)(xs)), (any(xs), all(xs), any(x > 2 for x in xs)), xs)
+
+    def test_sorted(self):
+        @Entrypoint
+        def f(xs: ListOf(int)):
+            return sorted(xs), sorted(xs, reverse=True), sorted(xs, key=negate)
+
+        for n in [0, 1, 2, 7, 100]:
+            xs = ListOf(int)([(i * 7919) % 31 for i in range(n)])
+
+            self.assertEqual(f(xs), (sorted(xs), sorted(xs, reverse=True), sorted(xs, key=negate)))
+
+    def test_sorted_is_stable(self):
+        @Entrypoint
+        def f(xs: ListOf(Tuple(int, int))):
+            return sorted(xs, key=firstElement), sorted(xs, key=firstElement, reverse=True)
+
+        xs = ListOf(Tuple(int, int))([(i % 3, i) for i in range(20)])
+
+        forward, backward = f(xs)
+
+        self.assertEqual(forward, sorted(xs, key=firstElement))
+        self.assertEqual(backward, sorted(xs, key=firstElement, reverse=True))
+
+    def test_sorted_dict_views(self):
+        @Entrypoint
+        def f(d: Dict(str, int)):
+            return sorted(d), sorted(d.values()), sorted(d.keys(), reverse=True)
+
+        d = Dict(str, int)({"b": 2, "c": 1, "a": 3})
+
+        self.assertEqual(f(d), (["a", "b", "c"], [1, 2, 3], ["c", "b", "a"]))
+
+    def test_const_dict(self):
+        @Entrypoint
+        def f(d: ConstDict(int, float)):
+            return max(d), sum(d.values()), any(d)
+
+        d = ConstDict(int, float)({1: 1.5, 3: 2.0, 2: 0.5})
+
+        self.assertEqual(f(d), (3, 4.0, True))
+
+    def test_enumerate(self):
+        @Entrypoint
+        def f(xs: ListOf(str), start: int):
+            res = ListOf(str)()
+            for i, x in enumerate(xs, start):
+                res.append(str(i) + x)
+            return res
+
+        self.assertEqual(f(ListOf(str)(["a", "b"]), 0), ["0a", "1b"])
+        self.assertEqual(f(ListOf(str)(["a", "b"]), 5), ["5a", "6b"])
+        self.assertEqual(f(ListOf(str)(), 0), [])
+
+    def test_zip(self):
+        @Entrypoint
+        def f(xs: ListOf(int), ys: TupleOf(float)):
+            res = 0.0
+            for i, x, y in zip(range(100), xs, ys):
+                res += i * x * y
+            return res
+
+        xs = ListOf(int)([1, 2, 3])
+        ys = TupleOf(float)([0.5, 1.5])
+
+        self.assertEqual(f(xs, ys), sum(i * x * y for i, x, y in zip(range(100), xs, ys)))
+
+    def test_zip_dict_items(self):
+        @Entrypoint
+        def f(d: Dict(int, str)):
+            res = ListOf(str)()
+            for i, (k, v) in zip(range(10), d.items()):
+                res.append(str(i + k) + v)
+            return res
+
+        self.assertEqual(f(Dict(int, str)({1: "a", 2: "b"})), ["1a", "3b"])
+
+    def test_reversed(self):
+        @Entrypoint
+        def f(xs: ListOf(int), ys: TupleOf(str), n: int):
+            res = ListOf(str)()
+            for x in reversed(xs):
+                res.append(str(x))
+            for y in reversed(ys):
+                res.append(y)
+            for i in reversed(range(n)):
+                res.append(str(i))
+            return res
+
+        self.assertEqual(
+            f(ListOf(int)([1, 2]), TupleOf(str)(["a", "b"]), 3),
+            ["2", "1", "b", "a", "2", "1", "0"]
+        )
+        self.assertEqual(f(ListOf(int)(), TupleOf(str)(), 0), [])
+
+    def test_builtins_on_objects_run_in_the_interpreter(self):
+        @Entrypoint
+        def f(x: object):
+            return sorted(x), sum(x), max(x)
+
+        self.assertEqual(f([3, 1, 2]), ([1, 2, 3], 6, 3))
+
+    def test_unsupported_loop_targets_say_what_they_are(self):
+        @Entrypoint
+        def assignsToAttribute(x: object, xs: ListOf(int)):
+            for x.y in xs:
+                pass
+
+        @Entrypoint
+        def assignsToSubscript(x: ListOf(int), xs: ListOf(int)):
+            for x[0] in xs:
+                pass
+
+        with self.assertRaisesRegex(Exception, "loops that assign to Attribute"):
+            assignsToAttribute(None, ListOf(int)([1]))
+
+        with self.assertRaisesRegex(Exception, "loops that assign to Subscript"):
+            assignsToSubscript(ListOf(int)([0]), ListOf(int)([1]))
+
+    def test_sum_perf(self):
+        @Entrypoint
+        def f(xs: ListOf(float)):
+            return sum(xs)
+
+        xs = ListOf(float)(range(1000000))
+
+        f(xs)
+
+        t0 = time.time()
+        compiledRes = f(xs)
+        t1 = time.time()
+        interpretedRes = sum(xs)
+        t2 = time.time()
+
+        self.assertEqual(compiledRes, interpretedRes)
+
+        # the compiled sum is a tight loop over the raw floats
+        self.assertLess((t1 - t0) * 5, t2 - t1)
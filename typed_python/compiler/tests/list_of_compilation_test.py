@@ -12,14 +12,19 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typed_python import ListOf, Function, TupleOf, OneOf, Compiled
+from typed_python import ListOf, Function, TupleOf, OneOf, Compiled, Entrypoint, UInt8, Dict
 import typed_python._types as _types
+import os
 import unittest
 import time
 import numpy
 import psutil
 
 
+def negate(x):
+    return -x
+
+
 class TestListOfCompilation(unittest.TestCase):
     def checkFunction(self, f, argsToCheck):
         f_fast = Compiled(f)
@@ -434,3 +439,566 @@ class TestListOfCompilation(unittest.TestCase):
         self.assertTrue(chkListListInt(x))
         x.append(ListOf(int)())
         self.assertFalse(chkListListInt(x))
+
+    def test_many_small_containers(self):
+        # counts are 64 bits wide, and compiled code has to read and write them
+        # (and the dict's hash-table slots) at the same width as the interpreter.
+        @Compiled
+        def makeManySmallLists(ct: int):
+            total = 0
+            for i in range(ct):
+                aList = ListOf(int)()
+                aList.append(i)
+                aList.append(i + 1)
+                total += len(aList) + aList[1]
+            return total
+
+        @Compiled
+        def makeManySmallDicts(ct: int):
+            total = 0
+            for i in range(ct):
+                aDict = Dict(int, int)()
+                aDict[i] = i
+                aDict[i + 1] = i
+                total += len(aDict) + aDict[i + 1]
+            return total
+
+        ct = 1000
+
+        self.assertEqual(makeManySmallLists(ct), sum(2 + i + 1 for i in range(ct)))
+        self.assertEqual(makeManySmallDicts(ct), sum(2 + i for i in range(ct)))
+
+    def test_container_counts_agree_with_the_interpreter(self):
+        @Compiled
+        def growList(x: ListOf(int), ct: int):
+            for i in range(ct):
+                x.append(i)
+            x.reserve(len(x) * 3)
+
+        @Compiled
+        def churnDict(d: Dict(int, int), ct: int):
+            for i in range(ct):
+                d[i] = i * 2
+            for i in range(0, ct, 3):
+                del d[i]
+
+        aList = ListOf(int)()
+        growList(aList, 10000)
+
+        self.assertEqual(len(aList), 10000)
+        self.assertEqual(aList.reserved(), 30000)
+        self.assertEqual(aList[9999], 9999)
+
+        aDict = Dict(int, int)()
+        churnDict(aDict, 10000)
+
+        expected = {i: i * 2 for i in range(10000) if i % 3}
+
+        self.assertEqual(len(aDict), len(expected))
+        self.assertEqual(dict(aDict), expected)
+
+    @unittest.skipUnless(os.getenv("TP_RUN_BENCHMARKS"), "a benchmark: set TP_RUN_BENCHMARKS=1 to run it")
+    def test_small_container_perf(self):
+        @Compiled
+        def makeManySmallLists(ct: int):
+            total = 0
+            for i in range(ct):
+                aList = ListOf(int)()
+                aList.append(i)
+                aList.append(i + 1)
+                total += len(aList) + aList[1]
+            return total
+
+        @Compiled
+        def makeManySmallDicts(ct: int):
+            total = 0
+            for i in range(ct):
+                aDict = Dict(int, int)()
+                aDict[i] = i
+                aDict[i + 1] = i
+                total += len(aDict) + aDict[i + 1]
+            return total
+
+        ct = 1000000
+
+        makeManySmallLists(1)
+        makeManySmallDicts(1)
+
+        t0 = time.time()
+        makeManySmallLists(ct)
+        t1 = time.time()
+        makeManySmallDicts(ct)
+        t2 = time.time()
+
+        print(f"{ct} small lists took {t1 - t0}. {ct} small dicts took {t2 - t1}")
+
+    @unittest.skipUnless(os.getenv("TP_RUN_BENCHMARKS"), "a benchmark: set TP_RUN_BENCHMARKS=1 to run it")
+    def test_large_container_perf(self):
+        @Compiled
+        def fill(x: ListOf(int)):
+            for i in range(len(x)):
+                x[i] = i
+
+        @Compiled
+        def sumOf(x: ListOf(int)):
+            res = 0
+            for i in x:
+                res += i
+            return res
+
+        aList = ListOf(int)()
+        aList.resize(50000000)
+
+        t0 = time.time()
+        fill(aList)
+        sumOf(aList)
+        t1 = time.time()
+
+        print(f"filling and summing {len(aList)} ints took {t1 - t0}")
+
+    def test_list_sort(self):
+        @Compiled
+        def sortInts(x: ListOf(int), reverse: bool):
+            x.sort(reverse=reverse)
+
+        @Compiled
+        def sortStrs(x: ListOf(str), reverse: bool):
+            x.sort(reverse=reverse)
+
+        @Compiled
+        def sortByKey(x: ListOf(int)):
+            x.sort(key=negate)
+
+        values = [(i * 7919) % 101 - 50 for i in range(200)]
+
+        for reverse in [False, True]:
+            aList = ListOf(int)(values)
+            sortInts(aList, reverse)
+            self.assertEqual(aList, sorted(values, reverse=reverse))
+
+            strs = ListOf(str)([str(v) for v in values])
+            sortStrs(strs, reverse)
+            self.assertEqual(strs, sorted([str(v) for v in values], reverse=reverse))
+
+        aList = ListOf(int)(values)
+        sortByKey(aList)
+        self.assertEqual(aList, sorted(values, key=negate))
+
+    def test_list_argsort(self):
+        @Compiled
+        def argsort(x: ListOf(float)):
+            return x.argsort(), x.argsort(reverse=True), x.argsort(key=negate)
+
+        self.assertEqual(argsort(ListOf(float)([3.0, 1.0, 2.0, 1.0])), ([1, 3, 2, 0], [0, 2, 1, 3], [0, 2, 1, 3]))
+
+    def test_list_argsort_orders_nans_like_the_interpreter(self):
+        @Compiled
+        def argsort(x: ListOf(float), reverse: bool):
+            return x.argsort(reverse=reverse)
+
+        @Compiled
+        def sortInPlace(x: ListOf(float), reverse: bool):
+            x.sort(reverse=reverse)
+
+        nan = float("nan")
+        values = ListOf(float)([2.0, nan, -1.0, 0.0, nan, -0.0, 2.0])
+
+        for reverse in [False, True]:
+            order = argsort(values, reverse)
+            self.assertEqual(order, values.argsort(reverse=reverse))
+
+            inPlace = ListOf(float)(values)
+            sortInPlace(inPlace, reverse)
+            self.assertEqual(
+                [str(values[i]) for i in order],
+                [str(x) for x in inPlace]
+            )
+
+    def test_list_bisect(self):
+        import bisect
+
+        @Compiled
+        def bisectBoth(x: ListOf(float), value: float):
+            return x.bisect_left(value), x.bisect_right(value), x.bisect_left(value, 2), x.bisect_right(value, hi=3)
+
+        values = [1.0, 2.0, 2.0, 2.0, 5.0, 7.0]
+
+        for value in range(9):
+            self.assertEqual(
+                bisectBoth(ListOf(float)(values), value),
+                (
+                    bisect.bisect_left(values, value),
+                    bisect.bisect_right(values, value),
+                    bisect.bisect_left(values, value, 2),
+                    bisect.bisect_right(values, value, hi=3)
+                )
+            )
+
+    def test_list_partial_sort_and_nth_element(self):
+        @Compiled
+        def smallest(x: ListOf(int), n: int):
+            x.partialSort(n)
+
+        @Compiled
+        def nth(x: ListOf(str), n: int):
+            x.nthElement(n)
+            return x[n]
+
+        values = [(i * 7919) % 101 for i in range(100)]
+
+        aList = ListOf(int)(values)
+        smallest(aList, 10)
+        self.assertEqual(list(aList)[:10], sorted(values)[:10])
+
+        strs = [str(v) for v in values]
+        self.assertEqual(nth(ListOf(str)(strs), 37), sorted(strs)[37])
+        self.assertEqual(nth(ListOf(str)(strs), -1), max(strs))
+
+        with self.assertRaises(IndexError):
+            nth(ListOf(str)(strs), 100)
+
+    def test_list_sort_perf(self):
+        @Compiled
+        def sortIt(x: ListOf(float)):
+            x.sort()
+
+        aList = ListOf(float)(numpy.random.uniform(size=10000000))
+        asArray = aList.toArray()
+
+        t0 = time.time()
+        sortIt(aList)
+        t1 = time.time()
+        asArray.sort()
+        t2 = time.time()
+
+        print(f"sorting {len(aList)} floats took {t1 - t0}. numpy took {t2 - t1}")
+
+        self.assertEqual(aList.toArray().tolist(), asArray.tolist())
+        self.assertLess(t1 - t0, (t2 - t1) * 3)
+
+    def test_list_slicing(self):
+        @Compiled
+        def sliceBetween(x: ListOf(str), a: int, b: int):
+            return x[a:b]
+
+        @Compiled
+        def sliceFrom(x: ListOf(str), a: int):
+            return x[a:]
+
+        @Compiled
+        def sliceTo(x: ListOf(str), b: int):
+            return x[:b]
+
+        @Compiled
+        def sliceWithStep(x: ListOf(str), a: int, b: int, step: int):
+            return x[a:b:step], x[::step]
+
+        values = [str(i) for i in range(10)]
+        aList = ListOf(str)(values)
+
+        for a in range(-12, 13):
+            self.assertEqual(sliceFrom(aList, a), values[a:])
+            self.assertEqual(sliceTo(aList, a), values[:a])
+
+            for b in range(-12, 13):
+                self.assertEqual(sliceBetween(aList, a, b), values[a:b])
+
+                for step in [-3, -1, 2]:
+                    self.assertEqual(sliceWithStep(aList, a, b, step), (values[a:b:step], values[::step]))
+
+        self.assertIs(type(sliceBetween(aList, 1, 3)), ListOf(str))
+
+        with self.assertRaisesRegex(ValueError, "slice step cannot be zero"):
+            sliceWithStep(aList, 0, 1, 0)
+
+    def test_list_slice_assignment(self):
+        @Compiled
+        def assign(x: ListOf(int), a: int, b: int, y: ListOf(int)):
+            x[a:b] = y
+
+        @Compiled
+        def assignWithStep(x: ListOf(int), a: int, b: int, step: int, y: ListOf(int)):
+            x[a:b:step] = y
+
+        @Compiled
+        def assignToItself(x: ListOf(int)):
+            x[1:2] = x
+
+        @Compiled
+        def appendToSlice(x: ListOf(int), a: int, b: int, y: ListOf(int)):
+            x[a:b] += y
+
+        values = list(range(8))
+
+        for a in range(-9, 10):
+            for b in range(-9, 10):
+                for newValues in [[], [100], [100, 101, 102]]:
+                    aList = ListOf(int)(values)
+                    assign(aList, a, b, ListOf(int)(newValues))
+
+                    expected = list(values)
+                    expected[a:b] = newValues
+                    self.assertEqual(aList, expected)
+
+                    aList = ListOf(int)(values)
+                    appendToSlice(aList, a, b, ListOf(int)(newValues))
+
+                    expected = list(values)
+                    expected[a:b] += newValues
+                    self.assertEqual(aList, expected)
+
+                for step in [-2, 3]:
+                    newValues = list(range(100, 100 + len(values[a:b:step])))
+
+                    aList = ListOf(int)(values)
+                    assignWithStep(aList, a, b, step, ListOf(int)(newValues))
+
+                    expected = list(values)
+                    expected[a:b:step] = newValues
+                    self.assertEqual(aList, expected)
+
+        with self.assertRaisesRegex(ValueError, "attempt to assign sequence of size 1 to extended slice of size 4"):
+            assignWithStep(ListOf(int)(values), 0, 8, 2, ListOf(int)([1]))
+
+        aList = ListOf(int)(values)
+        assignToItself(aList)
+
+        expected = list(values)
+        expected[1:2] = expected
+        self.assertEqual(aList, expected)
+
+    def test_list_slice_deletion(self):
+        @Compiled
+        def deleteBetween(x: ListOf(str), a: int, b: int):
+            del x[a:b]
+
+        @Compiled
+        def deleteWithStep(x: ListOf(str), a: int, b: int, step: int):
+            del x[a:b:step]
+
+        @Compiled
+        def deleteEveryOther(x: ListOf(str)):
+            del x[::2]
+
+        values = [str(i) for i in range(8)]
+
+        for a in range(-9, 10):
+            for b in range(-9, 10):
+                aList = ListOf(str)(values)
+                deleteBetween(aList, a, b)
+
+                expected = list(values)
+                del expected[a:b]
+                self.assertEqual(aList, expected)
+
+                for step in [-3, -1, 2]:
+                    aList = ListOf(str)(values)
+                    deleteWithStep(aList, a, b, step)
+
+                    expected = list(values)
+                    del expected[a:b:step]
+                    self.assertEqual(aList, expected)
+
+        aList = ListOf(str)(values)
+        deleteEveryOther(aList)
+        self.assertEqual(aList, values[1::2])
+
+    def test_list_view(self):
+        @Compiled
+        def describeView(x: ListOf(int), a: int, b: int):
+            v = x.view(a, b)
+            return len(v), ListOf(int)(v), ListOf(int)(v.view(1, -1)), ListOf(int)(x.view(a))
+
+        @Compiled
+        def viewItem(x: ListOf(int), i: int):
+            return x.view(2, 5)[i]
+
+        values = list(range(10))
+
+        for a in range(-11, 12):
+            for b in range(-11, 12):
+                window = values[a:b]
+
+                self.assertEqual(
+                    describeView(ListOf(int)(values), a, b),
+                    (len(window), window, window[1:-1], values[a:])
+                )
+
+        self.assertEqual(viewItem(ListOf(int)(values), 0), 2)
+        self.assertEqual(viewItem(ListOf(int)(values), -1), 4)
+
+        with self.assertRaisesRegex(IndexError, "view index out of range"):
+            viewItem(ListOf(int)(values), 3)
+
+    def test_list_view_windowed_sums(self):
+        @Compiled
+        def windowedSums(x: ListOf(float), width: int):
+            res = ListOf(float)()
+            for i in range(len(x) - width + 1):
+                res.append(sum(x.view(i, i + width)))
+            return res
+
+        values = [float(i % 7) for i in range(100)]
+
+        self.assertEqual(
+            windowedSums(ListOf(float)(values), 5),
+            [sum(values[i:i + 5]) for i in range(96)]
+        )
+
+    def test_list_view_reads_through_to_the_list(self):
+        @Compiled
+        def viewAfterChanges(x: ListOf(int)):
+            v = x.view(2, 8)
+            x[2] = 100
+
+            res = ListOf(int)()
+            for e in v:
+                res.append(e)
+            return len(v), res
+
+        @Compiled
+        def viewOutlivesItsList(n: int):
+            x = ListOf(str)()
+            for i in range(n):
+                x.append(str(i))
+
+            v = x.view(1)
+
+            # the view holds the only remaining reference to the list
+            x = ListOf(str)()
+
+            return ListOf(str)(v)
+
+        self.assertEqual(viewAfterChanges(ListOf(int)(range(10))), (6, [100, 3, 4, 5, 6, 7]))
+        self.assertEqual(viewOutlivesItsList(5), ["1", "2", "3", "4"])
+
+    def test_list_view_locks_the_list_size(self):
+        @Compiled
+        def appendWhileViewed(x: ListOf(int)):
+            v = x.view(1)
+            x.append(len(v))
+
+        @Compiled
+        def appendAfterView(x: ListOf(int)):
+            x.view(1)
+            x.append(1)
+
+        aList = ListOf(int)(range(5))
+
+        with self.assertRaises(BufferError):
+            appendWhileViewed(aList)
+
+        # the view is gone once the function exits, so we're unlocked again
+        appendAfterView(aList)
+        self.assertEqual(aList, [0, 1, 2, 3, 4, 1])
+
+    def test_list_view_leaves_compiled_code(self):
+        @Entrypoint
+        def makeView(x: ListOf(float), a: int, b: int):
+            return x.view(a, b)
+
+        aList = ListOf(float)(range(10))
+        refcountBefore = _types.refcount(aList)
+
+        v = makeView(aList, 2, 5)
+
+        self.assertIsInstance(v, _types.ListOfView)
+        self.assertEqual(list(v), [2.0, 3.0, 4.0])
+        self.assertEqual(_types.refcount(aList), refcountBefore + 1)
+
+        # it shares the list's buffer
+        aList[2] = 100.0
+        self.assertEqual(numpy.asarray(v).tolist(), [100.0, 3.0, 4.0])
+
+        with self.assertRaises(BufferError):
+            aList.append(1.0)
+
+        v = None
+        self.assertEqual(_types.refcount(aList), refcountBefore)
+        aList.append(1.0)
+
+    def test_list_exported_buffers_lock_size(self):
+        @Compiled
+        def appendTo(x: ListOf(float), y: float):
+            x.append(y)
+
+        @Compiled
+        def sortAndSum(x: ListOf(float)):
+            x.sort()
+            res = 0.0
+            for e in x:
+                res += e
+            return res
+
+        @Compiled
+        def assignSlice(x: ListOf(float), a: int, b: int, y: ListOf(float)):
+            x[a:b] = y
+
+        @Compiled
+        def deleteSlice(x: ListOf(float), a: int, b: int, step: int):
+            del x[a:b:step]
+
+        aList = ListOf(float)([3.0, 1.0, 2.0])
+        arr = numpy.asarray(aList)
+
+        with self.assertRaises(BufferError):
+            appendTo(aList, 4.0)
+
+        with self.assertRaises(BufferError):
+            assignSlice(aList, 0, 1, ListOf(float)([3.0, 3.0]))
+
+        for step in [1, 2]:
+            with self.assertRaises(BufferError):
+                deleteSlice(aList, 0, 2, step)
+
+        self.assertEqual(aList, [3.0, 1.0, 2.0])
+
+        # a slice assignment that doesn't change our size is fine
+        assignSlice(aList, 0, 1, ListOf(float)([3.0]))
+        deleteSlice(aList, 1, 1, 1)
+
+        # the compiled code sorts the memory numpy is looking at
+        self.assertEqual(sortAndSum(aList), 6.0)
+        self.assertEqual(arr.tolist(), [1.0, 2.0, 3.0])
+
+        arr = None
+        appendTo(aList, 4.0)
+        self.assertEqual(aList, [1.0, 2.0, 3.0, 4.0])
+
+        # adopted buffers work in compiled code, but can never change size
+        arr = numpy.array([5.0, 4.0])
+        adopted = ListOf(float).fromBuffer(arr)
+
+        self.assertEqual(sortAndSum(adopted), 9.0)
+        self.assertEqual(arr.tolist(), [4.0, 5.0])
+
+        with self.assertRaises(BufferError):
+            appendTo(adopted, 1.0)
+
+    @unittest.skipIf(
+        psutil.virtual_memory().available < 8 * 1024 ** 3,
+        "needs enough memory to hold a list with more than 2**31 elements"
+    )
+    def test_list_with_more_than_2_to_the_31_elements(self):
+        ct = 2 ** 31 + 10
+
+        @Compiled
+        def setLast(x: ListOf(UInt8)):
+            x[len(x) - 1] = 7
+            return len(x)
+
+        @Compiled
+        def appendOne(x: ListOf(UInt8)):
+            x.append(UInt8(9))
+            return len(x)
+
+        aList = ListOf(UInt8)()
+        aList.resize(ct)
+
+        self.assertEqual(len(aList), ct)
+        self.assertEqual(setLast(aList), ct)
+        self.assertEqual(aList[ct - 1], 7)
+        self.assertEqual(aList[-1], 7)
+
+        self.assertEqual(appendOne(aList), ct + 1)
+        self.assertEqual(aList[ct], 9)
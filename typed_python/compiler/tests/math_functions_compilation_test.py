@@ -18,7 +18,7 @@ import time
 import numpy
 
 from typed_python import (
-    Float32, UInt64, UInt32, UInt16, UInt8, Int32, Int16, Int8
+    Float32, UInt64, UInt32, UInt16, UInt8, Int32, Int16, Int8, ListOf
 )
 
 from typed_python import Entrypoint
@@ -29,6 +29,14 @@ def compiledHash(x):
     return hash(x)
 
 
+def compileUnary(f):
+    return Entrypoint(lambda x: f(x))
+
+
+def compileBinary(f):
+    return Entrypoint(lambda x, y: f(x, y))
+
+
 class TestMathFunctionsCompilation(unittest.TestCase):
     def test_math_functions(self):
         for funToTest in [
@@ -83,3 +91,144 @@ class TestMathFunctionsCompilation(unittest.TestCase):
 
         # I get about .9x, so we're a little slower than numpy but not much
         print("speedup vs numpy is", speedupVsNumpy)
+
+    def test_native_math_functions_match_python(self):
+        unaryFunctions = [
+            math.sqrt, math.exp, math.expm1, math.log, math.log2, math.log10, math.log1p,
+            math.sin, math.cos, math.tan, math.asin, math.acos, math.atan,
+            math.sinh, math.cosh, math.tanh, math.asinh, math.acosh, math.atanh,
+            math.erf, math.erfc, math.gamma, math.lgamma, math.fabs, math.degrees, math.radians
+        ]
+        binaryFunctions = [math.pow, math.atan2, math.hypot, math.copysign, math.fmod, math.log]
+
+        def callOrException(f, *args):
+            try:
+                return f(*args)
+            except Exception as e:
+                return type(e)
+
+        def check(f, compiled, *args):
+            expected = callOrException(f, *args)
+            actual = callOrException(compiled, *args)
+
+            if isinstance(expected, float) and isinstance(actual, float):
+                if math.isnan(expected):
+                    self.assertTrue(math.isnan(actual), (f, args))
+                else:
+                    self.assertTrue(math.isclose(actual, expected, rel_tol=1e-12, abs_tol=1e-300), (f, args, actual, expected))
+            else:
+                self.assertEqual(actual, expected, (f, args))
+
+        values = [0.0, -0.0, 0.5, -0.5, 1.0, -1.0, 2.0, -2.5, 3, 10.0, 1000.0, -1000.0, 1e-300, math.inf, -math.inf, math.nan]
+
+        for f in unaryFunctions:
+            compiled = compileUnary(f)
+
+            for x in values:
+                check(f, compiled, x)
+
+        for f in binaryFunctions:
+            compiled = compileBinary(f)
+
+            for x in values:
+                for y in values:
+                    check(f, compiled, x, y)
+
+    def test_math_errors(self):
+        for f, x in [(math.sqrt, -1.0), (math.log, 0.0), (math.log, -1), (math.acosh, 0.5),
+                     (math.atanh, 1.0), (math.gamma, 0.0), (math.gamma, -2.0), (math.lgamma, -1.0),
+                     (math.sin, math.inf)]:
+            with self.assertRaisesRegex(ValueError, "math domain error"):
+                compileUnary(f)(x)
+
+        for f, x in [(math.exp, 1000.0), (math.cosh, 1000.0), (math.gamma, 200.0)]:
+            with self.assertRaisesRegex(OverflowError, "math range error"):
+                compileUnary(f)(x)
+
+        with self.assertRaisesRegex(ValueError, "math domain error"):
+            compileBinary(math.pow)(0.0, -1.0)
+
+        with self.assertRaisesRegex(OverflowError, "math range error"):
+            compileBinary(math.pow)(10.0, 400.0)
+
+        with self.assertRaisesRegex(ValueError, "math domain error"):
+            compileBinary(math.fmod)(1.0, 0.0)
+
+        with self.assertRaises(ZeroDivisionError):
+            compileBinary(math.log)(2.0, 1.0)
+
+        self.assertEqual(compileBinary(math.log)(8.0, 2.0), math.log(8.0, 2.0))
+        self.assertEqual(compileUnary(math.lgamma)(-math.inf), math.inf)
+
+    def test_math_functions_on_float32(self):
+        @Entrypoint
+        def f(x: Float32):
+            return math.sqrt(x) + math.exp(x) * math.sin(x)
+
+        @Entrypoint
+        def g(x: Float32, y: int):
+            return math.pow(x, y)
+
+        self.assertEqual(f.resultTypeFor(Float32).typeRepresentation, Float32)
+        self.assertEqual(g.resultTypeFor(Float32, int).typeRepresentation, Float32)
+
+        self.assertAlmostEqual(f(Float32(0.5)), math.sqrt(0.5) + math.exp(0.5) * math.sin(0.5), places=5)
+        self.assertAlmostEqual(g(Float32(1.5), 3), 1.5 ** 3, places=5)
+
+        with self.assertRaisesRegex(ValueError, "math domain error"):
+            f(Float32(-1.0))
+
+    def test_fsum(self):
+        @Entrypoint
+        def fsumList(xs: ListOf(float)):
+            return math.fsum(xs)
+
+        @Entrypoint
+        def fsumGenerator(xs: ListOf(int)):
+            return math.fsum(x * 0.1 for x in xs)
+
+        for values in [[], [0.1] * 10, [1.0, 1e100, 1.0, -1e100], [1e16, 1.0, 1e-16], [math.inf, 1.0], [math.nan]]:
+            res = fsumList(ListOf(float)(values))
+
+            if math.isnan(math.fsum(values)):
+                self.assertTrue(math.isnan(res))
+            else:
+                self.assertEqual(res, math.fsum(values), values)
+
+        self.assertEqual(fsumGenerator(ListOf(int)(range(10))), math.fsum(x * 0.1 for x in range(10)))
+
+        with self.assertRaises(OverflowError):
+            fsumList(ListOf(float)([1e308, 1e308]))
+
+        with self.assertRaises(ValueError):
+            fsumList(ListOf(float)([math.inf, -math.inf]))
+
+    def test_native_math_functions_perf(self):
+        def priceAll(spots: ListOf(float), strike: float, vol: float, t: float):
+            total = 0.0
+            for s in spots:
+                d1 = (math.log(s / strike) + 0.5 * vol * vol * t) / (vol * math.sqrt(t))
+                d2 = d1 - vol * math.sqrt(t)
+                total += s * 0.5 * math.erfc(-d1 / math.sqrt(2.0)) - strike * 0.5 * math.erfc(-d2 / math.sqrt(2.0))
+            return total
+
+        priceAllCompiled = Entrypoint(priceAll)
+
+        spots = ListOf(float)([50.0 + i * 0.0001 for i in range(1000000)])
+
+        priceAllCompiled(spots, 100.0, 0.2, 1.0)
+
+        t0 = time.time()
+        interpreted = priceAll(spots, 100.0, 0.2, 1.0)
+        t1 = time.time()
+        compiled = priceAllCompiled(spots, 100.0, 0.2, 1.0)
+        t2 = time.time()
+
+        self.assertTrue(math.isclose(interpreted, compiled, rel_tol=1e-9))
+
+        speedup = (t1 - t0) / (t2 - t1)
+
+        print("speedup is", speedup)
+
+        # every call used to go through the interpreter, so we were no faster than it
+        self.assertGreater(speedup, 10)
@@ -0,0 +1,140 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from typed_python import Entrypoint, ListOf
+from typed_python.compiler.native_ast import Expression, Int32, Function, FunctionBody, const_int32_expr
+from typed_python.compiler.llvm_compiler import Compiler
+from typed_python.compiler.runtime import Runtime
+
+
+PERF_MAP_SCRIPT = """
+import sys
+from typed_python import Entrypoint
+from typed_python.compiler.runtime import Runtime
+
+runtime = Runtime.singleton()
+runtime.enablePerfMap({perfMapPath!r})
+
+@Entrypoint
+def mappedFunction(x):
+    return x // 2
+
+mappedFunction(10)
+
+name = [n for n in runtime.llvm_compiler.functions_by_name if 'mappedFunction' in n][0]
+
+print(name)
+print(runtime.llvm_compiler.functions_by_name[name].fp)
+print(runtime.llvm_compiler.optimized_copy_module(name))
+"""
+
+
+class TestNativeProfiling(unittest.TestCase):
+    def test_perf_map_lists_each_function(self):
+        with tempfile.TemporaryDirectory() as tf:
+            path = os.path.join(tf, "perf.map")
+
+            compiler = Compiler()
+            compiler.enablePerfMap(path)
+
+            pointers = compiler.add_functions({
+                'perf_map_a': Function(
+                    args=(),
+                    output_type=Int32,
+                    body=FunctionBody.Internal(Expression.Return(arg=const_int32_expr(1)))
+                )
+            })
+
+            with open(path) as f:
+                entries = [line.split() for line in f.read().splitlines()]
+
+            self.assertEqual(len(entries), 1)
+
+            address, size, name = entries[0]
+
+            self.assertEqual(name, 'perf_map_a')
+            self.assertEqual(int(address, 16), pointers['perf_map_a'].fp)
+            self.assertGreater(int(size, 16), 0)
+
+    def test_perf_map_and_line_tables_in_a_fresh_process(self):
+        with tempfile.TemporaryDirectory() as tf:
+            perfMapPath = os.path.join(tf, "perf.map")
+
+            output = subprocess.check_output(
+                [sys.executable, "-c", PERF_MAP_SCRIPT.format(perfMapPath=perfMapPath)]
+            ).decode("utf8")
+
+            name, fp = output.splitlines()[:2]
+
+            with open(perfMapPath) as f:
+                entries = {line.split()[2]: int(line.split()[0], 16) for line in f.read().splitlines()}
+
+            self.assertEqual(entries[name], int(fp))
+
+            # the division can throw, so it carries the location of its line
+            self.assertIn('DILocation(line: 11', output)
+            self.assertIn('filename: "<string>"', output)
+
+    def test_counts_calls_and_time(self):
+        runtime = Runtime.singleton()
+        runtime.enableCompiledFunctionProfile()
+
+        try:
+            def profiledHelper(x):
+                return x + 1
+
+            @Entrypoint
+            def profiledCaller(x):
+                res = 0
+                for i in x:
+                    res += profiledHelper(i)
+                return res
+
+            aList = ListOf(int)(range(10))
+
+            self.assertEqual(profiledCaller(aList), 55)
+
+            runtime.resetCompiledFunctionProfile()
+
+            for _ in range(5):
+                profiledCaller(aList)
+        finally:
+            runtime.disableCompiledFunctionProfile()
+
+        profile = runtime.compiledFunctionProfile()
+
+        def countsFor(fragment):
+            matches = [counts for name, counts in profile.items() if fragment in name]
+            self.assertEqual(len(matches), 1, (fragment, list(profile)))
+            return matches[0]
+
+        callerCalls, callerNanoseconds = countsFor('profiledCaller')
+        helperCalls, helperNanoseconds = countsFor('profiledHelper')
+
+        self.assertEqual(callerCalls, 5)
+        self.assertEqual(helperCalls, 50)
+
+        # times are inclusive, so the caller includes its calls to the helper
+        self.assertGreater(helperNanoseconds, 0)
+        self.assertGreaterEqual(callerNanoseconds, helperNanoseconds)
+
+        runtime.resetCompiledFunctionProfile()
+
+        self.assertEqual(runtime.compiledFunctionProfile()[[n for n in profile if 'profiledHelper' in n][0]], (0, 0))
@@ -0,0 +1,230 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import ctypes
+import os
+import time
+import unittest
+
+from typed_python import Entrypoint, ListOf
+from typed_python.compiler.native_ast import (
+    Expression, Int32, Int64, Function, FunctionBody, const_int32_expr,
+    CallTarget, NamedCallTarget
+)
+from typed_python.compiler.llvm_compiler import Compiler, partitionFunctions, _definitionSize
+from typed_python.compiler.runtime import Runtime
+
+
+def callTarget(name, argTypes=(), outputType=Int32):
+    return CallTarget.Named(
+        target=NamedCallTarget(
+            name=name,
+            arg_types=argTypes,
+            output_type=outputType,
+            external=False,
+            varargs=False,
+            intrinsic=False,
+            can_throw=False
+        )
+    )
+
+
+def returning(expr):
+    return Function(
+        args=(),
+        output_type=Int32,
+        body=FunctionBody.Internal(Expression.Return(arg=expr))
+    )
+
+
+def balancedSum(exprs):
+    if len(exprs) == 1:
+        return exprs[0]
+
+    return balancedSum(exprs[:len(exprs) // 2]).add(balancedSum(exprs[len(exprs) // 2:]))
+
+
+def connectedFunctions(count, termCount, tag):
+    """Return native definitions of 'count' functions of one int that all call each other.
+
+    Function 'i' adds up 'termCount' branches on its argument, and calls function
+    'i + 1' and a shared helper, so the call graph is a single connected component,
+    like the methods of one class hierarchy compiled from one entrypoint.
+    """
+    x = Expression.Variable(name="x")
+
+    def name(i):
+        return f"connected_{tag}_{i}"
+
+    functions = {f"connected_{tag}_helper": Function(
+        args=(("x", Int64),),
+        output_type=Int64,
+        body=FunctionBody.Internal(Expression.Return(arg=x.add(1)))
+    )}
+
+    for i in range(count):
+        terms = [
+            Expression.Branch(cond=x.gt(k), true=x.mul(k + i + 1), false=x.sub(k))
+            for k in range(termCount)
+        ]
+
+        terms.append(callTarget(f"connected_{tag}_helper", (Int64,), Int64).call(x))
+
+        if i + 1 < count:
+            terms.append(callTarget(name(i + 1), (Int64,), Int64).call(x))
+
+        functions[name(i)] = Function(
+            args=(("x", Int64),),
+            output_type=Int64,
+            body=FunctionBody.Internal(Expression.Return(arg=balancedSum(terms)))
+        )
+
+    return functions
+
+
+def connectedFunctionValue(count, termCount, i, x):
+    """What function 'i' from 'connectedFunctions' returns."""
+    if i == count:
+        return 0
+
+    return (
+        sum(x * (k + i + 1) if x > k else x - k for k in range(termCount))
+        + x + 1
+        + connectedFunctionValue(count, termCount, i + 1, x)
+    )
+
+
+def makeFunctions(count, tag):
+    """Return 'count' distinct python functions that each take a ListOf(float)."""
+    namespace = {}
+
+    for i in range(count):
+        exec(
+            f"def f_{tag}_{i}(x):\n"
+            f"    res = 0.0\n"
+            f"    for j in range(len(x)):\n"
+            f"        v = x[j] * {i + 1}\n"
+            f"        if v > {i}:\n"
+            f"            res += v / {i + 2}\n"
+            f"        else:\n"
+            f"            res -= v * {i + 3}\n"
+            f"    return res\n",
+            namespace
+        )
+
+    return [namespace[f"f_{tag}_{i}"] for i in range(count)]
+
+
+class TestParallelCodegen(unittest.TestCase):
+    def test_partition_keeps_callers_with_callees(self):
+        functions = {
+            'a': returning(callTarget('b').call().add(const_int32_expr(1))),
+            'b': returning(callTarget('c').call()),
+            'c': returning(const_int32_expr(1)),
+            'd': returning(const_int32_expr(2)),
+            'e': returning(callTarget('someOtherFunction').call()),
+        }
+
+        partitions = partitionFunctions(functions, 2)
+
+        self.assertEqual(len(partitions), 2)
+        self.assertEqual(sorted(sorted(p) for p in partitions), [['a', 'b', 'c'], ['d', 'e']])
+
+        self.assertEqual(partitionFunctions(functions, 1), [functions])
+        self.assertEqual(len(partitionFunctions(functions, 10)), 3)
+
+    def test_partition_splits_connected_call_graphs(self):
+        functions = connectedFunctions(16, 100, "partition")
+        totalSize = sum(_definitionSize(f) for f in functions.values())
+
+        partitions = partitionFunctions(functions, 4)
+
+        self.assertEqual(len(partitions), 4)
+        self.assertEqual(sorted(name for p in partitions for name in p), sorted(functions))
+
+        for p in partitions:
+            self.assertLessEqual(sum(_definitionSize(f) for f in p.values()), totalSize / 2)
+
+    def test_partition_cuts_calls_to_large_functions(self):
+        functions = {
+            'a': returning(callTarget('b').call().add(const_int32_expr(1))),
+            'b': returning(const_int32_expr(1).add(const_int32_expr(2))),
+        }
+
+        self.assertEqual(len(partitionFunctions(functions, 2)), 1)
+        self.assertEqual(
+            sorted(sorted(p) for p in partitionFunctions(functions, 2, largeFunctionSize=3)),
+            [['a'], ['b']]
+        )
+
+    def test_connected_call_graphs_compile_in_parallel(self):
+        functions = connectedFunctions(8, 50, "parallel")
+
+        pointers = Compiler(workerCount=4).add_functions(functions)
+
+        for i in range(8):
+            f = ctypes.CFUNCTYPE(ctypes.c_int64, ctypes.c_int64)(pointers[f"connected_parallel_{i}"].fp)
+
+            for x in [-3, 0, 7, 40]:
+                self.assertEqual(f(x), connectedFunctionValue(8, 50, i, x))
+
+    def test_parallel_modules_link_against_each_other(self):
+        compiler = Compiler(workerCount=4)
+
+        compiler.add_functions({'parallel_codegen_base': returning(const_int32_expr(10))})
+
+        pointers = compiler.add_functions({
+            'parallel_codegen_a': returning(callTarget('parallel_codegen_b').call().add(const_int32_expr(1))),
+            'parallel_codegen_b': returning(callTarget('parallel_codegen_base').call().add(const_int32_expr(2))),
+            'parallel_codegen_c': returning(const_int32_expr(3)),
+            'parallel_codegen_d': returning(callTarget('parallel_codegen_base').call()),
+        })
+
+        def call(name):
+            return ctypes.CFUNCTYPE(ctypes.c_int32)(pointers[name].fp)()
+
+        self.assertEqual(call('parallel_codegen_a'), 13)
+        self.assertEqual(call('parallel_codegen_b'), 12)
+        self.assertEqual(call('parallel_codegen_c'), 3)
+        self.assertEqual(call('parallel_codegen_d'), 10)
+
+    def test_precompile_with_several_workers(self):
+        runtime = Runtime.singleton()
+
+        try:
+            for workerCount in [1, 2, 4, 8]:
+                functions = makeFunctions(32, workerCount)
+
+                runtime.setCompilerWorkerCount(workerCount)
+                runtime.precompile([(f, [ListOf(float)]) for f in functions])
+
+                aList = ListOf(float)([1.0, 2.0, -3.0])
+
+                for f in functions:
+                    self.assertEqual(Entrypoint(f)(aList), f(aList))
+        finally:
+            runtime.setCompilerWorkerCount(1)
+
+    @unittest.skipUnless(os.getenv("TP_RUN_BENCHMARKS"), "a benchmark: set TP_RUN_BENCHMARKS=1 to run it")
+    def test_connected_call_graph_compile_time_by_worker_count(self):
+        timings = {}
+
+        for workerCount in [1, 4]:
+            functions = connectedFunctions(32, 400, f"benchmark{workerCount}")
+
+            t0 = time.time()
+            Compiler(workerCount=workerCount).add_functions(functions)
+            timings[workerCount] = time.time() - t0
+
+        self.assertLess(timings[4], timings[1], timings)
@@ -0,0 +1,152 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from typed_python import Entrypoint, ListOf
+from typed_python.compiler.runtime import Runtime
+from typed_python.compiler.precompile import parseManifest
+
+
+MODULE = """
+from typed_python import Entrypoint, ListOf
+
+@Entrypoint
+def sumOf(x):
+    res = 0
+    for i in x:
+        res += i
+    return res
+
+@Entrypoint
+def addOne(x):
+    return x + 1
+"""
+
+MANIFEST = """
+# the signatures our service calls
+sumOf: ListOf(int)
+sumOf: ListOf(float)
+addOne: int
+"""
+
+SCRIPT = """
+import sys
+sys.path.insert(0, {moduleDir!r})
+
+from typed_python import ListOf
+from typed_python.compiler.runtime import Runtime
+import precompiled_module
+
+print(precompiled_module.sumOf(ListOf(int)([1, 2, 3])))
+print(precompiled_module.sumOf(ListOf(float)([1.5, 2.5])))
+print(precompiled_module.addOne(10))
+print(Runtime.singleton().timesCompiled)
+"""
+
+
+class TestPrecompile(unittest.TestCase):
+    def test_precompile_uses_one_module(self):
+        @Entrypoint
+        def addOne(x):
+            return x + 1
+
+        def total(x):
+            res = 0
+            for i in x:
+                res += i
+            return res
+
+        runtime = Runtime.singleton()
+        addFunctionsCalls = []
+
+        originalAddFunctions = runtime.llvm_compiler.add_functions
+
+        def addFunctions(functions):
+            addFunctionsCalls.append(len(functions))
+            return originalAddFunctions(functions)
+
+        runtime.llvm_compiler.add_functions = addFunctions
+        try:
+            callTargets = runtime.precompile([(addOne, [int]), (addOne, [float]), (total, [ListOf(int)])])
+        finally:
+            runtime.llvm_compiler.add_functions = originalAddFunctions
+
+        self.assertEqual(len(addFunctionsCalls), 1)
+        self.assertEqual([len(x) for x in callTargets], [1, 1, 1])
+        self.assertEqual(callTargets[0][0].output_type.typeRepresentation, int)
+
+        timesCompiled = runtime.timesCompiled
+
+        self.assertEqual(addOne(1), 2)
+        self.assertEqual(addOne(1.5), 2.5)
+
+        self.assertEqual(runtime.timesCompiled, timesCompiled)
+
+        self.assertEqual(Entrypoint(total)(ListOf(int)([1, 2])), 3)
+
+    def test_parse_manifest(self):
+        with tempfile.TemporaryDirectory() as moduleDir:
+            with open(os.path.join(moduleDir, "manifest_module.py"), "w") as f:
+                f.write(textwrap.dedent(MODULE))
+
+            sys.path.insert(0, moduleDir)
+            try:
+                import manifest_module
+            finally:
+                sys.path.remove(moduleDir)
+
+            signatures = parseManifest(manifest_module, MANIFEST)
+
+            self.assertEqual(
+                signatures,
+                [
+                    (manifest_module.sumOf, [ListOf(int)]),
+                    (manifest_module.sumOf, [ListOf(float)]),
+                    (manifest_module.addOne, [int])
+                ]
+            )
+
+            with self.assertRaises(ValueError):
+                parseManifest(manifest_module, "sumOf")
+
+    def test_precompiled_module_loads_in_another_process(self):
+        with tempfile.TemporaryDirectory() as moduleDir:
+            modulePath = os.path.join(moduleDir, "precompiled_module.py")
+            manifestPath = os.path.join(moduleDir, "manifest.txt")
+            outputPath = os.path.join(moduleDir, "precompiled.so")
+
+            with open(modulePath, "w") as f:
+                f.write(textwrap.dedent(MODULE))
+
+            with open(manifestPath, "w") as f:
+                f.write(textwrap.dedent(MANIFEST))
+
+            subprocess.check_call(
+                [sys.executable, "-m", "typed_python.compiler.precompile", modulePath, manifestPath, outputPath]
+            )
+
+            self.assertTrue(os.path.exists(outputPath))
+
+            output = subprocess.check_output(
+                [sys.executable, "-c", SCRIPT.format(moduleDir=moduleDir)],
+                env=dict(os.environ, TP_COMPILER_PRECOMPILED=outputPath)
+            )
+
+            self.assertEqual(output.decode("ASCII").split(), ["6", "4.0", "11", "0"])
@@ -0,0 +1,279 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typed_python import Set, ListOf, Entrypoint
+import typed_python._types as _types
+import unittest
+import time
+
+
+class TestSetCompilation(unittest.TestCase):
+    def test_set_length_and_bool(self):
+        @Entrypoint
+        def setLen(x: Set(int)):
+            return len(x)
+
+        @Entrypoint
+        def setBool(x: Set(int)):
+            if x:
+                return True
+            return False
+
+        self.assertEqual(setLen(Set(int)()), 0)
+        self.assertEqual(setLen(Set(int)([1, 2, 3])), 3)
+        self.assertFalse(setBool(Set(int)()))
+        self.assertTrue(setBool(Set(int)([1])))
+
+    def test_set_add_and_contains(self):
+        @Entrypoint
+        def addAll(x: ListOf(int)):
+            s = Set(int)()
+            for i in x:
+                s.add(i)
+            return s
+
+        @Entrypoint
+        def contains(s: Set(int), i: int):
+            return i in s
+
+        @Entrypoint
+        def notContains(s: Set(int), i: int):
+            return i not in s
+
+        s = addAll(ListOf(int)([1, 2, 3, 2, 1, 100]))
+
+        self.assertEqual(s, Set(int)([1, 2, 3, 100]))
+
+        for i in range(-5, 105):
+            self.assertEqual(contains(s, i), i in (1, 2, 3, 100))
+            self.assertEqual(notContains(s, i), i not in (1, 2, 3, 100))
+
+    def test_set_discard_remove_and_pop(self):
+        @Entrypoint
+        def discard(s: Set(int), i: int):
+            s.discard(i)
+
+        @Entrypoint
+        def remove(s: Set(int), i: int):
+            s.remove(i)
+
+        @Entrypoint
+        def pop(s: Set(int)):
+            return s.pop()
+
+        s = Set(int)(range(10))
+
+        discard(s, 3)
+        discard(s, 3)
+        remove(s, 4)
+
+        with self.assertRaises(KeyError):
+            remove(s, 4)
+
+        self.assertEqual(s, Set(int)([0, 1, 2, 5, 6, 7, 8, 9]))
+
+        popped = set()
+        while s:
+            popped.add(pop(s))
+
+        self.assertEqual(popped, {0, 1, 2, 5, 6, 7, 8, 9})
+
+        with self.assertRaises(KeyError):
+            pop(s)
+
+    def test_set_iteration(self):
+        @Entrypoint
+        def toList(s: Set(str)):
+            res = ListOf(str)()
+            for x in s:
+                res.append(x)
+            return res
+
+        s = Set(str)(["a", "b", "c"])
+
+        self.assertEqual(sorted(toList(s)), ["a", "b", "c"])
+        self.assertEqual(toList(Set(str)()), [])
+
+    def test_set_refcounts(self):
+        @Entrypoint
+        def addAndRemove(s: Set(str), x: str):
+            s.add(x)
+            s.discard(x)
+            s.add(x)
+
+        s = Set(str)()
+        x = "a string that's long enough to not be interned" * 2
+
+        addAndRemove(s, x)
+
+        self.assertEqual(s, Set(str)([x]))
+
+    def test_iterating_doesnt_leak_the_set(self):
+        @Entrypoint
+        def count(s: Set(int)):
+            res = 0
+            for _ in s:
+                res += 1
+            return res
+
+        s = Set(int)([1, 2, 3])
+        refcount = _types.refcount(s)
+
+        self.assertEqual(count(s), 3)
+        self.assertEqual(_types.refcount(s), refcount)
+
+    def test_set_operations(self):
+        @Entrypoint
+        def union(a: Set(int), b: Set(int)):
+            return a | b
+
+        @Entrypoint
+        def intersection(a: Set(int), b: Set(int)):
+            return a & b
+
+        @Entrypoint
+        def difference(a: Set(int), b: Set(int)):
+            return a - b
+
+        @Entrypoint
+        def unionMethod(a: Set(int), b: ListOf(int)):
+            return a.union(b)
+
+        @Entrypoint
+        def intersectionMethod(a: Set(int), b: ListOf(int)):
+            return a.intersection(b)
+
+        @Entrypoint
+        def differenceMethod(a: Set(int), b: ListOf(int)):
+            return a.difference(b)
+
+        for aList, bList in [([], []), ([1, 2, 3], []), ([], [4, 5]), ([1, 2, 3], [2, 3, 4]), (range(100), range(50, 60))]:
+            a = Set(int)(aList)
+            b = Set(int)(bList)
+
+            self.assertEqual(set(union(a, b)), set(aList) | set(bList))
+            self.assertEqual(set(intersection(a, b)), set(aList) & set(bList))
+            self.assertEqual(set(difference(a, b)), set(aList) - set(bList))
+
+            self.assertEqual(set(unionMethod(a, ListOf(int)(bList))), set(aList) | set(bList))
+            self.assertEqual(set(intersectionMethod(a, ListOf(int)(bList))), set(aList) & set(bList))
+            self.assertEqual(set(differenceMethod(a, ListOf(int)(bList))), set(aList) - set(bList))
+
+            # the operators don't modify their arguments
+            self.assertEqual(set(a), set(aList))
+            self.assertEqual(set(b), set(bList))
+
+    def test_set_inplace_operations(self):
+        @Entrypoint
+        def inplaceUnion(a: Set(int), b: Set(int)):
+            a |= b
+
+        @Entrypoint
+        def inplaceIntersection(a: Set(int), b: Set(int)):
+            a &= b
+
+        @Entrypoint
+        def inplaceDifference(a: Set(int), b: Set(int)):
+            a -= b
+
+        @Entrypoint
+        def update(a: Set(int), b: ListOf(int)):
+            a.update(b)
+
+        a = Set(int)([1, 2, 3])
+        inplaceUnion(a, Set(int)([3, 4]))
+        self.assertEqual(set(a), {1, 2, 3, 4})
+
+        inplaceIntersection(a, Set(int)([2, 3, 4, 5]))
+        self.assertEqual(set(a), {2, 3, 4})
+
+        inplaceDifference(a, Set(int)([4]))
+        self.assertEqual(set(a), {2, 3})
+
+        update(a, ListOf(int)([10, 11, 2]))
+        self.assertEqual(set(a), {2, 3, 10, 11})
+
+    def test_set_intersection_update(self):
+        @Entrypoint
+        def intersectionUpdate(a: Set(int), b: ListOf(int)):
+            a.intersection_update(b)
+
+        @Entrypoint
+        def intersectionUpdateWithSet(a: Set(int), b: Set(int)):
+            a.intersection_update(b)
+
+        for aList, bList in [([], []), ([1, 2, 3], []), ([], [4, 5]), ([1, 2, 3], [2, 3, 3, 4]), (range(1000), range(50, 600, 3))]:
+            expected = set(aList) & set(bList)
+
+            a = Set(int)(aList)
+            alias = a
+            intersectionUpdate(a, ListOf(int)(bList))
+
+            # the set is filtered in place, so every reference to it sees the result
+            self.assertEqual(set(alias), expected)
+
+            a = Set(int)(aList)
+            intersectionUpdateWithSet(a, Set(int)(bList))
+            self.assertEqual(set(a), expected)
+
+            # and it still works as a hash table afterwards
+            for i in range(1000):
+                self.assertEqual(i in a, i in expected)
+
+    def test_interpreter_set_operators(self):
+        a = Set(int)([1, 2, 3])
+        b = Set(int)([2, 3, 4])
+
+        self.assertEqual(set(a | b), {1, 2, 3, 4})
+        self.assertEqual(set(a & b), {2, 3})
+        self.assertEqual(set(a - b), {1})
+        self.assertEqual(set(a | {10}), {1, 2, 3, 10})
+
+        with self.assertRaises(TypeError):
+            a | [1]
+
+    def test_set_add_perf(self):
+        @Entrypoint
+        def addAll(x: ListOf(int)):
+            s = Set(int)()
+            for i in x:
+                s.add(i)
+            count = 0
+            for i in x:
+                if i in s:
+                    count += 1
+            return count
+
+        aList = ListOf(int)(range(1000000))
+
+        # prime the compiler
+        addAll(ListOf(int)([1]))
+
+        t0 = time.time()
+        self.assertEqual(addAll(aList), len(aList))
+        compiledTime = time.time() - t0
+
+        t0 = time.time()
+        s = set()
+        for i in aList:
+            s.add(i)
+        count = 0
+        for i in aList:
+            if i in s:
+                count += 1
+        interpretedTime = time.time() - t0
+
+        print(f"compiled Set took {compiledTime}, python set took {interpretedTime}")
+
+        self.assertLess(compiledTime, interpretedTime)
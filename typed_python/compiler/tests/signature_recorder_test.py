@@ -0,0 +1,195 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import fcntl
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+
+from typed_python import Entrypoint
+from typed_python.compiler.python_object_representation import typedPythonTypeToTypeWrapper as typeWrapper
+from typed_python.compiler.signature_recorder import SignatureRecorder, readSignatures, _RECORD_HEADER
+
+
+@Entrypoint
+def recordedFunction(x):
+    return x + 1
+
+
+MODULE = """
+from typed_python import Entrypoint, ListOf
+
+@Entrypoint
+def sumOf(x):
+    res = 0
+    for i in x:
+        res += i
+    return res
+"""
+
+RECORDING_SCRIPT = """
+import sys
+sys.path.insert(0, {moduleDir!r})
+
+from typed_python import ListOf
+import recorded_module
+
+recorded_module.sumOf(ListOf(int)([1, 2, 3]))
+recorded_module.sumOf(ListOf(int)([4]))
+recorded_module.sumOf(ListOf(float)([1.5]))
+"""
+
+REPLAYING_SCRIPT = """
+import sys
+sys.path.insert(0, {moduleDir!r})
+
+from typed_python import ListOf
+from typed_python.compiler.runtime import Runtime
+from typed_python.compiler.signature_recorder import replaySignatures
+import recorded_module
+
+print(replaySignatures({signaturesPath!r}))
+
+timesCompiled = Runtime.singleton().timesCompiled
+
+print(recorded_module.sumOf(ListOf(int)([1, 2, 3])))
+print(recorded_module.sumOf(ListOf(float)([1.5])))
+print(Runtime.singleton().timesCompiled - timesCompiled)
+"""
+
+
+class TestSignatureRecorder(unittest.TestCase):
+    def test_records_each_signature_once(self):
+        @Entrypoint
+        def localFunction(x):
+            return x
+
+        with tempfile.TemporaryDirectory() as tf:
+            path = os.path.join(tf, "signatures")
+
+            with SignatureRecorder(path):
+                recordedFunction(1)
+                recordedFunction(2)
+                recordedFunction(1.5)
+                localFunction(1)
+
+            self.assertEqual(
+                readSignatures(path),
+                [
+                    (__name__, "recordedFunction", (int,)),
+                    (__name__, "recordedFunction", (float,)),
+                ]
+            )
+
+            # a new recorder doesn't duplicate what's already in the file
+            size = os.path.getsize(path)
+
+            recorder = SignatureRecorder(path)
+            recorder.onEntrypointSignature(recordedFunction.overloads[0].functionObj, [typeWrapper(int)])
+
+            self.assertEqual(os.path.getsize(path), size)
+            self.assertEqual(len(readSignatures(path)), 2)
+
+    def test_records_after_a_truncated_record(self):
+        with tempfile.TemporaryDirectory() as tf:
+            path = os.path.join(tf, "signatures")
+
+            with SignatureRecorder(path):
+                recordedFunction(1)
+                recordedFunction(1.5)
+
+            # simulate a process that died partway through writing its last record
+            with open(path, "rb+") as f:
+                f.truncate(os.path.getsize(path) - 3)
+
+            self.assertEqual(readSignatures(path), [(__name__, "recordedFunction", (int,))])
+
+            recorder = SignatureRecorder(path)
+            recorder.onEntrypointSignature(recordedFunction.overloads[0].functionObj, [typeWrapper(str)])
+
+            self.assertEqual(
+                readSignatures(path),
+                [
+                    (__name__, "recordedFunction", (int,)),
+                    (__name__, "recordedFunction", (str,)),
+                ]
+            )
+
+    def test_opening_waits_for_appends_in_progress(self):
+        with tempfile.TemporaryDirectory() as tf:
+            path = os.path.join(tf, "signatures")
+
+            with SignatureRecorder(path):
+                recordedFunction(1)
+
+            record = SignatureRecorder(path).serializationContext.serialize(
+                (__name__, "recordedFunction", (float,))
+            )
+            data = _RECORD_HEADER.pack(len(record)) + record
+
+            recorders = []
+
+            # act like another process that's halfway through appending a record
+            with open(path, "ab") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                f.write(data[:5])
+                f.flush()
+
+                opener = threading.Thread(target=lambda: recorders.append(SignatureRecorder(path)))
+                opener.start()
+                opener.join(.1)
+
+                # the recorder can't truncate the partial record while we hold the lock
+                self.assertTrue(opener.is_alive())
+
+                f.write(data[5:])
+
+            opener.join()
+
+            self.assertEqual(
+                readSignatures(path),
+                [
+                    (__name__, "recordedFunction", (int,)),
+                    (__name__, "recordedFunction", (float,)),
+                ]
+            )
+            self.assertEqual(len(recorders[0]._seen), 2)
+
+    def test_replay_in_a_fresh_process(self):
+        with tempfile.TemporaryDirectory() as moduleDir:
+            signaturesPath = os.path.join(moduleDir, "signatures")
+
+            with open(os.path.join(moduleDir, "recorded_module.py"), "w") as f:
+                f.write(textwrap.dedent(MODULE))
+
+            subprocess.check_call(
+                [sys.executable, "-c", RECORDING_SCRIPT.format(moduleDir=moduleDir)],
+                env=dict(os.environ, TP_COMPILER_RECORD_SIGNATURES=signaturesPath)
+            )
+
+            self.assertEqual(len(readSignatures(signaturesPath)), 2)
+
+            output = subprocess.check_output(
+                [
+                    sys.executable,
+                    "-c",
+                    REPLAYING_SCRIPT.format(moduleDir=moduleDir, signaturesPath=signaturesPath)
+                ]
+            )
+
+            self.assertEqual(output.decode("ASCII").split(), ["2", "6", "1.5", "0"])
@@ -0,0 +1,108 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+import unittest
+
+from typed_python import Entrypoint, ListOf
+from typed_python.compiler.runtime import Runtime
+
+
+class TestTieredCompilation(unittest.TestCase):
+    def setUp(self):
+        Runtime.singleton().setTieredCompilation(hotCallThreshold=10)
+
+    def tearDown(self):
+        Runtime.singleton().setTieredCompilation(0)
+
+    def test_hot_specializations_get_reoptimized(self):
+        runtime = Runtime.singleton()
+
+        def square(x):
+            return x * x
+
+        @Entrypoint
+        def sumOfSquares(x):
+            res = 0
+            for i in range(x):
+                res += square(i)
+            return res
+
+        timesReoptimized = runtime.timesReoptimized
+
+        for _ in range(9):
+            self.assertEqual(sumOfSquares(10), 285)
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertEqual(runtime.timesReoptimized, timesReoptimized)
+
+        # the tenth call crosses the threshold
+        self.assertEqual(sumOfSquares(10), 285)
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertEqual(runtime.timesReoptimized, timesReoptimized + 1)
+
+        for _ in range(100):
+            self.assertEqual(sumOfSquares(10), 285)
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertEqual(runtime.timesReoptimized, timesReoptimized + 1)
+
+        # a different signature is a different specialization
+        self.assertEqual(sumOfSquares(10.0), 285.0)
+
+    def test_swapping_while_other_threads_call(self):
+        runtime = Runtime.singleton()
+
+        @Entrypoint
+        def total(x):
+            res = 0.0
+            for v in x:
+                res += v
+            return res
+
+        aList = ListOf(float)(range(1000))
+        failures = []
+
+        def callRepeatedly():
+            for _ in range(200):
+                if total(aList) != 499500.0:
+                    failures.append(True)
+
+        total(aList)
+
+        threads = [threading.Thread(target=callRepeatedly) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertFalse(failures)
+
+    def test_no_counting_when_disabled(self):
+        runtime = Runtime.singleton()
+        runtime.setTieredCompilation(0)
+
+        @Entrypoint
+        def addOne(x):
+            return x + 1
+
+        timesReoptimized = runtime.timesReoptimized
+
+        for _ in range(100):
+            addOne(1)
+
+        self.assertTrue(runtime.waitForBackgroundCompilation(timeout=60))
+        self.assertEqual(runtime.timesReoptimized, timesReoptimized)
@@ -0,0 +1,292 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import sys
+import traceback
+import unittest
+
+from typed_python import Entrypoint, ListOf, isCompiled
+
+
+class CustomError(Exception):
+    pass
+
+
+class TestTryExceptCompilation(unittest.TestCase):
+    def test_catch_matching_exception(self):
+        @Entrypoint
+        def safeDivide(x, y):
+            try:
+                return x // y
+            except ZeroDivisionError:
+                return -1
+
+        self.assertEqual(safeDivide(10, 2), 5)
+        self.assertEqual(safeDivide(10, 0), -1)
+
+    def test_unmatched_exceptions_propagate(self):
+        @Entrypoint
+        def f(x):
+            try:
+                if x == 0:
+                    raise KeyError("key")
+                if x == 1:
+                    raise CustomError("custom")
+                return x
+            except KeyError:
+                return -1
+
+        self.assertEqual(f(0), -1)
+        self.assertEqual(f(2), 2)
+
+        with self.assertRaisesRegex(CustomError, "custom"):
+            f(1)
+
+    def test_clauses_are_tested_in_order(self):
+        @Entrypoint
+        def f(x):
+            try:
+                if x == 0:
+                    raise KeyError("key")
+                if x == 1:
+                    raise IndexError("index")
+                if x == 2:
+                    raise CustomError("custom")
+                raise ValueError("value")
+            except (KeyError, IndexError):
+                return "lookup"
+            except CustomError as e:
+                return "custom: " + str(e)
+            except Exception:
+                return "other"
+
+        self.assertEqual(f(0), "lookup")
+        self.assertEqual(f(1), "lookup")
+        self.assertEqual(f(2), "custom: custom")
+        self.assertEqual(f(3), "other")
+
+    def test_bare_except_and_reraise(self):
+        @Entrypoint
+        def f(x, reraise):
+            try:
+                raise CustomError(x)
+            except:  # noqa
+                if reraise:
+                    raise
+                return "caught"
+
+        self.assertEqual(f("a", False), "caught")
+
+        with self.assertRaisesRegex(CustomError, "b"):
+            f("b", True)
+
+        try:
+            f("c", True)
+        except CustomError:
+            self.assertIn("CustomError", traceback.format_exc())
+
+    def test_else(self):
+        @Entrypoint
+        def f(x):
+            res = ListOf(str)()
+            try:
+                if x:
+                    raise CustomError()
+                res.append("body")
+            except CustomError:
+                res.append("except")
+            else:
+                res.append("else")
+            return res
+
+        self.assertEqual(f(False), ["body", "else"])
+        self.assertEqual(f(True), ["except"])
+
+    def test_exceptions_in_else_are_not_caught(self):
+        @Entrypoint
+        def f():
+            try:
+                pass
+            except CustomError:
+                return "caught"
+            else:
+                raise CustomError("from else")
+
+        with self.assertRaisesRegex(CustomError, "from else"):
+            f()
+
+    def test_finally(self):
+        log = []
+
+        @Entrypoint
+        def f(x):
+            try:
+                if x == 0:
+                    return "returned"
+                if x == 1:
+                    raise CustomError("raised")
+            finally:
+                # the pending exception mustn't stop us calling into the interpreter
+                log.append(x)
+
+            return "fell through"
+
+        self.assertEqual(f(0), "returned")
+        self.assertEqual(f(2), "fell through")
+
+        with self.assertRaisesRegex(CustomError, "raised"):
+            f(1)
+
+        self.assertEqual(log, [0, 2, 1])
+
+    def test_finally_after_handlers(self):
+        @Entrypoint
+        def f(x):
+            res = ListOf(str)()
+            try:
+                try:
+                    if x == 1:
+                        raise CustomError()
+                    if x == 2:
+                        raise KeyError()
+                except CustomError:
+                    res.append("except")
+                finally:
+                    res.append("finally")
+            except KeyError:
+                res.append("outer")
+            return res
+
+        self.assertEqual(f(0), ["finally"])
+        self.assertEqual(f(1), ["except", "finally"])
+        self.assertEqual(f(2), ["finally", "outer"])
+
+    def test_exception_raised_in_finally_replaces_the_pending_one(self):
+        @Entrypoint
+        def f():
+            try:
+                raise KeyError("first")
+            finally:
+                raise CustomError("second")
+
+        with self.assertRaisesRegex(CustomError, "second"):
+            f()
+
+    def test_functions_leaving_finally_run_in_the_interpreter(self):
+        def swallowZeroDivision(x):
+            try:
+                return 10 // x
+            finally:
+                if x == 0:
+                    return -1
+
+        def firstNonzero(values):
+            for v in values:
+                try:
+                    pass
+                finally:
+                    if v:
+                        break
+            return v
+
+        @Entrypoint
+        def callThem(x: int, values: ListOf(int)):
+            return swallowZeroDivision(x), firstNonzero(values)
+
+        self.assertEqual(callThem(2, [0, 0, 3, 4]), (5, 3))
+        self.assertEqual(callThem(0, [5]), (-1, 5))
+
+        # we can't compile them ourselves, so an entrypoint like that doesn't convert
+        @Entrypoint
+        def leavesFinally(x: int):
+            try:
+                x += 1
+            finally:
+                return x
+
+        with self.assertRaisesRegex(Exception, "inside a 'finally' block"):
+            leavesFinally(1)
+
+    def test_variables_assigned_in_the_body(self):
+        @Entrypoint
+        def f(x):
+            try:
+                y = 10
+                y = y // x
+                z = 1
+            except ZeroDivisionError:
+                return y
+
+            return y + z
+
+        self.assertEqual(f(2), 6)
+        self.assertEqual(f(0), 10)
+
+        @Entrypoint
+        def g(x):
+            try:
+                if x:
+                    raise CustomError()
+                y = 1
+            except CustomError:
+                pass
+
+            return y
+
+        self.assertEqual(g(False), 1)
+
+        with self.assertRaises(UnboundLocalError):
+            g(True)
+
+    def test_per_record_errors_in_a_loop(self):
+        @Entrypoint
+        def parseAll(records):
+            total = 0
+            failures = 0
+            for r in records:
+                try:
+                    total += int(r)
+                except ValueError:
+                    failures += 1
+                    continue
+            return total, failures
+
+        self.assertEqual(parseAll(ListOf(str)(["1", "x", "2", "", "3"])), (6, 2))
+
+    def test_try_is_compiled(self):
+        @Entrypoint
+        def f():
+            try:
+                return isCompiled()
+            except Exception:
+                return False
+
+        self.assertTrue(f())
+
+    def test_caught_exceptions_are_released(self):
+        anException = CustomError()
+
+        @Entrypoint
+        def f(e):
+            try:
+                raise e
+            except CustomError as caught:
+                return caught is e
+
+        refcount = sys.getrefcount(anException)
+
+        for _ in range(100):
+            self.assertTrue(f(anException))
+
+        self.assertLess(sys.getrefcount(anException), refcount + 5)
@@ -211,3 +211,21 @@ class TestTupleOfCompilation(unittest.TestCase):
 
         self.assertEqual(makeT([1, 2, 3, 4]), Compiled(makeT)([1, 2, 3, 4]))
         self.assertEqual(makeT({1: 2}), Compiled(makeT)({1: 2}))
+
+    def test_tuple_slicing(self):
+        @Compiled
+        def sliceWithStep(x: TupleOf(str), a: int, b: int, step: int):
+            return x[a:b:step], x[a:b], x[:b], x[a:]
+
+        values = tuple(str(i) for i in range(10))
+        aTuple = TupleOf(str)(values)
+
+        for a in range(-12, 13):
+            for b in range(-12, 13):
+                for step in [-3, -1, 1, 2]:
+                    self.assertEqual(
+                        sliceWithStep(aTuple, a, b, step),
+                        (values[a:b:step], values[a:b], values[:b], values[a:])
+                    )
+
+        self.assertIs(type(sliceWithStep(aTuple, 1, 3, 1)[0]), TupleOf(str))
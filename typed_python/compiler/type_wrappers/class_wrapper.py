@@ -127,6 +127,7 @@ class ClassWrapper(RefcountedWrapper):
             if otherType.typeRepresentation in self.typeRepresentation.MRO:
                 # this is an upcast
                 index = _types.getDispatchIndexForType(otherType.typeRepresentation, self.typeRepresentation)
+                context.markUnrelocatable()
 
                 context.pushEffect(
                     targetVal.expr.store(
@@ -559,6 +560,7 @@ class ClassWrapper(RefcountedWrapper):
 
         # each entrypoint generates a slot we could call.
         dispatchSlot = _types.allocateClassMethodDispatch(self.typeRepresentation, methodName, retType, argTupleType, kwargTupleType)
+        context.markUnrelocatable()
 
         classDispatchTable = self.classDispatchTable(instance)
 
@@ -623,6 +625,7 @@ class ClassWrapper(RefcountedWrapper):
 
         # each entrypoint generates a slot we could call.
         dispatchSlot = _types.allocateClassMethodDispatch(self.typeRepresentation, methodName, retType, argTupleType, kwargTupleType)
+        context.markUnrelocatable()
 
         classDispatchTable = self.classDispatchTable(instance)
 
@@ -761,6 +764,8 @@ class ClassWrapper(RefcountedWrapper):
         )
 
     def generateConstructor(self, context, out, *args):
+        context.markUnrelocatable()
+
         context.pushEffect(
             out.expr.store(
                 runtime_functions.malloc.call(
@@ -901,4 +906,5 @@ class ClassWrapper(RefcountedWrapper):
         PRIME_NO = 1000003
 
         vtp = _types._vtablePointer(self.typeRepresentation)
+        context.markUnrelocatable()
         return context.constant(Int32(((((HELD_CLASS_CAT_NO * PRIME_NO) ^ (vtp >> 32)) * PRIME_NO) ^ vtp) & 0xFFFFFFFF))
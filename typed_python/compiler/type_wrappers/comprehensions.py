@@ -0,0 +1,268 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Conversion of list, set, and dict comprehensions, and helpers shared with generator expressions."""
+
+from typed_python import NoneType, ListOf, Dict, Set
+from typed_python.compiler.type_wrappers.range_wrapper import RangeInstanceWrapper
+from typed_python.compiler.type_wrappers.tuple_of_wrapper import TupleOrListOfWrapper
+import typed_python.compiler.native_ast as native_ast
+import typed_python.python_ast as python_ast
+
+
+def convertComprehension(context, ast):
+    """Convert a list, set, or dict comprehension to a ListOf, Set, or Dict.
+
+    We pick the container's element types by converting the body once up front
+    to see what it produces, and then run the loops, adding to the container as we go.
+    If the comprehension is a single unfiltered loop over something whose length
+    we know, we reserve space for all the elements before we start.
+
+    Args:
+        context - an ExpressionConversionContext
+        ast - a python_ast.Expr that's a ListComp, SetComp, or DictComp.
+
+    Returns:
+        None if the expression doesn't return control flow to the caller,
+        or a TypedExpression for the container.
+    """
+    for generator in ast.generators:
+        if generator.is_async:
+            raise NotImplementedError("Can't handle asynchronous comprehensions")
+
+        checkTargetIsSupported(generator.target)
+
+    if ast.matches.DictComp:
+        body = (ast.key, ast.value)
+    else:
+        body = (ast.elt,)
+
+    # the iterable of the first clause gets evaluated exactly once, so we
+    # convert it before either pass over the loops.
+    source = context.convert_expression_ast(ast.generators[0].iter)
+    if source is None:
+        return None
+
+    bodyTypes = []
+
+    with context.subcontext():
+        convertLoops(
+            context,
+            source,
+            ast.generators,
+            lambda: convertElements(
+                context,
+                body,
+                lambda *elements: bodyTypes.append([e.convert_masquerade_to_typed().expr_type for e in elements])
+            )
+        )
+
+    if bodyTypes:
+        elementTypes = [containerElementType(T) for T in bodyTypes[0]]
+    else:
+        # the body always throws, so the container is always empty
+        elementTypes = [NoneType for _ in body]
+
+    if ast.matches.ListComp:
+        containerType = ListOf(elementTypes[0])
+    elif ast.matches.SetComp:
+        containerType = Set(elementTypes[0])
+    else:
+        containerType = Dict(elementTypes[0], elementTypes[1])
+
+    container = context.push(containerType, lambda c: c.convert_default_initialize())
+
+    if ast.matches.ListComp and len(ast.generators) == 1 and not ast.generators[0].ifs and hasKnownLength(source):
+        length = source.convert_len()
+        if length is None:
+            return None
+
+        container.convert_method_call("reserve", (length,), {})
+
+    def addElements(*elements):
+        if ast.matches.ListComp:
+            container.convert_method_call("append", elements, {})
+        elif ast.matches.SetComp:
+            container.convert_method_call("add", elements, {})
+        else:
+            container.convert_setitem(elements[0], elements[1])
+
+    if not convertLoops(
+        context,
+        source,
+        ast.generators,
+        lambda: convertElements(context, body, addElements)
+    ):
+        return None
+
+    return container
+
+
+def hasKnownLength(source):
+    """Can we find out how many elements iterating over 'source' produces without iterating?"""
+    return isinstance(source.expr_type, (TupleOrListOfWrapper, RangeInstanceWrapper))
+
+
+def containerElementType(wrapper):
+    """Return the typed_python type a container should use to hold values of type 'wrapper'."""
+    if isinstance(wrapper.typeRepresentation, type):
+        return wrapper.typeRepresentation
+
+    return object
+
+
+def convertLoops(context, source, generators, callback):
+    """Generate the nested loops for the 'for' clauses 'generators', and call 'callback' in the innermost one.
+
+    Args:
+        context - an ExpressionConversionContext
+        source - a TypedExpression for the iterable of the first clause. Later
+            clauses get their iterables from the names bound by the earlier ones.
+        generators - a sequence of python_ast.Comprehension objects
+        callback - a function of no arguments that converts the body. It gets called
+            with the names of all the loop variables in scope, in the branch where
+            all the conditions passed.
+
+    Returns:
+        False if the loops always throw, True otherwise.
+    """
+    generator = generators[0]
+
+    iterator = source.convert_method_call("__iter__", (), {})
+    if iterator is None:
+        return False
+
+    isPopulated = context.push(bool, lambda b: b.expr.store(native_ast.const_bool_expr(True)))
+
+    with context.whileLoop(isPopulated):
+        item, hasItem = iterator.convert_next()
+
+        if item is not None:
+            context.pushEffect(isPopulated.expr.store(hasItem.nonref_expr))
+
+            with context.ifelse(hasItem.nonref_expr) as (ifTrue, ifFalse):
+                with ifTrue:
+                    names = {}
+
+                    if bindTarget(context, generator.target, item, names):
+                        with context.scopedNames(names):
+                            if len(generators) == 1:
+                                convertIfAllTrue(context, generator.ifs, callback)
+                            else:
+                                convertIfAllTrue(
+                                    context,
+                                    generator.ifs,
+                                    lambda: convertInnerLoops(context, generators[1:], callback)
+                                )
+
+    return True
+
+
+def convertInnerLoops(context, generators, callback):
+    source = context.convert_expression_ast(generators[0].iter)
+    if source is None:
+        return None
+
+    return convertLoops(context, source, generators, callback)
+
+
+def checkTargetIsSupported(target):
+    if target.matches.Name:
+        return
+
+    if target.matches.Tuple or target.matches.List:
+        for elt in target.elts:
+            checkTargetIsSupported(elt)
+        return
+
+    raise NotImplementedError("Can't handle comprehensions that assign to %s" % python_ast.alternativeName(target))
+
+
+def bindTarget(context, target, value, names):
+    """Bind the names in the assignment target 'target' to 'value', adding them to the dict 'names'.
+
+    Returns:
+        False if unpacking 'value' always throws, True otherwise.
+    """
+    if target.matches.Name:
+        names[target.id] = value
+        return True
+
+    values = value.get_iteration_expressions()
+
+    if values is None:
+        context.pushException(TypeError, "Can't unpack an instance of %s" % value.expr_type)
+        return False
+
+    if len(values) != len(target.elts):
+        context.pushException(
+            ValueError,
+            "Expected %s values to unpack but got %s" % (len(target.elts), len(values))
+        )
+        return False
+
+    for subtarget, subvalue in zip(target.elts, values):
+        if not bindTarget(context, subtarget, subvalue, names):
+            return False
+
+    return True
+
+
+def convertIfAllTrue(context, conditions, callback):
+    """Convert the python_ast expressions 'conditions' in turn, and call 'callback' in the branch where all are true.
+
+    Returns:
+        whatever 'callback' returned, or None if it never got called.
+    """
+    if not conditions:
+        return callback()
+
+    condition = context.convert_expression_ast(conditions[0])
+    if condition is None:
+        return None
+
+    condition = condition.toBool()
+    if condition is None:
+        return None
+
+    result = [None]
+
+    with context.ifelse(condition.nonref_expr) as (ifTrue, ifFalse):
+        with ifTrue:
+            result[0] = convertIfAllTrue(context, conditions[1:], callback)
+
+    return result[0]
+
+
+def convertElement(context, elt, onElement):
+    """Convert the python_ast expression 'elt' and pass the result to 'onElement', unless it always throws."""
+    return convertElements(context, (elt,), onElement)
+
+
+def convertElements(context, elts, onElements):
+    """Convert each python_ast expression in 'elts' and pass the results to 'onElements'.
+
+    Returns:
+        whatever 'onElements' returned, or None if one of the expressions always throws.
+    """
+    elements = []
+
+    for elt in elts:
+        element = context.convert_expression_ast(elt)
+        if element is None:
+            return None
+
+        elements.append(element)
+
+    return onElements(*elements)
@@ -126,17 +126,23 @@ def dict_next_slot(instance, slotIx):
     return -1
 
 
-def dict_remove_key(instance, item, itemHash):
+def dict_discard_key(instance, item, itemHash):
+    """Remove 'item' from a hash table, returning True if it was present."""
     if instance._items_reserved > (instance._hash_table_count + 2) * 4:
         instance._compressItemTableUnsafe()
 
     if instance._hash_table_count < instance._hash_table_size >> 3:
         instance._resizeTableUnsafe()
 
+    return dict_discard_key_in_place(instance, item, itemHash)
+
+
+def dict_discard_key_in_place(instance, item, itemHash):
+    """Like 'dict_discard_key', but never compresses or resizes the table, so no other item moves."""
     slots = instance._hash_table_slots
 
     if not slots:
-        raise KeyError(item)
+        return False
 
     if itemHash < 0:
         itemHash = -itemHash
@@ -147,7 +153,7 @@ def dict_remove_key(instance, item, itemHash):
         slotIndex = int((slots + offset).get())
 
         if slotIndex == EMPTY:
-            raise KeyError(item)
+            return False
 
         if slotIndex != DELETED and (instance._hash_table_hashes + offset).get() == itemHash:
             if instance.getKeyByIndexUnsafe(slotIndex) == item:
@@ -157,7 +163,7 @@ def dict_remove_key(instance, item, itemHash):
                 instance._items_populated[slotIndex] = 0
 
                 instance.deleteItemByIndexUnsafe(slotIndex)
-                return
+                return True
 
         offset += 1
         if offset >= instance._hash_table_size:
@@ -165,7 +171,12 @@ def dict_remove_key(instance, item, itemHash):
 
     # not necessary, but currently we don't currently realize that the while loop
     # never exits, and so we think there's a possibility we return None
-    return 0
+    return False
+
+
+def dict_remove_key(instance, item, itemHash):
+    if not dict_discard_key(instance, item, itemHash):
+        raise KeyError(item)
 
 
 def dict_clear(instance):
@@ -307,7 +318,7 @@ class DictWrapperBase(RefcountedWrapper):
             ('items_populated', native_ast.UInt8Ptr),
             ('items_reserved', native_ast.Int64),
             ('top_item_slot', native_ast.Int64),
-            ('hash_table_slots', native_ast.Int32Ptr),
+            ('hash_table_slots', native_ast.Int64Ptr),
             ('hash_table_hashes', native_ast.Int32Ptr),
             ('hash_table_size', native_ast.Int64),
             ('hash_table_count', native_ast.Int64),
@@ -372,7 +383,7 @@ class DictWrapper(DictWrapperBase):
 
         if attr == '_hash_table_slots':
             return context.pushPod(
-                PointerTo(Int32),
+                PointerTo(Int64),
                 expr.nonref_expr.ElementPtrIntegers(0, 5).load()
             )
 
@@ -485,7 +496,7 @@ class DictWrapper(DictWrapperBase):
 
             if methodname == "_allocateNewSlotUnsafe":
                 return context.pushPod(
-                    Int32,
+                    Int64,
                     runtime_functions.dict_allocateNewSlot.call(
                         instance.nonref_expr.cast(native_ast.VoidPtr),
                         context.constant(self.kvBytecount)
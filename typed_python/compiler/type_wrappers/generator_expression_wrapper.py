@@ -0,0 +1,271 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typed_python import NoneType
+from typed_python.compiler.type_wrappers.iterator_wrappers import CompositeIteratorWrapper
+from typed_python.compiler.python_ast_analysis import computeComprehensionReadVariables
+from typed_python.compiler.type_wrappers.comprehensions import (
+    checkTargetIsSupported, bindTarget, convertIfAllTrue, convertElement
+)
+import typed_python.compiler.native_ast as native_ast
+import typed_python.compiler
+
+typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
+
+# the states of the search loop in 'convert_next'
+_SEARCHING = 0
+_FOUND = 1
+_EXHAUSTED = 2
+
+
+class GeneratorWrapper(CompositeIteratorWrapper):
+    """Base class for the lazy iterators we compile generator expressions and generator functions to.
+
+    Besides iterating, a generator can be explicitly converted to a ListOf,
+    which appends its elements straight into the new list.
+    """
+
+    def _can_convert_to_type(self, otherType, explicit):
+        if explicit and getattr(otherType.typeRepresentation, "__typed_python_category__", None) == "ListOf":
+            return True
+
+        return super()._can_convert_to_type(otherType, explicit)
+
+    def convert_to_type_with_target(self, context, expr, targetVal, explicit):
+        if explicit and getattr(targetVal.expr_type.typeRepresentation, "__typed_python_category__", None) == "ListOf":
+            # stream our elements straight into the list
+            targetVal.convert_default_initialize()
+
+            iterator = expr.convert_method_call("__iter__", (), {})
+            if iterator is None:
+                return None
+
+            isPopulated = context.push(bool, lambda b: b.expr.store(native_ast.const_bool_expr(True)))
+
+            with context.whileLoop(isPopulated):
+                element, hasElement = iterator.convert_next()
+
+                if element is not None:
+                    context.pushEffect(isPopulated.expr.store(hasElement.nonref_expr))
+
+                    with context.ifelse(hasElement.nonref_expr) as (ifTrue, ifFalse):
+                        with ifTrue:
+                            targetVal.convert_method_call("append", (element,), {})
+
+            return context.constant(True)
+
+        return super().convert_to_type_with_target(context, expr, targetVal, explicit)
+
+
+class GeneratorExpressionWrapper(GeneratorWrapper):
+    """Models a generator expression like '(f(x) for x in xs if p(x))' as a lazy iterator.
+
+    The generator holds the iterator over its source together with a copy of every
+    variable its body reads, so it doesn't depend on the frame that created it and
+    can be passed to other compiled functions. 'convert_next' advances the source
+    iterator until it finds an element passing the filters, and computes the
+    element in place, so a pipeline of generators runs as a single fused loop
+    without materializing anything in between.
+
+    Because the generator is a value, copying it copies its position. Python
+    would share the position between the copies.
+    """
+
+    def __init__(self, ast, iteratorType, capturedNamesAndTypes, elementType):
+        """Initialize a GeneratorExpressionWrapper.
+
+        Args:
+            ast - the python_ast.Expr.GeneratorExp we're implementing
+            iteratorType - a Wrapper for the iterator over the source iterable
+            capturedNamesAndTypes - a tuple of (name, Wrapper) pairs for the variables
+                the body reads from the scope that created the generator
+            elementType - a Wrapper for the elements we produce
+        """
+        super().__init__(
+            (
+                "generator",
+                (ast.filename, ast.line_number, ast.col_offset),
+                iteratorType,
+                capturedNamesAndTypes,
+                elementType
+            ),
+            # the members we actually need to store. Empty types carry no data, and
+            # the iterator's name can't collide with the name of a python variable.
+            ((".iterator", iteratorType),) + tuple(
+                (name, T) for name, T in capturedNamesAndTypes if not T.is_empty
+            ),
+            "generator_expression"
+        )
+
+        self.ast = ast
+        self.iteratorType = iteratorType
+        self.capturedNamesAndTypes = capturedNamesAndTypes
+        self.elementType = elementType
+
+    def __str__(self):
+        return "Generator(%s)" % self.elementType
+
+    @staticmethod
+    def convertGeneratorExpression(context, ast):
+        """Convert the generator expression 'ast' to a TypedExpression of a GeneratorExpressionWrapper.
+
+        Like python, we evaluate the iterable of the first 'for' clause immediately.
+        Unlike python, we also look up the variables the body reads immediately,
+        rather than each time the body runs.
+
+        Args:
+            context - an ExpressionConversionContext
+            ast - a python_ast.Expr.GeneratorExp
+
+        Returns:
+            None if the expression doesn't return control flow to the caller,
+            or a TypedExpression.
+        """
+        if len(ast.generators) != 1:
+            raise NotImplementedError("Can't handle generator expressions with more than one 'for' clause")
+
+        if ast.generators[0].is_async:
+            raise NotImplementedError("Can't handle asynchronous generator expressions")
+
+        checkTargetIsSupported(ast.generators[0].target)
+
+        source = context.convert_expression_ast(ast.generators[0].iter)
+        if source is None:
+            return None
+
+        iterator = source.convert_method_call("__iter__", (), {})
+        if iterator is None:
+            return None
+
+        captured = {}
+        for name in sorted(computeComprehensionReadVariables(ast)):
+            captured[name] = context.namedVariableLookup(name)
+            if captured[name] is None:
+                return None
+
+        # convert the body once against a throwaway copy of the iterator to find out
+        # what type of element it produces.
+        with context.subcontext():
+            step = GeneratorExpressionWrapper.convertBody(
+                context,
+                ast,
+                iterator,
+                captured,
+                lambda element: element.convert_mutable_masquerade_to_untyped().expr_type
+            )
+
+        elementType = step[1] if step is not None else None
+
+        if elementType is None:
+            # the body always throws, so we'll never actually produce an element
+            elementType = typeWrapper(NoneType)
+
+        wrapper = GeneratorExpressionWrapper(
+            ast,
+            iterator.expr_type,
+            tuple((name, captured[name].expr_type) for name in sorted(captured)),
+            elementType
+        )
+
+        return wrapper.initializeMembers(context, dict(captured, **{".iterator": iterator}))
+
+    @staticmethod
+    def convertBody(context, ast, iterator, captured, onElement):
+        """Generate code that advances 'iterator' once and produces an element if the filters pass.
+
+        Args:
+            context - an ExpressionConversionContext
+            ast - the python_ast.Expr.GeneratorExp
+            iterator - a TypedExpression for the iterator over the source
+            captured - a dict from name to TypedExpression for the variables the body reads
+            onElement - a function called with the TypedExpression for the element, if
+                we produce one, within the branch where all the filters passed.
+
+        Returns:
+            None if advancing the iterator always throws. Otherwise, a pair (isPopulated, result)
+            where 'isPopulated' is a TypedExpression that's True if the source produced a value,
+            and 'result' is whatever 'onElement' returned, or None if it never gets called.
+        """
+        item, isPopulated = iterator.convert_next()
+        if item is None:
+            return None
+
+        result = [None]
+
+        with context.ifelse(isPopulated.nonref_expr) as (ifTrue, ifFalse):
+            with ifTrue:
+                names = dict(captured)
+
+                if bindTarget(context, ast.generators[0].target, item, names):
+                    with context.scopedNames(names):
+                        result[0] = convertIfAllTrue(
+                            context,
+                            ast.generators[0].ifs,
+                            lambda: convertElement(context, ast.elt, onElement)
+                        )
+
+        return isPopulated, result[0]
+
+    def capturedValues(self, context, expr):
+        """Return a dict from name to a TypedExpression for each variable we captured."""
+        res = {}
+
+        for name, T in self.capturedNamesAndTypes:
+            if T.is_empty:
+                res[name] = context.pushVoid(T)
+            else:
+                res[name] = self.refTo(context, expr, name)
+
+        return res
+
+    def convert_next(self, context, expr):
+        iterator = self.refTo(context, expr, ".iterator")
+        captured = self.capturedValues(context, expr)
+
+        state = context.push(int, lambda s: s.expr.store(native_ast.const_int_expr(_SEARCHING)))
+
+        if self.elementType.is_empty:
+            result = context.pushVoid(self.elementType)
+        else:
+            result = context.allocateUninitializedSlot(self.elementType)
+
+        def onElement(element):
+            element = element.convert_mutable_masquerade_to_untyped().convert_to_type(self.elementType)
+            if element is None:
+                return None
+
+            if not self.elementType.is_empty:
+                result.convert_copy_initialize(element)
+
+            context.pushEffect(state.expr.store(native_ast.const_int_expr(_FOUND)))
+
+        with context.whileLoop(state.nonref_expr.eq(native_ast.const_int_expr(_SEARCHING))):
+            step = self.convertBody(context, self.ast, iterator, captured, onElement)
+
+            if step is not None:
+                isPopulated, _ = step
+
+                with context.ifelse(isPopulated.nonref_expr) as (ifTrue, ifFalse):
+                    with ifFalse:
+                        context.pushEffect(state.expr.store(native_ast.const_int_expr(_EXHAUSTED)))
+
+        found = context.pushPod(bool, state.nonref_expr.eq(native_ast.const_int_expr(_FOUND)))
+
+        # we can't activate the slot's destructor inside the loop, so we do it once we're out
+        if not self.elementType.is_empty:
+            with context.ifelse(found.nonref_expr) as (ifTrue, ifFalse):
+                with ifTrue:
+                    context.markUninitializedSlotInitialized(result)
+
+        return result, found
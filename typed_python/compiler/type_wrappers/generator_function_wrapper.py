@@ -0,0 +1,970 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import builtins
+
+from typed_python import NoneType, OneOf
+from typed_python.compiler.type_wrappers.generator_expression_wrapper import GeneratorWrapper
+from typed_python.compiler.python_ast_analysis import (
+    computeAssignedVariables, computeReadVariables, visitPyAstChildren
+)
+from typed_python.compiler.type_wrappers.comprehensions import checkTargetIsSupported, bindTarget
+import typed_python.python_ast as python_ast
+import typed_python.compiler.native_ast as native_ast
+import typed_python.compiler
+
+typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
+pythonObjectRepresentation = lambda context, f: \
+    typed_python.compiler.python_object_representation.pythonObjectRepresentation(context, f)
+
+# the modes the body runs in during 'convert_next'. A positive mode means we're
+# looking for the 'yield' with that number, so we can resume right after it.
+_RUNNING = 0
+_YIELDED = -1
+_BREAKING = -2
+_CONTINUING = -3
+
+# the '.state' of a generator that has finished. Otherwise '.state' is 0 if
+# the generator hasn't started, or the number of the 'yield' it's paused at.
+_FINISHED = -4
+
+# how many times we'll convert the body looking for the types of the locals
+# before we give up and let the interpreter run the generator.
+_MAX_INFERENCE_PASSES = 20
+
+# generator functions we're in the middle of converting. A generator that
+# calls itself gets the interpreter's version of itself.
+_generatorsBeingConverted = set()
+
+
+class GeneratorFunctionWrapper(GeneratorWrapper):
+    """Models the generator returned by calling a generator function as a resumable lazy iterator.
+
+    The generator holds the function's arguments and locals, an iterator for each
+    of its 'for' loops, and the number of the 'yield' it's paused at. 'convert_next'
+    runs the body as a state machine: it skips forward to the paused 'yield', runs
+    until the next one, and records where it stopped.
+
+    We can only do this for bodies made of assignments, expressions, 'if', 'while',
+    and 'for' statements, 'break', 'continue', 'raise', bare 'return', and 'yield'
+    used as a statement. Other generator functions run in the interpreter.
+
+    Like generator expressions, copying the generator copies its position, and we look
+    up the globals the body reads when we convert it rather than when it runs.
+    """
+
+    def __init__(self, f, pyast, freeValues, localNamesAndTypes, iteratorTypes, elementType):
+        """Initialize a GeneratorFunctionWrapper.
+
+        Args:
+            f - the python generator function we're implementing
+            pyast - the python_ast.Statement.FunctionDef for 'f'
+            freeValues - a dict from name to value for the globals, closure variables,
+                and builtins the body reads
+            localNamesAndTypes - a tuple of (name, Wrapper) pairs for the arguments and locals
+            iteratorTypes - a tuple with a Wrapper for the iterator of each 'for' loop,
+                in the order they appear in the body
+            elementType - a Wrapper for the elements we produce
+        """
+        memberNamesAndTypes = [(".state", typeWrapper(int))]
+        memberNamesAndTypes.extend((name, T) for name, T in localNamesAndTypes if not T.is_empty)
+
+        # the iterator of a loop we haven't reached yet isn't initialized, so we
+        # track which of the ones that need destroying are.
+        liveFlags = {}
+        for i, T in enumerate(iteratorTypes):
+            memberNamesAndTypes.append((".iter%s" % i, T))
+            if not T.is_pod:
+                liveFlags[".iter%s" % i] = ".iter%s.live" % i
+                memberNamesAndTypes.append((liveFlags[".iter%s" % i], typeWrapper(bool)))
+
+        super().__init__(
+            ("generator_function", f, localNamesAndTypes, iteratorTypes, elementType),
+            memberNamesAndTypes,
+            "generator_function"
+        )
+
+        self.f = f
+        self.pyast = pyast
+        self.freeValues = freeValues
+        self.localNamesAndTypes = localNamesAndTypes
+        self.iteratorTypes = iteratorTypes
+        self.elementType = elementType
+        self.liveFlags = liveFlags
+
+    def __str__(self):
+        return "Generator(%s, %s)" % (self.f.__name__, self.elementType)
+
+    @staticmethod
+    def convertGeneratorCall(context, f, args, kwargs):
+        """Convert a call to the generator function 'f' to a TypedExpression of a GeneratorFunctionWrapper.
+
+        Like python, we evaluate the arguments but don't run any of the body.
+
+        Args:
+            context - an ExpressionConversionContext
+            f - a python function whose code has the CO_GENERATOR flag
+            args - a list of TypedExpressions for the positional arguments
+            kwargs - a dict from name to TypedExpression for the keyword arguments
+
+        Returns:
+            a TypedExpression.
+
+        Raises:
+            NotImplementedError if we can't compile 'f', in which case we haven't
+            generated any code, and the caller should call it in the interpreter.
+        """
+        if f in _generatorsBeingConverted:
+            raise NotImplementedError("Can't compile generator functions that call themselves")
+
+        try:
+            pyast = python_ast.convertFunctionToAlgebraicPyAst(f)
+        except Exception:
+            raise NotImplementedError("Can't get the source of %s" % f.__qualname__)
+
+        if not pyast.matches.FunctionDef:
+            raise NotImplementedError("Can't compile a generator lambda")
+
+        checkStatementsAreSupported(pyast.body)
+
+        argNames = [arg.arg for arg in pyast.args.args]
+        localNames = computeAssignedVariables(pyast.body).union(argNames)
+        freeValues = lookupFreeValues(f, computeReadVariables(pyast.body).difference(localNames))
+
+        # our locals always hold a value, so we leave it to the interpreter to raise
+        # UnboundLocalError if the body might read one before assigning it.
+        checkLocalsAreAssignedBeforeUse(pyast.body, localNames, set(argNames))
+
+        _generatorsBeingConverted.add(f)
+        try:
+            with context.subcontext():
+                argTypes = {
+                    name: arg.expr_type.convert_mutable_masquerade_to_untyped_type()
+                    for name, arg in bindArguments(context, f, pyast, args, kwargs).items()
+                }
+
+            wrapper = GeneratorFunctionWrapper.inferTypes(context, f, pyast, freeValues, localNames, argTypes)
+
+            # make sure we can generate all the code we'll need before we generate any of it
+            with context.subcontext():
+                wrapper.initialize(context, bindArguments(context, f, pyast, args, kwargs))
+                wrapper.convert_next(context, context.allocateUninitializedSlot(wrapper))
+        finally:
+            _generatorsBeingConverted.discard(f)
+
+        return wrapper.initialize(context, bindArguments(context, f, pyast, args, kwargs))
+
+    @staticmethod
+    def inferTypes(context, f, pyast, freeValues, localNames, argTypes):
+        """Find the types of the locals, loop iterators, and elements of the generator function 'f'.
+
+        We convert the body over and over, recording the type of everything assigned
+        to each local, until the types stop changing. On each pass we skip statements
+        that read locals we don't know the type of yet.
+
+        Returns:
+            a GeneratorFunctionWrapper.
+        """
+        inference = GeneratorTypeInference(argTypes, None)
+
+        for _ in range(_MAX_INFERENCE_PASSES):
+            previous = inference
+            inference = GeneratorTypeInference(previous.localTypes, previous.elementType)
+
+            provisional = GeneratorFunctionWrapper(
+                f,
+                pyast,
+                freeValues,
+                tuple(sorted(previous.localTypes.items())),
+                (),
+                typeWrapper(NoneType)
+            )
+
+            with context.subcontext():
+                GeneratorBodyConversion(
+                    context,
+                    provisional,
+                    context.allocateUninitializedSlot(provisional),
+                    context.push(int, lambda mode: mode.expr.store(native_ast.const_int_expr(_RUNNING))),
+                    None,
+                    inference
+                ).convertBody()
+
+            if inference.summary() == previous.summary():
+                break
+        else:
+            raise NotImplementedError("The types of the locals of %s never settle down" % f.__qualname__)
+
+        untyped = set(localNames).difference(inference.localTypes)
+        if untyped:
+            raise NotImplementedError("Can't work out the types of %s" % ", ".join(sorted(untyped)))
+
+        loopCount = countLoops(pyast.body)
+        if sorted(inference.iteratorTypes) != list(range(loopCount)):
+            raise NotImplementedError("Can't work out the types of all the loops in %s" % f.__qualname__)
+
+        return GeneratorFunctionWrapper(
+            f,
+            pyast,
+            freeValues,
+            tuple(sorted(inference.localTypes.items())),
+            tuple(inference.iteratorTypes[i] for i in range(loopCount)),
+            inference.elementType or typeWrapper(NoneType)
+        )
+
+    def localType(self, name):
+        for localName, T in self.localNamesAndTypes:
+            if localName == name:
+                return T
+
+        raise Exception(f"{self} has no local {name}")
+
+    def initialize(self, context, argValues):
+        """Push a new generator that hasn't started, with its arguments taken from the dict 'argValues'."""
+        def initialize(instance):
+            context.pushEffect(self.refTo(context, instance, ".state").expr.store(native_ast.const_int_expr(_RUNNING)))
+
+            for name, T in self.localNamesAndTypes:
+                if T.is_empty:
+                    continue
+
+                if name in argValues:
+                    value = argValues[name].convert_mutable_masquerade_to_untyped().convert_to_type(T)
+                    if value is None:
+                        return None
+
+                    self.refTo(context, instance, name).convert_copy_initialize(value)
+                else:
+                    self.refTo(context, instance, name).convert_default_initialize()
+
+            for i, T in enumerate(self.iteratorTypes):
+                name = ".iter%s" % i
+
+                if name in self.liveFlags:
+                    context.pushEffect(
+                        self.refTo(context, instance, self.liveFlags[name]).expr.store(native_ast.falseExpr)
+                    )
+                else:
+                    context.pushEffect(
+                        self.refTo(context, instance, name).expr.store(T.getNativeLayoutType().zero())
+                    )
+
+        return context.push(self, initialize)
+
+    def assignIterator(self, context, instance, loopIx, iterator):
+        """Store 'iterator' as the iterator of the loop numbered 'loopIx'."""
+        name = ".iter%s" % loopIx
+        T = self.iteratorTypes[loopIx]
+
+        if iterator.expr_type != T:
+            raise NotImplementedError(f"Loop {loopIx} iterates a {iterator.expr_type} rather than a {T}")
+
+        target = self.refTo(context, instance, name)
+
+        if name not in self.liveFlags:
+            target.convert_assign(iterator)
+            return
+
+        isLive = self.refTo(context, instance, self.liveFlags[name])
+
+        with context.ifelse(isLive.nonref_expr) as (ifLive, ifNotLive):
+            with ifLive:
+                target.convert_assign(iterator)
+            with ifNotLive:
+                target.convert_copy_initialize(iterator)
+
+        context.pushEffect(isLive.expr.store(native_ast.trueExpr))
+
+    def convert_copy_initialize(self, context, expr, other):
+        for name, T in self.memberNamesAndTypes:
+            if name not in self.liveFlags:
+                self.refTo(context, expr, name).convert_copy_initialize(self.refTo(context, other, name))
+
+        for name, flag in self.liveFlags.items():
+            with context.ifelse(self.refTo(context, other, flag).nonref_expr) as (ifLive, ifNotLive):
+                with ifLive:
+                    self.refTo(context, expr, name).convert_copy_initialize(self.refTo(context, other, name))
+
+    def convert_assign(self, context, expr, other):
+        assert expr.isReference
+
+        flags = set(self.liveFlags.values())
+
+        for name, T in self.memberNamesAndTypes:
+            if name not in self.liveFlags and name not in flags:
+                self.refTo(context, expr, name).convert_assign(self.refTo(context, other, name))
+
+        for name, flag in self.liveFlags.items():
+            target = self.refTo(context, expr, name)
+            source = self.refTo(context, other, name)
+            targetIsLive = self.refTo(context, expr, flag)
+            sourceIsLive = self.refTo(context, other, flag)
+
+            with context.ifelse(targetIsLive.nonref_expr) as (ifTargetLive, ifTargetNotLive):
+                with ifTargetLive:
+                    with context.ifelse(sourceIsLive.nonref_expr) as (ifBothLive, ifOnlyTargetLive):
+                        with ifBothLive:
+                            target.convert_assign(source)
+                        with ifOnlyTargetLive:
+                            target.convert_destroy()
+                with ifTargetNotLive:
+                    with context.ifelse(sourceIsLive.nonref_expr) as (ifOnlySourceLive, ifNeitherLive):
+                        with ifOnlySourceLive:
+                            target.convert_copy_initialize(source)
+
+            context.pushEffect(targetIsLive.expr.store(sourceIsLive.nonref_expr))
+
+    def convert_destroy(self, context, expr):
+        for name, T in self.memberNamesAndTypes:
+            if T.is_pod:
+                continue
+
+            if name in self.liveFlags:
+                with context.ifelse(self.refTo(context, expr, self.liveFlags[name]).nonref_expr) as (ifLive, ifNotLive):
+                    with ifLive:
+                        self.refTo(context, expr, name).convert_destroy()
+            else:
+                self.refTo(context, expr, name).convert_destroy()
+
+    def convert_next(self, context, expr):
+        state = self.refTo(context, expr, ".state")
+
+        mode = context.push(int, lambda mode: mode.expr.store(state.nonref_expr))
+
+        # python finishes a generator whose body throws, so we're finished
+        # unless we make it to a 'yield'.
+        context.pushEffect(state.expr.store(native_ast.const_int_expr(_FINISHED)))
+
+        if self.elementType.is_empty:
+            result = context.pushVoid(self.elementType)
+        else:
+            result = context.allocateUninitializedSlot(self.elementType)
+
+        # the body sees the same version of any generator it calls as it did when we inferred its types
+        wasBeingConverted = self.f in _generatorsBeingConverted
+        _generatorsBeingConverted.add(self.f)
+        try:
+            GeneratorBodyConversion(context, self, expr, mode, result, None).convertBody()
+        finally:
+            if not wasBeingConverted:
+                _generatorsBeingConverted.discard(self.f)
+
+        found = context.pushPod(bool, mode.nonref_expr.eq(native_ast.const_int_expr(_YIELDED)))
+
+        # we can't activate the slot's destructor inside the body, so we do it once we're out
+        if not self.elementType.is_empty:
+            with context.ifelse(found.nonref_expr) as (ifTrue, ifFalse):
+                with ifTrue:
+                    context.markUninitializedSlotInitialized(result)
+
+        return result, found
+
+
+class GeneratorTypeInference:
+    """The types we've found so far for the locals, loop iterators, and elements of a generator function."""
+
+    def __init__(self, localTypes, elementType):
+        self.localTypes = dict(localTypes)
+        self.iteratorTypes = {}
+        self.elementType = elementType
+
+    def summary(self):
+        return (self.localTypes, self.iteratorTypes, self.elementType)
+
+    def noteAssignment(self, name, T):
+        self.localTypes[name] = mergeTypes(self.localTypes.get(name), T)
+
+    def noteElement(self, T):
+        self.elementType = mergeTypes(self.elementType, T)
+
+    def noteIterator(self, loopIx, T):
+        self.iteratorTypes[loopIx] = T
+
+
+class GeneratorBodyConversion:
+    """Converts the body of a generator function to the state machine that runs in 'convert_next'.
+
+    We number the 'yield' statements and 'for' loops in the order they appear.
+    Every statement runs only if 'mode' is _RUNNING, or if we're looking for a
+    'yield' inside it. When we find the 'yield' we're looking for, we switch to
+    _RUNNING. When we yield, break, continue, or return, we set the mode so that
+    every other statement gets skipped until the enclosing loop (if any) handles it.
+
+    If 'inference' is a GeneratorTypeInference, we're converting the body to find out
+    the types of things rather than to run it, so we record what we see instead of
+    storing it, and skip statements that read locals whose type we don't know.
+    """
+
+    def __init__(self, context, wrapper, instance, mode, result, inference):
+        self.context = context
+        self.wrapper = wrapper
+        self.instance = instance
+        self.mode = mode
+        self.result = result
+        self.inference = inference
+        self.yieldIx = 1
+        self.loopIx = 0
+        self.names = None
+
+        self.unknownLocals = set(
+            computeAssignedVariables(wrapper.pyast.body).union(arg.arg for arg in wrapper.pyast.args.args)
+        ).difference(name for name, T in wrapper.localNamesAndTypes)
+
+    def convertBody(self):
+        self.names = {name: pythonObjectRepresentation(self.context, value) for name, value in self.wrapper.freeValues.items()}
+
+        for name, T in self.wrapper.localNamesAndTypes:
+            if T.is_empty:
+                self.names[name] = self.context.pushVoid(T)
+            else:
+                self.names[name] = self.wrapper.refTo(self.context, self.instance, name)
+
+        with self.context.scopedNames(self.names):
+            self.convertStatements(self.wrapper.pyast.body)
+
+    def modeIs(self, mode):
+        return self.mode.nonref_expr.eq(native_ast.const_int_expr(mode))
+
+    def setMode(self, mode):
+        self.context.pushEffect(self.mode.expr.store(native_ast.const_int_expr(mode)))
+
+    def isSeeking(self, firstYieldIx, yieldCount):
+        """Return a native expression that's true if we're looking for one of 'yieldCount' yields starting at 'firstYieldIx'."""
+        if not yieldCount:
+            return native_ast.falseExpr
+
+        return self.mode.nonref_expr.gte(native_ast.const_int_expr(firstYieldIx)).bitand(
+            self.mode.nonref_expr.lte(native_ast.const_int_expr(firstYieldIx + yieldCount - 1))
+        )
+
+    def readsUnknownLocals(self, *exprs):
+        return self.inference is not None and computeReadVariables(list(exprs)).intersection(self.unknownLocals)
+
+    def convertStatements(self, statements):
+        for statement in statements:
+            yieldIx = self.yieldIx
+            loopIx = self.loopIx
+
+            yieldCount = countYields([statement])
+
+            with self.context.ifelse(self.modeIs(_RUNNING).bitor(self.isSeeking(yieldIx, yieldCount))) as (ifRuns, ifSkipped):
+                with ifRuns:
+                    self.convertStatement(statement)
+
+            self.yieldIx = yieldIx + yieldCount
+            self.loopIx = loopIx + countLoops([statement])
+
+    def convertStatement(self, ast):
+        context = self.context
+
+        if ast.matches.Expr and ast.value.matches.Yield:
+            self.convertYield(ast.value)
+            return
+
+        if ast.matches.Expr:
+            if not self.readsUnknownLocals(ast.value):
+                context.convert_expression_ast(ast.value)
+            return
+
+        if ast.matches.Assign:
+            if self.readsUnknownLocals(ast.value):
+                return
+
+            value = context.convert_expression_ast(ast.value)
+            if value is None:
+                return
+
+            names = {}
+            if not bindTarget(context, ast.targets[0], value, names):
+                return
+
+            for name, nameValue in names.items():
+                if not self.assignLocal(name, nameValue):
+                    return
+            return
+
+        if ast.matches.AugAssign:
+            if self.readsUnknownLocals(ast.value) or ast.target.id in self.unknownLocals:
+                return
+
+            value = context.convert_expression_ast(ast.value)
+            if value is None:
+                return
+
+            value = self.names[ast.target.id].convert_bin_op(ast.op, value, True)
+            if value is None:
+                return
+
+            self.assignLocal(ast.target.id, value)
+            return
+
+        if ast.matches.If:
+            self.convertIf(ast)
+            return
+
+        if ast.matches.While:
+            self.convertWhile(ast)
+            return
+
+        if ast.matches.For:
+            self.convertFor(ast)
+            return
+
+        if ast.matches.Raise:
+            if self.readsUnknownLocals(ast.exc):
+                return
+
+            toThrow = context.convert_expression_ast(ast.exc)
+            if toThrow is not None:
+                context.pushExceptionObject(toThrow)
+            return
+
+        if ast.matches.Break:
+            self.setMode(_BREAKING)
+            return
+
+        if ast.matches.Continue:
+            self.setMode(_CONTINUING)
+            return
+
+        if ast.matches.Return:
+            self.setMode(_FINISHED)
+            return
+
+        assert ast.matches.Pass, ast
+
+    def convertYield(self, ast):
+        yieldIx = self.yieldIx
+
+        with self.context.ifelse(self.modeIs(yieldIx)) as (ifResuming, ifRunning):
+            with ifResuming:
+                # we paused here last time, so pick up where we left off
+                self.setMode(_RUNNING)
+
+            with ifRunning:
+                if ast.value is None:
+                    value = self.context.constant(None)
+                elif self.readsUnknownLocals(ast.value):
+                    return
+                else:
+                    value = self.context.convert_expression_ast(ast.value)
+
+                if value is None:
+                    return
+
+                value = value.convert_mutable_masquerade_to_untyped()
+
+                if self.inference is not None:
+                    self.inference.noteElement(value.expr_type)
+                    return
+
+                value = value.convert_to_type(self.wrapper.elementType)
+                if value is None:
+                    return
+
+                if not self.wrapper.elementType.is_empty:
+                    self.result.convert_copy_initialize(value)
+
+                self.context.pushEffect(
+                    self.wrapper.refTo(self.context, self.instance, ".state").expr.store(
+                        native_ast.const_int_expr(yieldIx)
+                    )
+                )
+                self.setMode(_YIELDED)
+
+    def assignLocal(self, name, value):
+        """Assign 'value' to the local 'name'. Returns False if that always throws."""
+        value = value.convert_mutable_masquerade_to_untyped()
+
+        if self.inference is not None:
+            self.inference.noteAssignment(name, value.expr_type)
+            return True
+
+        T = self.wrapper.localType(name)
+
+        value = value.convert_to_type(T)
+        if value is None:
+            return False
+
+        if not T.is_empty:
+            self.names[name].convert_assign(value)
+
+        return True
+
+    def convertIf(self, ast):
+        context = self.context
+
+        if self.readsUnknownLocals(ast.test):
+            return
+
+        yieldIx = self.yieldIx
+        loopIx = self.loopIx
+        bodyYieldCount = countYields(ast.body)
+
+        # if we're looking for a yield, it tells us which branch we were in
+        takeBody = context.push(bool, lambda b: b.expr.store(self.isSeeking(yieldIx, bodyYieldCount)))
+
+        with context.ifelse(self.modeIs(_RUNNING)) as (ifRunning, ifSeeking):
+            with ifRunning:
+                test = context.convert_expression_ast(ast.test)
+                if test is not None:
+                    test = test.toBool()
+                if test is not None:
+                    context.pushEffect(takeBody.expr.store(test.nonref_expr))
+
+        with context.ifelse(takeBody.nonref_expr) as (ifTrue, ifFalse):
+            with ifTrue:
+                self.yieldIx, self.loopIx = yieldIx, loopIx
+                self.convertStatements(ast.body)
+
+            with ifFalse:
+                self.yieldIx, self.loopIx = yieldIx + bodyYieldCount, loopIx + countLoops(ast.body)
+                self.convertStatements(ast.orelse)
+
+    def convertWhile(self, ast):
+        context = self.context
+
+        if self.readsUnknownLocals(ast.test):
+            return
+
+        keepGoing = context.push(bool, lambda b: b.expr.store(native_ast.trueExpr))
+
+        with context.whileLoop(keepGoing):
+            with context.ifelse(self.modeIs(_RUNNING)) as (ifRunning, ifSeeking):
+                with ifRunning:
+                    test = context.convert_expression_ast(ast.test)
+                    if test is not None:
+                        test = test.toBool()
+                    if test is not None:
+                        context.pushEffect(keepGoing.expr.store(test.nonref_expr))
+
+            self.convertLoopBody(ast.body, keepGoing)
+
+    def convertFor(self, ast):
+        context = self.context
+        loopIx = self.loopIx
+
+        if self.readsUnknownLocals(ast.iter):
+            return
+
+        if self.inference is not None:
+            iterable = context.convert_expression_ast(ast.iter)
+            if iterable is None:
+                return
+
+            iterator = iterable.convert_method_call("__iter__", (), {})
+            if iterator is None:
+                return
+
+            self.inference.noteIterator(loopIx, iterator.expr_type)
+        else:
+            with context.ifelse(self.modeIs(_RUNNING)) as (ifRunning, ifSeeking):
+                with ifRunning:
+                    iterable = context.convert_expression_ast(ast.iter)
+                    newIterator = iterable.convert_method_call("__iter__", (), {}) if iterable is not None else None
+                    if newIterator is not None:
+                        self.wrapper.assignIterator(context, self.instance, loopIx, newIterator)
+
+            iterator = self.wrapper.refTo(context, self.instance, ".iter%s" % loopIx)
+
+        self.loopIx = loopIx + 1
+
+        keepGoing = context.push(bool, lambda b: b.expr.store(native_ast.trueExpr))
+
+        with context.whileLoop(keepGoing):
+            with context.ifelse(self.modeIs(_RUNNING)) as (ifRunning, ifSeeking):
+                with ifRunning:
+                    item, isPopulated = iterator.convert_next()
+
+                    if item is not None:
+                        with context.ifelse(isPopulated.nonref_expr) as (ifPopulated, ifExhausted):
+                            with ifPopulated:
+                                names = {}
+                                if bindTarget(context, ast.target, item, names):
+                                    for name, value in names.items():
+                                        if not self.assignLocal(name, value):
+                                            break
+                            with ifExhausted:
+                                context.pushEffect(keepGoing.expr.store(native_ast.falseExpr))
+
+            self.convertLoopBody(ast.body, keepGoing)
+
+    def convertLoopBody(self, body, keepGoing):
+        """Convert the body of a loop, and then handle any 'break' or 'continue' it hit."""
+        context = self.context
+        yieldIx = self.yieldIx
+        loopIx = self.loopIx
+
+        with context.ifelse(keepGoing.nonref_expr) as (ifTrue, ifFalse):
+            with ifTrue:
+                self.convertStatements(body)
+
+                with context.ifelse(self.modeIs(_BREAKING)) as (ifBreaking, ifNotBreaking):
+                    with ifBreaking:
+                        self.setMode(_RUNNING)
+                        context.pushEffect(keepGoing.expr.store(native_ast.falseExpr))
+
+                    with ifNotBreaking:
+                        with context.ifelse(self.modeIs(_CONTINUING)) as (ifContinuing, ifNotContinuing):
+                            with ifContinuing:
+                                self.setMode(_RUNNING)
+
+                            with ifNotContinuing:
+                                # we yielded or returned, so leave the loop where it is
+                                with context.ifelse(self.modeIs(_RUNNING)) as (ifRunning, ifLeaving):
+                                    with ifLeaving:
+                                        context.pushEffect(keepGoing.expr.store(native_ast.falseExpr))
+
+        self.yieldIx = yieldIx + countYields(body)
+        self.loopIx = loopIx + countLoops(body)
+
+
+def mergeTypes(existing, new):
+    """Return a Wrapper that can hold values of Wrappers 'existing' (which may be None) and 'new'."""
+    if existing is None or existing == new:
+        return new
+
+    existingType = existing.typeRepresentation
+
+    if getattr(existingType, "__typed_python_category__", None) == "OneOf" and new.typeRepresentation in existingType.Types:
+        return existing
+
+    if not isinstance(existingType, type) or not isinstance(new.typeRepresentation, type):
+        raise NotImplementedError(f"Can't hold both a {existing} and a {new} in the same variable")
+
+    return typeWrapper(OneOf(new.typeRepresentation, existingType))
+
+
+def countYields(statements):
+    """Return the number of 'yield' statements in the python_ast statements 'statements', including nested ones."""
+    res = 0
+
+    for statement in statements:
+        if statement.matches.Expr and statement.value.matches.Yield:
+            res += 1
+        elif statement.matches.If or statement.matches.While or statement.matches.For:
+            res += countYields(statement.body) + countYields(statement.orelse)
+
+    return res
+
+
+def countLoops(statements):
+    """Return the number of 'for' loops in the python_ast statements 'statements', including nested ones."""
+    res = 0
+
+    for statement in statements:
+        if statement.matches.For:
+            res += 1
+
+        if statement.matches.If or statement.matches.While or statement.matches.For:
+            res += countLoops(statement.body) + countLoops(statement.orelse)
+
+    return res
+
+
+def checkStatementsAreSupported(statements):
+    """Raise NotImplementedError unless we can compile a generator function whose body is 'statements'."""
+    for statement in statements:
+        if statement.matches.Expr:
+            if statement.value.matches.Yield:
+                if statement.value.value is not None:
+                    checkExpressionIsSupported(statement.value.value)
+            else:
+                checkExpressionIsSupported(statement.value)
+        elif statement.matches.Assign:
+            if len(statement.targets) != 1:
+                raise NotImplementedError("Can't compile chained assignments in generator functions")
+
+            checkTargetIsSupported(statement.targets[0])
+            checkExpressionIsSupported(statement.value)
+        elif statement.matches.AugAssign:
+            if not statement.target.matches.Name:
+                raise NotImplementedError(
+                    "Can't compile augmented assignments to %s in generator functions"
+                    % python_ast.alternativeName(statement.target)
+                )
+
+            checkExpressionIsSupported(statement.value)
+        elif statement.matches.If:
+            checkExpressionIsSupported(statement.test)
+            checkStatementsAreSupported(statement.body)
+            checkStatementsAreSupported(statement.orelse)
+        elif statement.matches.While or statement.matches.For:
+            if statement.orelse:
+                raise NotImplementedError("Can't compile loops with 'else' clauses in generator functions")
+
+            if statement.matches.While:
+                checkExpressionIsSupported(statement.test)
+            else:
+                checkTargetIsSupported(statement.target)
+                checkExpressionIsSupported(statement.iter)
+
+            checkStatementsAreSupported(statement.body)
+        elif statement.matches.Raise:
+            if statement.exc is None or statement.cause is not None:
+                raise NotImplementedError("Can't compile bare 'raise' or 'raise ... from' in generator functions")
+
+            checkExpressionIsSupported(statement.exc)
+        elif statement.matches.Return:
+            value = statement.value
+
+            if value is not None and not (value.matches.Num and value.n.matches.None_):
+                raise NotImplementedError("Can't compile generator functions that return a value")
+        elif not (statement.matches.Pass or statement.matches.Break or statement.matches.Continue):
+            raise NotImplementedError(
+                "Can't compile %s statements in generator functions" % python_ast.alternativeName(statement)
+            )
+
+
+def checkLocalsAreAssignedBeforeUse(statements, localNames, assigned):
+    """Raise NotImplementedError if 'statements' might read one of 'localNames' before assigning it.
+
+    Args:
+        statements - the python_ast statements of a generator function we can compile
+        localNames - the set of names local to the function
+        assigned - the set of locals definitely assigned before 'statements' run
+
+    Returns:
+        the set of locals definitely assigned afterwards, or None if control
+        never flows out the bottom of 'statements'.
+    """
+    def checkReads(*exprs):
+        unassigned = computeReadVariables([e for e in exprs if e is not None]).intersection(localNames).difference(assigned)
+
+        if unassigned:
+            raise NotImplementedError(
+                "Can't compile generator functions that might read %s before assigning it" % ", ".join(sorted(unassigned))
+            )
+
+    assigned = set(assigned)
+
+    for statement in statements:
+        if statement.matches.Expr:
+            checkReads(statement.value)
+        elif statement.matches.Assign:
+            checkReads(statement.value)
+            assigned.update(computeAssignedVariables(statement.targets))
+        elif statement.matches.AugAssign:
+            checkReads(statement.value)
+            if statement.target.id not in assigned:
+                raise NotImplementedError(
+                    "Can't compile generator functions that might read %s before assigning it" % statement.target.id
+                )
+        elif statement.matches.If:
+            checkReads(statement.test)
+
+            afterBody = checkLocalsAreAssignedBeforeUse(statement.body, localNames, assigned)
+            afterOrelse = checkLocalsAreAssignedBeforeUse(statement.orelse, localNames, assigned)
+
+            if afterBody is None and afterOrelse is None:
+                return None
+
+            if afterBody is None or afterOrelse is None:
+                assigned = afterBody if afterOrelse is None else afterOrelse
+            else:
+                assigned = afterBody.intersection(afterOrelse)
+        elif statement.matches.While:
+            # the body might not run at all, so it can't assign anything for the code after the loop
+            checkReads(statement.test)
+            checkLocalsAreAssignedBeforeUse(statement.body, localNames, assigned)
+        elif statement.matches.For:
+            checkReads(statement.iter)
+            checkLocalsAreAssignedBeforeUse(
+                statement.body,
+                localNames,
+                assigned.union(computeAssignedVariables(statement.target))
+            )
+        elif statement.matches.Raise:
+            checkReads(statement.exc)
+            return None
+        elif statement.matches.Return or statement.matches.Break or statement.matches.Continue:
+            return None
+
+    return assigned
+
+
+def checkExpressionIsSupported(expr):
+    """Raise NotImplementedError if 'expr' yields, so we'd have to pause in the middle of it."""
+    def visit(x):
+        if isinstance(x, python_ast.Expr):
+            if x.matches.Yield or x.matches.YieldFrom or x.matches.Await:
+                raise NotImplementedError(
+                    "Can't compile generator functions using %s inside an expression" % python_ast.alternativeName(x)
+                )
+
+            if x.matches.Lambda:
+                return False
+
+        return True
+
+    visitPyAstChildren(expr, visit)
+
+
+def lookupFreeValues(f, names):
+    """Return a dict from name to value for the globals, closure variables, and builtins 'names' of 'f'."""
+    freeVariables = dict(f.__globals__)
+
+    if f.__closure__:
+        for name, cell in zip(f.__code__.co_freevars, f.__closure__):
+            freeVariables[name] = cell.cell_contents
+
+    res = {}
+
+    for name in names:
+        if name in freeVariables:
+            res[name] = freeVariables[name]
+        elif hasattr(builtins, name):
+            res[name] = getattr(builtins, name)
+        else:
+            raise NotImplementedError("%s reads the undefined name %s" % (f.__qualname__, name))
+
+    return res
+
+
+def bindArguments(context, f, pyast, args, kwargs):
+    """Match the arguments of a call to the generator function 'f' to its parameters.
+
+    Returns:
+        a dict from parameter name to TypedExpression.
+
+    Raises:
+        NotImplementedError if 'f' takes *args, **kwargs, or keyword-only arguments,
+        or if the call doesn't match its parameters. The interpreter reports those.
+    """
+    if pyast.args.vararg is not None or pyast.args.kwarg is not None or pyast.args.kwonlyargs:
+        raise NotImplementedError("Can't compile generator functions with *args, **kwargs, or keyword-only arguments")
+
+    names = [arg.arg for arg in pyast.args.args]
+
+    if len(args) > len(names):
+        raise NotImplementedError("Too many arguments to %s" % f.__qualname__)
+
+    res = dict(zip(names, args))
+
+    for name, value in kwargs.items():
+        if name not in names or name in res:
+            raise NotImplementedError("Bad keyword argument %s to %s" % (name, f.__qualname__))
+
+        res[name] = value
+
+    defaults = f.__defaults__ or ()
+
+    for name, default in zip(names[len(names) - len(defaults):], defaults):
+        if name not in res:
+            res[name] = pythonObjectRepresentation(context, default)
+
+    if len(res) != len(names):
+        raise NotImplementedError("Missing arguments to %s" % f.__qualname__)
+
+    return res
@@ -0,0 +1,475 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Compiled versions of the builtins that consume or wrap iterables.
+
+The reductions are written in python against the ordinary iteration protocol, so
+they compile to a single loop specialized on the type being iterated. Iterating a
+ListOf of POD elements that way touches no refcounts at all.
+"""
+
+from typed_python import NoneType, ListOf
+from typed_python.compiler.type_wrappers.wrapper import Wrapper
+from typed_python.compiler.type_wrappers.one_of_wrapper import OneOfWrapper
+from typed_python.compiler.type_wrappers.python_object_of_type_wrapper import PythonObjectOfTypeWrapper
+from typed_python.compiler.type_wrappers.iterator_wrappers import EnumerateWrapper, ZipWrapper
+from typed_python.compiler.type_wrappers.comprehensions import containerElementType
+import typed_python.compiler.native_ast as native_ast
+import typed_python.python_ast as python_ast
+import typed_python.compiler
+
+typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
+
+
+def identity(x):
+    return x
+
+
+def iterable_min(iterable, key):
+    isEmpty = True
+    for x in iterable:
+        k = key(x)
+        if isEmpty:
+            res = x
+            resKey = k
+            isEmpty = False
+        elif k < resKey:
+            res = x
+            resKey = k
+
+    if isEmpty:
+        raise ValueError("min() arg is an empty sequence")
+
+    return res
+
+
+def iterable_max(iterable, key):
+    isEmpty = True
+    for x in iterable:
+        k = key(x)
+        if isEmpty:
+            res = x
+            resKey = k
+            isEmpty = False
+        elif k > resKey:
+            res = x
+            resKey = k
+
+    if isEmpty:
+        raise ValueError("max() arg is an empty sequence")
+
+    return res
+
+
+def iterable_min_default(iterable, key, default):
+    isEmpty = True
+    for x in iterable:
+        k = key(x)
+        if isEmpty:
+            res = x
+            resKey = k
+            isEmpty = False
+        elif k < resKey:
+            res = x
+            resKey = k
+
+    if isEmpty:
+        return default
+
+    return res
+
+
+def iterable_max_default(iterable, key, default):
+    isEmpty = True
+    for x in iterable:
+        k = key(x)
+        if isEmpty:
+            res = x
+            resKey = k
+            isEmpty = False
+        elif k > resKey:
+            res = x
+            resKey = k
+
+    if isEmpty:
+        return default
+
+    return res
+
+
+def iterable_sum(iterable, start):
+    res = start
+    for x in iterable:
+        res = res + x
+    return res
+
+
+def iterable_any(iterable):
+    for x in iterable:
+        if x:
+            return True
+    return False
+
+
+def iterable_all(iterable):
+    for x in iterable:
+        if not x:
+            return False
+    return True
+
+
+def sorted_order(keys, reverse):
+    """Return the indices of 'keys' in sorted order, using a stable bottom-up merge sort.
+
+    We only ever compare keys with '<', like python does.
+    """
+    n = len(keys)
+
+    order = ListOf(int)()
+    order.reserve(n)
+    for i in range(n):
+        order.append(i)
+
+    scratch = ListOf(int)()
+    scratch.resize(n)
+
+    width = 1
+    while width < n:
+        lo = 0
+        while lo < n:
+            mid = lo + width
+            if mid > n:
+                mid = n
+            hi = mid + width
+            if hi > n:
+                hi = n
+
+            i = lo
+            j = mid
+            k = lo
+            while i < mid and j < hi:
+                # take from the right run only if it's strictly better, so equal keys keep their order
+                if reverse:
+                    takeRight = keys[order[i]] < keys[order[j]]
+                else:
+                    takeRight = keys[order[j]] < keys[order[i]]
+
+                if takeRight:
+                    scratch[k] = order[j]
+                    j += 1
+                else:
+                    scratch[k] = order[i]
+                    i += 1
+                k += 1
+
+            while i < mid:
+                scratch[k] = order[i]
+                i += 1
+                k += 1
+
+            while j < hi:
+                scratch[k] = order[j]
+                j += 1
+                k += 1
+
+            lo = hi
+
+        temp = order
+        order = scratch
+        scratch = temp
+
+        width *= 2
+
+    return order
+
+
+def iterable_sorted(iterable, listType, reverse):
+    values = listType()
+    for x in iterable:
+        values.append(x)
+
+    res = listType()
+    res.reserve(len(values))
+    for i in sorted_order(values, reverse):
+        res.append(values[i])
+
+    return res
+
+
+def iterable_sorted_with_key(iterable, listType, keyListType, key, reverse):
+    values = listType()
+    for x in iterable:
+        values.append(x)
+
+    keys = keyListType()
+    keys.reserve(len(values))
+    for x in values:
+        keys.append(key(x))
+
+    res = listType()
+    res.reserve(len(values))
+    for i in sorted_order(keys, reverse):
+        res.append(values[i])
+
+    return res
+
+
+def elementTypeFor(context, iterable, transform=None):
+    """Find out what typed_python type we'd hold the elements of 'iterable' as.
+
+    We convert code that pulls one element out of 'iterable' and then throw it away.
+
+    Args:
+        context - an ExpressionConversionContext
+        iterable - a TypedExpression we can iterate
+        transform - if not None, a function from the element to a TypedExpression,
+            in which case we return the type we'd hold its result as instead.
+
+    Returns:
+        a typed_python type. If we can never produce an element, NoneType.
+    """
+    with context.subcontext():
+        iterator = iterable.convert_method_call("__iter__", (), {})
+        if iterator is None:
+            return NoneType
+
+        item, isPopulated = iterator.convert_next()
+        if item is None:
+            return NoneType
+
+        if transform is not None:
+            item = transform(item)
+            if item is None:
+                return NoneType
+
+        return containerElementType(item.convert_masquerade_to_typed().expr_type)
+
+
+class IterableBuiltinWrapper(Wrapper):
+    is_pod = True
+    is_empty = False
+    is_pass_by_ref = False
+
+    SUPPORTED_FUNCTIONS = (min, max, sum, any, all, sorted, enumerate, zip, reversed)
+
+    def __init__(self, builtin):
+        assert builtin in self.SUPPORTED_FUNCTIONS
+        super().__init__(builtin)
+
+    def getNativeLayoutType(self):
+        return native_ast.Type.Void()
+
+    def convert_call(self, context, expr, args, kwargs):
+        builtin = self.typeRepresentation
+
+        if any(isinstance(a.expr_type, PythonObjectOfTypeWrapper) for a in args):
+            # we know nothing about how an arbitrary object iterates, so let the interpreter do it
+            return context.constantPyObject(builtin).convert_call(args, kwargs)
+
+        if builtin in (min, max) and args and not (set(kwargs) - {"key", "default"}):
+            return self.convertMinMax(context, args, kwargs.get("key"), kwargs.get("default"))
+
+        if builtin is sum and len(args) in (1, 2) and not (set(kwargs) - {"start"}):
+            if len(args) == 2 and kwargs:
+                return super().convert_call(context, expr, args, kwargs)
+
+            if len(args) == 2:
+                start = args[1]
+            else:
+                start = kwargs.get("start", context.constant(0))
+
+            return self.convertSum(context, args[0], start)
+
+        if builtin is any and len(args) == 1 and not kwargs:
+            return context.call_py_function(iterable_any, (args[0],), {})
+
+        if builtin is all and len(args) == 1 and not kwargs:
+            return context.call_py_function(iterable_all, (args[0],), {})
+
+        if builtin is sorted and len(args) == 1 and not (set(kwargs) - {"key", "reverse"}):
+            return self.convertSorted(context, args[0], kwargs.get("key"), kwargs.get("reverse"))
+
+        if builtin is enumerate and len(args) in (1, 2) and not (set(kwargs) - {"start"}):
+            if len(args) == 2 and kwargs:
+                return super().convert_call(context, expr, args, kwargs)
+
+            if len(args) == 2:
+                start = args[1]
+            else:
+                start = kwargs.get("start", context.constant(0))
+
+            return self.convertEnumerate(context, args[0], start)
+
+        if builtin is zip and args and not kwargs:
+            return self.convertZip(context, args)
+
+        if builtin is reversed and len(args) == 1 and not kwargs:
+            return args[0].convert_method_call("__reversed__", (), {})
+
+        return super().convert_call(context, expr, args, kwargs)
+
+    @staticmethod
+    def isNoneOrMissing(arg):
+        return arg is None or arg.expr_type.typeRepresentation is NoneType
+
+    def convertMinMax(self, context, args, key, default):
+        isMax = self.typeRepresentation is max
+
+        if len(args) > 1:
+            if default is not None:
+                context.pushException(
+                    TypeError,
+                    "Cannot specify a default for %s() with multiple positional arguments"
+                    % self.typeRepresentation.__name__
+                )
+                return None
+
+            return self.convertMinMaxOfArguments(context, args, None if self.isNoneOrMissing(key) else key, isMax)
+
+        if self.isNoneOrMissing(key):
+            key = typed_python.compiler.python_object_representation.pythonObjectRepresentation(context, identity)
+
+        if default is None:
+            return context.call_py_function(iterable_max if isMax else iterable_min, (args[0], key), {})
+
+        return context.call_py_function(
+            iterable_max_default if isMax else iterable_min_default,
+            (args[0], key, default),
+            {}
+        )
+
+    @staticmethod
+    def convertMinMaxOfArguments(context, args, key, isMax):
+        """Find the smallest or largest of several arguments, without building a container to hold them.
+
+        Like python, we call 'key' on each argument once, in order, and return the first
+        of the arguments with the best key. If the arguments have different types, the
+        result is a OneOf.
+        """
+        if key is None:
+            keys = args
+        else:
+            keys = []
+            for a in args:
+                keys.append(key.convert_call((a,), {}))
+                if keys[-1] is None:
+                    return None
+
+        resultType = OneOfWrapper.mergeTypes([a.expr_type for a in args])
+        keyType = OneOfWrapper.mergeTypes([k.expr_type for k in keys])
+
+        first = args[0].convert_to_type(resultType)
+        firstKey = keys[0].convert_to_type(keyType)
+        if first is None or firstKey is None:
+            return None
+
+        result = context.push(resultType, lambda r: r.convert_copy_initialize(first))
+        resultKey = context.push(keyType, lambda r: r.convert_copy_initialize(firstKey))
+
+        op = python_ast.ComparisonOp.Gt() if isMax else python_ast.ComparisonOp.Lt()
+
+        for a, k in zip(args[1:], keys[1:]):
+            isBetter = k.convert_bin_op(op, resultKey)
+            if isBetter is None:
+                return None
+
+            isBetter = isBetter.toBool()
+            if isBetter is None:
+                return None
+
+            with context.ifelse(isBetter.nonref_expr) as (ifTrue, ifFalse):
+                with ifTrue:
+                    a = a.convert_to_type(resultType)
+                    k = k.convert_to_type(keyType)
+
+                    if a is not None and k is not None:
+                        result.convert_assign(a)
+                        resultKey.convert_assign(k)
+
+        return result
+
+    @staticmethod
+    def convertSum(context, iterable, start):
+        if start.expr_type in (typeWrapper(str), typeWrapper(bytes)):
+            context.pushException(TypeError, "sum() can't sum strings or bytes")
+            return None
+
+        # if we're summing numbers, start with the type the sum will have, so the
+        # accumulator has a single type rather than a OneOf of 'start' and the elements.
+        sumType = elementTypeFor(context, iterable, lambda item: start.convert_bin_op(python_ast.BinaryOp.Add(), item))
+
+        if start.expr_type.is_arithmetic and typeWrapper(sumType).is_arithmetic:
+            start = start.convert_to_type(sumType)
+            if start is None:
+                return None
+
+        return context.call_py_function(iterable_sum, (iterable, start), {})
+
+    def convertSorted(self, context, iterable, key, reverse):
+        if reverse is None:
+            reverse = context.constant(False)
+
+        reverse = reverse.toBool()
+        if reverse is None:
+            return None
+
+        listType = ListOf(elementTypeFor(context, iterable))
+
+        if self.isNoneOrMissing(key):
+            return context.call_py_function(
+                iterable_sorted,
+                (iterable, context.constant(listType), reverse),
+                {}
+            )
+
+        keyListType = ListOf(elementTypeFor(context, iterable, lambda item: key.convert_call((item,), {})))
+
+        return context.call_py_function(
+            iterable_sorted_with_key,
+            (iterable, context.constant(listType), context.constant(keyListType), key, reverse),
+            {}
+        )
+
+    @staticmethod
+    def convertEnumerate(context, iterable, start):
+        start = start.toInt64()
+        if start is None:
+            return None
+
+        iterator = iterable.convert_method_call("__iter__", (), {})
+        if iterator is None:
+            return None
+
+        wrapper = EnumerateWrapper(iterator.expr_type, elementTypeFor(context, iterable))
+
+        return wrapper.initializeMembers(context, {"iterator": iterator, "count": start})
+
+    @staticmethod
+    def convertZip(context, iterables):
+        iterators = []
+
+        for iterable in iterables:
+            iterators.append(iterable.convert_method_call("__iter__", (), {}))
+            if iterators[-1] is None:
+                return None
+
+        wrapper = ZipWrapper(
+            [i.expr_type for i in iterators],
+            [elementTypeFor(context, iterable) for iterable in iterables]
+        )
+
+        return wrapper.initializeMembers(
+            context,
+            {"iterator%s" % i: iterator for i, iterator in enumerate(iterators)}
+        )
@@ -0,0 +1,181 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typed_python import Tuple
+from typed_python.compiler.type_wrappers.wrapper import Wrapper
+import typed_python.compiler.native_ast as native_ast
+import typed_python.compiler
+
+typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
+
+
+class CompositeIteratorWrapper(Wrapper):
+    """Base class for iterators (and iterable views) whose state is a struct of other values.
+
+    Subclasses pass the names and Wrappers of their members, and we take care of
+    the layout, and of copying, assigning, and destroying member by member.
+    Iterating an iterator produces a copy of it, so copies have their own position.
+    """
+    is_empty = False
+    is_pass_by_ref = True
+
+    def __init__(self, typeRepresentation, memberNamesAndTypes, layoutName):
+        super().__init__(typeRepresentation)
+
+        self.memberNamesAndTypes = tuple(memberNamesAndTypes)
+        self.layoutName = layoutName
+        self.is_pod = all(T.is_pod for _, T in self.memberNamesAndTypes)
+
+    def getNativeLayoutType(self):
+        return native_ast.Type.Struct(
+            element_types=tuple((name, T.getNativeLayoutType()) for name, T in self.memberNamesAndTypes),
+            name=self.layoutName
+        )
+
+    def refTo(self, context, expr, memberName):
+        for i, (name, T) in enumerate(self.memberNamesAndTypes):
+            if name == memberName:
+                return context.pushReference(T, expr.expr.ElementPtrIntegers(0, i))
+
+        raise Exception(f"{self} has no member {memberName}")
+
+    def initializeMembers(self, context, values):
+        """Push a new instance of this iterator with members copy-initialized from the dict 'values'."""
+        def initialize(instance):
+            for name, T in self.memberNamesAndTypes:
+                self.refTo(context, instance, name).convert_copy_initialize(values[name])
+
+        return context.push(self, initialize)
+
+    def convert_copy_initialize(self, context, expr, other):
+        for name, T in self.memberNamesAndTypes:
+            self.refTo(context, expr, name).convert_copy_initialize(self.refTo(context, other, name))
+
+    def convert_assign(self, context, expr, other):
+        assert expr.isReference
+
+        for name, T in self.memberNamesAndTypes:
+            self.refTo(context, expr, name).convert_assign(self.refTo(context, other, name))
+
+    def convert_destroy(self, context, expr):
+        for name, T in self.memberNamesAndTypes:
+            if not T.is_pod:
+                self.refTo(context, expr, name).convert_destroy()
+
+    def convert_method_call(self, context, instance, methodname, args, kwargs):
+        if methodname == "__iter__" and not args and not kwargs:
+            return context.push(self, lambda iterator: iterator.convert_copy_initialize(instance))
+
+        return super().convert_method_call(context, instance, methodname, args, kwargs)
+
+
+class EnumerateWrapper(CompositeIteratorWrapper):
+    """Models 'enumerate(iterable, start)', producing Tuple(int, T) for each element.
+
+    'elementType' is the typed_python type we hold the iterable's elements as.
+    """
+
+    def __init__(self, iteratorType, elementType):
+        super().__init__(
+            ("enumerate", iteratorType, elementType),
+            (("iterator", iteratorType), ("count", typeWrapper(int))),
+            "enumerate"
+        )
+
+        self.iteratorType = iteratorType
+        self.elementType = elementType
+        self.tupleType = typeWrapper(Tuple(int, elementType))
+
+    def __str__(self):
+        return "Enumerate(%s)" % self.elementType.__name__
+
+    def convert_next(self, context, expr):
+        count = self.refTo(context, expr, "count")
+
+        item, isPopulated = self.refTo(context, expr, "iterator").convert_next()
+        if item is None:
+            return None, None
+
+        result = context.allocateUninitializedSlot(self.tupleType)
+
+        with context.ifelse(isPopulated.nonref_expr) as (ifTrue, ifFalse):
+            with ifTrue:
+                item = item.convert_to_type(self.elementType)
+
+                if item is not None:
+                    self.tupleType.refAs(context, result, 0).convert_copy_initialize(count)
+                    self.tupleType.refAs(context, result, 1).convert_copy_initialize(item)
+                    context.markUninitializedSlotInitialized(result)
+
+                    context.pushEffect(count.expr.store(count.nonref_expr.add(1)))
+
+        return result, isPopulated
+
+
+class ZipWrapper(CompositeIteratorWrapper):
+    """Models 'zip(*iterables)', producing a Tuple with an element from each iterable.
+
+    Like python, we stop as soon as one of the iterables is exhausted, without
+    advancing the ones after it. 'elementTypes' are the typed_python types we hold
+    the iterables' elements as.
+    """
+
+    def __init__(self, iteratorTypes, elementTypes):
+        super().__init__(
+            ("zip", tuple(iteratorTypes), tuple(elementTypes)),
+            tuple(("iterator%s" % i, T) for i, T in enumerate(iteratorTypes)),
+            "zip"
+        )
+
+        self.iteratorTypes = tuple(iteratorTypes)
+        self.elementTypes = tuple(elementTypes)
+        self.tupleType = typeWrapper(Tuple(*elementTypes))
+
+    def __str__(self):
+        return "Zip(%s)" % ", ".join(T.__name__ for T in self.elementTypes)
+
+    def convert_next(self, context, expr):
+        result = context.allocateUninitializedSlot(self.tupleType)
+        isPopulated = context.push(bool, lambda b: b.expr.store(native_ast.const_bool_expr(False)))
+
+        def advance(which, items):
+            if which == len(self.iteratorTypes):
+                for i, item in enumerate(items):
+                    self.tupleType.refAs(context, result, i).convert_copy_initialize(item)
+
+                context.markUninitializedSlotInitialized(result)
+                context.pushEffect(isPopulated.expr.store(native_ast.const_bool_expr(True)))
+                return
+
+            item, hasItem = self.refTo(context, expr, "iterator%s" % which).convert_next()
+            if item is None:
+                return
+
+            with context.ifelse(hasItem.nonref_expr) as (ifTrue, ifFalse):
+                with ifTrue:
+                    item = item.convert_to_type(self.elementTypes[which])
+                    if item is not None:
+                        advance(which + 1, items + [item])
+
+        firstItem, firstHasItem = self.refTo(context, expr, "iterator0").convert_next()
+        if firstItem is None:
+            return None, None
+
+        with context.ifelse(firstHasItem.nonref_expr) as (ifTrue, ifFalse):
+            with ifTrue:
+                firstItem = firstItem.convert_to_type(self.elementTypes[0])
+                if firstItem is not None:
+                    advance(1, [firstItem])
+
+        return result, isPopulated
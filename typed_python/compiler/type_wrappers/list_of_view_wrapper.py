@@ -0,0 +1,266 @@
+#   Copyright 2017-2019 typed_python Authors
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typed_python import NoneType, PointerTo, _types
+from typed_python.compiler.type_wrappers.bound_compiled_method_wrapper import BoundCompiledMethodWrapper
+from typed_python.compiler.type_wrappers.iterator_wrappers import CompositeIteratorWrapper
+from typed_python.compiler.type_wrappers.tuple_of_wrapper import slice_start, slice_stop
+import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
+import typed_python.compiler.native_ast as native_ast
+import typed_python.compiler
+
+typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
+
+
+def view_stop(length, start, upper):
+    """Where a view of something with 'length' elements ends, given its clamped 'start'."""
+    stop = slice_stop(length, upper, 1)
+    if stop < start:
+        return start
+    return stop
+
+
+class ListOfViewWrapper(CompositeIteratorWrapper):
+    """Models 'aList.view(start, stop)', a read-only window onto the elements of a ListOf.
+
+    Like the interpreter's ListOfView, we hold a reference to the list's layout, a pointer
+    to the first element we see, and a count, so creating a view never copies anything.
+    Each view counts as an export of the list's buffer, which stops the list from changing
+    size (and moving its elements) while the view is alive. Views that leave compiled code
+    become ListOfView objects that share the same buffer.
+    """
+
+    def __init__(self, listType):
+        super().__init__(
+            (listType, "view"),
+            (
+                ("list", typeWrapper(listType)),
+                ("data", typeWrapper(PointerTo(listType.ElementType))),
+                ("count", typeWrapper(int))
+            ),
+            "list_of_view"
+        )
+
+        self.listType = listType
+        self.underlyingWrapperType = typeWrapper(listType.ElementType)
+
+    def __str__(self):
+        return "ListOfView(%s)" % self.listType.ElementType.__name__
+
+    @property
+    def interpreterTypeRepresentation(self):
+        return _types.ListOfView
+
+    @staticmethod
+    def convert_view(context, aList, data, length, args):
+        """Push a view of 'aList' for a call to 'view(start, stop)' on a list or on a view of it.
+
+        Args:
+            context - an ExpressionConversionContext
+            aList - a TypedExpression for the ListOf we're viewing
+            data - a native expression pointing at the first element of the object we're called on
+            length - a TypedExpression for the length of the object we're called on
+            args - the positional 'start' and 'stop' arguments, either of which may be missing or None
+
+        Returns:
+            None if control flow doesn't return, or a TypedExpression for the view.
+        """
+        bounds = []
+        for i in range(2):
+            if i >= len(args) or args[i].expr_type.typeRepresentation is NoneType:
+                bounds.append(context.constant(None))
+            else:
+                bound = args[i].toInt64()
+                if bound is None:
+                    return None
+                bounds.append(bound)
+
+        start = context.call_py_function(slice_start, (length, bounds[0], context.constant(1)), {})
+        if start is None:
+            return None
+
+        stop = context.call_py_function(view_stop, (length, start, bounds[1]), {})
+        if stop is None:
+            return None
+
+        listType = aList.expr_type.typeRepresentation
+
+        return ListOfViewWrapper(listType).initializeMembers(
+            context,
+            dict(
+                list=aList,
+                data=context.pushPod(PointerTo(listType.ElementType), data.elemPtr(start.nonref_expr)),
+                count=stop - start
+            )
+        )
+
+    def lockList(self, context, expr, delta):
+        """Add 'delta' to the buffer exports of the list the view 'expr' looks at."""
+        context.pushEffect(
+            self.refTo(context, expr, "list").nonref_expr.ElementPtrIntegers(0, 2).atomic_add(
+                native_ast.const_int32_expr(delta)
+            )
+        )
+
+    def initializeMembers(self, context, values):
+        res = super().initializeMembers(context, values)
+        self.lockList(context, res, 1)
+        return res
+
+    def convert_copy_initialize(self, context, expr, other):
+        super().convert_copy_initialize(context, expr, other)
+        self.lockList(context, expr, 1)
+
+    def convert_assign(self, context, expr, other):
+        self.lockList(context, other, 1)
+        self.lockList(context, expr, -1)
+        super().convert_assign(context, expr, other)
+
+    def convert_destroy(self, context, expr):
+        self.lockList(context, expr, -1)
+        super().convert_destroy(context, expr)
+
+    def convert_mutable_masquerade_to_untyped_type(self):
+        return typeWrapper(_types.ListOfView)
+
+    def convert_mutable_masquerade_to_untyped(self, context, instance):
+        return context.push(
+            typeWrapper(_types.ListOfView),
+            lambda viewObj: viewObj.expr.store(
+                runtime_functions.list_of_view_to_pyobj.call(
+                    context.getTypePointer(self.listType),
+                    self.refTo(context, instance, "list").nonref_expr.cast(native_ast.VoidPtr),
+                    self.refTo(context, instance, "data").nonref_expr.cast(native_ast.VoidPtr),
+                    self.refTo(context, instance, "count").nonref_expr
+                ).cast(viewObj.expr_type.getNativeLayoutType())
+            )
+        )
+
+    def elementRef(self, context, expr, item):
+        """A reference to element 'item' (a TypedExpression for an int) of the view 'expr', unchecked."""
+        return context.pushReference(
+            self.underlyingWrapperType,
+            self.refTo(context, expr, "data").nonref_expr.elemPtr(item.nonref_expr)
+        )
+
+    def convert_len(self, context, expr):
+        return context.pushPod(int, self.refTo(context, expr, "count").nonref_expr)
+
+    def convert_bool_cast(self, context, expr):
+        return context.pushPod(bool, self.refTo(context, expr, "count").nonref_expr.neq(0))
+
+    def convert_getitem(self, context, expr, item):
+        item = item.toInt64()
+        if item is None:
+            return None
+
+        length = self.convert_len(context, expr)
+
+        actualItem = context.pushPod(
+            int,
+            native_ast.Expression.Branch(
+                cond=item.nonref_expr.lt(0),
+                true=item.nonref_expr.add(length.nonref_expr),
+                false=item.nonref_expr
+            )
+        )
+
+        with context.ifelse(((actualItem >= 0) & (actualItem < length)).nonref_expr) as (ifTrue, ifFalse):
+            with ifFalse:
+                context.pushException(IndexError, "view index out of range")
+
+        return self.elementRef(context, expr, actualItem)
+
+    def convert_attribute(self, context, instance, attr):
+        if attr == "view":
+            return instance.changeType(BoundCompiledMethodWrapper(self, attr))
+
+        return super().convert_attribute(context, instance, attr)
+
+    def convert_method_call(self, context, instance, methodname, args, kwargs):
+        if methodname == "__iter__" and not args and not kwargs:
+            # the iterator increments its position before it reads
+            return ListOfViewIteratorWrapper(self).initializeMembers(
+                context,
+                dict(view=instance, pos=context.constant(-1))
+            )
+
+        if methodname == "view" and len(args) <= 2 and not kwargs:
+            return ListOfViewWrapper.convert_view(
+                context,
+                self.refTo(context, instance, "list"),
+                self.refTo(context, instance, "data").nonref_expr,
+                self.convert_len(context, instance),
+                args
+            )
+
+        return super().convert_method_call(context, instance, methodname, args, kwargs)
+
+    def _can_convert_to_type(self, otherType, explicit):
+        if explicit and getattr(otherType.typeRepresentation, "__typed_python_category__", None) == "ListOf":
+            return True
+
+        if getattr(otherType.typeRepresentation, "__typed_python_category__", None) == "PythonObjectOfType":
+            return True
+
+        return super()._can_convert_to_type(otherType, explicit)
+
+    def convert_to_type_with_target(self, context, expr, targetVal, explicit):
+        targetCategory = getattr(targetVal.expr_type.typeRepresentation, "__typed_python_category__", None)
+
+        if explicit and targetCategory == "ListOf":
+            # copy the elements we're looking at into a list of their own
+            length = self.convert_len(context, expr)
+
+            targetVal.convert_default_initialize()
+            targetVal.convert_method_call("reserve", (length,), {})
+
+            with context.loop(length) as i:
+                targetVal.convert_method_call("append", (self.elementRef(context, expr, i),), {})
+
+            return context.constant(True)
+
+        if targetCategory == "PythonObjectOfType":
+            # hand the interpreter a ListOfView that shares our buffer
+            return self.convert_mutable_masquerade_to_untyped(context, expr).convert_to_type_with_target(
+                targetVal, explicit
+            )
+
+        return super().convert_to_type_with_target(context, expr, targetVal, explicit)
+
+
+class ListOfViewIteratorWrapper(CompositeIteratorWrapper):
+    """Iterates a ListOfView. We hold a copy of the view, which keeps the list's size locked."""
+
+    def __init__(self, viewWrapper):
+        super().__init__(
+            (viewWrapper.listType, "view_iterator"),
+            (("view", viewWrapper), ("pos", typeWrapper(int))),
+            "list_of_view_iterator"
+        )
+
+        self.viewWrapper = viewWrapper
+
+    def convert_next(self, context, expr):
+        pos = self.refTo(context, expr, "pos")
+        view = self.refTo(context, expr, "view")
+
+        context.pushEffect(pos.expr.store(pos.nonref_expr.add(1)))
+
+        canContinue = context.pushPod(
+            bool,
+            pos.nonref_expr.lt(self.viewWrapper.refTo(context, view, "count").nonref_expr)
+        )
+
+        return self.viewWrapper.elementRef(context, view, pos), canContinue
@@ -13,11 +13,15 @@
 #   limitations under the License.
 
 from typed_python.compiler.typed_expression import TypedExpression
-from typed_python.compiler.type_wrappers.tuple_of_wrapper import TupleOrListOfWrapper
+from typed_python.compiler.type_wrappers.tuple_of_wrapper import (
+    TupleOrListOfWrapper, slice_start, slice_stop, slice_length, TUPLE_OR_LIST_LAYOUT_BYTES
+)
 from typed_python.compiler.type_wrappers.bound_compiled_method_wrapper import BoundCompiledMethodWrapper
+from typed_python.compiler.type_wrappers.iterable_builtin_wrappers import sorted_order, elementTypeFor
+from typed_python.compiler.type_wrappers.list_of_view_wrapper import ListOfViewWrapper
 import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
 
-from typed_python import PointerTo, ListOf
+from typed_python import PointerTo, ListOf, NoneType
 
 import typed_python.compiler.native_ast as native_ast
 import typed_python.compiler
@@ -36,6 +40,144 @@ def list_of_extend(aList, extendWith):
             aList.append(thing)
 
 
+def list_of_permute(aList, order):
+    values = aList.copy()
+    for i in range(len(order)):
+        aList[i] = values[order[i]]
+
+
+def list_of_sort(aList, reverse):
+    list_of_permute(aList, sorted_order(aList, reverse))
+
+
+def list_of_key_order(aList, keyListType, key, reverse):
+    keys = keyListType()
+    keys.reserve(len(aList))
+    for x in aList:
+        keys.append(key(x))
+
+    return sorted_order(keys, reverse)
+
+
+def list_of_sort_with_key(aList, keyListType, key, reverse):
+    list_of_permute(aList, list_of_key_order(aList, keyListType, key, reverse))
+
+
+def list_of_bisect_left(aList, x, lo, hi):
+    if lo < 0:
+        raise ValueError("lo must be non-negative")
+    if hi > len(aList):
+        hi = len(aList)
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if aList[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+
+def list_of_bisect_right(aList, x, lo, hi):
+    if lo < 0:
+        raise ValueError("lo must be non-negative")
+    if hi > len(aList):
+        hi = len(aList)
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < aList[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
+
+
+def list_of_nth_element_index(aList, n):
+    if n < 0:
+        n += len(aList)
+
+    if n < 0 or n >= len(aList):
+        raise IndexError("nthElement index out of range")
+
+    return n
+
+
+def list_of_setslice(aList, lower, upper, step, values):
+    if step == 0:
+        raise ValueError("slice step cannot be zero")
+
+    # copy 'values' before we touch 'aList', since they may be the same list
+    newValues = type(aList)()
+    for value in values:
+        newValues.append(value)
+
+    start = slice_start(len(aList), lower, step)
+    stop = slice_stop(len(aList), upper, step)
+
+    if step == 1:
+        if stop < start:
+            stop = start
+
+        # a slice of the same size doesn't change our size, so it's allowed even
+        # if our buffer is exported.
+        if len(newValues) == stop - start:
+            for i in range(len(newValues)):
+                aList[start + i] = newValues[i]
+            return
+
+        tail = type(aList)()
+        tail.reserve(len(aList) - stop)
+        for i in range(stop, len(aList)):
+            tail.append(aList[i])
+
+        aList.resize(start)
+        aList.reserve(start + len(newValues) + len(tail))
+        aList.extend(newValues)
+        aList.extend(tail)
+    else:
+        count = slice_length(start, stop, step)
+
+        if len(newValues) != count:
+            raise ValueError(
+                "attempt to assign sequence of size " + str(len(newValues))
+                + " to extended slice of size " + str(count)
+            )
+
+        for i in range(count):
+            aList[start + i * step] = newValues[i]
+
+
+def list_of_delslice(aList, lower, upper, step):
+    if step == 0:
+        raise ValueError("slice step cannot be zero")
+
+    start = slice_start(len(aList), lower, step)
+    count = slice_length(start, slice_stop(len(aList), upper, step), step)
+
+    if count == 0:
+        return
+
+    if step < 0:
+        start += (count - 1) * step
+        step = -step
+
+    last = start + (count - 1) * step
+
+    # copy the elements we keep before we touch 'aList', so that if its buffer is
+    # exported, 'resize' raises before we've changed anything.
+    kept = type(aList)()
+    kept.reserve(len(aList) - start - count)
+    for readIx in range(start, len(aList)):
+        if readIx > last or (readIx - start) % step != 0:
+            kept.append(aList[readIx])
+
+    aList.resize(start)
+    aList.extend(kept)
+
+
 class ListOfWrapper(TupleOrListOfWrapper):
     is_pod = False
     is_empty = False
@@ -46,27 +188,48 @@ class ListOfWrapper(TupleOrListOfWrapper):
     def convert_len_native(self, expr):
         if isinstance(expr, TypedExpression):
             expr = expr.nonref_expr
-        return expr.ElementPtrIntegers(0, 2).load().cast(native_ast.Int64)
+        return expr.ElementPtrIntegers(0, 3).load().cast(native_ast.Int64)
 
     def convert_reserved_native(self, expr):
         if isinstance(expr, TypedExpression):
             expr = expr.nonref_expr
-        return expr.ElementPtrIntegers(0, 3).load().cast(native_ast.Int64)
+        return expr.ElementPtrIntegers(0, 4).load().cast(native_ast.Int64)
 
     def convert_reserved(self, context, expr):
-        return context.pushPod(int, expr.nonref_expr.ElementPtrIntegers(0, 3).load().cast(native_ast.Int64))
+        return context.pushPod(int, expr.nonref_expr.ElementPtrIntegers(0, 4).load().cast(native_ast.Int64))
 
     def convert_attribute(self, context, instance, attr):
         if attr in ("copy", "resize", "reserve", "reserved", "extend", "append",
-                    "clear", "pop", "setSizeUnsafe", "pointerUnsafe"):
+                    "clear", "pop", "setSizeUnsafe", "pointerUnsafe", "sort", "argsort",
+                    "bisect_left", "bisect_right", "partialSort", "nthElement", "view"):
             return instance.changeType(BoundCompiledMethodWrapper(self, attr))
 
         return super().convert_attribute(context, instance, attr)
 
     def convert_method_call(self, context, instance, methodname, args, kwargs):
+        if methodname in ("sort", "argsort") and not args and not (set(kwargs) - {"key", "reverse"}):
+            return self.convert_sort(context, instance, methodname == "argsort", kwargs.get("key"), kwargs.get("reverse"))
+
+        if methodname in ("bisect_left", "bisect_right") and 1 <= len(args) <= 3 and not (set(kwargs) - {"lo", "hi"}):
+            return self.convert_bisect(context, instance, methodname == "bisect_right", args, kwargs)
+
         if kwargs:
             return super().convert_method_call(context, instance, methodname, args, kwargs)
 
+        if methodname in ("partialSort", "nthElement") and len(args) == 1:
+            return self.convert_partial_sort(context, instance, methodname == "nthElement", args[0])
+
+        if methodname == "view" and len(args) <= 2:
+            return ListOfViewWrapper.convert_view(
+                context,
+                instance,
+                instance.nonref_expr.ElementPtrIntegers(0, 5).load().cast(
+                    self.underlyingWrapperType.getNativeLayoutType().pointer()
+                ),
+                self.convert_len(context, instance),
+                args
+            )
+
         if methodname == "pop":
             if len(args) == 0:
                 args = (context.constant(-1),)
@@ -103,7 +266,7 @@ class ListOfWrapper(TupleOrListOfWrapper):
 
                 return context.pushPod(
                     PointerTo(self.typeRepresentation.ElementType),
-                    instance.nonref_expr.ElementPtrIntegers(0, 4).load().cast(
+                    instance.nonref_expr.ElementPtrIntegers(0, 5).load().cast(
                         self.underlyingWrapperType.getNativeLayoutType().pointer()
                     ).elemPtr(count.nonref_expr)
                 )
@@ -212,7 +375,119 @@ class ListOfWrapper(TupleOrListOfWrapper):
 
         return super().convert_method_call(context, instance, methodname, args, kwargs)
 
+    def convert_sort(self, context, instance, isArgsort, key, reverse):
+        """Convert 'sort' or 'argsort' with the given 'key' and 'reverse' arguments, which may be None."""
+        if reverse is None:
+            reverse = context.constant(False)
+
+        reverse = reverse.toBool()
+        if reverse is None:
+            return None
+
+        if key is not None and key.expr_type.typeRepresentation is NoneType:
+            key = None
+
+        if key is not None:
+            keyListType = ListOf(elementTypeFor(context, instance, lambda item: key.convert_call((item,), {})))
+
+            return context.call_py_function(
+                list_of_key_order if isArgsort else list_of_sort_with_key,
+                (instance, context.constant(keyListType), key, reverse),
+                {}
+            )
+
+        if isArgsort and self.underlyingWrapperType.is_arithmetic:
+            # order the raw values with the same native code the interpreter uses,
+            # so NaNs end up in the same place in both.
+            return context.push(
+                ListOf(int),
+                lambda order: order.expr.store(
+                    runtime_functions.list_of_argsort.call(
+                        context.getTypePointer(self.typeRepresentation),
+                        instance.nonref_expr.cast(native_ast.VoidPtr),
+                        reverse.nonref_expr
+                    ).cast(order.expr_type.getNativeLayoutType())
+                )
+            )
+
+        if isArgsort:
+            return context.call_py_function(sorted_order, (instance, reverse), {})
+
+        if self.underlyingWrapperType.is_arithmetic:
+            # sort the raw values in place with the same native code the interpreter uses
+            context.pushEffect(
+                runtime_functions.list_of_sort.call(
+                    context.getTypePointer(self.typeRepresentation),
+                    instance.nonref_expr.cast(native_ast.VoidPtr),
+                    reverse.nonref_expr
+                )
+            )
+            return context.pushVoid()
+
+        return context.call_py_function(list_of_sort, (instance, reverse), {})
+
+    def convert_bisect(self, context, instance, isRight, args, kwargs):
+        x = args[0].convert_to_type(self.underlyingWrapperType)
+        if x is None:
+            return None
+
+        if (len(args) > 1 and "lo" in kwargs) or (len(args) > 2 and "hi" in kwargs):
+            context.pushException(TypeError, "bisect got multiple values for the same argument")
+            return None
+
+        lo = args[1] if len(args) > 1 else kwargs.get("lo", context.constant(0))
+        hi = args[2] if len(args) > 2 else kwargs.get("hi")
+
+        if hi is None or hi.expr_type.typeRepresentation is NoneType:
+            hi = instance.convert_len()
+
+        lo = lo.toInt64()
+        hi = hi.toInt64()
+        if lo is None or hi is None:
+            return None
+
+        return context.call_py_function(
+            list_of_bisect_right if isRight else list_of_bisect_left,
+            (instance, x, lo, hi),
+            {}
+        )
+
+    def convert_partial_sort(self, context, instance, isNthElement, n):
+        n = n.toInt64()
+        if n is None:
+            return None
+
+        if isNthElement:
+            n = context.call_py_function(list_of_nth_element_index, (instance, n), {})
+            if n is None:
+                return None
+
+        if not self.underlyingWrapperType.is_arithmetic:
+            # a full stable sort satisfies both contracts
+            return context.call_py_function(list_of_sort, (instance, context.constant(False)), {})
+
+        context.pushEffect(
+            (runtime_functions.list_of_nth_element if isNthElement else runtime_functions.list_of_partial_sort).call(
+                context.getTypePointer(self.typeRepresentation),
+                instance.nonref_expr.cast(native_ast.VoidPtr),
+                n.nonref_expr
+            )
+        )
+
+        return context.pushVoid()
+
+    def checkResizable(self, context, listInst):
+        """Raise a BufferError if 'listInst' has exported or adopted its buffer and so can't change size."""
+        # exports change with the GIL held, and we may not be holding it, so we read atomically.
+        bufferExports = listInst.nonref_expr.ElementPtrIntegers(0, 2).atomic_load()
+
+        with context.ifelse(bufferExports.neq(native_ast.const_int32_expr(0))) as (ifExported, _):
+            with ifExported:
+                context.pushException(BufferError, "Existing exports of data: object cannot be re-sized")
+
     def generatePop(self, context, out, inst, ix):
+        self.checkResizable(context, inst)
+
         ix = context.push(int, lambda tgt: tgt.expr.store(ix.nonref_expr))
 
         with context.ifelse(ix < 0) as (then, otherwise):
@@ -231,18 +506,18 @@ class ListOfWrapper(TupleOrListOfWrapper):
         )
 
         context.pushEffect(
-            inst.nonref_expr.ElementPtrIntegers(0, 2).store(
-                inst.nonref_expr.ElementPtrIntegers(0, 2).load().add(native_ast.const_int32_expr(-1))
+            inst.nonref_expr.ElementPtrIntegers(0, 3).store(
+                inst.nonref_expr.ElementPtrIntegers(0, 3).load().add(native_ast.const_int_expr(-1))
             )
         )
 
-        data = inst.nonref_expr.ElementPtrIntegers(0, 4).load()
+        data = inst.nonref_expr.ElementPtrIntegers(0, 5).load()
 
         context.pushEffect(
             runtime_functions.memmove.call(
                 data.elemPtr(ix * self.underlyingWrapperType.getBytecount()),
                 data.elemPtr((ix+1) * self.underlyingWrapperType.getBytecount()),
-                inst.nonref_expr.ElementPtrIntegers(0, 2).load().cast(native_ast.Int64).sub(ix.nonref_expr).mul(
+                inst.nonref_expr.ElementPtrIntegers(0, 3).load().cast(native_ast.Int64).sub(ix.nonref_expr).mul(
                     self.underlyingWrapperType.getBytecount()
                 )
             )
@@ -258,6 +533,8 @@ class ListOfWrapper(TupleOrListOfWrapper):
             )
 
     def generateResize(self, context, out, listInst, countInst, arg=None):
+        self.checkResizable(context, listInst)
+
         with context.ifelse(listInst.convert_len() == countInst) as (if_eq, if_neq):
             with if_eq:
                 context.pushEffect(native_ast.Expression.Return(arg=None))
@@ -279,10 +556,12 @@ class ListOfWrapper(TupleOrListOfWrapper):
                     listInst.convert_getitem_unsafe(i+countInst).convert_destroy()
 
         context.pushEffect(
-            listInst.nonref_expr.ElementPtrIntegers(0, 2).store(countInst.nonref_expr.cast(native_ast.Int32))
+            listInst.nonref_expr.ElementPtrIntegers(0, 3).store(countInst.nonref_expr.cast(native_ast.Int64))
         )
 
     def generateAppend(self, context, out, listInst, arg):
+        self.checkResizable(context, listInst)
+
         with context.ifelse(listInst.convert_reserved() < listInst.convert_len()+1) as (if_needs_reserve, _):
             with if_needs_reserve:
                 self.convert_method_call(context, listInst, "reserve", ((listInst.convert_len() * 5) / 4 + 1,), {})
@@ -290,7 +569,7 @@ class ListOfWrapper(TupleOrListOfWrapper):
         listInst.convert_getitem_unsafe(listInst.convert_len()).convert_copy_initialize(arg)
 
         context.pushEffect(
-            listInst.nonref_expr.ElementPtrIntegers(0, 2).store((listInst.convert_len()+1).nonref_expr.cast(native_ast.Int32))
+            listInst.nonref_expr.ElementPtrIntegers(0, 3).store((listInst.convert_len()+1).nonref_expr.cast(native_ast.Int64))
         )
 
     def generateCopy(self, context, out, listInst):
@@ -307,6 +586,8 @@ class ListOfWrapper(TupleOrListOfWrapper):
         self.convert_method_call(context, out, "setSizeUnsafe", (listInst.convert_len(),), {})
 
     def generateReserve(self, context, out, listInst, countInst):
+        self.checkResizable(context, listInst)
+
         countInst = context.push(int, lambda target: target.expr.store(countInst.nonref_expr))
 
         with context.ifelse(countInst < listInst.convert_len()) as (then, _):
@@ -314,16 +595,16 @@ class ListOfWrapper(TupleOrListOfWrapper):
                 context.pushEffect(countInst.expr.store(listInst.convert_len().nonref_expr))
 
         context.pushEffect(
-            listInst.nonref_expr.ElementPtrIntegers(0, 4).store(
+            listInst.nonref_expr.ElementPtrIntegers(0, 5).store(
                 runtime_functions.realloc.call(
-                    listInst.nonref_expr.ElementPtrIntegers(0, 4).load(),
+                    listInst.nonref_expr.ElementPtrIntegers(0, 5).load(),
                     countInst.nonref_expr.mul(self.underlyingWrapperType.getBytecount())
                 )
             )
         )
 
         context.pushEffect(
-            listInst.nonref_expr.ElementPtrIntegers(0, 3).store(countInst.nonref_expr.cast(native_ast.Int32))
+            listInst.nonref_expr.ElementPtrIntegers(0, 4).store(countInst.nonref_expr.cast(native_ast.Int64))
         )
 
     def generateReserved(self, context, out, listInst):
@@ -343,13 +624,14 @@ class ListOfWrapper(TupleOrListOfWrapper):
     def createEmptyList(self, context, out):
         context.pushEffect(
             out.expr.store(
-                runtime_functions.malloc.call(28).cast(self.getNativeLayoutType())
+                runtime_functions.malloc.call(TUPLE_OR_LIST_LAYOUT_BYTES).cast(self.getNativeLayoutType())
             )
             >> out.nonref_expr.ElementPtrIntegers(0, 0).store(native_ast.const_int_expr(1))  # refcount
             >> out.nonref_expr.ElementPtrIntegers(0, 1).store(native_ast.const_int32_expr(-1))  # hash cache
-            >> out.nonref_expr.ElementPtrIntegers(0, 2).store(native_ast.const_int32_expr(0))  # count
-            >> out.nonref_expr.ElementPtrIntegers(0, 3).store(native_ast.const_int32_expr(1))  # reserved
-            >> out.nonref_expr.ElementPtrIntegers(0, 4).store(
+            >> out.nonref_expr.ElementPtrIntegers(0, 2).store(native_ast.const_int32_expr(0))  # buffer exports
+            >> out.nonref_expr.ElementPtrIntegers(0, 3).store(native_ast.const_int_expr(0))  # count
+            >> out.nonref_expr.ElementPtrIntegers(0, 4).store(native_ast.const_int_expr(1))  # reserved
+            >> out.nonref_expr.ElementPtrIntegers(0, 5).store(
                 runtime_functions.malloc.call(self.underlyingWrapperType.getBytecount())
             )  # data
         )
@@ -375,6 +657,20 @@ class ListOfWrapper(TupleOrListOfWrapper):
 
         return context.pushVoid()
 
+    def convert_setslice(self, context, expr, lower, upper, step, value):
+        bounds = self.convert_slice_bounds(context, lower, upper, step)
+        if bounds is None:
+            return None
+
+        return context.call_py_function(list_of_setslice, (expr,) + bounds + (value,), {})
+
+    def convert_delslice(self, context, expr, lower, upper, step):
+        bounds = self.convert_slice_bounds(context, lower, upper, step)
+        if bounds is None:
+            return None
+
+        return context.call_py_function(list_of_delslice, (expr,) + bounds, {})
+
     def convert_type_call(self, context, typeInst, args, kwargs):
         if len(args) == 1 and args[0].expr_type == self and not kwargs:
             return context.push(
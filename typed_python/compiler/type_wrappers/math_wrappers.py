@@ -14,10 +14,155 @@
 
 from typed_python.compiler.type_wrappers.wrapper import Wrapper
 import typed_python.compiler.native_ast as native_ast
-from typed_python import Float32, Float64
+from typed_python import Float32, Float64, ListOf
 import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
 
-from math import isnan, isfinite, isinf
+from math import (
+    isnan, isfinite, isinf, fsum,
+    sqrt, exp, expm1, log, log2, log10, log1p, pow,
+    sin, cos, tan, asin, acos, atan, atan2,
+    sinh, cosh, tanh, asinh, acosh, atanh,
+    erf, erfc, gamma, lgamma,
+    hypot, copysign, fmod, fabs, degrees, radians, pi
+)
+
+# For each function we lower directly to native code: its number of arguments,
+# the LLVM intrinsic or libm function implementing it for Float64 and for Float32,
+# and whether an infinite result from finite arguments is an OverflowError (as for 'exp')
+# rather than a ValueError (as for 'log').
+_NATIVE_FUNCTIONS = {
+    sqrt: (1, "llvm.sqrt.f64", "llvm.sqrt.f32", False),
+    exp: (1, "llvm.exp.f64", "llvm.exp.f32", True),
+    expm1: (1, "expm1", "expm1f", True),
+    log: (1, "llvm.log.f64", "llvm.log.f32", False),
+    log2: (1, "llvm.log2.f64", "llvm.log2.f32", False),
+    log10: (1, "llvm.log10.f64", "llvm.log10.f32", False),
+    log1p: (1, "log1p", "log1pf", False),
+    sin: (1, "llvm.sin.f64", "llvm.sin.f32", False),
+    cos: (1, "llvm.cos.f64", "llvm.cos.f32", False),
+    tan: (1, "tan", "tanf", False),
+    asin: (1, "asin", "asinf", False),
+    acos: (1, "acos", "acosf", False),
+    atan: (1, "atan", "atanf", False),
+    sinh: (1, "sinh", "sinhf", True),
+    cosh: (1, "cosh", "coshf", True),
+    tanh: (1, "tanh", "tanhf", False),
+    asinh: (1, "asinh", "asinhf", False),
+    acosh: (1, "acosh", "acoshf", False),
+    atanh: (1, "atanh", "atanhf", False),
+    erf: (1, "erf", "erff", False),
+    erfc: (1, "erfc", "erfcf", False),
+    gamma: (1, "tgamma", "tgammaf", True),
+    lgamma: (1, "lgamma", "lgammaf", True),
+    fabs: (1, "llvm.fabs.f64", "llvm.fabs.f32", False),
+    pow: (2, "llvm.pow.f64", "llvm.pow.f32", True),
+    atan2: (2, "atan2", "atan2f", False),
+    hypot: (2, "hypot", "hypotf", True),
+    copysign: (2, "llvm.copysign.f64", "llvm.copysign.f32", False),
+    fmod: (2, "fmod", "fmodf", False),
+}
+
+# functions that are just a multiplication by a constant
+_SCALINGS = {
+    degrees: 180.0 / pi,
+    radians: pi / 180.0,
+}
+
+
+def math_fsum(iterable):
+    # Shewchuk's algorithm, following CPython's 'math_fsum': we keep the running sum
+    # as a list of non-overlapping partial sums, smallest magnitude first.
+    partials = ListOf(float)()
+    specialSum = 0.0
+    infSum = 0.0
+
+    for item in iterable:
+        x = float(item)
+        xsave = x
+        i = 0
+
+        for j in range(len(partials)):
+            y = partials[j]
+            if abs(x) < abs(y):
+                t = x
+                x = y
+                y = t
+            hi = x + y
+            lo = y - (hi - x)
+            if lo != 0.0:
+                partials[i] = lo
+                i += 1
+            x = hi
+
+        partials.resize(i)
+
+        if x != 0.0:
+            if not isfinite(x):
+                # a nonfinite x is either an intermediate overflow or came from an inf or nan
+                if isfinite(xsave):
+                    raise OverflowError("intermediate overflow in fsum")
+                if isinf(xsave):
+                    infSum += xsave
+                specialSum += xsave
+                partials.resize(0)
+            else:
+                partials.append(x)
+
+    if specialSum != 0.0:
+        if isnan(infSum):
+            raise ValueError("-inf + inf in fsum")
+        return specialSum
+
+    hi = 0.0
+    n = len(partials)
+
+    if n > 0:
+        n -= 1
+        hi = partials[n]
+        lo = 0.0
+
+        # add the partials from the top, stopping once the sum becomes inexact
+        while n > 0:
+            x = hi
+            n -= 1
+            y = partials[n]
+            hi = x + y
+            lo = y - (hi - x)
+            if lo != 0.0:
+                break
+
+        # make half-even rounding work across multiple partials
+        if n > 0 and ((lo < 0.0 and partials[n - 1] < 0.0) or (lo > 0.0 and partials[n - 1] > 0.0)):
+            y = lo * 2.0
+            x = hi + y
+            if y == x - hi:
+                hi = x
+
+    return hi
+
+
+def isNanExpr(e):
+    # ordered comparisons are false for nan, so only nan isn't equal to itself
+    return e.eq(e).logical_not()
+
+
+def isFiniteExpr(e):
+    # x - x is zero for finite x and nan for inf and nan
+    return e.sub(e).eq(e.sub(e))
+
+
+def anyOf(exprs):
+    res = exprs[0]
+    for e in exprs[1:]:
+        res = res.bitor(e)
+    return res
+
+
+def allOf(exprs):
+    res = exprs[0]
+    for e in exprs[1:]:
+        res = res.bitand(e)
+    return res
 
 
 class MathFunctionWrapper(Wrapper):
@@ -25,17 +170,17 @@ class MathFunctionWrapper(Wrapper):
     is_empty = False
     is_pass_by_ref = False
 
-    SUPPORTED_FUNCTIONS = (isnan, isfinite, isinf)
+    SUPPORTED_FUNCTIONS = (isnan, isfinite, isinf, fsum) + tuple(_NATIVE_FUNCTIONS) + tuple(_SCALINGS)
 
     def __init__(self, mathFun):
-        assert mathFun in (isnan, isfinite, isinf)
+        assert mathFun in self.SUPPORTED_FUNCTIONS
         super().__init__(mathFun)
 
     def getNativeLayoutType(self):
         return native_ast.Type.Void()
 
     def convert_call(self, context, expr, args, kwargs):
-        if len(args) == 1 and not kwargs:
+        if self.typeRepresentation in (isnan, isfinite, isinf) and len(args) == 1 and not kwargs:
             if not args[0].expr_type.is_arithmetic:
                 return context.pushException(TypeError, f"must be a real number, not {args[0].expr_type}")
 
@@ -58,4 +203,137 @@ class MathFunctionWrapper(Wrapper):
 
             return context.pushPod(bool, func.call(args[0].nonref_expr))
 
+        if self.typeRepresentation is fsum and len(args) == 1 and not kwargs:
+            return context.call_py_function(math_fsum, args, {})
+
+        if kwargs or not args:
+            return super().convert_call(context, expr, args, kwargs)
+
+        if not all(a.expr_type.is_arithmetic for a in args):
+            # let the interpreter decide what to do with objects that might have a __float__
+            return context.constantPyObject(self.typeRepresentation).convert_call(args, kwargs)
+
+        if self.typeRepresentation in _SCALINGS and len(args) == 1:
+            x = self.convertArgumentsToFloat(args)[0]
+            if x is None:
+                return None
+
+            return context.pushPod(
+                x.expr_type,
+                x.nonref_expr.mul(self.floatConstant(x.expr_type, _SCALINGS[self.typeRepresentation]))
+            )
+
+        if self.typeRepresentation is log and len(args) == 2:
+            return self.convertLogWithBase(context, args[0], args[1])
+
+        if self.typeRepresentation in _NATIVE_FUNCTIONS and len(args) == _NATIVE_FUNCTIONS[self.typeRepresentation][0]:
+            floatArgs = self.convertArgumentsToFloat(args)
+            if any(a is None for a in floatArgs):
+                return None
+
+            return self.convertNativeFunction(context, self.typeRepresentation, floatArgs)
+
         return super().convert_call(context, expr, args, kwargs)
+
+    @staticmethod
+    def convertArgumentsToFloat(args):
+        """Convert arithmetic TypedExpressions to the float type we compute with.
+
+        We stay in single precision if any argument is Float32 and none is Float64,
+        so Float32 kernels don't pay for conversions. Otherwise we use Float64, like python.
+        """
+        argTypes = [a.expr_type.typeRepresentation for a in args]
+
+        if Float32 in argTypes and Float64 not in argTypes:
+            T = Float32
+        else:
+            T = Float64
+
+        return [a.convert_to_type(T) for a in args]
+
+    @staticmethod
+    def floatConstant(floatType, value):
+        return native_ast.Expression.Constant(
+            val=native_ast.Constant.Float(bits=floatType.getNativeLayoutType().bits, val=value)
+        )
+
+    @staticmethod
+    def convertNativeFunction(context, mathFun, args):
+        """Call the native implementation of 'mathFun' on 'args' and check for errors like python does.
+
+        Args:
+            context - an ExpressionConversionContext
+            mathFun - one of the keys of _NATIVE_FUNCTIONS
+            args - a list of TypedExpressions, all Float32 or all Float64
+
+        Returns:
+            a TypedExpression of the same type as 'args'.
+        """
+        _, name64, name32, canOverflow = _NATIVE_FUNCTIONS[mathFun]
+
+        floatType = args[0].expr_type
+        nativeType = floatType.getNativeLayoutType()
+        name = name32 if floatType.typeRepresentation is Float32 else name64
+        argExprs = [a.nonref_expr for a in args]
+
+        if name.startswith("llvm."):
+            target = runtime_functions.intrinsicCallTarget(name, nativeType, *[nativeType for _ in args])
+        else:
+            target = runtime_functions.externalCallTarget(name, nativeType, *[nativeType for _ in args])
+
+        if mathFun in (gamma, lgamma):
+            # both have poles at zero and the negative integers, which python reports as
+            # domain errors even though the C functions return an infinity.
+            x = argExprs[0]
+            floor = runtime_functions.intrinsicCallTarget(
+                "llvm.floor.f%s" % nativeType.bits, nativeType, nativeType
+            )
+
+            with context.ifelse(
+                allOf([isFiniteExpr(x), x.lte(nativeType.zero()), x.eq(floor.call(x))])
+            ) as (ifTrue, ifFalse):
+                with ifTrue:
+                    context.pushException(ValueError, "math domain error")
+
+        result = context.pushPod(floatType, target.call(*argExprs))
+
+        # like CPython's 'math_1' and 'math_2', we infer errors from the result: a nan from
+        # arguments that aren't nan is a domain error, and an infinity from finite arguments
+        # is either a pole or an overflow.
+        with context.ifelse(
+            isNanExpr(result.nonref_expr).bitand(anyOf([isNanExpr(a) for a in argExprs]).logical_not())
+        ) as (ifTrue, ifFalse):
+            with ifTrue:
+                context.pushException(ValueError, "math domain error")
+
+        with context.ifelse(
+            isFiniteExpr(result.nonref_expr).logical_not().bitand(allOf([isFiniteExpr(a) for a in argExprs]))
+        ) as (ifTrue, ifFalse):
+            with ifTrue:
+                if mathFun is pow:
+                    # 0.0 ** -y is a pole, not an overflow
+                    with context.ifelse(argExprs[0].eq(nativeType.zero())) as (isPole, isOverflow):
+                        with isPole:
+                            context.pushException(ValueError, "math domain error")
+                        with isOverflow:
+                            context.pushException(OverflowError, "math range error")
+                elif canOverflow:
+                    context.pushException(OverflowError, "math range error")
+                else:
+                    context.pushException(ValueError, "math domain error")
+
+        return result
+
+    def convertLogWithBase(self, context, x, base):
+        x, base = self.convertArgumentsToFloat([x, base])
+        if x is None or base is None:
+            return None
+
+        num = self.convertNativeFunction(context, log, [x])
+        den = self.convertNativeFunction(context, log, [base])
+
+        with context.ifelse(den.nonref_expr.eq(den.expr_type.getNativeLayoutType().zero())) as (ifTrue, ifFalse):
+            with ifTrue:
+                context.pushException(ZeroDivisionError, "float division by zero")
+
+        return context.pushPod(num.expr_type, num.nonref_expr.div(den.nonref_expr))
@@ -75,8 +75,31 @@ class RangeInstanceWrapper(Wrapper):
                 lambda instance:
                     instance.expr.store(expr.nonref_expr)
             )
+        if methodname == "__reversed__" and not args and not kwargs:
+            # count down from 'stop', stopping once we reach 'start - 1'
+            return context.push(
+                _RangeReversedIteratorWrapper,
+                lambda instance:
+                    instance.expr.ElementPtrIntegers(0, 0).store(expr.nonref_expr.structElt(1))
+                    >> instance.expr.ElementPtrIntegers(0, 1).store(expr.nonref_expr.structElt(0))
+            )
         return super().convert_method_call(context, expr, methodname, args, kwargs)
 
+    def convert_len(self, context, expr):
+        # we store one less than 'start', since the iterator increments before it reads
+        res = context.push(
+            int,
+            lambda length: length.expr.store(
+                expr.nonref_expr.structElt(1).sub(expr.nonref_expr.structElt(0).add(1))
+            )
+        )
+
+        with context.ifelse(res.nonref_expr.lt(0)) as (ifTrue, ifFalse):
+            with ifTrue:
+                context.pushEffect(res.expr.store(native_ast.const_int_expr(0)))
+
+        return res
+
 
 class RangeIteratorWrapper(Wrapper):
     is_pod = True
@@ -109,6 +132,43 @@ class RangeIteratorWrapper(Wrapper):
         return nextExpr, canContinue
 
 
+class RangeReversedIteratorWrapper(Wrapper):
+    is_pod = True
+    is_empty = False
+    is_pass_by_ref = True
+
+    def __init__(self):
+        super().__init__((range, "reversed_iterator"))
+
+    def getNativeLayoutType(self):
+        return native_ast.Type.Struct(
+            element_types=(("count", native_ast.Int64), ("startMinusOne", native_ast.Int64)),
+            name="range_reversed_storage"
+        )
+
+    def convert_method_call(self, context, expr, methodname, args, kwargs):
+        if methodname == "__iter__" and not args and not kwargs:
+            return context.push(self, lambda instance: instance.expr.store(expr.nonref_expr))
+        return super().convert_method_call(context, expr, methodname, args, kwargs)
+
+    def convert_next(self, context, expr):
+        context.pushEffect(
+            expr.expr.ElementPtrIntegers(0, 0).store(
+                expr.expr.ElementPtrIntegers(0, 0).load().sub(1)
+            )
+        )
+        canContinue = context.pushPod(
+            bool,
+            expr.expr.ElementPtrIntegers(0, 0).load().gt(
+                expr.expr.ElementPtrIntegers(0, 1).load()
+            )
+        )
+        nextExpr = context.pushReference(int, expr.expr.ElementPtrIntegers(0, 0))
+
+        return nextExpr, canContinue
+
+
 _RangeWrapper = RangeWrapper()
 _RangeInstanceWrapper = RangeInstanceWrapper()
 _RangeIteratorWrapper = RangeIteratorWrapper()
+_RangeReversedIteratorWrapper = RangeReversedIteratorWrapper()
@@ -45,6 +45,21 @@ def externalCallTarget(name, output, *inputs, varargs=False):
     )
 
 
+def intrinsicCallTarget(name, output, *inputs):
+    """Return a CallTarget for the LLVM intrinsic 'name', like 'llvm.sqrt.f64'."""
+    return native_ast.CallTarget.Named(
+        target=native_ast.NamedCallTarget(
+            name=name,
+            arg_types=inputs,
+            output_type=output,
+            external=True,
+            varargs=False,
+            intrinsic=True,
+            can_throw=False
+        )
+    )
+
+
 def binaryPyobjCallTarget(name):
     return externalCallTarget(
         name,
@@ -104,6 +119,35 @@ initialize_exception = externalCallTarget(
     Void.pointer()
 )
 
+fetch_exception = externalCallTarget(
+    "np_fetch_exception",
+    Void.pointer()
+)
+
+exception_matches = externalCallTarget(
+    "np_exception_matches",
+    Bool,
+    Void.pointer(),
+    Void.pointer()
+)
+
+save_exception = externalCallTarget(
+    "np_save_exception",
+    Void.pointer()
+)
+
+restore_exception = externalCallTarget(
+    "np_restore_exception",
+    Void,
+    Void.pointer()
+)
+
+discard_exception = externalCallTarget(
+    "np_discard_exception",
+    Void,
+    Void.pointer()
+)
+
 builtin_pyobj_by_name = externalCallTarget(
     "np_builtin_pyobj_by_name",
     Void.pointer(),
@@ -280,6 +324,19 @@ add_traceback = externalCallTarget(
     Int64
 )
 
+profile_enter = externalCallTarget(
+    "np_profile_enter",
+    Int64,
+    Void.pointer()
+)
+
+profile_exit = externalCallTarget(
+    "np_profile_exit",
+    Void,
+    Void.pointer(),
+    Int64
+)
+
 to_pyobj = externalCallTarget(
     "np_runtime_to_pyobj",
     Void.pointer(),
@@ -536,7 +593,7 @@ dict_create = externalCallTarget(
 
 dict_allocateNewSlot = externalCallTarget(
     "nativepython_dict_allocateNewSlot",
-    Int32,
+    Int64,
     Void.pointer(), Int64
 )
 
@@ -729,3 +786,39 @@ bytes_to_float64 = externalCallTarget(
     Float64,
     Void.pointer()
 )
+
+list_of_sort = externalCallTarget(
+    "np_list_of_sort",
+    Void,
+    UInt64, Void.pointer(), Bool
+)
+
+list_of_argsort = externalCallTarget(
+    "np_list_of_argsort",
+    Void.pointer(),
+    UInt64, Void.pointer(), Bool
+)
+
+list_of_partial_sort = externalCallTarget(
+    "np_list_of_partial_sort",
+    Void,
+    UInt64, Void.pointer(), Int64
+)
+
+list_of_nth_element = externalCallTarget(
+    "np_list_of_nth_element",
+    Void,
+    UInt64, Void.pointer(), Int64
+)
+
+release_adopted_tuple_or_list = externalCallTarget(
+    "np_release_adopted_tuple_or_list",
+    Void,
+    Void.pointer()
+)
+
+list_of_view_to_pyobj = externalCallTarget(
+    "np_list_of_view_to_pyobj",
+    Void.pointer(),
+    UInt64, Void.pointer(), Void.pointer(), Int64
+)
@@ -15,7 +15,13 @@
 from typed_python.compiler.type_wrappers.refcounted_wrapper import RefcountedWrapper
 from typed_python.compiler.typed_expression import TypedExpression
 import typed_python.compiler.type_wrappers.runtime_functions as runtime_functions
-from typed_python import NoneType
+from typed_python.compiler.type_wrappers.bound_compiled_method_wrapper import BoundCompiledMethodWrapper
+from typed_python.compiler.type_wrappers.wrapper import Wrapper
+from typed_python.compiler.type_wrappers.dict_wrapper import (
+    dict_add_slot, dict_slot_for_key, dict_next_slot, dict_discard_key, dict_discard_key_in_place,
+    dict_remove_key, dict_clear, dict_contains, dict_contains_not
+)
+from typed_python import NoneType, PointerTo, Int32, Int64, UInt8, ListOf
 
 import typed_python.compiler.native_ast as native_ast
 import typed_python.compiler
@@ -24,11 +30,151 @@ import typed_python.compiler
 typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
 
 
+def set_add(instance, key):
+    itemHash = hash(key)
+
+    slot = dict_slot_for_key(instance, itemHash, key)
+
+    if slot == -1:
+        newSlot = instance._allocateNewSlotUnsafe()
+        dict_add_slot(instance, itemHash, newSlot)
+        instance.initializeKeyByIndexUnsafe(newSlot, key)
+
+
+def set_discard(instance, key):
+    dict_discard_key(instance, key, hash(key))
+
+
+def set_remove(instance, key):
+    dict_remove_key(instance, key, hash(key))
+
+
+def set_pop(instance):
+    slot = dict_next_slot(instance, -1)
+
+    if slot == -1:
+        raise KeyError("pop from an empty set")
+
+    result = instance.getKeyByIndexUnsafe(slot)
+
+    dict_remove_key(instance, result, hash(result))
+
+    return result
+
+
+def set_update(instance, other):
+    for key in other:
+        instance.add(key)
+
+
+def set_copy(instance):
+    result = type(instance)()
+
+    for key in instance:
+        set_add(result, key)
+
+    return result
+
+
+def set_union(instance, other):
+    result = set_copy(instance)
+
+    set_update(result, other)
+
+    return result
+
+
+def set_intersection(instance, other):
+    result = type(instance)()
+
+    for key in other:
+        if key in instance:
+            result.add(key)
+
+    return result
+
+
+def set_intersection_of_sets(instance, other):
+    # probe the larger set with the elements of the smaller one
+    result = type(instance)()
+
+    if len(other) < len(instance):
+        for key in other:
+            if key in instance:
+                set_add(result, key)
+    else:
+        for key in instance:
+            if key in other:
+                set_add(result, key)
+
+    return result
+
+
+def set_intersection_update(instance, other):
+    # 'other' is a Set of our type, so we can probe it directly. Discarding in place
+    # leaves the slots we're iterating over where they are.
+    slotIx = dict_next_slot(instance, -1)
+
+    while slotIx != -1:
+        key = instance.getKeyByIndexUnsafe(slotIx)
+
+        if key not in other:
+            dict_discard_key_in_place(instance, key, hash(key))
+
+        slotIx = dict_next_slot(instance, slotIx)
+
+
+def set_intersection_update_from_iterable(instance, other):
+    # mark the slots of the keys we share with 'other', then drop the rest in place
+    keep = ListOf(bool)()
+    keep.resize(instance._items_reserved, False)
+
+    for key in other:
+        slotIx = dict_slot_for_key(instance, hash(key), key)
+
+        if slotIx != -1:
+            keep[slotIx] = True
+
+    slotIx = dict_next_slot(instance, -1)
+
+    while slotIx != -1:
+        if not keep[slotIx]:
+            key = instance.getKeyByIndexUnsafe(slotIx)
+            dict_discard_key_in_place(instance, key, hash(key))
+
+        slotIx = dict_next_slot(instance, slotIx)
+
+
+def set_difference(instance, other):
+    result = set_copy(instance)
+
+    set_difference_update(result, other)
+
+    return result
+
+
+def set_difference_of_sets(instance, other):
+    result = type(instance)()
+
+    for key in instance:
+        if key not in other:
+            set_add(result, key)
+
+    return result
+
+
+def set_difference_update(instance, other):
+    for key in other:
+        instance.discard(key)
+
+
 class SetWrapperBase(RefcountedWrapper):
     is_pod = False
     is_empty = False
     is_pass_by_ref = True
 
+    CAN_BE_NULL = False
+
     def __init__(self, t, behavior):
         assert hasattr(t, '__typed_python_category__')
         super().__init__(t if behavior is None else (t, behavior))
@@ -44,7 +190,7 @@ class SetWrapperBase(RefcountedWrapper):
             ('items_populated', native_ast.UInt8Ptr),
             ('items_reserved', native_ast.Int64),
             ('top_item_slot', native_ast.Int64),
-            ('hash_table_slots', native_ast.Int32Ptr),
+            ('hash_table_slots', native_ast.Int64Ptr),
             ('hash_table_hashes', native_ast.Int32Ptr),
             ('hash_table_size', native_ast.Int64),
             ('hash_table_count', native_ast.Int64),
@@ -70,8 +216,236 @@ class SetWrapperBase(RefcountedWrapper):
 
 
 class SetWrapper(SetWrapperBase):
-    def __init__(self, dictType):
-        super().__init__(dictType, None)
+    # the fields of the hash_table_layout that the shared hash table code in
+    # dict_wrapper reads (and in some cases writes), by their index in the layout.
+    _layoutFields = {
+        '_items_populated': (2, PointerTo(UInt8)),
+        '_items_reserved': (3, Int64),
+        '_top_item_slot': (4, Int64),
+        '_hash_table_slots': (5, PointerTo(Int64)),
+        '_hash_table_hashes': (6, PointerTo(Int32)),
+        '_hash_table_size': (7, int),
+        '_hash_table_count': (8, int),
+        '_hash_table_empty_slots': (9, int),
+    }
+
+    _writableLayoutFields = ('_top_item_slot', '_hash_table_count', '_hash_table_empty_slots')
+
+    def __init__(self, setType):
+        super().__init__(setType, None)
+
+    def convert_default_initialize(self, context, instance):
+        context.pushEffect(
+            instance.expr.store(
+                runtime_functions.dict_create.call().cast(self.layoutType)
+            )
+        )
+
+    def convert_attribute(self, context, expr, attr):
+        if attr in (
+                "getKeyByIndexUnsafe", "deleteItemByIndexUnsafe", "initializeKeyByIndexUnsafe",
+                "_allocateNewSlotUnsafe", "_resizeTableUnsafe", "_compressItemTableUnsafe",
+                "add", "discard", "remove", "pop", "clear", "copy", "update", "union",
+                "intersection", "difference", "intersection_update", "difference_update"):
+            return expr.changeType(BoundCompiledMethodWrapper(self, attr))
+
+        if attr in self._layoutFields:
+            index, fieldType = self._layoutFields[attr]
+
+            return context.pushPod(
+                fieldType,
+                expr.nonref_expr.ElementPtrIntegers(0, index).load()
+            )
+
+        return super().convert_attribute(context, expr, attr)
+
+    def convert_set_attribute(self, context, instance, attr, expr):
+        if attr in self._writableLayoutFields:
+            val = expr.convert_to_type(int)
+            if val is None:
+                return None
+
+            context.pushEffect(
+                instance.nonref_expr.ElementPtrIntegers(0, self._layoutFields[attr][0]).store(val.nonref_expr)
+            )
+
+            return context.pushVoid()
+
+        return super().convert_set_attribute(context, instance, attr, expr)
+
+    def convert_method_call(self, context, instance, methodname, args, kwargs):
+        if kwargs:
+            return super().convert_method_call(context, instance, methodname, args, kwargs)
+
+        if methodname == "__iter__" and not args:
+            res = context.push(
+                SetKeysIteratorWrapper(self.setType),
+                lambda instance:
+                    instance.expr.ElementPtrIntegers(0, 0).store(-1)
+            )
+
+            context.pushReference(
+                self,
+                res.expr.ElementPtrIntegers(0, 1)
+            ).convert_copy_initialize(instance)
+
+            return res
+
+        if len(args) == 0:
+            if methodname == "_compressItemTableUnsafe":
+                context.pushEffect(
+                    runtime_functions.dict_compressItemTable.call(
+                        instance.nonref_expr.cast(native_ast.VoidPtr),
+                        context.constant(self.keyBytecount)
+                    )
+                )
+                return context.pushVoid()
+
+            if methodname == "_resizeTableUnsafe":
+                context.pushEffect(
+                    runtime_functions.dict_resizeTable.call(
+                        instance.nonref_expr.cast(native_ast.VoidPtr)
+                    )
+                )
+                return context.pushVoid()
+
+            if methodname == "_allocateNewSlotUnsafe":
+                return context.pushPod(
+                    Int64,
+                    runtime_functions.dict_allocateNewSlot.call(
+                        instance.nonref_expr.cast(native_ast.VoidPtr),
+                        context.constant(self.keyBytecount)
+                    )
+                )
+
+            if methodname == "pop":
+                return context.call_py_function(set_pop, (instance,), {})
+
+            if methodname == "clear":
+                return context.call_py_function(dict_clear, (instance,), {})
+
+            if methodname in ("copy", "union", "intersection", "difference"):
+                return context.call_py_function(set_copy, (instance,), {})
+
+        if len(args) == 1:
+            if methodname in ("add", "discard", "remove"):
+                key = args[0].convert_to_type(self.keyType, explicit=False)
+                if key is None:
+                    return None
+
+                return context.call_py_function(
+                    {"add": set_add, "discard": set_discard, "remove": set_remove}[methodname],
+                    (instance, key),
+                    {}
+                )
+
+            if methodname in ("update", "union", "intersection", "difference",
+                              "intersection_update", "difference_update"):
+                return self.convert_set_operation(context, instance, methodname, args[0])
+
+            if methodname in ("getKeyByIndexUnsafe", "deleteItemByIndexUnsafe"):
+                index = args[0].convert_to_type(int)
+                if index is None:
+                    return None
+
+                key = self.convert_getkey_by_index_unsafe(context, instance, index)
+
+                if methodname == "deleteItemByIndexUnsafe":
+                    key.convert_destroy()
+                    return context.pushVoid()
+
+                return key
+
+        if len(args) == 2:
+            if methodname == "initializeKeyByIndexUnsafe":
+                index = args[0].convert_to_type(int)
+                if index is None:
+                    return None
+
+                key = args[1].convert_to_type(self.keyType)
+                if key is None:
+                    return None
+
+                self.convert_getkey_by_index_unsafe(context, instance, index).convert_copy_initialize(key)
+
+                return context.pushVoid()
+
+        return super().convert_method_call(context, instance, methodname, args, kwargs)
+
+    def convert_set_operation(self, context, instance, methodname, other):
+        """Apply one of the binary set operations to 'instance' and an arbitrary iterable.
+
+        When 'other' is a Set of the same type we know its elements are unique and
+        hashable in the same way, so we can probe it directly instead of iterating it.
+        """
+        otherIsSameSet = other.expr_type == self
+
+        if methodname == "update":
+            return context.call_py_function(set_update, (instance, other), {})
+
+        if methodname == "union":
+            return context.call_py_function(set_union, (instance, other), {})
+
+        if methodname == "intersection":
+            return context.call_py_function(
+                set_intersection_of_sets if otherIsSameSet else set_intersection,
+                (instance, other),
+                {}
+            )
+
+        if methodname == "difference":
+            return context.call_py_function(
+                set_difference_of_sets if otherIsSameSet else set_difference,
+                (instance, other),
+                {}
+            )
+
+        if methodname == "difference_update":
+            return context.call_py_function(set_difference_update, (instance, other), {})
+
+        if methodname == "intersection_update":
+            return context.call_py_function(
+                set_intersection_update if otherIsSameSet else set_intersection_update_from_iterable,
+                (instance, other),
+                {}
+            )
+
+        raise Exception(f"Unknown set operation {methodname}")
+
+    def convert_bin_op(self, context, left, op, right, inplace):
+        if right.expr_type == left.expr_type:
+            if op.matches.BitOr:
+                methodname = "update" if inplace else "union"
+            elif op.matches.BitAnd:
+                methodname = "intersection_update" if inplace else "intersection"
+            elif op.matches.Sub:
+                methodname = "difference_update" if inplace else "difference"
+            else:
+                methodname = None
+
+            if methodname is not None:
+                res = self.convert_set_operation(context, left, methodname, right)
+                if res is None:
+                    return None
+
+                # in-place operators mutate the set and rebind the name to the same set.
+                return left if inplace else res
+
+        return super().convert_bin_op(context, left, op, right, inplace)
+
+    def convert_bin_op_reverse(self, context, left, op, right, inplace):
+        if op.matches.In or op.matches.NotIn:
+            right = right.convert_to_type(self.keyType)
+            if right is None:
+                return None
+
+            return context.call_py_function(
+                dict_contains if op.matches.In else dict_contains_not,
+                (left, right),
+                {}
+            )
+
+        return super().convert_bin_op_reverse(context, left, op, right, inplace)
 
     def convert_len_native(self, expr):
         if isinstance(expr, TypedExpression):
@@ -97,8 +471,8 @@ class SetWrapper(SetWrapperBase):
     def convert_getkey_by_index_unsafe(self, context, expr, item):
         return context.pushReference(
             self.keyType,
-            expr.nonref_expr.ElementPtrIntegers(0, 1)
-            .elemPtr(item.nonref_expr.mul(native_ast.const_int_expr(self.keyBytecount)))
+            expr.nonref_expr.ElementPtrIntegers(0, 1).load()
+            .elemPtr(item.toInt64().nonref_expr.mul(native_ast.const_int_expr(self.keyBytecount)))
             .cast(self.keyType.getNativeLayoutType().pointer())
         )
 
@@ -116,5 +490,77 @@ class SetWrapper(SetWrapperBase):
             runtime_functions.free.call(inst.nonref_expr.cast(native_ast.UInt8Ptr))
         )
 
+    def convert_type_call(self, context, typeInst, args, kwargs):
+        if len(args) == 0 and not kwargs:
+            return context.push(self, lambda x: x.convert_default_initialize())
+
+        if len(args) == 1 and not kwargs:
+            return args[0].convert_to_type(self, True)
+
+        return super().convert_type_call(context, typeInst, args, kwargs)
+
     def convert_bool_cast(self, context, expr):
         return context.pushPod(bool, self.convert_len_native(expr.nonref_expr).neq(0))
+
+
+class SetKeysIteratorWrapper(Wrapper):
+    is_pod = False
+    is_empty = False
+    is_pass_by_ref = True
+
+    def __init__(self, setType):
+        self.setType = setType
+        super().__init__((setType, "iterator"))
+
+    def getNativeLayoutType(self):
+        return native_ast.Type.Struct(
+            element_types=(("pos", native_ast.Int64), ("set", SetWrapper(self.setType).getNativeLayoutType())),
+            name="const_set_iterator"
+        )
+
+    def convert_next(self, context, expr):
+        nextSlotIx = context.call_py_function(dict_next_slot, (self.refAs(context, expr, 1), self.refAs(context, expr, 0)), {})
+
+        if nextSlotIx is None:
+            return None, None
+
+        context.pushEffect(
+            expr.expr.ElementPtrIntegers(0, 0).store(
+                nextSlotIx.nonref_expr
+            )
+        )
+        canContinue = context.pushPod(
+            bool,
+            nextSlotIx.nonref_expr.gte(0)
+        )
+
+        nextIx = context.pushReference(int, expr.expr.ElementPtrIntegers(0, 0))
+
+        return SetWrapper(self.setType).convert_getkey_by_index_unsafe(context, self.refAs(context, expr, 1), nextIx), canContinue
+
+    def refAs(self, context, expr, which):
+        assert expr.expr_type == self
+
+        if which == 0:
+            return context.pushReference(int, expr.expr.ElementPtrIntegers(0, 0))
+
+        if which == 1:
+            return context.pushReference(
+                self.setType,
+                expr.expr
+                    .ElementPtrIntegers(0, 1)
+                    .cast(SetWrapper(self.setType).getNativeLayoutType().pointer())
+            )
+
+    def convert_assign(self, context, expr, other):
+        assert expr.isReference
+
+        for i in range(2):
+            self.refAs(context, expr, i).convert_assign(self.refAs(context, other, i))
+
+    def convert_copy_initialize(self, context, expr, other):
+        for i in range(2):
+            self.refAs(context, expr, i).convert_copy_initialize(self.refAs(context, other, i))
+
+    def convert_destroy(self, context, expr):
+        self.refAs(context, expr, 1).convert_destroy()
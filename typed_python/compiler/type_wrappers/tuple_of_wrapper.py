@@ -27,6 +27,9 @@ import typed_python.compiler
 
 typeWrapper = lambda t: typed_python.compiler.python_object_representation.typedPythonTypeToTypeWrapper(t)
 
+# sizeof(TupleOrListOfType::layout): refcount, hash_cache, buffer_exports, count, reserved, data
+TUPLE_OR_LIST_LAYOUT_BYTES = 40
+
 
 def tuple_compare_eq(left, right):
     """Compare two 'TupleOf' instances by comparing their individual elements."""
@@ -114,10 +117,10 @@ class PreReservedTupleOrList(CompilableBuiltin):
                 self.tupleType,
                 lambda out:
                     out.expr.store(
-                        runtime_functions.malloc.call(native_ast.const_int_expr(28))
+                        runtime_functions.malloc.call(native_ast.const_int_expr(TUPLE_OR_LIST_LAYOUT_BYTES))
                             .cast(self.tupleTypeWrapper.getNativeLayoutType())
                     ) >>
-                    out.expr.load().ElementPtrIntegers(0, 4).store(
+                    out.expr.load().ElementPtrIntegers(0, 5).store(
                         runtime_functions.malloc.call(
                             length.nonref_expr
                             .mul(native_ast.const_int_expr(self.underlyingWrapperType.getBytecount()))
@@ -126,7 +129,8 @@ class PreReservedTupleOrList(CompilableBuiltin):
                     out.expr.load().ElementPtrIntegers(0, 0).store(native_ast.const_int_expr(1)) >>
                     out.expr.load().ElementPtrIntegers(0, 1).store(native_ast.const_int32_expr(-1)) >>
                     out.expr.load().ElementPtrIntegers(0, 2).store(native_ast.const_int32_expr(0)) >>
-                    out.expr.load().ElementPtrIntegers(0, 3).store(length.nonref_expr.cast(native_ast.Int32))
+                    out.expr.load().ElementPtrIntegers(0, 3).store(native_ast.const_int_expr(0)) >>
+                    out.expr.load().ElementPtrIntegers(0, 4).store(length.nonref_expr.cast(native_ast.Int64))
             )
 
         return super().convert_call(context, instance, args, kwargs)
@@ -150,6 +154,74 @@ def concatenate_tuple_or_list(l, r):
     return result
 
 
+def slice_start(length, lower, step):
+    """Clamp the start of a slice to 'length', as python's 'slice.indices' does.
+
+    'lower' is None if the slice had no lower bound.
+    """
+    if lower is None:
+        if step < 0:
+            return length - 1
+        else:
+            return 0
+    else:
+        start = lower
+        if start < 0:
+            start += length
+            if start < 0:
+                if step < 0:
+                    start = -1
+                else:
+                    start = 0
+        elif start >= length:
+            if step < 0:
+                start = length - 1
+            else:
+                start = length
+        return start
+
+
+def slice_stop(length, upper, step):
+    """Clamp the end of a slice to 'length', as python's 'slice.indices' does.
+
+    'upper' is None if the slice had no upper bound.
+    """
+    if upper is None:
+        if step < 0:
+            return -1
+        else:
+            return length
+    else:
+        return slice_start(length, upper, step)
+
+
+def slice_length(start, stop, step):
+    """The number of indices in 'range(start, stop, step)'."""
+    if step < 0:
+        if stop < start:
+            return (start - stop - 1) // (-step) + 1
+    elif start < stop:
+        return (stop - start - 1) // step + 1
+
+    return 0
+
+
+def tuple_or_list_of_getslice(tupOrList, lower, upper, step):
+    if step == 0:
+        raise ValueError("slice step cannot be zero")
+
+    start = slice_start(len(tupOrList), lower, step)
+    count = slice_length(start, slice_stop(len(tupOrList), upper, step), step)
+
+    result = PreReservedTupleOrList(type(tupOrList))(count)
+
+    for i in range(count):
+        result._initializeItemUnsafe(i, tupOrList._getItemUnsafe(start + i * step))
+        result.setSizeUnsafe(i + 1)
+
+    return result
+
+
 class TupleOrListOfWrapper(RefcountedWrapper):
     is_pod = False
     is_empty = False
@@ -166,8 +238,9 @@ class TupleOrListOfWrapper(RefcountedWrapper):
         self.layoutType = native_ast.Type.Struct(element_types=(
             ('refcount', native_ast.Int64),
             ('hash_cache', native_ast.Int32),
-            ('count', native_ast.Int32),
-            ('reserved', native_ast.Int32),
+            ('buffer_exports', native_ast.Int32),
+            ('count', native_ast.Int64),
+            ('reserved', native_ast.Int64),
             ('data', native_ast.UInt8Ptr)
         ), name='TupleOfLayout' if self.is_tuple else 'ListOfLayout').pointer()
 
@@ -193,12 +266,21 @@ class TupleOrListOfWrapper(RefcountedWrapper):
             with context.loop(inst.convert_len()) as i:
                 inst.convert_getitem_unsafe(i).convert_destroy()
 
-        context.pushEffect(
-            runtime_functions.free.call(inst.nonref_expr.ElementPtrIntegers(0, 4).load())
-        )
-        context.pushEffect(
-            runtime_functions.free.call(inst.nonref_expr.cast(native_ast.UInt8Ptr))
-        )
+        # exports hold a reference to us, so if any are left, they're the one for an adopted buffer
+        bufferExports = inst.nonref_expr.ElementPtrIntegers(0, 2).load()
+
+        with context.ifelse(bufferExports.neq(native_ast.const_int32_expr(0))) as (ifAdopted, ifOwned):
+            with ifAdopted:
+                context.pushEffect(
+                    runtime_functions.release_adopted_tuple_or_list.call(inst.nonref_expr.cast(native_ast.VoidPtr))
+                )
+            with ifOwned:
+                context.pushEffect(
+                    runtime_functions.free.call(inst.nonref_expr.ElementPtrIntegers(0, 5).load())
+                )
+                context.pushEffect(
+                    runtime_functions.free.call(inst.nonref_expr.cast(native_ast.UInt8Ptr))
+                )
 
     def convert_bin_op(self, context, left, op, right, inplace):
         if issubclass(right.expr_type.typeRepresentation, (TupleOf, ListOf)):
@@ -271,15 +353,43 @@ class TupleOrListOfWrapper(RefcountedWrapper):
 
         return context.pushReference(
             self.underlyingWrapperType,
-            expr.nonref_expr.ElementPtrIntegers(0, 4).load().cast(
+            expr.nonref_expr.ElementPtrIntegers(0, 5).load().cast(
                 self.underlyingWrapperType.getNativeLayoutType().pointer()
             ).elemPtr(actualItem.toInt64().nonref_expr)
         )
 
+    def convert_slice_bounds(self, context, lower, upper, step):
+        """Convert the bounds of a slice to ints, leaving missing lower and upper bounds as None.
+
+        Returns:
+            None if a bound can't be converted, or a tuple (lower, upper, step) of TypedExpressions.
+        """
+        if step is None:
+            step = context.constant(1)
+
+        bounds = []
+        for bound in (lower, upper, step):
+            if bound is None:
+                bounds.append(context.constant(None))
+            else:
+                bound = bound.toInt64()
+                if bound is None:
+                    return None
+                bounds.append(bound)
+
+        return tuple(bounds)
+
+    def convert_getslice(self, context, expr, lower, upper, step):
+        bounds = self.convert_slice_bounds(context, lower, upper, step)
+        if bounds is None:
+            return None
+
+        return context.call_py_function(tuple_or_list_of_getslice, (expr,) + bounds, {})
+
     def convert_getitem_unsafe(self, context, expr, item):
         return context.pushReference(
             self.underlyingWrapperType,
-            expr.nonref_expr.ElementPtrIntegers(0, 4).load().cast(
+            expr.nonref_expr.ElementPtrIntegers(0, 5).load().cast(
                 self.underlyingWrapperType.getNativeLayoutType().pointer()
             ).elemPtr(item.toInt64().nonref_expr)
         )
@@ -290,7 +400,7 @@ class TupleOrListOfWrapper(RefcountedWrapper):
         return native_ast.Expression.Branch(
             cond=expr,
             false=native_ast.const_int_expr(0),
-            true=expr.ElementPtrIntegers(0, 2).load().cast(native_ast.Int64)
+            true=expr.ElementPtrIntegers(0, 3).load().cast(native_ast.Int64)
         )
 
     def convert_len(self, context, expr):
@@ -312,8 +422,8 @@ class TupleOrListOfWrapper(RefcountedWrapper):
 
                 context.pushEffect(
                     instance.nonref_expr
-                    .ElementPtrIntegers(0, 2)
-                    .store(count.nonref_expr.cast(native_ast.Int32))
+                    .ElementPtrIntegers(0, 3)
+                    .store(count.nonref_expr.cast(native_ast.Int64))
                 )
 
                 return context.pushVoid()
@@ -345,6 +455,21 @@ class TupleOrListOfWrapper(RefcountedWrapper):
 
             return res
 
+        if methodname == "__reversed__" and not args and not kwargs:
+            # the iterator decrements its position before it reads
+            res = context.push(
+                TupleOrListOfReversedIteratorWrapper(self.typeRepresentation),
+                lambda iterator:
+                    iterator.expr.ElementPtrIntegers(0, 0).store(self.convert_len_native(instance.nonref_expr))
+            )
+
+            context.pushReference(
+                self,
+                res.expr.ElementPtrIntegers(0, 1)
+            ).convert_copy_initialize(instance)
+
+            return res
+
         return super().convert_method_call(context, instance, methodname, args, kwargs)
 
     def convert_type_call_on_container_expression(self, context, typeInst, argExpr):
@@ -460,6 +585,40 @@ class TupleOrListOfIteratorWrapper(Wrapper):
         self.refAs(context, expr, 1).convert_destroy()
 
 
+class TupleOrListOfReversedIteratorWrapper(TupleOrListOfIteratorWrapper):
+    """An iterator that walks a TupleOf or ListOf from its last element to its first."""
+
+    def __init__(self, tupType):
+        self.tupType = tupType
+        Wrapper.__init__(self, (tupType, "reversed_iterator"))
+
+    def convert_method_call(self, context, instance, methodname, args, kwargs):
+        if methodname == "__iter__" and not args and not kwargs:
+            return context.push(self, lambda iterator: iterator.convert_copy_initialize(instance))
+
+        return super().convert_method_call(context, instance, methodname, args, kwargs)
+
+    def convert_next(self, context, expr):
+        context.pushEffect(
+            expr.expr.ElementPtrIntegers(0, 0).store(
+                expr.expr.ElementPtrIntegers(0, 0).load().sub(1)
+            )
+        )
+        self_len = self.refAs(context, expr, 1).convert_len()
+
+        # like python, we stop early if the list shrank underneath us
+        canContinue = context.pushPod(
+            bool,
+            expr.expr.ElementPtrIntegers(0, 0).load().gte(0).bitand(
+                expr.expr.ElementPtrIntegers(0, 0).load().lt(self_len.nonref_expr)
+            )
+        )
+
+        nextIx = context.pushReference(int, expr.expr.ElementPtrIntegers(0, 0))
+
+        return self.iteratedItemForReference(context, expr, nextIx), canContinue
+
+
 class TupleOfWrapper(TupleOrListOfWrapper):
     def convert_default_initialize(self, context, tgt):
         context.pushEffect(
@@ -177,6 +177,18 @@ class Wrapper(object):
             "%s does not support item assignment" % str(self)
         )
 
+    def convert_setslice(self, context, instance, lower, upper, step, value):
+        return context.pushException(
+            AttributeError,
+            "%s does not support slice assignment" % str(self)
+        )
+
+    def convert_delslice(self, context, instance, lower, upper, step):
+        return context.pushException(
+            AttributeError,
+            "%s does not support slice deletion" % str(self)
+        )
+
     def convert_assign(self, context, target, toStore):
         if self.is_pod:
             assert target.isReference
@@ -130,6 +130,12 @@ class TypedExpression(object):
     def convert_getslice(self, lower, upper, step):
         return self.expr_type.convert_getslice(self.context, self, lower, upper, step)
 
+    def convert_setslice(self, lower, upper, step, value):
+        return self.expr_type.convert_setslice(self.context, self, lower, upper, step, value)
+
+    def convert_delslice(self, lower, upper, step):
+        return self.expr_type.convert_delslice(self.context, self, lower, upper, step)
+
     def convert_getitem(self, item):
         return self.expr_type.convert_getitem(self.context, self, item)
 
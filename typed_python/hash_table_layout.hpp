@@ -34,7 +34,8 @@ class hash_table_layout {
 
     enum { EMPTY = -1, DELETED = -2 };
 
-    void setTo(int32_t* ptr, int32_t value, size_t count) {
+    template<class T>
+    void setTo(T* ptr, T value, size_t count) {
         for (size_t k = 0; k < count; k++) {
             *(ptr++) = value;
         }
@@ -42,7 +43,7 @@ class hash_table_layout {
 
     // return the index of the object indexed by 'hash', or -1
     template <class eq_func>
-    int32_t find(int32_t kv_pair_size, typed_python_hash_type hash, const eq_func& compare) {
+    int64_t find(int64_t kv_pair_size, typed_python_hash_type hash, const eq_func& compare) {
         if (!hash_table_slots) {
             return -1;
         }
@@ -54,11 +55,11 @@ class hash_table_layout {
             hash = -hash;
         }
 
-        int32_t offset = hash % hash_table_size;
+        int64_t offset = hash % hash_table_size;
 
         while (true) {
             // slot is empty
-            int32_t slot = hash_table_slots[offset];
+            int64_t slot = hash_table_slots[offset];
 
             if (slot == EMPTY) {
                 return -1;
@@ -74,7 +75,7 @@ class hash_table_layout {
     }
 
     // linear search
-    int32_t nextOffset(int32_t offset) const {
+    int64_t nextOffset(int64_t offset) const {
         offset += 1;
         if (offset >= hash_table_size) {
             offset = 0;
@@ -83,7 +84,7 @@ class hash_table_layout {
     }
 
     // add an item to the hash table
-    void add(typed_python_hash_type hash, int32_t slot) {
+    void add(typed_python_hash_type hash, int64_t slot) {
         if (hash_table_count * 2 + 1 > hash_table_size
             || hash_table_empty_slots < hash_table_size / 4 + 1) {
             resizeTable();
@@ -96,7 +97,7 @@ class hash_table_layout {
             hash = -hash;
         }
 
-        int32_t offset = hash % hash_table_size;
+        int64_t offset = hash % hash_table_size;
         while (true) {
             if (hash_table_slots[offset] == EMPTY || hash_table_slots[offset] == DELETED) {
                 if (hash_table_slots[offset] == EMPTY) {
@@ -118,7 +119,7 @@ class hash_table_layout {
     // lived.
     //-1 if not found
     template <class eq_func>
-    int32_t remove(int32_t kv_pair_size, typed_python_hash_type hash, const eq_func& compare) {
+    int64_t remove(int64_t kv_pair_size, typed_python_hash_type hash, const eq_func& compare) {
         if (!hash_table_slots) {
             return -1;
         }
@@ -139,10 +140,10 @@ class hash_table_layout {
             hash = -hash;
         }
 
-        int32_t offset = hash % hash_table_size;
+        int64_t offset = hash % hash_table_size;
 
         while (true) {
-            int32_t slot = hash_table_slots[offset];
+            int64_t slot = hash_table_slots[offset];
 
             if (slot == EMPTY) {
                 // we never found the item
@@ -164,8 +165,8 @@ class hash_table_layout {
     }
 
     void compressItemTable(size_t kv_pair_size) {
-        std::vector<int32_t> newItemPositions;
-        int32_t count_so_far = 0;
+        std::vector<int64_t> newItemPositions;
+        int64_t count_so_far = 0;
 
         for (long k = 0; k < items_reserved; k++) {
             if (items_populated[k]) {
@@ -213,7 +214,7 @@ class hash_table_layout {
         }
     }
 
-    int32_t allocateNewSlot(size_t kv_pair_size) {
+    int64_t allocateNewSlot(size_t kv_pair_size) {
         if (!items) {
             items = (uint8_t*)malloc(4 * kv_pair_size);
             std::memset(items, 0, 4 * kv_pair_size);
@@ -240,13 +241,13 @@ class hash_table_layout {
         return top_item_slot++;
     }
 
-    int32_t computeNextPrime(int32_t p) {
-        static std::vector<int32_t> primes;
+    int64_t computeNextPrime(int64_t p) {
+        static std::vector<int64_t> primes;
         if (!primes.size()) {
             primes.push_back(2);
         }
 
-        auto isprime = [&](int32_t candidate) {
+        auto isprime = [&](int64_t candidate) {
             for (auto d : primes) {
                 if (candidate % d == 0) {
                     return false;
@@ -260,7 +261,7 @@ class hash_table_layout {
 
         while (true) {
             while (primes.back() * primes.back() < p) {
-                int32_t cur = primes.back() + 1;
+                int64_t cur = primes.back() + 1;
                 while (!isprime(cur)) {
                     cur++;
                 }
@@ -286,33 +287,33 @@ class hash_table_layout {
         top_item_slot = 0;
         hash_table_empty_slots = hash_table_size;
 
-        setTo(hash_table_slots, EMPTY, hash_table_size);
-        setTo(hash_table_hashes, EMPTY, hash_table_size);
+        setTo<int64_t>(hash_table_slots, EMPTY, hash_table_size);
+        setTo<typed_python_hash_type>(hash_table_hashes, EMPTY, hash_table_size);
     }
 
     void resizeTable() {
         if (!hash_table_slots) {
-            hash_table_slots = (int32_t*)malloc(7 * sizeof(int32_t));
-            setTo(hash_table_slots, EMPTY, 7);
+            hash_table_slots = (int64_t*)malloc(7 * sizeof(int64_t));
+            setTo<int64_t>(hash_table_slots, EMPTY, 7);
             hash_table_hashes = (typed_python_hash_type*)malloc(7 * sizeof(typed_python_hash_type));
-            setTo(hash_table_hashes, EMPTY, 7);
+            setTo<typed_python_hash_type>(hash_table_hashes, EMPTY, 7);
             hash_table_size = 7;
             hash_table_count = 0;
             hash_table_empty_slots = hash_table_size;
 
         } else {
-            int32_t oldSize = hash_table_size;
-            int32_t* oldSlots = hash_table_slots;
+            int64_t oldSize = hash_table_size;
+            int64_t* oldSlots = hash_table_slots;
             typed_python_hash_type* oldHashes = hash_table_hashes;
 
             // make sure the table's not too small
             hash_table_size = computeNextPrime(hash_table_count * 4 + 7);
 
-            hash_table_slots = (int32_t*)malloc(hash_table_size * sizeof(int32_t));
-            setTo(hash_table_slots, EMPTY, hash_table_size);
+            hash_table_slots = (int64_t*)malloc(hash_table_size * sizeof(int64_t));
+            setTo<int64_t>(hash_table_slots, EMPTY, hash_table_size);
             hash_table_hashes =
               (typed_python_hash_type*)malloc(hash_table_size * sizeof(typed_python_hash_type));
-            setTo(hash_table_hashes, EMPTY, hash_table_size);
+            setTo<typed_python_hash_type>(hash_table_hashes, EMPTY, hash_table_size);
             hash_table_count = 0;
             hash_table_empty_slots = hash_table_size;
 
@@ -327,7 +328,7 @@ class hash_table_layout {
         }
     }
 
-    void prepareForDeserialization(uint32_t slotCount, size_t kv_pair_size) {
+    void prepareForDeserialization(size_t slotCount, size_t kv_pair_size) {
         if (hash_table_size) {
             throw std::runtime_error("deserialization prepare should only be called on "
                                      "empty tables");
@@ -347,7 +348,7 @@ class hash_table_layout {
     template <class hash_fun_type>
     void buildHashTableAfterDeserialization(size_t kv_pair_size, const hash_fun_type& hash_fun) {
         hash_table_size = computeNextPrime(items_reserved * 2.5 + 7);
-        hash_table_slots = (int32_t*)malloc(hash_table_size * sizeof(int32_t));
+        hash_table_slots = (int64_t*)malloc(hash_table_size * sizeof(int64_t));
         hash_table_hashes =
           (typed_python_hash_type*)malloc(hash_table_size * sizeof(typed_python_hash_type));
         hash_table_count = 0;
@@ -418,7 +419,7 @@ class hash_table_layout {
     }
 
     bool empty() const { return hash_table_count == 0; }
-    int32_t size() const { return hash_table_count; }
+    int64_t size() const { return hash_table_count; }
 
     std::atomic<int64_t> refcount;
 
@@ -427,7 +428,7 @@ class hash_table_layout {
     size_t items_reserved; // count of items reserved
     size_t top_item_slot; // index of the next item slot to use
 
-    int32_t* hash_table_slots; // a hashtable. each actual object hash to
+    int64_t* hash_table_slots; // a hashtable. each actual object hash to
                                // the slot index it holds. -1 if not
                                // populated.
     typed_python_hash_type* hash_table_hashes; // a hashtable. each actual object hash to
@@ -337,8 +337,19 @@ class FunctionOverload:
             "<signature>" if self.functionObj is None else "<impl>"
         )
 
-    def _installNativePointer(self, fp, returnType, argumentTypes):
-        typed_python._types.installNativeFunctionPointer(self.functionTypeObject, self.index, fp, returnType, tuple(argumentTypes))
+    def _installNativePointer(self, fp, returnType, argumentTypes, hotCallThreshold=0):
+        """Install a compiled specialization and return its index.
+
+        If 'hotCallThreshold' is positive, the call that reaches that many calls of
+        this specialization tells the runtime, by calling 'Runtime.specializationIsHot'.
+        """
+        return typed_python._types.installNativeFunctionPointer(
+            self.functionTypeObject, self.index, fp, returnType, tuple(argumentTypes), hotCallThreshold
+        )
+
+    def _replaceNativePointer(self, specializationIx, fp):
+        """Atomically swap in 'fp' as the implementation of an installed specialization."""
+        typed_python._types.replaceNativeFunctionPointer(self.functionTypeObject, self.index, specializationIx, fp)
 
 
 class DisableCompiledCode:
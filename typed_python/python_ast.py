@@ -845,6 +845,19 @@ def convertPyAstToAlgebraic(tree, fname, keepLineInformation=True):
     return tree
 
 
+def alternativeName(node):
+    """Return the name of the kind of node 'node' is, like 'Attribute' for an Expr.Attribute.
+
+    We can't use 'node.Name' for this, since on an Expr it finds the Expr.Name alternative.
+    """
+    for alternativeType in (Expr, Statement):
+        for concreteType in alternativeType.__typed_python_alternatives__:
+            if getattr(node.matches, concreteType.Name):
+                return concreteType.Name
+
+    return type(node).__name__
+
+
 # a nasty hack to allow us to find the Ast's of functions we have deserialized
 # but for which we never had the source code.
 _originalAstCache = weakref.WeakKeyDictionary()
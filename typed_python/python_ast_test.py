@@ -28,6 +28,18 @@ class TestPythonAst(unittest.TestCase):
         self.assertTrue(pyast.body.matches.Name)
         self.assertEqual(pyast.body.id, "X")
 
+    def test_alternative_name(self):
+        def f(x, y):
+            for x.y in y:
+                pass
+
+        pyast = python_ast.convertFunctionToAlgebraicPyAst(f)
+
+        self.assertEqual(python_ast.alternativeName(pyast), "FunctionDef")
+        self.assertEqual(python_ast.alternativeName(pyast.body[0]), "For")
+        self.assertEqual(python_ast.alternativeName(pyast.body[0].target), "Attribute")
+        self.assertEqual(python_ast.alternativeName(pyast.body[0].iter), "Name")
+
     def reverseParseCheck(self, f):
         pyast = python_ast.convertFunctionToAlgebraicPyAst(f)
         native_ast = python_ast.convertAlgebraicToPyAst(pyast)
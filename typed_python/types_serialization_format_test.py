@@ -80,6 +80,10 @@ def floatToBits(f):
     return struct.pack("d", f)
 
 
+def packedInts(*ints):
+    return struct.pack("%sq" % len(ints), *ints)
+
+
 class TypesSerializationWireFormatTest(unittest.TestCase):
     """Test that the wire format we produce matches our standard.
 
@@ -135,7 +139,9 @@ class TypesSerializationWireFormatTest(unittest.TestCase):
 
     TupleOf(T) is encoded as a compound (EMPTY, SINGLE, or a BEGIN_COMPOUND/END_COMPOUND
     pair) followed by a record count, and then individual objects. All field numbers are
-    zero.
+    zero. If T is a register type (bool, an integer type, or a float type), the objects
+    are instead packed into a single BYTES message holding the raw in-memory contents
+    of the tuple. Readers accept either form.
 
     Lists are encoded like tuples, but they have a single varint identity value first. If
     the list has been seen before, the data is not repeated.
@@ -339,31 +345,114 @@ class TypesSerializationWireFormatTest(unittest.TestCase):
 
         self.assertEqual(serialize(T, T(())), EMPTY(0))
 
-        # A single element tuple is SINGLE + 0=VARINT + count + 0=VARINT + value
+        # A single element tuple of a register type is BEGIN_COMPOUND + 0=VARINT + count +
+        # 0=BYTES holding the packed values
         self.assertEqual(
             serialize(T, T((1,))),
-            BEGIN_COMPOUND(0) + VARINT(0) + unsignedVarint(1) + VARINT(0) + signedVarint(1) + END_COMPOUND()
+            BEGIN_COMPOUND(0) + VARINT(0) + unsignedVarint(1) + BYTES(0) + unsignedVarint(8) + packedInts(1) + END_COMPOUND()
         )
 
         self.assertEqual(
-            serialize(T, T((123, 124))),
+            serialize(T, T((123, 124, 125))),
+            BEGIN_COMPOUND(0) + (
+                VARINT(0) + unsignedVarint(3) +
+                BYTES(0) + unsignedVarint(24) + packedInts(123, 124, 125)
+            ) + END_COMPOUND()
+        )
+
+        # other element types get one message per element
+        self.assertEqual(
+            serialize(TupleOf(str), TupleOf(str)(("a", "bc"))),
             BEGIN_COMPOUND(0) + (
                 VARINT(0) + unsignedVarint(2) +
-                VARINT(0) + signedVarint(123) +
-                VARINT(0) + signedVarint(124)
+                BYTES(0) + unsignedVarint(1) + b"a" +
+                BYTES(0) + unsignedVarint(2) + b"bc"
             ) + END_COMPOUND()
         )
 
+    def test_packed_lists(self):
         self.assertEqual(
-            serialize(T, T((123, 124, 125))),
+            serialize(ListOf(float), ListOf(float)([1.5, 2.5])),
+            BEGIN_COMPOUND(0) + (
+                VARINT(0) + unsignedVarint(0) +  # the ID
+                VARINT(0) + unsignedVarint(2) +  # the size
+                BYTES(0) + unsignedVarint(16) + struct.pack("dd", 1.5, 2.5)
+            ) + END_COMPOUND()
+        )
+
+        self.assertEqual(
+            serialize(ListOf(bool), ListOf(bool)([True, False, True])),
             BEGIN_COMPOUND(0) + (
+                VARINT(0) + unsignedVarint(0) +
                 VARINT(0) + unsignedVarint(3) +
-                VARINT(0) + signedVarint(123) +
-                VARINT(0) + signedVarint(124) +
-                VARINT(0) + signedVarint(125)
+                BYTES(0) + unsignedVarint(3) + b"\x01\x00\x01"
             ) + END_COMPOUND()
         )
 
+        # packed data decodes as a bytes object
+        self.assertEqual(
+            decodeSerializedObject(serialize(ListOf(float), ListOf(float)([1.5]))),
+            [(0, 0), (0, 1), (0, floatToBits(1.5))]
+        )
+
+        for T in [ListOf(int), TupleOf(int), ListOf(float), TupleOf(bool)]:
+            self.assertEqual(validateSerializedObject(serialize(T, T([1, 0, 1]))), None)
+
+    def test_empty_packed_lists(self):
+        # empty lists write no element messages at all
+        self.assertEqual(
+            serialize(ListOf(int), ListOf(int)()),
+            BEGIN_COMPOUND(0) + VARINT(0) + unsignedVarint(0) + VARINT(0) + unsignedVarint(0) + END_COMPOUND()
+        )
+
+        for T in [ListOf(int), ListOf(float), ListOf(bool)]:
+            self.assertEqual(deserialize(T, serialize(T, T())), T())
+
+        T = TupleOf(ListOf(float))
+        self.assertEqual(
+            deserialize(T, serialize(T, T([[], [1.5], []]))),
+            T([[], [1.5], []])
+        )
+
+    def test_unpacked_register_lists_still_deserialize(self):
+        # data written before lists of register types were packed must still be readable
+        self.assertEqual(
+            deserialize(
+                TupleOf(int),
+                BEGIN_COMPOUND(0) + (
+                    VARINT(0) + unsignedVarint(2) +
+                    VARINT(0) + signedVarint(123) +
+                    VARINT(0) + signedVarint(124)
+                ) + END_COMPOUND()
+            ),
+            (123, 124)
+        )
+
+        self.assertEqual(
+            deserialize(
+                ListOf(float),
+                BEGIN_COMPOUND(0) + (
+                    VARINT(0) + unsignedVarint(0) +
+                    VARINT(0) + unsignedVarint(2) +
+                    BITS_64(0) + floatToBits(1.5) +
+                    BITS_64(0) + floatToBits(2.5)
+                ) + END_COMPOUND()
+            ),
+            [1.5, 2.5]
+        )
+
+    def test_corrupt_packed_lists(self):
+        # the packed bytecount has to match the element count
+        with self.assertRaises(Exception):
+            deserialize(
+                ListOf(int),
+                BEGIN_COMPOUND(0) + (
+                    VARINT(0) + unsignedVarint(0) +
+                    VARINT(0) + unsignedVarint(2) +
+                    BYTES(0) + unsignedVarint(8) + packedInts(1)
+                ) + END_COMPOUND()
+            )
+
     def test_oneof(self):
         # tuples are a compound with indices on item numbers
         T = OneOf(None, int, float, "HI", TupleOf(int))
@@ -376,9 +465,7 @@ class TypesSerializationWireFormatTest(unittest.TestCase):
             serialize(T, (1, 2, 123)),
             SINGLE(0) + BEGIN_COMPOUND(4) + (
                 VARINT(0) + unsignedVarint(3) +
-                VARINT(0) + signedVarint(1) +
-                VARINT(0) + signedVarint(2) +
-                VARINT(0) + signedVarint(123)
+                BYTES(0) + unsignedVarint(24) + packedInts(1, 2, 123)
             ) + END_COMPOUND()
         )
 
@@ -26,6 +26,7 @@ import pytz
 import gc
 import pprint
 import tempfile
+import lz4.frame
 import typed_python.dummy_test_module as dummy_test_module
 
 from typed_python.Codebase import Codebase
@@ -36,7 +37,8 @@ from typed_python import (
     Member, String, Bool, Bytes, ConstDict, Alternative, serialize, deserialize,
     Dict, Set, SerializationContext, EmbeddedMessage,
     serializeStream, deserializeStream, decodeSerializedObject,
-    Forward
+    Forward, serializeInto, deserializeFromFile, serializeChunkedStream, deserializeChunkedStream,
+    validateSerializedObject, Final
 )
 
 from typed_python._types import refcount
@@ -513,6 +515,318 @@ class TypesSerializationTest(unittest.TestCase):
 
         self.assertEqual(len(OK), len(threads))
 
+    def test_native_compression_matches_python_compression(self):
+        class PythonCompressionContext(SerializationContext):
+            def compress(self, bytes):
+                return lz4.frame.compress(bytes)
+
+            def decompress(self, bytes):
+                return lz4.frame.decompress(bytes)
+
+        nativeContext = SerializationContext()
+        pythonContext = PythonCompressionContext()
+
+        self.assertTrue(nativeContext.nativeCompressionEnabled)
+        self.assertFalse(pythonContext.nativeCompressionEnabled)
+
+        # big enough that we compress more than one block
+        value = ListOf(float)(numpy.arange(5000000) % 100)
+
+        for writer in [nativeContext, pythonContext]:
+            for reader in [nativeContext, pythonContext]:
+                self.assertEqual(reader.deserialize(writer.serialize(value)), value)
+
+        self.assertEqual(nativeContext.serialize(value), pythonContext.serialize(value))
+
+        with self.assertRaisesRegex(Exception, "Corrupt data"):
+            nativeContext.deserialize(nativeContext.serialize(value)[:100000])
+
+    def test_native_compression_releases_the_gil(self):
+        sc = SerializationContext()
+        self.assertTrue(sc.nativeCompressionEnabled)
+
+        value = ListOf(float)(numpy.arange(2000000) % 1000)
+
+        progress = [0]
+        done = threading.Event()
+
+        def spin():
+            # sleeping releases the GIL, and waking up needs it back, so we only count
+            # while the main thread isn't holding it
+            while not done.is_set():
+                progress[0] += 1
+                time.sleep(0.0001)
+
+        # with a huge switch interval the main thread only gives up the GIL when it
+        # blocks, or when native code releases it explicitly.
+        switchInterval = sys.getswitchinterval()
+        sys.setswitchinterval(1000)
+
+        thread = threading.Thread(target=spin, daemon=True)
+        thread.start()
+
+        try:
+            progressBefore = progress[0]
+            data = sc.serialize(value)
+            progressDuringSerialize = progress[0] - progressBefore
+
+            progressBefore = progress[0]
+            self.assertEqual(sc.deserialize(data), value)
+            progressDuringDeserialize = progress[0] - progressBefore
+        finally:
+            done.set()
+            sys.setswitchinterval(switchInterval)
+            thread.join()
+
+        self.assertGreater(progressDuringSerialize, 0)
+        self.assertGreater(progressDuringDeserialize, 0)
+
+    def test_chunked_streams(self):
+        T = NamedTuple(x=int, y=str, z=ListOf(float))
+
+        items = ListOf(T)([T(x=i, y=str(i), z=[i, i + .5]) for i in range(1000)])
+
+        for chunkSize in [1, 7, 100, 1000, 5000]:
+            for threadCount in [1, 4]:
+                data = serializeChunkedStream(T, items, chunkSize=chunkSize, threadCount=threadCount)
+
+                self.assertIsNone(validateSerializedObject(data))
+                self.assertEqual(deserializeChunkedStream(T, data, threadCount=threadCount), items)
+
+        data = serializeChunkedStream(T, items, chunkSize=64)
+
+        self.assertEqual(type(deserializeChunkedStream(T, data)), ListOf(T))
+
+        # we can decode a subrange without touching the other chunks
+        for start, stop in [(0, 1), (63, 65), (100, 700), (999, 1000), (-10, None), (None, -990), (500, 500), (700, 100)]:
+            self.assertEqual(deserializeChunkedStream(T, data, start=start, stop=stop), items[start:stop])
+
+        self.assertEqual(deserializeChunkedStream(T, serializeChunkedStream(T, ListOf(T)())), [])
+
+        # anything convertible to TupleOf(T) works too
+        self.assertEqual(deserializeChunkedStream(int, serializeChunkedStream(int, range(10), chunkSize=3)), list(range(10)))
+
+    def test_chunked_streams_with_python_objects(self):
+        class A:
+            def __init__(self, x):
+                self.x = x
+
+            def __eq__(self, other):
+                return type(other) is A and other.x == self.x
+
+        ts = SerializationContext({'A': A})
+
+        items = [A(i) for i in range(200)] + ["hi", None, 1.5]
+
+        data = serializeChunkedStream(object, items, ts, chunkSize=10)
+
+        self.assertEqual(list(deserializeChunkedStream(object, data, ts)), items)
+        self.assertEqual(list(deserializeChunkedStream(object, data, ts, start=195)), items[195:])
+
+        # errors raised on worker threads make it back to us
+        with self.assertRaises(Exception):
+            serializeChunkedStream(object, items + [threading.Lock()], ts, chunkSize=10)
+
+    def test_chunked_streams_reject_corrupt_data(self):
+        data = serializeChunkedStream(int, ListOf(int)(range(1000)), chunkSize=100)
+
+        for badData in [data[:-1], data[:len(data) // 2], serialize(int, 10), b""]:
+            with self.assertRaises(Exception):
+                deserializeChunkedStream(int, badData)
+
+    def test_chunked_streams_are_faster_with_more_threads(self):
+        if os.cpu_count() < 4:
+            self.skipTest("needs at least 4 cores")
+
+        T = NamedTuple(x=int, y=str, z=OneOf(None, float))
+
+        items = ListOf(T)([T(x=i, y=str(i), z=i) for i in range(2000000)])
+
+        timings = {}
+
+        for threadCount in [1, 4]:
+            t0 = time.time()
+            data = serializeChunkedStream(T, items, threadCount=threadCount)
+            self.assertEqual(len(deserializeChunkedStream(T, data, threadCount=threadCount)), len(items))
+            timings[threadCount] = time.time() - t0
+
+        print("chunked stream roundtrip times by thread count: ", timings)
+
+        self.assertLess(timings[4], timings[1] * .6)
+
+    def test_serialize_preserves_sharing(self):
+        inner = ListOf(int)([1, 2, 3])
+        outer = ListOf(ListOf(int))([inner, inner, ListOf(int)([1, 2, 3])] * 1000)
+
+        roundtripped = deserialize(ListOf(ListOf(int)), serialize(ListOf(ListOf(int)), outer))
+
+        self.assertEqual(roundtripped, outer)
+
+        roundtripped[0].append(4)
+        self.assertEqual(roundtripped[1], [1, 2, 3, 4])
+        self.assertEqual(roundtripped[2], [1, 2, 3])
+        self.assertEqual(roundtripped[3], [1, 2, 3, 4])
+
+    def test_serialize_tree_types(self):
+        inner = ListOf(int)([1, 2, 3])
+        outer = ListOf(ListOf(int))([inner, inner])
+
+        sc = SerializationContext().withTreeTypes(ListOf(int))
+
+        self.assertEqual(sc.treeTypes, frozenset([ListOf(int)]))
+        self.assertEqual(sc.withoutCompression().treeTypes, sc.treeTypes)
+
+        roundtripped = sc.deserialize(sc.serialize(outer, ListOf(ListOf(int))), ListOf(ListOf(int)))
+
+        self.assertEqual(roundtripped, outer)
+
+        # we promised there was no sharing, so the shared list comes back as two copies
+        roundtripped[0].append(4)
+        self.assertEqual(roundtripped[1], [1, 2, 3])
+
+        # the output is readable without knowing the tree types
+        self.assertEqual(
+            SerializationContext().deserialize(sc.serialize(outer, ListOf(ListOf(int))), ListOf(ListOf(int))),
+            outer
+        )
+
+        with self.assertRaises(Exception):
+            SerializationContext(treeTypes=[int, "not a type"]).serialize(outer)
+
+    def test_serialize_memo_perf(self):
+        class Node(Class, Final):
+            value = Member(int)
+            children = Member(ListOf(int))
+
+        def timeRoundtrip(sc, value):
+            t0 = time.time()
+            data = sc.serialize(value, ListOf(Node))
+            t1 = time.time()
+            self.assertEqual(len(sc.deserialize(data, ListOf(Node))), len(value))
+            return t1 - t0, time.time() - t1
+
+        sc = SerializationContext().withoutCompression()
+
+        # a million distinct nodes, each of which has to go into the memo
+        distinct = ListOf(Node)([Node(value=i, children=[i]) for i in range(1000000)])
+
+        # a million references to a thousand shared nodes, which mostly hit the memo
+        shared = ListOf(Node)([distinct[i % 1000] for i in range(1000000)])
+
+        memoizedTimes = timeRoundtrip(sc, distinct)
+        sharedTimes = timeRoundtrip(sc, shared)
+        treeTimes = timeRoundtrip(sc.withTreeTypes(Node, ListOf(int)), distinct)
+
+        print("serialize/deserialize times for a million distinct nodes: ", memoizedTimes)
+        print("serialize/deserialize times for a million shared nodes: ", sharedTimes)
+        print("serialize/deserialize times for a million nodes as tree types: ", treeTimes)
+
+        self.assertLess(treeTimes[0], memoizedTimes[0])
+
+    def test_named_instances_of_plain_types(self):
+        class C:
+            pass
+
+        named = C()
+        sc = SerializationContext({'named': named, 'C': C})
+
+        self.assertFalse(sc.isPlainInstanceType(C))
+        self.assertFalse(sc.isPlainInstanceType(datetime.date))
+        self.assertTrue(sc.isPlainInstanceType(type(self)))
+
+        res = sc.deserialize(sc.serialize([named, C(), named]))
+
+        self.assertIs(res[0], named)
+        self.assertIs(res[2], named)
+        self.assertIsNot(res[1], named)
+        self.assertIsInstance(res[1], C)
+
+    def test_serialization_context_cache_invalidation(self):
+        T = NamedTuple(x=int)
+
+        class ContextWithMutableNames(SerializationContext):
+            def __init__(self):
+                super().__init__(compressionEnabled=False)
+                self.names = {}
+
+            def nameForObject(self, t):
+                return self.names.get(t) or super().nameForObject(t)
+
+            def objectFromName(self, name):
+                for k, v in self.names.items():
+                    if v == name:
+                        return k
+                return super().objectFromName(name)
+
+        sc = ContextWithMutableNames()
+
+        self.assertFalse(sc.isPlainInstanceType(type(self)))
+
+        unnamed = sc.serialize(T)
+        sc.names[T] = 'T'
+
+        # we remember that T had no name
+        self.assertEqual(sc.serialize(T), unnamed)
+
+        sc.invalidateCache()
+
+        self.assertNotEqual(sc.serialize(T), unnamed)
+        self.assertIn(b'T', sc.serialize(T))
+        self.assertIs(sc.deserialize(sc.serialize(T)), T)
+
+    def test_union_and_prefix_contexts_name_objects_correctly(self):
+        class C:
+            pass
+
+        class D:
+            pass
+
+        sc = SerializationContext({'C': C}).withTreeTypes(ListOf(int))
+
+        # populate the cache on the original context
+        self.assertIs(sc.deserialize(sc.serialize(C)), C)
+
+        prefixed = sc.withPrefix('prefix')
+
+        self.assertEqual(prefixed.objToName, {id(C): 'prefix.C'})
+        self.assertEqual(prefixed.treeTypes, sc.treeTypes)
+        self.assertIn(b'prefix.C', prefixed.withoutCompression().serialize(C))
+        self.assertIs(prefixed.deserialize(prefixed.serialize(C)), C)
+
+        unioned = sc.union(SerializationContext({'D': D}))
+
+        self.assertEqual(unioned.treeTypes, sc.treeTypes)
+        self.assertIs(unioned.deserialize(unioned.serialize(D)), D)
+        self.assertIs(unioned.deserialize(unioned.serialize(C)), C)
+
+    def test_serialize_plain_instances_perf(self):
+        class C:
+            def __init__(self, x):
+                self.x = x
+
+        class D:
+            def __init__(self, x):
+                self.x = x
+
+        class UncachedContext(SerializationContext):
+            def isPlainInstanceType(self, t):
+                return False
+
+        instances = ListOf(object)([C(i) if i % 2 else D(i) for i in range(1000000)])
+
+        def timeSerialize(sc):
+            t0 = time.time()
+            data = sc.serialize(instances, ListOf(object))
+            return time.time() - t0, data
+
+        cachedTime, cachedData = timeSerialize(SerializationContext({'C': C, 'D': D}, compressionEnabled=False))
+        uncachedTime, uncachedData = timeSerialize(UncachedContext({'C': C, 'D': D}, compressionEnabled=False))
+
+        print("serializing a million plain instances took ", cachedTime, " with the cache and ", uncachedTime, " without")
+
+        self.assertEqual(cachedData, uncachedData)
+        self.assertLess(cachedTime, uncachedTime)
+
     def test_serialize_named_tuple(self):
         X = NamedTuple(x=int)
         self.check_idempotence(X(x=20))
@@ -1052,6 +1366,102 @@ class TypesSerializationTest(unittest.TestCase):
 
         self.assertEqual(lst, l2)
 
+    def test_deserialize_from_buffer_objects(self):
+        T = ListOf(float)
+        data = serialize(T, T(range(100)))
+
+        self.assertEqual(deserialize(T, bytearray(data)), T(range(100)))
+        self.assertEqual(deserialize(T, memoryview(b"xx" + data + b"yy")[2:-2]), T(range(100)))
+        self.assertEqual(deserializeStream(int, memoryview(serializeStream(int, [1, 2, 3]))), (1, 2, 3))
+
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+
+            import mmap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual(deserialize(T, m), T(range(100)))
+
+        # non-contiguous buffers can't be read directly
+        with self.assertRaises(Exception):
+            deserialize(T, memoryview(data)[::2])
+
+        with self.assertRaises(TypeError):
+            deserialize(T, "not a buffer")
+
+    def test_deserialize_from_file(self):
+        sc = SerializationContext({})
+        T = Dict(str, ListOf(int))
+        value = T({"a": [1, 2, 3], "b": []})
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "data")
+
+            with open(path, "wb") as f:
+                f.write(serialize(T, value))
+
+            self.assertEqual(deserializeFromFile(path, T), value)
+
+            with open(path, "wb") as f:
+                f.write(sc.serialize(value))
+
+            self.assertEqual(sc.deserializeFromFile(path), value)
+
+            with open(path, "wb"):
+                pass
+
+            with self.assertRaises(Exception):
+                deserializeFromFile(path, T)
+
+            with self.assertRaises(OSError):
+                deserializeFromFile(os.path.join(tempDir, "doesnt_exist"), T)
+
+    def test_serialize_into(self):
+        T = ListOf(int)
+        value = T(range(1000))
+        expected = serialize(T, value)
+
+        buf = bytearray(len(expected) + 10)
+        self.assertEqual(serializeInto(T, value, buf), len(expected))
+        self.assertEqual(bytes(buf[:len(expected)]), expected)
+
+        # we can write into the middle of a larger buffer
+        buf = bytearray(len(expected) * 2)
+        self.assertEqual(serializeInto(T, value, memoryview(buf)[10:]), len(expected))
+        self.assertEqual(deserialize(T, memoryview(buf)[10:10 + len(expected)]), value)
+
+        with self.assertRaisesRegex(ValueError, str(len(expected))):
+            serializeInto(T, value, bytearray(len(expected) - 1))
+
+        # the target has to be writable
+        with self.assertRaises(Exception):
+            serializeInto(T, value, bytes(len(expected)))
+
+        sc = SerializationContext({})
+        buf = bytearray(100000)
+        written = sc.serializeInto(value, buf)
+        self.assertEqual(sc.deserialize(bytes(buf[:written])), value)
+
+    def test_serialize_packed_lists_perf(self):
+        x = SerializationContext({})
+
+        packed = ListOf(float)(range(10000000))
+
+        # OneOf elements aren't register types, so they serialize one at a time
+        unpacked = ListOf(OneOf(None, float))(packed)
+
+        t0 = time.time()
+        self.assertEqual(x.deserialize(x.serialize(packed)), packed)
+        packedTime = time.time() - t0
+
+        t0 = time.time()
+        self.assertEqual(x.deserialize(x.serialize(unpacked)), unpacked)
+        unpackedTime = time.time() - t0
+
+        print(f"packed roundtrip took {packedTime}, unpacked took {unpackedTime}")
+
+        self.assertLess(packedTime * 5, unpackedTime)
+
     def test_serialize_large_numpy_arrays(self):
         x = SerializationContext({})
 
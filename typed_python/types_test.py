@@ -17,6 +17,7 @@ import numpy
 import os
 import psutil
 import sys
+import threading
 import time
 import unittest
 
@@ -2861,6 +2862,327 @@ class NativeTypesTests(unittest.TestCase):
         self.assertEqual(tupleOfLists.y, ['hi', 'hihi'])
         self.assertEqual(tupleOfLists.z, [False, True])
 
+    def test_list_of_sort(self):
+        values = [(i * 7919) % 101 - 50 for i in range(200)]
+
+        for T in [int, float, str, OneOf(int, str)]:
+            converted = [T(x) if T in (int, float, str) else x for x in values]
+
+            aList = ListOf(T)(converted)
+            aList.sort()
+            self.assertEqual(aList, sorted(converted))
+
+            aList = ListOf(T)(converted)
+            aList.sort(reverse=True)
+            self.assertEqual(aList, sorted(converted, reverse=True))
+
+        aList = ListOf(int)(values)
+        aList.sort(key=abs)
+        self.assertEqual(aList, sorted(values, key=abs))
+
+        aList = ListOf(int)(values)
+        aList.sort(key=abs, reverse=True)
+        self.assertEqual(aList, sorted(values, key=abs, reverse=True))
+
+    def test_list_of_sort_is_stable(self):
+        T = NamedTuple(k=int, v=int)
+
+        aList = ListOf(T)([T(k=i % 3, v=i) for i in range(30)])
+        aList.sort(key=lambda t: t.k)
+
+        self.assertEqual([t.v for t in aList], sorted(range(30), key=lambda i: i % 3))
+
+    def test_list_of_sort_puts_nans_last(self):
+        aList = ListOf(float)([2.0, math.nan, 1.0, math.nan, 3.0])
+        aList.sort()
+        self.assertEqual(list(aList[:3]), [1.0, 2.0, 3.0])
+        self.assertTrue(math.isnan(aList[3]) and math.isnan(aList[4]))
+
+        aList.sort(reverse=True)
+        self.assertEqual(list(aList[:3]), [3.0, 2.0, 1.0])
+
+    def test_list_of_sort_propagates_key_exceptions(self):
+        def key(x):
+            if x == 3:
+                raise ValueError("no threes")
+            return x
+
+        aList = ListOf(int)([5, 3, 1])
+
+        with self.assertRaisesRegex(ValueError, "no threes"):
+            aList.sort(key=key)
+
+        self.assertEqual(aList, [5, 3, 1])
+
+    def test_list_of_argsort(self):
+        values = [3.0, 1.0, 2.0, 1.0]
+
+        self.assertEqual(ListOf(float)(values).argsort(), [1, 3, 2, 0])
+        self.assertEqual(ListOf(float)(values).argsort(reverse=True), [0, 2, 1, 3])
+        self.assertEqual(ListOf(str)(["b", "a", "c"]).argsort(), [1, 0, 2])
+        self.assertEqual(ListOf(int)([-3, 1, 2]).argsort(key=abs), [1, 2, 0])
+        self.assertEqual(type(ListOf(int)().argsort()), ListOf(int))
+
+    def test_list_of_bisect(self):
+        import bisect
+
+        values = [1, 2, 2, 2, 5, 7]
+        aList = ListOf(int)(values)
+
+        for x in range(9):
+            self.assertEqual(aList.bisect_left(x), bisect.bisect_left(values, x))
+            self.assertEqual(aList.bisect_right(x), bisect.bisect_right(values, x))
+            self.assertEqual(aList.bisect_left(x, 2, 4), bisect.bisect_left(values, x, 2, 4))
+            self.assertEqual(aList.bisect_right(x, hi=3), bisect.bisect_right(values, x, hi=3))
+
+        self.assertEqual(ListOf(str)(["a", "c"]).bisect_left("b"), 1)
+
+        with self.assertRaises(ValueError):
+            aList.bisect_left(1, -1)
+
+    def test_list_of_partial_sort_and_nth_element(self):
+        values = [(i * 7919) % 101 for i in range(100)]
+
+        for T in [int, float, str]:
+            converted = [T(x) for x in values]
+
+            aList = ListOf(T)(converted)
+            aList.partialSort(10)
+            self.assertEqual(aList[:10], sorted(converted)[:10])
+            self.assertEqual(sorted(aList), sorted(converted))
+
+            aList = ListOf(T)(converted)
+            aList.nthElement(37)
+            self.assertEqual(aList[37], sorted(converted)[37])
+            self.assertTrue(all(x <= aList[37] for x in aList[:37]))
+            self.assertTrue(all(x >= aList[37] for x in aList[38:]))
+
+            aList = ListOf(T)(converted)
+            aList.nthElement(-1)
+            self.assertEqual(aList[-1], max(converted))
+
+        with self.assertRaises(IndexError):
+            ListOf(int)([1, 2]).nthElement(2)
+
+    def test_list_of_view(self):
+        aList = ListOf(str)([str(i) for i in range(10)])
+        refcountBefore = _types.refcount(aList)
+
+        # the view holds a reference to the list's layout, not to the list object
+        v = aList.view(2, 8)
+
+        self.assertIsInstance(v, _types.ListOfView)
+        self.assertEqual(_types.refcount(aList), refcountBefore + 1)
+        self.assertEqual(len(v), 6)
+        self.assertEqual(list(v), ["2", "3", "4", "5", "6", "7"])
+        self.assertEqual((v[0], v[-1]), ("2", "7"))
+        self.assertEqual(list(v.view(1, -1)), ["3", "4", "5", "6"])
+        self.assertEqual(list(aList.view(-3)), ["7", "8", "9"])
+        self.assertEqual(list(aList.view(5, 2)), [])
+
+        with self.assertRaises(IndexError):
+            v[6]
+
+        with self.assertRaises(TypeError):
+            v[0] = "hi"
+
+        # views read through to the list, which can't change size while they're alive
+        aList[2] = "changed"
+        self.assertEqual(v[0], "changed")
+
+        with self.assertRaises(BufferError):
+            aList.resize(4)
+
+        # the view keeps the list's elements alive after the list itself is gone
+        aList = None
+        self.assertEqual(list(v), ["changed", "3", "4", "5", "6", "7"])
+
+    def test_list_of_view_shares_the_buffer(self):
+        aList = ListOf(float)(range(10))
+        v = aList.view(2, 6)
+
+        arr = numpy.asarray(v)
+        mem = memoryview(v)
+
+        self.assertEqual(arr.dtype, numpy.float64)
+        self.assertEqual(mem.format, "d")
+        self.assertTrue(mem.readonly)
+        self.assertEqual(arr.tolist(), [2.0, 3.0, 4.0, 5.0])
+
+        # the exports look at the list's own memory
+        aList[3] = 100.0
+        self.assertEqual(arr[1], 100.0)
+        self.assertEqual(mem[1], 100.0)
+
+        # but they're read-only
+        with self.assertRaises(ValueError):
+            arr[0] = 1.0
+
+        # releasing the view and its exports unlocks the list
+        del v, arr
+        mem.release()
+        aList.append(10.0)
+        self.assertEqual(len(aList), 11)
+
+        with self.assertRaises(TypeError):
+            memoryview(ListOf(str)(["a"]).view())
+
+    def test_list_of_buffer_export(self):
+        aList = ListOf(float)([1.0, 2.0, 3.0])
+
+        arr = numpy.asarray(aList)
+        mem = memoryview(aList)
+
+        self.assertEqual(arr.dtype, numpy.float64)
+        self.assertEqual(mem.format, "d")
+        self.assertEqual(mem.shape, (3,))
+
+        # writes show through in both directions
+        arr[0] = 10.0
+        aList[1] = 20.0
+        self.assertEqual(aList[0], 10.0)
+        self.assertEqual(arr[1], 20.0)
+        self.assertEqual(mem[1], 20.0)
+
+        # we can't change size while an export is alive
+        for resize in [
+            lambda: aList.append(4.0),
+            lambda: aList.extend([4.0]),
+            lambda: aList.resize(10),
+            lambda: aList.reserve(100),
+            lambda: aList.pop(),
+            lambda: aList.clear(),
+            lambda: aList.__setitem__(slice(0, 1), [1.0, 2.0]),
+            lambda: aList.__setitem__(slice(0, 2), []),
+            lambda: aList.__delitem__(slice(0, 2)),
+            lambda: aList.__delitem__(slice(None, None, 2))
+        ]:
+            with self.assertRaises(BufferError):
+                resize()
+
+        self.assertEqual(aList, [10.0, 20.0, 3.0])
+
+        # assigning a slice of the same size doesn't change our size, so that's fine
+        aList[0:2] = [1.0, 2.0]
+        aList[::2] = [5.0, 6.0]
+        self.assertEqual(arr.tolist(), [5.0, 2.0, 6.0])
+
+        mem.release()
+        arr = None
+
+        aList.append(4.0)
+        self.assertEqual(aList, [5.0, 2.0, 6.0, 4.0])
+
+    def test_list_of_slice_assignment_and_deletion(self):
+        for step in [None, 1, 2, 3, -1, -2]:
+            for a in [None, -12, -3, 0, 2, 5, 12]:
+                for b in [None, -12, -3, 0, 2, 5, 12]:
+                    values = [str(i) for i in range(8)]
+
+                    aList = ListOf(str)(values)
+                    del aList[a:b:step]
+                    del values[a:b:step]
+                    self.assertEqual(aList, values)
+
+                    values = [str(i) for i in range(8)]
+
+                    # extended slices need exactly as many values as they have elements
+                    if step in (None, 1):
+                        newValues = ["x", "y", "z"]
+                    else:
+                        newValues = ["x"] * len(values[a:b:step])
+
+                    aList = ListOf(str)(values)
+                    aList[a:b:step] = newValues
+                    values[a:b:step] = newValues
+                    self.assertEqual(aList, values)
+
+        aList = ListOf(int)(range(4))
+        aList[1:2] = aList
+        self.assertEqual(aList, [0, 0, 1, 2, 3, 2, 3])
+
+        aList[2:] = range(3)
+        self.assertEqual(aList, [0, 0, 0, 1, 2])
+
+        with self.assertRaisesRegex(ValueError, "attempt to assign sequence of size 1 to extended slice of size 3"):
+            aList[::2] = [1]
+
+    def test_tuple_of_buffer_is_read_only(self):
+        aTup = TupleOf(int)([1, 2, 3])
+
+        self.assertTrue(memoryview(aTup).readonly)
+        self.assertEqual(numpy.asarray(aTup).tolist(), [1, 2, 3])
+        self.assertEqual(len(memoryview(TupleOf(int)())), 0)
+
+        with self.assertRaises(ValueError):
+            numpy.asarray(aTup)[0] = 10
+
+        # only register types export their buffers
+        with self.assertRaises(TypeError):
+            memoryview(TupleOf(str)(["hi"]))
+
+    def test_list_of_from_buffer(self):
+        arr = numpy.arange(10, dtype=numpy.int64)
+        refcountBefore = sys.getrefcount(arr)
+
+        aList = ListOf(int).fromBuffer(arr)
+
+        self.assertGreater(sys.getrefcount(arr), refcountBefore)
+        self.assertEqual(aList, list(range(10)))
+
+        # we share the array's memory rather than copying it
+        arr[0] = 100
+        aList[1] = 200
+        self.assertEqual(aList[0], 100)
+        self.assertEqual(arr[1], 200)
+
+        # and we can't change its size
+        with self.assertRaises(BufferError):
+            aList.append(10)
+
+        aList = None
+        self.assertEqual(sys.getrefcount(arr), refcountBefore)
+
+        # any contiguous shape works, and gets flattened
+        self.assertEqual(TupleOf(float).fromBuffer(numpy.ones((2, 3))), [1.0] * 6)
+        self.assertEqual(TupleOf(float).fromBuffer(numpy.ones(0)), ())
+
+        with self.assertRaises(TypeError):
+            ListOf(int).fromBuffer(numpy.ones(3, dtype=numpy.float64))
+
+        with self.assertRaises(TypeError):
+            ListOf(float).fromBuffer(numpy.ones(3, dtype=numpy.float32))
+
+        with self.assertRaises(TypeError):
+            ListOf(str).fromBuffer(numpy.ones(3))
+
+        # lists need a writable buffer
+        with self.assertRaises(BufferError):
+            ListOf(UInt8).fromBuffer(b"hello")
+
+        self.assertEqual(TupleOf(UInt8).fromBuffer(b"hello"), tuple(b"hello"))
+
+    @flaky(max_runs=3, min_passes=1)
+    def test_list_of_sort_releases_the_gil(self):
+        aList = ListOf(float)(numpy.random.uniform(size=5000000))
+
+        t0 = time.time()
+        aList.sort()
+        singleThreaded = time.time() - t0
+
+        lists = [ListOf(float)(numpy.random.uniform(size=5000000)) for _ in range(2)]
+        threads = [threading.Thread(target=toSort.sort) for toSort in lists]
+
+        t0 = time.time()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        multiThreaded = time.time() - t0
+
+        # two sorts at once should take much less than twice as long as one
+        self.assertLess(multiThreaded, singleThreaded * 1.6)
+
     def test_const_dict_equality_with_python(self):
         CD = ConstDict(OneOf(int, str), OneOf(int, str))
 